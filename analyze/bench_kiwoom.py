@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+키움증권 클라이언트 부하 측정
+
+대역 서버(lib.kiwoom_stub_server)를 띄우고 (또는 --base-url로 이미 떠 있는 서버를 사용)
+동기 KiwoomAPI(스레드)와 AsyncKiwoomAPI로 일봉 조회를 반복해 처리량과 지연(p50/p95/p99)을 출력합니다.
+클라이언트 요청 한도(rate_limiter)와 토큰 브로커, 커넥션 풀을 모두 거친 수치입니다.
+
+사용 예:
+    python bench_kiwoom.py --requests 200 --concurrency 8 --latency-ms 30 --jitter-ms 20
+    KIWOOM_RATE_LIMIT_PER_SEC=1000 KIWOOM_RATE_LIMIT_BURST=1000 python bench_kiwoom.py
+"""
+
+import os
+import time
+import asyncio
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from lib.kiwoom_stub_server import KiwoomStubServer
+
+SYMBOLS = ['005930', '000660', '035420', '035720', '005380', '051910', '006400', '068270']
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def report(name: str, latencies: List[float], failures: int, elapsed: float):
+    ms = [latency * 1000 for latency in latencies]
+    print(f"{name:<8} {len(latencies):>6}건 실패 {failures:>3}  "
+          f"{len(latencies) / elapsed:>8.1f} req/s  "
+          f"p50 {percentile(ms, 50):>7.1f}ms  p95 {percentile(ms, 95):>7.1f}ms  "
+          f"p99 {percentile(ms, 99):>7.1f}ms  평균 {statistics.mean(ms):>7.1f}ms")
+
+
+def bench_sync(total: int, concurrency: int):
+    """동기 KiwoomAPI를 스레드 풀에서 동시에 호출"""
+    from lib.kiwoom import KiwoomAPI
+
+    api = KiwoomAPI('bench-app', 'bench-secret', '00000000')
+    api.get_access_token()
+
+    def call(index: int):
+        started = time.perf_counter()
+        result = api.get_daily_chart(SYMBOLS[index % len(SYMBOLS)])
+        return time.perf_counter() - started, result is not None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(call, range(total)))
+    elapsed = time.perf_counter() - started
+    report('sync', [latency for latency, ok in results if ok], sum(not ok for _, ok in results), elapsed)
+
+
+def bench_async(total: int, concurrency: int):
+    """AsyncKiwoomAPI를 세마포어로 동시 요청 수를 제한해 호출"""
+    from lib.kiwoom_async import AsyncKiwoomAPI, close_async_clients
+
+    async def run():
+        api = AsyncKiwoomAPI('bench-app', 'bench-secret', '00000000')
+        await api.get_access_token()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(index: int):
+            async with semaphore:
+                started = time.perf_counter()
+                result = await api.get_daily_chart(SYMBOLS[index % len(SYMBOLS)])
+                return time.perf_counter() - started, result is not None
+
+        try:
+            started = time.perf_counter()
+            results = await asyncio.gather(*[call(index) for index in range(total)])
+            return results, time.perf_counter() - started
+        finally:
+            await close_async_clients()
+
+    results, elapsed = asyncio.run(run())
+    report('async', [latency for latency, ok in results if ok], sum(not ok for _, ok in results), elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='키움증권 클라이언트 부하 측정 (대역 서버 사용)')
+    parser.add_argument('--requests', type=int, default=100, help='모드별 요청 수')
+    parser.add_argument('--concurrency', type=int, default=8, help='동시 요청 수')
+    parser.add_argument('--mode', choices=['sync', 'async', 'all'], default='all')
+    parser.add_argument('--base-url', help='이미 떠 있는 대역 서버 URL (없으면 프로세스 안에서 시작)')
+    parser.add_argument('--fixtures', help='대역 서버 기록 디렉터리')
+    parser.add_argument('--latency-ms', type=float, default=20.0)
+    parser.add_argument('--jitter-ms', type=float, default=10.0)
+    parser.add_argument('--rate-limit', type=int, default=0, help='서버 측 초당 한도 (0: 제한 없음)')
+    parser.add_argument('--page-size', type=int, default=600)
+    args = parser.parse_args()
+
+    # 토큰 디스크 캐시에 벤치마크 토큰을 남기지 않음
+    os.environ['KIWOOM_TOKEN_CACHE_PATH'] = ''
+
+    stub = None
+    if args.base_url:
+        os.environ['KIWOOM_BASE_URL'] = args.base_url
+    else:
+        stub = KiwoomStubServer(
+            fixtures_dir=args.fixtures, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+            rate_limit=args.rate_limit, page_size=args.page_size, pages=1,
+        ).start()
+        os.environ.update(stub.env())
+
+    benches: List[Callable[[int, int], None]] = []
+    if args.mode in ('sync', 'all'):
+        benches.append(bench_sync)
+    if args.mode in ('async', 'all'):
+        benches.append(bench_async)
+
+    print(f"서버: {os.environ['KIWOOM_BASE_URL']}, 요청 {args.requests}건, 동시 {args.concurrency}")
+    try:
+        for bench in benches:
+            bench(args.requests, args.concurrency)
+    finally:
+        if stub is not None:
+            print(f"서버 통계: {dict(stub.stats)}")
+            stub.stop()
+
+
+if __name__ == '__main__':
+    main()
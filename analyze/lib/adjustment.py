@@ -0,0 +1,116 @@
+"""
+수정주가 계수 (권리락/액면분할 등)
+
+원주가 봉은 한 번만 저장하고, 종목별 수정 이벤트 표 [(권리락일, 비율), ...]로 수정주가를 읽을 때 계산합니다.
+권리락일 이전 봉의 가격에는 그 이후 모든 이벤트 비율의 곱(누적 계수)을 곱합니다.
+수정주가/원주가 전환이나 새 분할 반영에 API 재조회나 중복 저장이 필요 없습니다.
+
+- 이벤트는 같은 기간의 원주가/수정주가 봉을 비교해 찾음 (derive_adjustment_events)
+- 가격(시가/고가/저가/종가)은 계수를 곱해 원 단위로 반올림, 거래량은 계수로 나눔, 거래대금은 그대로
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close')
+
+# (권리락일 'YYYY-MM-DD', 권리락일 이전 봉에 곱할 비율)
+AdjustmentEvent = Tuple[str, float]
+
+
+def price_tolerance(prices: np.ndarray) -> np.ndarray:
+    """수정주가 비교 허용 오차 (원 단위 반올림 차이: 2원 또는 0.2% 중 큰 값)"""
+    return np.maximum(2.0, np.abs(prices) * 0.002)
+
+
+def derive_adjustment_events(raw: pd.DataFrame, adjusted: pd.DataFrame) -> List[AdjustmentEvent]:
+    """
+    같은 종목의 원주가/수정주가 봉을 비교해 수정 이벤트를 찾습니다.
+
+    수정주가/원주가 비율(계수)은 이벤트 사이에서는 일정하고 권리락일에 바뀝니다.
+    전일 수정 종가가 '전일 원 종가 × 당일 계수'와 허용 오차 이상 다르면 당일을 권리락일로 보고,
+    이벤트로 나뉜 구간별 계수(수정 종가 합 / 원 종가 합)의 비로 비율을 정합니다 (반올림 잡음 완화).
+
+    Args:
+        raw: 원주가 표준 일봉/분봉 프레임
+        adjusted: 수정주가 표준 프레임 (같은 기간)
+
+    Returns:
+        list: [(권리락일 'YYYY-MM-DD', 비율), ...] (권리락일 오름차순)
+    """
+    dates, raw_index, adjusted_index = np.intersect1d(
+        raw['date'].to_numpy(), adjusted['date'].to_numpy(), return_indices=True
+    )
+    if len(dates) < 2:
+        return []
+
+    raw_close = raw['close'].to_numpy()[raw_index].astype(np.float64)
+    adjusted_close = adjusted['close'].to_numpy()[adjusted_index].astype(np.float64)
+    factors = adjusted_close / raw_close
+
+    expected_previous = raw_close[:-1] * factors[1:]
+    changed = np.abs(adjusted_close[:-1] - expected_previous) > price_tolerance(adjusted_close[:-1])
+    boundaries = np.flatnonzero(changed) + 1  # 권리락일 인덱스
+    if not len(boundaries):
+        return []
+
+    starts = np.concatenate([[0], boundaries])
+    segment_factors = np.add.reduceat(adjusted_close, starts) / np.add.reduceat(raw_close, starts)
+    ratios = segment_factors[:-1] / segment_factors[1:]
+    ex_dates = np.datetime_as_string(dates[boundaries], unit='D')
+    return [(str(ex_date), round(float(ratio), 8)) for ex_date, ratio in zip(ex_dates, ratios)]
+
+
+def cumulative_factors(dates: np.ndarray, events: Sequence[AdjustmentEvent]) -> np.ndarray:
+    """
+    봉마다 곱할 누적 계수 (그 봉보다 뒤의 권리락일 이벤트 비율의 곱).
+
+    Args:
+        dates: datetime64 배열 (오름차순)
+        events: 수정 이벤트 목록
+
+    Returns:
+        np.ndarray: float64 계수 배열 (dates와 같은 길이)
+    """
+    if not events:
+        return np.ones(len(dates))
+    ex_dates = np.array([ex_date for ex_date, _ in events], dtype='datetime64[D]').astype(dates.dtype)
+    ratios = np.array([ratio for _, ratio in events], dtype=np.float64)
+    suffix_products = np.append(np.cumprod(ratios[::-1])[::-1], 1.0)
+    return suffix_products[np.searchsorted(ex_dates, dates, side='right')]
+
+
+def apply_adjustment(columns: Dict[str, np.ndarray], events: Sequence[AdjustmentEvent]) -> Dict[str, np.ndarray]:
+    """
+    원주가 컬럼에 수정 계수를 적용합니다.
+    구간 안에 영향을 주는 이벤트가 없으면 입력 배열을 그대로 반환합니다 (복사 없음).
+
+    Args:
+        columns: 표준 프레임 컬럼 배열 (date 오름차순)
+        events: 수정 이벤트 목록
+
+    Returns:
+        dict: 수정주가 컬럼 배열
+    """
+    dates = columns['date']
+    if not events or not len(dates):
+        return columns
+    factors = cumulative_factors(dates, events)
+    if factors[0] == 1.0:  # 가장 이른 봉도 모든 권리락일 이후
+        return columns
+
+    adjusted = dict(columns)
+    for column in PRICE_COLUMNS:
+        adjusted[column] = np.rint(columns[column] * factors).astype(columns[column].dtype)
+    adjusted['volume'] = np.rint(columns['volume'] / factors).astype(columns['volume'].dtype)
+    return adjusted
+
+
+def merge_events(events: Sequence[AdjustmentEvent], new_events: Sequence[AdjustmentEvent]) -> List[AdjustmentEvent]:
+    """이벤트 목록을 합칩니다 (같은 권리락일은 비율을 곱함, 권리락일 오름차순)."""
+    merged: Dict[str, float] = {}
+    for ex_date, ratio in list(events) + list(new_events):
+        merged[ex_date] = round(merged.get(ex_date, 1.0) * ratio, 8)
+    return sorted(merged.items())
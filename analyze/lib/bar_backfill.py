@@ -0,0 +1,202 @@
+"""
+전 종목 일봉 백필 (재개 가능한 체크포인트)
+
+stocks_info의 전체 종목(코스피+코스닥 약 2,500개)을 돌며 로컬 일봉 저장소(lib.bar_store)에 빠진 봉을 채웁니다.
+스크리닝/백테스트/추천 점수 계산이 API 호출 없이 로컬 데이터만으로 돌 수 있게 하는 야간 작업입니다.
+
+- 종목별 갱신은 refresh_bars와 같음: 이미 최신이면 호출 없음, 아니면 증분 조회, 저장된 봉이 없으면 전체 조회
+- 갱신한 종목은 지표 상태(lib.indicator_state)도 새 봉만큼 이어서 갱신
+- 동시 조회: 스레드 BACKFILL_WORKERS개 (실제 전송 속도는 키움 요청 한도 버킷이 제한)
+- 체크포인트: 기준 거래일(run_id)별로 끝난 종목을 기록하므로, 중단된 작업을 다시 실행하면 남은 종목부터 진행
+  (실패한 종목은 다시 시도)
+- 진행 로그/결과에 처리 속도(종목/분) 포함
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import pandas as pd
+
+try:
+    from .bar_store import BarStore, latest_final_day, refresh_bars
+    from .indicator_state import refresh_indicators
+except ImportError:  # analyze/lib를 sys.path에 직접 추가해 'bar_backfill'로 임포트한 경우
+    from bar_store import BarStore, latest_final_day, refresh_bars
+    from indicator_state import refresh_indicators
+
+logger = logging.getLogger(__name__)
+
+# 동시 조회 스레드 수 (실제 전송 속도는 rate_limiter가 제한)
+BACKFILL_WORKERS = int(os.getenv('BAR_BACKFILL_WORKERS', '4'))
+
+# 체크포인트 저장 주기 (끝난 종목 수)
+CHECKPOINT_EVERY = 20
+# 진행 로그 주기 (처리한 종목 수)
+PROGRESS_EVERY = 100
+
+
+class BackfillCheckpoint:
+    """
+    백필 진행 상황 파일 (기준 거래일별)
+
+    {'run_id': '2025-09-08', 'done': [종목코드...], 'failed': {종목코드: 사유}, 'updated_at': ...}
+    파일의 run_id가 현재 작업과 다르면(다음 거래일의 새 작업) 처음부터 시작합니다.
+    """
+
+    def __init__(self, path: str, run_id: str):
+        """
+        Args:
+            path: 체크포인트 파일 경로
+            run_id: 작업 식별자 (기준 거래일)
+        """
+        self.path = path
+        self.run_id = run_id
+        self.done = set()
+        self.failed: Dict[str, str] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+
+        try:
+            with open(path, 'r') as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            saved = {}
+        except (ValueError, OSError) as e:
+            logger.warning(f"백필 체크포인트 읽기 실패 (처음부터 시작): {path}, {e}")
+            saved = {}
+
+        if saved.get('run_id') == run_id:
+            self.done = set(saved.get('done', []))
+            self.failed = dict(saved.get('failed', {}))
+
+    def is_done(self, code: str) -> bool:
+        return code in self.done
+
+    def mark(self, code: str, error: Optional[str] = None):
+        """종목 처리 결과를 기록합니다 (error가 있으면 실패, 재개 시 다시 시도)."""
+        with self._lock:
+            if error is None:
+                self.done.add(code)
+                self.failed.pop(code, None)
+            else:
+                self.failed[code] = error
+            self._pending += 1
+            if self._pending >= CHECKPOINT_EVERY:
+                self._save_locked()
+
+    def save(self):
+        """체크포인트를 파일에 기록합니다 (임시 파일 기록 후 교체)."""
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'run_id': self.run_id,
+                'done': sorted(self.done),
+                'failed': self.failed,
+                'updated_at': datetime.now().isoformat(),
+            }, f)
+        os.replace(tmp_path, self.path)
+        self._pending = 0
+
+
+def backfill_bars(
+    store: BarStore,
+    codes: Sequence[str],
+    fetch: Callable[[str, Optional[date], bool], pd.DataFrame],
+    workers: int = BACKFILL_WORKERS,
+    checkpoint_path: Optional[str] = None,
+    now: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    여러 종목의 일봉을 로컬 저장소에 채웁니다.
+
+    Args:
+        store: 일봉 저장소
+        codes: 종목코드 목록
+        fetch: fetch(종목코드, since, adjusted) → 표준 일봉 프레임 (refresh_bars의 fetch에 종목코드 인자 추가)
+        workers: 동시 조회 스레드 수
+        checkpoint_path: 체크포인트 파일 경로 (None이면 <저장소>/backfill_checkpoint.json)
+        now: 기준 시각 (테스트용)
+
+    Returns:
+        dict: {
+            'run_id': 기준 거래일, 'total': 전체 종목 수, 'resumed': 이전 실행에서 끝나 건너뛴 수,
+            'fresh': 이미 최신이던 수, 'updated': 조회한 수, 'failed': {종목코드: 사유},
+            'elapsed_sec': 소요 시간, 'symbols_per_min': 처리 속도
+        }
+    """
+    run_id = latest_final_day(now).isoformat()
+    checkpoint = BackfillCheckpoint(checkpoint_path or os.path.join(store.root, 'backfill_checkpoint.json'), run_id)
+
+    codes = list(dict.fromkeys(codes))
+    pending = [code for code in codes if not checkpoint.is_done(code)]
+    report = {
+        'run_id': run_id, 'total': len(codes), 'resumed': len(codes) - len(pending),
+        'fresh': 0, 'updated': 0, 'failed': {},
+    }
+    if report['resumed']:
+        logger.info(f"일봉 백필 재개: {run_id}, {report['resumed']}개 완료, {len(pending)}개 남음")
+
+    lock = threading.Lock()
+    started = time.monotonic()
+
+    def process(code: str):
+        error = None
+        try:
+            if store.is_fresh(code, now):
+                outcome = 'fresh'
+            else:
+                refresh_bars(store, code, lambda since, adjusted=True: fetch(code, since, adjusted), now)
+                outcome = 'updated' if store.count(code) else 'failed'
+                if outcome == 'failed':
+                    error = '일봉 없음'
+        except Exception as e:
+            outcome, error = 'failed', str(e) or type(e).__name__
+            logger.warning(f"일봉 백필 실패: {code}, {error}")
+
+        if error is None:
+            try:
+                refresh_indicators(store, code)
+            except Exception as e:
+                logger.warning(f"지표 상태 갱신 실패 (무시): {code}, {e}")
+
+        checkpoint.mark(code, error)
+        with lock:
+            if error is None:
+                report[outcome] += 1
+            else:
+                report['failed'][code] = error
+            processed = report['fresh'] + report['updated'] + len(report['failed'])
+            if processed % PROGRESS_EVERY == 0:
+                rate = processed / max(time.monotonic() - started, 1e-9) * 60
+                logger.info(
+                    f"일봉 백필 진행: {processed}/{len(pending)} (실패 {len(report['failed'])}), "
+                    f"{rate:.1f}종목/분, 남은 시간 약 {(len(pending) - processed) / rate:.0f}분"
+                )
+
+    try:
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(pending))), thread_name_prefix='backfill') as executor:
+                list(executor.map(process, pending))
+    finally:
+        checkpoint.save()
+
+    elapsed = time.monotonic() - started
+    report['elapsed_sec'] = round(elapsed, 1)
+    report['symbols_per_min'] = round(len(pending) / elapsed * 60, 1) if elapsed > 0 else None
+    logger.info(
+        f"일봉 백필 완료: {run_id}, 조회 {report['updated']}개, 최신 {report['fresh']}개, "
+        f"재개 건너뜀 {report['resumed']}개, 실패 {len(report['failed'])}개, "
+        f"{report['elapsed_sec']}초 ({report['symbols_per_min']}종목/분)"
+    )
+    return report
@@ -0,0 +1,511 @@
+"""
+로컬 일봉 저장소 (메모리 맵 컬럼 파일)
+
+종목별 원주가 일봉을 로컬 디스크에 컬럼 단위 바이너리 파일로 보관하고, 갱신 시에는 새 봉만 덧붙입니다.
+차트/ATR 요청은 로컬 읽기(np.memmap 슬라이스, 복사 없음)와 필요할 때의 작은 증분 조회 한 번으로 끝납니다.
+수정주가는 meta.json의 수정 이벤트 표로 읽을 때 계산합니다 (lib.adjustment, 이벤트가 없는 구간은 복사 없음).
+
+디렉터리 구조 (공급자별로 분리: 키움과 KIS는 거래대금 단위 등이 다름):
+    <root>/<source>/<종목코드>/meta.json      {'generation', 'count', 'updated_at', 'adjustments'}
+    <root>/<source>/<종목코드>/g<N>/<컬럼>.bin  lib.ohlcv.BAR_DTYPES dtype의 리틀엔디언 배열
+    <root>/<source>/<종목코드>/<이름>.state.json  파생 상태 (lib.indicator_state 지표 상태 등)
+
+- 덧붙이기: 컬럼 파일의 count 위치부터 기록한 뒤 meta.json을 원자적으로 교체 (읽는 쪽은 meta의 count만 봄)
+- 파일은 줄이지 않음 (다른 프로세스가 매핑 중인 파일을 잘라 SIGBUS가 나지 않도록)
+- 새 권리락 이벤트: 증분 구간의 원주가를 한 번 더 받아 이벤트만 추가 (과거 봉은 다시 쓰지 않음)
+- 전체 재작성(공백 발생, 저장된 원주가와 불일치): 새 세대(g<N+1>)에 기록 후 meta를 교체하고 이전 세대 삭제
+- 쓰기는 종목별 파일 잠금(fcntl)으로 프로세스 간 직렬화, 읽기는 잠금 없음
+  (읽는 사이 이전 세대가 삭제되면 새 meta로 다시 읽음)
+- 컬럼 메모리 맵은 파일 디스크립터를 하나씩 잡으므로 최근 사용한 BAR_STORE_MAP_CACHE개 종목만 유지 (LRU)
+"""
+
+import os
+import json
+import asyncio
+import shutil
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime, time
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .adjustment import (
+        PRICE_COLUMNS, AdjustmentEvent, apply_adjustment, derive_adjustment_events, merge_events, price_tolerance
+    )
+    from .ohlcv import BAR_DTYPES, empty_bars
+    from .krx_calendar import is_trading_day, previous_trading_day
+except ImportError:  # analyze/lib를 sys.path에 직접 추가해 'bar_store'로 임포트한 경우
+    from adjustment import (
+        PRICE_COLUMNS, AdjustmentEvent, apply_adjustment, derive_adjustment_events, merge_events, price_tolerance
+    )
+    from ohlcv import BAR_DTYPES, empty_bars
+    from krx_calendar import is_trading_day, previous_trading_day
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 프로세스 내 잠금만 사용
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# 저장소 기본 경로 (analyze/data/bars), BAR_STORE_DIR 환경변수로 변경 가능
+DEFAULT_STORE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'bars'
+)
+
+# 이 시각 이후에 저장한 당일 봉은 확정된 것으로 봄 (장 마감 15:30 + 종가 반영 여유)
+BAR_FINAL_TIME = time(15, 40)
+
+# 증분 조회 시 마지막 봉 앞으로 겹쳐 받을 봉 수 (수정주가 변경 감지용)
+OVERLAP_BARS = 5
+
+# 전체 조회 시 최대 봉 수 (약 6년)
+HISTORY_BARS = int(os.getenv('BAR_STORE_HISTORY_BARS', '1500'))
+
+# 메모리 맵을 유지할 종목 수 (종목당 컬럼 파일 수만큼 파일 디스크립터 사용)
+MAP_CACHE_SIZE = int(os.getenv('BAR_STORE_MAP_CACHE', '64'))
+
+# 컬럼 dtype (리틀엔디언 고정)
+COLUMN_DTYPES = {column: np.dtype(dtype).newbyteorder('<') for column, dtype in BAR_DTYPES.items()}
+
+# merge() 결과
+MERGE_APPENDED = 'appended'
+MERGE_UNCHANGED = 'unchanged'
+MERGE_GAP = 'gap'            # 받은 봉이 저장된 마지막 봉과 이어지지 않음 → 전체 재조회 필요
+MERGE_ADJUSTED = 'adjusted'  # 겹치는 과거 봉의 수정주가가 다름 (새 권리락) → 같은 구간 원주가와 함께 다시 merge
+MERGE_REBUILD = 'rebuild'    # 원주가까지 저장된 값과 맞지 않음 → 전체 재조회 필요
+
+
+def latest_final_day(now: Optional[datetime] = None) -> date:
+    """now 기준으로 일봉이 확정된 가장 최근 영업일"""
+    now = now or datetime.now()
+    if is_trading_day(now) and now.time() >= BAR_FINAL_TIME:
+        return now.date()
+    return datetime.strptime(previous_trading_day(now), '%Y%m%d').date()
+
+
+class BarStore:
+    """공급자 하나의 종목별 일봉 저장소"""
+
+    def __init__(self, root: str, map_cache_size: int = MAP_CACHE_SIZE):
+        """
+        Args:
+            root: 저장 디렉터리 (예: <BAR_STORE_DIR>/kiwoom)
+            map_cache_size: 컬럼 메모리 맵을 유지할 종목 수 (LRU)
+        """
+        self.root = root
+        self.map_cache_size = max(1, map_cache_size)
+        self._maps: 'OrderedDict[str, Tuple[Tuple[int, int], Dict[str, np.ndarray]]]' = OrderedDict()
+        self._maps_lock = threading.Lock()
+        self._symbol_locks: Dict[str, threading.RLock] = {}
+        self._symbol_locks_lock = threading.Lock()
+
+    def _symbol_dir(self, code: str) -> str:
+        if not code or not code.isalnum():
+            raise ValueError(f"잘못된 종목코드: {code!r}")
+        return os.path.join(self.root, code)
+
+    def _meta(self, code: str) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self._symbol_dir(code), 'meta.json'), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (ValueError, OSError) as e:
+            logger.warning(f"일봉 저장소 메타 읽기 실패 (무시): {code}, {e}")
+            return {}
+
+    def _write_meta(self, code: str, meta: Dict[str, Any]):
+        self._write_json(os.path.join(self._symbol_dir(code), 'meta.json'), meta)
+
+    @staticmethod
+    def _write_json(path: str, data: Dict[str, Any]):
+        """JSON 파일을 원자적으로 교체 (임시 파일 기록 후 os.replace)"""
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _symbol_lock(self, code: str) -> threading.RLock:
+        """종목별 스레드 잠금 (다른 종목의 파일 잠금 대기에 묶이지 않도록 종목마다 따로 둠)"""
+        lock = self._symbol_locks.get(code)
+        if lock is None:
+            with self._symbol_locks_lock:
+                lock = self._symbol_locks.setdefault(code, threading.RLock())
+        return lock
+
+    @contextmanager
+    def _locked(self, code: str) -> Iterator[None]:
+        """종목별 쓰기 잠금 (프로세스 간 + 스레드 간)"""
+        symbol_dir = self._symbol_dir(code)
+        os.makedirs(symbol_dir, exist_ok=True)
+        with self._symbol_lock(code):
+            if fcntl is None:
+                yield
+                return
+            fd = os.open(os.path.join(symbol_dir, '.lock'), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+    # ------------------------------------------------------------------ 읽기
+
+    def count(self, code: str) -> int:
+        """저장된 봉 수"""
+        return int(self._meta(code).get('count', 0))
+
+    def generation(self, code: str) -> int:
+        """현재 세대 번호 (전체 재기록마다 증가, 저장된 봉이 없으면 0)"""
+        return int(self._meta(code).get('generation', 0))
+
+    def updated_at(self, code: str) -> Optional[datetime]:
+        """마지막 저장 시각"""
+        value = self._meta(code).get('updated_at')
+        return datetime.fromisoformat(value) if value else None
+
+    def adjustments(self, code: str) -> List[AdjustmentEvent]:
+        """수정 이벤트 표 [(권리락일 'YYYY-MM-DD', 비율), ...] (권리락일 오름차순)"""
+        return self._adjustments(self._meta(code))
+
+    @staticmethod
+    def _adjustments(meta: Dict[str, Any]) -> List[AdjustmentEvent]:
+        return [(ex_date, float(ratio)) for ex_date, ratio in meta.get('adjustments', [])]
+
+    def columns(self, code: str) -> Dict[str, np.ndarray]:
+        """
+        저장된 전체 원주가 컬럼을 읽기 전용 메모리 맵으로 반환합니다 (복사 없음, 과거 → 최신).
+
+        Returns:
+            dict: {컬럼명: np.memmap} (저장된 봉이 없으면 빈 배열)
+        """
+        return self._snapshot(code)[1]
+
+    def _snapshot(self, code: str) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """meta와 그 세대의 컬럼 맵 (meta를 읽은 뒤 전체 재기록으로 그 세대가 삭제됐으면 새 meta로 다시 읽음)"""
+        meta = self._meta(code)
+        while True:
+            try:
+                return meta, self._columns(code, meta)
+            except FileNotFoundError:
+                fresh = self._meta(code)
+                if fresh.get('generation') == meta.get('generation'):
+                    raise
+                meta = fresh
+
+    def _columns(self, code: str, meta: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        count, generation = int(meta.get('count', 0)), int(meta.get('generation', 0))
+        if not count:
+            return {column: np.empty(0, dtype=dtype) for column, dtype in COLUMN_DTYPES.items()}
+
+        with self._maps_lock:
+            cached = self._maps.get(code)
+            if cached is not None and cached[0] == (generation, count):
+                self._maps.move_to_end(code)
+                return cached[1]
+
+        generation_dir = os.path.join(self._symbol_dir(code), f'g{generation}')
+        maps = {
+            column: np.memmap(os.path.join(generation_dir, f'{column}.bin'), dtype=dtype, mode='r', shape=(count,))
+            for column, dtype in COLUMN_DTYPES.items()
+        }
+        with self._maps_lock:
+            self._maps[code] = ((generation, count), maps)
+            self._maps.move_to_end(code)
+            while len(self._maps) > self.map_cache_size:
+                # 캐시에서만 뺌: 호출자가 아직 들고 있는 뷰가 없어지면 맵과 파일 디스크립터가 해제됨
+                self._maps.popitem(last=False)
+        return maps
+
+    def last_date(self, code: str) -> Optional[np.datetime64]:
+        """저장된 마지막 봉의 일자 (없으면 None)"""
+        dates = self.columns(code)['date']
+        return dates[-1] if len(dates) else None
+
+    def read(
+        self,
+        code: str,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+        last: Optional[int] = None,
+        adjusted: bool = True
+    ) -> Dict[str, np.ndarray]:
+        """
+        기간 조건에 맞는 컬럼 슬라이스를 반환합니다.
+        원주가이거나 구간 안에 권리락 이벤트가 없으면 메모리 맵 뷰(복사 없음), 있으면 수정 계수를 곱한 새 배열입니다.
+
+        Args:
+            code: 종목코드
+            start: 시작일 (포함, date/datetime/'YYYY-MM-DD')
+            end: 종료일 (포함)
+            last: 조건에 맞는 봉 중 최근 last개만
+            adjusted: True면 수정주가, False면 원주가
+
+        Returns:
+            dict: {컬럼명: 배열}
+        """
+        meta, columns = self._snapshot(code)
+        dates = columns['date']
+        lo = int(np.searchsorted(dates, np.datetime64(start, 'ns'), side='left')) if start is not None else 0
+        hi = int(np.searchsorted(dates, np.datetime64(end, 'D') + np.timedelta64(1, 'D'), side='left')) \
+            if end is not None else len(dates)
+        if last is not None:
+            lo = max(lo, hi - last)
+        sliced = {column: values[lo:hi] for column, values in columns.items()}
+        return apply_adjustment(sliced, self._adjustments(meta)) if adjusted else sliced
+
+    def read_frame(self, code: str, **kwargs) -> pd.DataFrame:
+        """read() 결과를 lib.ohlcv 표준 일봉 프레임으로 반환합니다 (컬럼 배열을 복사하지 않고 감쌈)."""
+        columns = self.read(code, **kwargs)
+        if not len(columns['date']):
+            return empty_bars()
+        return pd.DataFrame(columns, copy=False)
+
+    def is_fresh(self, code: str, now: Optional[datetime] = None) -> bool:
+        """
+        저장된 봉이 최신인지 확인합니다.
+        마지막 봉이 확정된 최근 영업일 봉이고, 그 봉이 장 마감 후에 저장되었으면 최신입니다
+        (장중에 저장한 당일 봉은 계속 바뀌므로 최신이 아님).
+        """
+        last = self.last_date(code)
+        updated_at = self.updated_at(code)
+        if last is None or updated_at is None:
+            return False
+        final_day = latest_final_day(now)
+        return last.astype('datetime64[D]').item() == final_day and updated_at >= datetime.combine(final_day, BAR_FINAL_TIME)
+
+    def read_state(self, code: str, name: str) -> Optional[Dict[str, Any]]:
+        """종목 디렉터리에 함께 보관한 파생 상태 (lib.indicator_state 등, 없으면 None)"""
+        try:
+            with open(os.path.join(self._symbol_dir(code), f'{name}.state.json'), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (ValueError, OSError) as e:
+            logger.warning(f"일봉 저장소 상태 읽기 실패 (무시): {code}/{name}, {e}")
+            return None
+
+    # ------------------------------------------------------------------ 쓰기
+
+    def write_state(self, code: str, name: str, state: Dict[str, Any]):
+        """파생 상태를 종목 디렉터리에 원자적으로 기록합니다."""
+        os.makedirs(self._symbol_dir(code), exist_ok=True)
+        self._write_json(os.path.join(self._symbol_dir(code), f'{name}.state.json'), state)
+
+    def write(self, code: str, bars: pd.DataFrame, adjusted: Optional[pd.DataFrame] = None):
+        """
+        종목의 원주가 일봉 전체를 새 세대로 다시 기록합니다.
+
+        Args:
+            bars: lib.ohlcv 표준 일봉 프레임, 원주가 (과거 → 최신)
+            adjusted: 같은 기간의 수정주가 프레임 (주면 두 프레임을 비교해 수정 이벤트 표를 만듦)
+        """
+        events = derive_adjustment_events(bars, adjusted) if adjusted is not None else []
+        with self._locked(code):
+            meta = self._meta(code)
+            old_generation = meta.get('generation')
+            generation = int(old_generation or 0) + 1
+            generation_dir = os.path.join(self._symbol_dir(code), f'g{generation}')
+            shutil.rmtree(generation_dir, ignore_errors=True)
+            os.makedirs(generation_dir)
+            for column, dtype in COLUMN_DTYPES.items():
+                self._write_column(os.path.join(generation_dir, f'{column}.bin'), 0, bars[column].to_numpy().astype(dtype))
+            self._write_meta(code, {
+                'generation': generation, 'count': len(bars), 'updated_at': datetime.now().isoformat(),
+                'adjustments': events,
+            })
+            if old_generation is not None and int(old_generation) != generation:
+                # 매핑 중인 파일은 삭제되어도 열린 동안 유효 (POSIX)
+                shutil.rmtree(os.path.join(self._symbol_dir(code), f'g{old_generation}'), ignore_errors=True)
+        logger.info(f"일봉 저장소 전체 기록: {code}, {len(bars)}개, 수정 이벤트 {len(events)}건")
+
+    def merge(self, code: str, bars: pd.DataFrame, raw: Optional[pd.DataFrame] = None) -> str:
+        """
+        증분 조회한 봉을 합칩니다. 저장된 마지막 봉(장중일 수 있음)부터 다시 쓰고 새 봉을 덧붙입니다.
+
+        마지막 봉 이전의 겹치는 구간은 저장된 원주가에 수정 계수를 적용한 값과 같아야 합니다.
+        다르면 그 사이 새 권리락이 있었다는 뜻이므로, 같은 구간의 원주가(raw)를 받아 다시 호출하면
+        수정 이벤트만 추가합니다 (과거 봉은 다시 쓰지 않음).
+
+        Args:
+            bars: 저장된 마지막 봉 이전부터 받은 수정주가 표준 일봉 프레임 (과거 → 최신)
+            raw: 같은 구간의 원주가 프레임 (MERGE_ADJUSTED 이후 재호출 시)
+
+        Returns:
+            str: MERGE_APPENDED / MERGE_UNCHANGED / MERGE_GAP / MERGE_ADJUSTED / MERGE_REBUILD
+                 (MERGE_APPENDED/MERGE_UNCHANGED 외에는 아무것도 쓰지 않음)
+        """
+        if bars.empty:
+            return MERGE_UNCHANGED
+
+        with self._locked(code):
+            meta = self._meta(code)
+            stored = self._columns(code, meta)
+            count = len(stored['date'])
+            if not count:
+                return MERGE_GAP
+
+            dates = stored['date']
+            last = dates[-1]
+            fetched_dates = bars['date'].to_numpy()
+            if fetched_dates[0] > last:
+                return MERGE_GAP
+
+            events = self._adjustments(meta)
+            overlap = fetched_dates < last
+            if overlap.any():
+                positions = np.searchsorted(dates, fetched_dates[overlap])
+                positions = np.minimum(positions, count - 1)
+                if not (dates[positions] == fetched_dates[overlap]).all():
+                    return MERGE_REBUILD
+                stored_overlap = {column: values[positions] for column, values in stored.items()}
+                fetched_overlap = {column: bars[column].to_numpy()[overlap] for column in PRICE_COLUMNS}
+
+                if not _prices_match(apply_adjustment(stored_overlap, events), fetched_overlap):
+                    if raw is None:
+                        logger.info(f"일봉 저장소 수정주가 변경 감지: {code}")
+                        return MERGE_ADJUSTED
+                    # 원주가는 그대로여야 하고, 새 이벤트를 더하면 수정주가가 맞아야 함
+                    raw_overlap = raw[raw['date'].isin(fetched_dates[overlap])]
+                    if len(raw_overlap) != len(positions) or not all(
+                        np.array_equal(stored_overlap[column], raw_overlap[column].to_numpy()) for column in PRICE_COLUMNS
+                    ):
+                        return MERGE_REBUILD
+                    events = merge_events(events, derive_adjustment_events(raw, bars))
+                    if not _prices_match(apply_adjustment(stored_overlap, events), fetched_overlap):
+                        return MERGE_REBUILD
+                    logger.info(f"일봉 저장소 수정 이벤트 추가: {code}, {events[-1]}")
+                    bars = raw  # 이벤트 이후(마지막 봉부터)의 값은 원주가로 기록
+
+            tail = bars[bars['date'].to_numpy() >= last]
+            if tail.empty:
+                return MERGE_UNCHANGED
+
+            generation_dir = os.path.join(self._symbol_dir(code), f"g{meta['generation']}")
+            offset = count - 1  # 마지막 봉(장중 값일 수 있음)부터 덮어씀
+            for column, dtype in COLUMN_DTYPES.items():
+                self._write_column(os.path.join(generation_dir, f'{column}.bin'), offset, tail[column].to_numpy().astype(dtype))
+            self._write_meta(code, {
+                **meta, 'count': offset + len(tail), 'updated_at': datetime.now().isoformat(), 'adjustments': events,
+            })
+        return MERGE_APPENDED
+
+    @staticmethod
+    def _write_column(path: str, offset: int, values: np.ndarray):
+        """컬럼 파일의 offset 위치(봉 단위)부터 값을 기록합니다 (파일은 줄이지 않음)."""
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.pwrite(fd, values.tobytes(), offset * values.dtype.itemsize)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def refresh_bars(
+    store: BarStore,
+    code: str,
+    fetch: Callable[..., pd.DataFrame],
+    now: Optional[datetime] = None
+) -> pd.DataFrame:
+    """
+    저장소가 최신이 아니면 증분(실패 시 전체) 조회로 갱신한 뒤 저장된 일봉 전체를 반환합니다.
+
+    증분 구간에서 새 권리락이 감지되면 같은 구간의 원주가만 한 번 더 받아 수정 이벤트를 추가하고,
+    전체 조회는 저장된 봉이 없거나 이어지지 않을 때만 합니다 (원주가 + 수정주가).
+
+    Args:
+        store: 일봉 저장소
+        code: 종목코드
+        fetch: fetch(since, adjusted=True) → 표준 일봉 프레임. since가 None이면 전체(HISTORY_BARS개),
+               date면 그 날짜부터 최신까지. adjusted가 False면 원주가
+        now: 기준 시각 (테스트용)
+
+    Returns:
+        pd.DataFrame: 수정주가 표준 일봉 프레임
+    """
+    if store.is_fresh(code, now):
+        return store.read_frame(code)
+
+    since = _delta_since(store, code)
+    result = MERGE_GAP
+    if since is not None:
+        bars = fetch(since)
+        result = store.merge(code, bars)
+        if result == MERGE_ADJUSTED:
+            result = store.merge(code, bars, raw=fetch(since, adjusted=False))
+    if result in (MERGE_GAP, MERGE_REBUILD):
+        store.write(code, fetch(None, adjusted=False), adjusted=fetch(None))
+    return store.read_frame(code)
+
+
+async def refresh_bars_async(
+    store: BarStore,
+    code: str,
+    fetch: Callable[..., Awaitable[pd.DataFrame]],
+    now: Optional[datetime] = None
+) -> pd.DataFrame:
+    """
+    refresh_bars의 비동기 버전 (fetch가 코루틴 함수).
+    파일 잠금 대기와 fsync가 있는 merge/write는 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+    """
+    if store.is_fresh(code, now):
+        return store.read_frame(code)
+
+    since = _delta_since(store, code)
+    result = MERGE_GAP
+    if since is not None:
+        bars = await fetch(since)
+        result = await asyncio.to_thread(store.merge, code, bars)
+        if result == MERGE_ADJUSTED:
+            raw = await fetch(since, adjusted=False)
+            result = await asyncio.to_thread(store.merge, code, bars, raw)
+    if result in (MERGE_GAP, MERGE_REBUILD):
+        raw, adjusted = await fetch(None, adjusted=False), await fetch(None)
+        await asyncio.to_thread(store.write, code, raw, adjusted)
+    return store.read_frame(code)
+
+
+def _prices_match(expected: Dict[str, np.ndarray], actual: Dict[str, np.ndarray]) -> bool:
+    """수정주가 가격 컬럼이 허용 오차(원 단위 반올림 차이) 안에서 같은지"""
+    return all(
+        (np.abs(expected[column].astype(np.float64) - actual[column]) <= price_tolerance(actual[column])).all()
+        for column in PRICE_COLUMNS
+    )
+
+
+def _delta_since(store: BarStore, code: str) -> Optional[date]:
+    """증분 조회 시작일 (마지막 봉보다 OVERLAP_BARS개 앞, 저장된 봉이 없으면 None)"""
+    dates = store.columns(code)['date']
+    if not len(dates):
+        return None
+    return dates[max(0, len(dates) - OVERLAP_BARS)].astype('datetime64[D]').item()
+
+
+_stores: Dict[str, BarStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_bar_store(source: str) -> BarStore:
+    """
+    공급자별 공유 일봉 저장소를 반환합니다.
+
+    Args:
+        source: 'kiwoom', 'kis' 등 (공급자마다 별도 디렉터리)
+    """
+    store = _stores.get(source)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(source)
+            if store is None:
+                root = os.getenv('BAR_STORE_DIR', DEFAULT_STORE_DIR)
+                store = _stores[source] = BarStore(os.path.join(root, source))
+    return store
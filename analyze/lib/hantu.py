@@ -7,24 +7,72 @@
 import os
 import requests
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Union, Any
 import pandas as pd
 from dotenv import load_dotenv
 
+try:
+    from .http_session import get_http_session
+    from .metrics import get_metrics, measure
+    from .token_cache import TokenFileCache, token_cache_key
+    from .ohlcv import empty_bars, kis_daily_bars, make_bars
+    from .rate_limiter import get_rate_limiter, KIS_RATE_LIMIT_KEY, PRIORITY_DEFAULT
+except ImportError:  # analyze/lib를 sys.path에 직접 추가해 'hantu'로 임포트한 경우
+    from http_session import get_http_session
+    from metrics import get_metrics, measure
+    from token_cache import TokenFileCache, token_cache_key
+    from ohlcv import empty_bars, kis_daily_bars, make_bars
+    from rate_limiter import get_rate_limiter, KIS_RATE_LIMIT_KEY, PRIORITY_DEFAULT
+
 # 환경 변수 로드
 load_dotenv()
 
+KIS_BASE_URL = "https://openapi.koreainvestment.com:9443"
+
+# 토큰 디스크 캐시 기본 경로 (analyze/kis_token.json, 실행 디렉터리와 무관)
+# KIS_TOKEN_CACHE_PATH 환경변수로 변경 가능, 빈 문자열이면 디스크 캐시 비활성화
+DEFAULT_TOKEN_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'kis_token.json'
+)
+
+# 만료 시각보다 이만큼 앞서 토큰 갱신 (KIS는 토큰 발급 횟수를 엄격히 제한하므로 유효한 토큰은 재사용)
+TOKEN_REFRESH_MARGIN = timedelta(minutes=30)
+
+# 토큰 만료/무효 응답 코드 (msg_cd)
+EXPIRED_TOKEN_CODES = ('EGW00121', 'EGW00123')
+
+# HTTP 요청 타임아웃 (초) - 응답 없는 커넥션에 워커 스레드가 묶이지 않도록
+REQUEST_TIMEOUT = float(os.getenv('KIS_REQUEST_TIMEOUT_SEC', '10'))
+
+# 기간별시세(inquire-daily-itemchartprice)는 한 번에 최대 100개 봉만 반환하므로
+# 달력 기준 이 길이로 구간을 나눠 조회 (19주 + 4일 → 평일 최대 99일)
+DAILY_WINDOW_DAYS = 137
+# 구간 동시 조회 수 (실제 전송 속도는 rate_limiter가 제한)
+DAILY_WORKERS = int(os.getenv('KIS_DAILY_WORKERS', '4'))
+
 class KISApi:
     """한국투자증권 Open API 클래스"""
     
     def __init__(self):
         """API 클라이언트 초기화"""
-        self.base_url = "https://openapi.koreainvestment.com:9443"
+        self.base_url = KIS_BASE_URL
+        # keep-alive 커넥션 풀을 가진 공유 세션 (매 호출마다 TLS 핸드셰이크 방지)
+        self.session = get_http_session(self.base_url)
         self.app_key = os.getenv('PROD_APP_KEY')
         self.app_secret = os.getenv('PROD_APP_SECRET')
         self.account_no = os.getenv('PROD_ACCOUNT_NO')
         self.access_token = None
+        self.token_expires_at = None
+        self._token_lock = threading.Lock()
+        
+        cache_path = os.getenv('KIS_TOKEN_CACHE_PATH', DEFAULT_TOKEN_CACHE_PATH)
+        self.token_cache = TokenFileCache(cache_path) if cache_path else None
+        
+        # KIS는 TR 구분 없이 앱 키 단위로 초당 요청 수를 제한하므로 버킷 하나를 공유
+        self.rate_limiter = get_rate_limiter()
         
         if not all([self.app_key, self.app_secret, self.account_no]):
             raise ValueError("KIS API 설정 정보가 부족합니다. .env 파일을 확인해주세요.")
@@ -32,32 +80,58 @@ class KISApi:
         # 접근 토큰 발급
         self.get_access_token()
     
-    def get_access_token(self) -> str:
-        """접근 토큰 발급 (캐싱 포함)"""
-        import json
-        from datetime import datetime
-        
-        token_file = "kis_token.json"
-        
-        # 🔥 강제 토큰 갱신 - 데이터 최신화를 위해 항상 새 토큰 발급
-        print("🔑 새로운 토큰 발급 시작 (데이터 최신화를 위해 강제 갱신)")
-        
-        # 기존 토큰 확인 로직은 주석 처리
-        # try:
-        #     if os.path.exists(token_file):
-        #         with open(token_file, 'r') as f:
-        #             token_data = json.load(f)
-        #         
-        #         # 토큰 만료 시간 확인 (30분 여유를 두고 갱신)
-        #         expire_time = datetime.fromisoformat(token_data['expires_at'])
-        #         if datetime.now() < expire_time:
-        #             self.access_token = token_data['access_token']
-        #             print("기존 토큰 재사용")
-        #             return self.access_token
-        # except Exception:
-        #     pass  # 토큰 파일 오류 시 새로 발급
-        
-        # 새 토큰 발급
+    def _token_fresh(self, token: Optional[str], expires_at: Optional[datetime]) -> bool:
+        """토큰이 갱신 여유시간(TOKEN_REFRESH_MARGIN)을 고려해도 유효한지 확인"""
+        return bool(token and expires_at and datetime.now() < expires_at - TOKEN_REFRESH_MARGIN)
+    
+    def _load_cached_token(self, exclude: Optional[str] = None) -> bool:
+        """디스크 캐시의 유효한 토큰을 불러옴 (exclude와 같은 토큰은 제외)"""
+        if self.token_cache is None:
+            return False
+        
+        entry = self.token_cache.load(token_cache_key(self.app_key, self.base_url))
+        if not entry or entry[0] == exclude or not self._token_fresh(*entry):
+            return False
+        
+        self.access_token, self.token_expires_at = entry
+        return True
+    
+    def get_access_token(self, rejected: Optional[str] = None) -> str:
+        """
+        접근 토큰 반환 (디스크 캐시를 같은 호스트의 모든 프로세스가 공유)
+        
+        유효한 토큰은 메모리 → 디스크 캐시 순으로 재사용하고, 만료 30분 전부터 새로 발급합니다.
+        발급은 캐시 파일 잠금 안에서 하므로 여러 워커가 동시에 시작해도 한 번만 발급됩니다.
+        
+        Args:
+            rejected (str): 서버가 만료/무효로 거부한 요청에 실었던 토큰.
+                현재 토큰이 이 토큰과 같을 때만 갱신하고, 다른 스레드가 이미 갱신했으면 그 토큰을 반환
+            
+        Returns:
+            str: 접근 토큰
+        """
+        if self.access_token != rejected and self._token_fresh(self.access_token, self.token_expires_at):
+            return self.access_token
+        
+        with self._token_lock:
+            if self.access_token != rejected and self._token_fresh(self.access_token, self.token_expires_at):
+                return self.access_token
+            if self._load_cached_token(exclude=rejected):
+                print("기존 토큰 재사용")
+                return self.access_token
+            
+            if self.token_cache is None:
+                return self._issue_access_token()
+            
+            # 잠금을 기다리는 동안 다른 프로세스가 발급했으면 그 토큰을 재사용
+            with self.token_cache.lock():
+                if self._load_cached_token(exclude=rejected):
+                    print("다른 프로세스가 발급한 토큰 재사용")
+                    return self.access_token
+                return self._issue_access_token()
+    
+    def _issue_access_token(self) -> str:
+        """/oauth2/tokenP로 새 토큰을 발급받아 디스크 캐시에 저장"""
         url = f"{self.base_url}/oauth2/tokenP"
         headers = {"Content-Type": "application/json"}
         data = {
@@ -67,24 +141,23 @@ class KISApi:
         }
         
         try:
-            response = requests.post(url, headers=headers, json=data)
+            with measure('kis', 'oauth2/tokenP') as measurement:
+                response = self.session.post(url, headers=headers, json=data, timeout=REQUEST_TIMEOUT)
+                measurement.response(response)
             response.raise_for_status()
             
             result = response.json()
             if result.get('access_token'):
                 self.access_token = result['access_token']
+                self.token_expires_at = self._parse_token_expiry(result)
+                get_metrics().record_token_refresh('kis')
                 
-                # 토큰을 파일에 저장 (23시간 30분 유효)
-                expire_time = datetime.now() + timedelta(hours=23, minutes=30)
-                token_data = {
-                    'access_token': self.access_token,
-                    'expires_at': expire_time.isoformat()
-                }
-                
-                with open(token_file, 'w') as f:
-                    json.dump(token_data, f)
+                if self.token_cache is not None:
+                    self.token_cache.store(
+                        token_cache_key(self.app_key, self.base_url), self.access_token, self.token_expires_at
+                    )
                 
-                print("새 토큰 발급 및 저장")
+                print(f"새 토큰 발급 및 저장 (만료: {self.token_expires_at.strftime('%Y-%m-%d %H:%M:%S')})")
                 return self.access_token
             else:
                 raise Exception(f"토큰 발급 실패: {result}")
@@ -92,116 +165,158 @@ class KISApi:
         except requests.exceptions.RequestException as e:
             raise Exception(f"API 호출 중 오류 발생: {e}")
     
+    @staticmethod
+    def _parse_token_expiry(result: Dict[str, Any]) -> datetime:
+        """토큰 응답의 만료 시각 (access_token_token_expired → expires_in → 24시간 순)"""
+        expired = result.get('access_token_token_expired')
+        if expired:
+            try:
+                return datetime.strptime(expired, '%Y-%m-%d %H:%M:%S')
+            except ValueError:
+                pass
+        try:
+            return datetime.now() + timedelta(seconds=int(result.get('expires_in', 86400)))
+        except (TypeError, ValueError):
+            return datetime.now() + timedelta(hours=24)
+    
     def _get_headers(self, tr_id: str) -> Dict[str, str]:
-        """API 호출용 헤더 생성"""
+        """API 호출용 헤더 생성 (만료가 가까우면 토큰을 먼저 갱신)"""
         return {
             "Content-Type": "application/json",
-            "authorization": f"Bearer {self.access_token}",
+            "authorization": f"Bearer {self.get_access_token()}",
             "appkey": self.app_key,
             "appsecret": self.app_secret,
             "tr_id": tr_id
         }
     
-    def get_stock_ohlc(self, stock_code: str, days: int = 30) -> pd.DataFrame:
+    def _get(self, url: str, headers: Dict[str, str], params: Dict[str, str]) -> Dict[str, Any]:
+        """GET 요청을 보내고 JSON 응답을 반환합니다 (tr_id별 지연/바이트/오류 코드 기록)."""
+        tr_id = headers.get("tr_id", "")
+        limiter_key = (self.app_key, KIS_RATE_LIMIT_KEY)
+        self.rate_limiter.acquire(limiter_key, PRIORITY_DEFAULT)
+        with measure('kis', tr_id) as measurement:
+            response = self.session.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
+            measurement.response(response)
+        
+        if response.status_code >= 400 and self._is_token_error(response):
+            # 다른 프로세스의 재발급 등으로 토큰이 무효화됨 → 거부된 토큰이 아직 현재 토큰이면 갱신 후 한 번만 재시도
+            get_metrics().record_retry('kis', tr_id, 'auth')
+            rejected = headers.get("authorization", "").removeprefix("Bearer ")
+            headers = {**headers, "authorization": f"Bearer {self.get_access_token(rejected=rejected)}"}
+            self.rate_limiter.acquire(limiter_key, PRIORITY_DEFAULT)
+            with measure('kis', tr_id) as measurement:
+                response = self.session.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
+                measurement.response(response)
+        response.raise_for_status()
+        
+        result = response.json()
+        if result.get('rt_cd') not in (None, '', '0'):
+            get_metrics().record_error('kis', tr_id, f"rt_cd_{result.get('rt_cd')}")
+        return result
+    
+    @staticmethod
+    def _is_token_error(response) -> bool:
+        """토큰 만료/무효 오류 응답인지 확인"""
+        try:
+            return response.json().get('msg_cd') in EXPIRED_TOKEN_CODES
+        except ValueError:
+            return False
+    
+    def get_daily_bars(
+        self,
+        stock_code: str,
+        days: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        adjusted: bool = True
+    ) -> pd.DataFrame:
         """
-        주식 OHLC 데이터 조회 (일별 시세 조회 API 사용)
+        기간 제한 없는 일봉 조회 (구간 분할 + 동시 조회)
+        
+        기간별시세 API는 한 번에 100개 봉까지만 주므로 요청 기간을 DAILY_WINDOW_DAYS 단위로 나눠
+        동시에 조회(앱 키 단위 요청 한도 안에서)한 뒤 일자 기준으로 합치고 중복을 제거합니다.
         
         Args:
             stock_code (str): 종목코드 (6자리)
-            days (int): 조회 기간 (일 수, 기본값: 30일)
+            days (int): 최근 봉 개수 (start_date가 없을 때 사용, 기본값: 100)
+            start_date (datetime): 조회 시작일 (지정하면 days 대신 사용)
+            end_date (datetime): 조회 종료일 (기본값: 오늘)
+            adjusted (bool): True면 수정주가, False면 원주가 (기본값: True)
             
         Returns:
-            pd.DataFrame: 날짜, 시가, 고가, 저가, 종가 데이터
+            pd.DataFrame: lib.ohlcv 표준 일봉 프레임 (과거 → 최신)
         """
-        # KIS API 문서 참고: inquire-daily-price 엔드포인트 사용
-        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-daily-price"
+        end_date = end_date or datetime.now()
+        keep_last = None
+        if start_date is None:
+            keep_last = days or 100
+            # 주말/공휴일을 고려해 달력 기준으로 여유 있게 잡고 마지막에 days개만 남김
+            start_date = end_date - timedelta(days=keep_last * 3 // 2 + 20)
+        
+        windows = self._daily_windows(start_date, end_date)
+        print(f"🔍 일봉 조회: {stock_code}, {start_date.strftime('%Y%m%d')} ~ {end_date.strftime('%Y%m%d')} ({len(windows)}개 구간)")
+        
+        with ThreadPoolExecutor(max_workers=min(DAILY_WORKERS, len(windows))) as executor:
+            frames = list(executor.map(lambda window: self._fetch_daily_window(stock_code, *window, adjusted), windows))
+        
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return empty_bars()
+        
+        merged = pd.concat(frames, ignore_index=True)
+        bars = make_bars({column: merged[column].to_numpy() for column in merged.columns})
+        if keep_last is not None and len(bars) > keep_last:
+            bars = bars.tail(keep_last).reset_index(drop=True)
+        print(f"🎯 일봉 {len(bars)}개 조회 완료: {stock_code}")
+        return bars
+    
+    @staticmethod
+    def _daily_windows(start_date: datetime, end_date: datetime) -> List[tuple]:
+        """[start_date, end_date]를 최신 구간부터 DAILY_WINDOW_DAYS 단위 (시작일, 종료일) 목록으로 분할"""
+        windows = []
+        window_end = end_date
+        while window_end >= start_date:
+            window_start = max(start_date, window_end - timedelta(days=DAILY_WINDOW_DAYS - 1))
+            windows.append((window_start, window_end))
+            window_end = window_start - timedelta(days=1)
+        return windows
+    
+    def _fetch_daily_window(
+        self, stock_code: str, start_date: datetime, end_date: datetime, adjusted: bool = True
+    ) -> pd.DataFrame:
+        """한 구간(최대 100개 봉)의 일봉을 조회"""
+        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
         headers = self._get_headers("FHKST03010100")  # 국내주식기간별시세(일/주/월/년) TR_ID
-        
-        # 최근 days일 데이터를 위해 충분한 범위로 설정 (주말, 공휴일 고려)
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days + 10)  # 여유분 추가
-        
         params = {
-            "fid_cond_mrkt_div_code": "J",  # 시장분류코드 (J: 주식)
-            "fid_input_iscd": stock_code,   # 종목코드
-            "fid_input_date_1": start_date.strftime("%Y%m%d"),  # 조회시작일자
-            "fid_input_date_2": end_date.strftime("%Y%m%d"),    # 조회종료일자
-            "fid_period_div_code": "D",     # 기간분류코드 (D: 일봉)
-            "fid_org_adj_prc": "0"          # 수정주가원주가가격 (0: 수정주가 반영)
+            "FID_COND_MRKT_DIV_CODE": "J",  # 시장분류코드 (J: 주식)
+            "FID_INPUT_ISCD": stock_code,   # 종목코드
+            "FID_INPUT_DATE_1": start_date.strftime("%Y%m%d"),  # 조회시작일자
+            "FID_INPUT_DATE_2": end_date.strftime("%Y%m%d"),    # 조회종료일자
+            "FID_PERIOD_DIV_CODE": "D",     # 기간분류코드 (D: 일봉)
+            "FID_ORG_ADJ_PRC": "0" if adjusted else "1"  # 수정주가원주가가격 (0: 수정주가, 1: 원주가)
         }
         
-        print(f"🔍 OHLC API 호출: {url}")
-        print(f"📋 파라미터: {params}")
-        
         try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            
-            result = response.json()
-            
-            print(f"📊 OHLC API 응답: rt_cd={result.get('rt_cd')}, msg1={result.get('msg1')}")
-            print(f"📈 응답 키들: {list(result.keys())}")
-            
-            if result.get('rt_cd') != '0' and result.get('rt_cd') != '':
-                print(f"🔴 API 오류 응답 전체: {result}")
-                raise Exception(f"API 호출 실패: {result.get('msg1', 'Unknown error')}")
-            
-            # output 또는 output2에서 데이터 추출 시도
-            output_data = result.get('output', result.get('output2', []))
-            
-            if not output_data:
-                print("⚠️ output 데이터가 비어있음")
-                return pd.DataFrame(columns=['date', 'open', 'high', 'low', 'close'])
-            
-            print(f"✅ {len(output_data)}개 데이터 포인트 처리 중...")
-            
-            # 데이터 변환 (필드명이 다를 수 있으므로 여러 패턴 시도)
-            ohlc_data = []
-            for item in output_data:
-                try:
-                    # 가능한 날짜 필드명들
-                    date_field = item.get('stck_bsop_date') or item.get('bsop_date') or item.get('date')
-                    if date_field:
-                        date_obj = datetime.strptime(str(date_field), '%Y%m%d')
-                    else:
-                        continue
-                    
-                    # 가능한 OHLC 필드명들
-                    open_price = float(item.get('stck_oprc') or item.get('oprc') or item.get('open') or 0)
-                    high_price = float(item.get('stck_hgpr') or item.get('hgpr') or item.get('high') or 0)
-                    low_price = float(item.get('stck_lwpr') or item.get('lwpr') or item.get('low') or 0)
-                    close_price = float(item.get('stck_clpr') or item.get('clpr') or item.get('close') or 0)
-                    
-                    if close_price > 0:  # 유효한 데이터만 추가
-                        ohlc_data.append({
-                            'date': date_obj,
-                            'open': open_price,
-                            'high': high_price,
-                            'low': low_price,
-                            'close': close_price
-                        })
-                        
-                except (ValueError, TypeError) as e:
-                    print(f"⚠️ 데이터 파싱 오류 (건너뜀): {e}, 데이터: {item}")
-                    continue
-            
-            if not ohlc_data:
-                print("❌ 파싱된 유효 데이터가 없음")
-                return pd.DataFrame(columns=['date', 'open', 'high', 'low', 'close'])
-            
-            df = pd.DataFrame(ohlc_data)
-            df = df.sort_values('date', ascending=False).head(days)  # 최신 days개만
-            df = df.sort_values('date').reset_index(drop=True)  # 날짜순 정렬
-            
-            print(f"🎯 최종 OHLC DataFrame: {len(df)}개 행")
-            return df
-            
+            result = self._get(url, headers, params)
         except requests.exceptions.RequestException as e:
-            print(f"🌐 네트워크 오류: {e}")
-            raise Exception(f"OHLC 데이터 조회 중 오류 발생: {e}")
-        except Exception as e:
-            print(f"💥 처리 오류: {e}")
-            raise Exception(f"데이터 처리 중 오류 발생: {e}")
+            raise Exception(f"일봉 조회 중 오류 발생 ({params['FID_INPUT_DATE_1']}~{params['FID_INPUT_DATE_2']}): {e}")
+        
+        if result.get('rt_cd') not in ('0', ''):
+            raise Exception(f"API 호출 실패: {result.get('msg1', 'Unknown error')}")
+        return kis_daily_bars(result.get('output2') or [])
+    
+    def get_stock_ohlc(self, stock_code: str, days: int = 30) -> pd.DataFrame:
+        """
+        주식 OHLC 데이터 조회 (get_daily_bars 사용, 100개 이상도 조회 가능)
+        
+        Args:
+            stock_code (str): 종목코드 (6자리)
+            days (int): 조회할 봉 개수 (기본값: 30일)
+            
+        Returns:
+            pd.DataFrame: 날짜, 시가, 고가, 저가, 종가 데이터
+        """
+        return self.get_daily_bars(stock_code, days)[['date', 'open', 'high', 'low', 'close']]
     
     def get_stock_volume(self, stock_code: str, days: int = 30) -> pd.DataFrame:
         """
@@ -230,10 +345,7 @@ class KISApi:
         }
         
         try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            
-            result = response.json()
+            result = self._get(url, headers, params)
             
             if result.get('rt_cd') != '0':
                 raise Exception(f"API 호출 실패: {result.get('msg1', 'Unknown error')}")
@@ -244,17 +356,8 @@ class KISApi:
             if not output_data:
                 return pd.DataFrame(columns=['date', 'volume', 'trade_amount'])
             
-            # 데이터 변환
-            volume_data = []
-            for item in output_data:
-                volume_data.append({
-                    'date': datetime.strptime(item['stck_bsop_date'], '%Y%m%d'),
-                    'volume': int(item['acml_vol']),           # 누적거래량
-                    'trade_amount': int(item['acml_tr_pbmn'])  # 누적거래대금
-                })
-            
-            df = pd.DataFrame(volume_data)
-            df = df.sort_values('date').reset_index(drop=True)
+            # 컬럼 단위 변환 (과거 → 최신 순)
+            df = kis_daily_bars(output_data)[['date', 'volume', 'trade_amount']]
             
             return df
             
@@ -285,10 +388,7 @@ class KISApi:
         print(f"⏰ API 호출 시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            
-            result = response.json()
+            result = self._get(url, headers, params)
             
             print(f"💵 현재가 API 응답: rt_cd={result.get('rt_cd')}, msg1={result.get('msg1')}")
             
@@ -345,129 +445,29 @@ class KISApi:
     
     def get_stock_data_combined(self, stock_code: str, days: int = 30) -> pd.DataFrame:
         """
-        주식 OHLC + 거래량 통합 데이터 조회 (수정된 API 엔드포인트 사용)
+        주식 OHLC + 거래량 통합 데이터 조회 (get_daily_bars 사용, 100개 이상도 조회 가능)
         
         Args:
             stock_code (str): 종목코드 (6자리)
-            days (int): 조회 기간 (일 수, 기본값: 30일)
+            days (int): 조회할 봉 개수 (기본값: 30일)
             
         Returns:
-            pd.DataFrame: 날짜, 시가, 고가, 저가, 종가, 거래량, 거래대금 데이터
+            pd.DataFrame: lib.ohlcv 표준 일봉 프레임 (date, open, high, low, close, volume, trade_amount, 과거 → 최신)
         """
-        # KIS API 문서 참고: inquire-daily-price 엔드포인트 사용
-        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-daily-price"
-        headers = self._get_headers("FHKST03010100")  # 국내주식기간별시세(일/주/월/년) TR_ID
-        
-        # 최근 days일 데이터를 위해 충분한 범위로 설정 (주말, 공휴일 고려)
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days + 10)  # 여유분 추가
-        
-        params = {
-            "fid_cond_mrkt_div_code": "J",  # 시장분류코드 (J: 주식)
-            "fid_input_iscd": stock_code,   # 종목코드
-            "fid_input_date_1": start_date.strftime("%Y%m%d"),  # 조회시작일자
-            "fid_input_date_2": end_date.strftime("%Y%m%d"),    # 조회종료일자
-            "fid_period_div_code": "D",     # 기간분류코드 (D: 일봉)
-            "fid_org_adj_prc": "0"          # 수정주가원주가가격 (0: 수정주가 반영)
-        }
-        
-        print(f"🔍 차트 API 호출: {stock_code}, {start_date.strftime('%Y%m%d')} ~ {end_date.strftime('%Y%m%d')}")
-        print(f"⏰ API 호출 시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            
-            result = response.json()
-            
-            print(f"📊 차트 API 응답: rt_cd={result.get('rt_cd')}, msg1={result.get('msg1')}")
-            print(f"📋 응답 키들: {list(result.keys())}")
-            
-            # 응답 데이터의 첫 번째와 마지막 항목의 날짜 확인
-            output_data = result.get('output', result.get('output2', []))
-            if output_data:
-                first_date = output_data[0].get('stck_bsop_date', 'Unknown')
-                last_date = output_data[-1].get('stck_bsop_date', 'Unknown') 
-                print(f"📅 API 데이터 범위: {first_date} ~ {last_date} (총 {len(output_data)}개)")
-            else:
-                print("⚠️ API 응답에 데이터가 없음")
-            
-            if result.get('rt_cd') != '0' and result.get('rt_cd') != '':
-                print(f"🔴 API 오류 응답: {result}")
-                raise Exception(f"API 호출 실패: {result.get('msg1', 'Unknown error')}")
-            
-            # output 또는 output2에서 데이터 추출 시도
-            output_data = result.get('output', result.get('output2', []))
-            
-            if not output_data:
-                print("⚠️ output 데이터가 비어있음")
-                return pd.DataFrame(columns=['date', 'open', 'high', 'low', 'close', 'volume', 'trade_amount'])
-            
-            print(f"✅ {len(output_data)}개 데이터 포인트 처리 중...")
-            
-            # 데이터 변환 (필드명이 다를 수 있으므로 여러 패턴 시도)
-            combined_data = []
-            for item in output_data:
-                try:
-                    # 가능한 날짜 필드명들
-                    date_field = item.get('stck_bsop_date') or item.get('bsop_date') or item.get('date')
-                    if date_field:
-                        date_obj = datetime.strptime(str(date_field), '%Y%m%d')
-                    else:
-                        continue
-                    
-                    # 가능한 OHLC 필드명들
-                    open_price = float(item.get('stck_oprc') or item.get('oprc') or item.get('open') or 0)
-                    high_price = float(item.get('stck_hgpr') or item.get('hgpr') or item.get('high') or 0)
-                    low_price = float(item.get('stck_lwpr') or item.get('lwpr') or item.get('low') or 0)
-                    close_price = float(item.get('stck_clpr') or item.get('clpr') or item.get('close') or 0)
-                    
-                    # 가능한 거래량 필드명들
-                    volume = int(item.get('acml_vol') or item.get('vol') or item.get('volume') or 0)
-                    trade_amount = int(item.get('acml_tr_pbmn') or item.get('tr_pbmn') or item.get('trade_amount') or volume * close_price)
-                    
-                    if close_price > 0:  # 유효한 데이터만 추가
-                        combined_data.append({
-                            'date': date_obj,
-                            'open': open_price,
-                            'high': high_price,
-                            'low': low_price,
-                            'close': close_price,
-                            'volume': volume,
-                            'trade_amount': trade_amount
-                        })
-                        
-                except (ValueError, TypeError) as e:
-                    print(f"⚠️ 데이터 파싱 오류 (건너뜀): {e}, 데이터: {item}")
-                    continue
-            
-            if not combined_data:
-                print("❌ 파싱된 유효 데이터가 없음")
-                return pd.DataFrame(columns=['date', 'open', 'high', 'low', 'close', 'volume', 'trade_amount'])
-            
-            df = pd.DataFrame(combined_data)
-            df = df.sort_values('date', ascending=False).head(days)  # 최신 days개만
-            df = df.sort_values('date').reset_index(drop=True)  # 날짜순 정렬
-            
-            print(f"🎯 최종 차트 DataFrame: {len(df)}개 행")
-            return df
-            
-        except requests.exceptions.RequestException as e:
-            print(f"🌐 네트워크 오류: {e}")
-            raise Exception(f"주식 데이터 조회 중 오류 발생: {e}")
-        except Exception as e:
-            print(f"💥 처리 오류: {e}")
-            raise Exception(f"데이터 처리 중 오류 발생: {e}")
+        return self.get_daily_bars(stock_code, days)
 
 
 # 전역 API 인스턴스
 _kis_api = None
+_kis_api_lock = threading.Lock()
 
 def get_kis_api() -> KISApi:
-    """KIS API 인스턴스 반환 (싱글톤 패턴)"""
+    """KIS API 인스턴스 반환 (싱글톤 패턴, 토큰은 디스크 캐시로 다른 프로세스와 공유)"""
     global _kis_api
     if _kis_api is None:
-        _kis_api = KISApi()
+        with _kis_api_lock:
+            if _kis_api is None:
+                _kis_api = KISApi()
     return _kis_api
 
 
@@ -0,0 +1,89 @@
+"""
+증권사 REST API 공용 HTTP 세션 (keep-alive 커넥션 풀)
+
+requests.post/get을 직접 호출하면 매 요청마다 TCP+TLS 연결을 새로 맺으므로,
+base_url 단위로 커넥션 풀을 가진 requests.Session을 하나씩 만들어 프로세스 안에서 공유합니다.
+"""
+
+import os
+import logging
+import threading
+from typing import Dict, Iterable
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# 커넥션 풀 설정 (환경변수로 조정 가능)
+POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '4'))  # 호스트별 풀 개수
+POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '16'))  # 풀당 유지할 최대 커넥션 수
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def _create_session(pool_connections: int, pool_maxsize: int) -> requests.Session:
+    """커넥션 풀 어댑터를 장착한 세션을 생성합니다."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=False,  # 풀이 가득 차면 대기하지 않고 임시 커넥션 사용
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_http_session(base_url: str) -> requests.Session:
+    """
+    base_url에 해당하는 공유 세션을 반환합니다 (없으면 생성).
+
+    Args:
+        base_url: API 기본 URL (예: 'https://api.kiwoom.com')
+
+    Returns:
+        requests.Session: keep-alive 커넥션 풀을 가진 세션
+    """
+    session = _sessions.get(base_url)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(base_url)
+            if session is None:
+                session = _create_session(POOL_CONNECTIONS, POOL_MAXSIZE)
+                _sessions[base_url] = session
+                logger.debug(f"HTTP 세션 생성: {base_url} (pool_maxsize={POOL_MAXSIZE})")
+    return session
+
+
+def warmup_sessions(base_urls: Iterable[str], timeout: float = 3.0) -> Dict[str, bool]:
+    """
+    미리 연결을 맺어 첫 요청의 TCP+TLS 핸드셰이크 비용을 없앱니다 (애플리케이션 시작 시 호출).
+
+    Args:
+        base_urls: 연결할 API 기본 URL 목록
+        timeout: 연결 타임아웃 (초)
+
+    Returns:
+        dict: base_url별 연결 성공 여부
+    """
+    results = {}
+    for base_url in base_urls:
+        try:
+            # 응답 코드와 상관없이 연결만 맺어지면 커넥션이 풀에 남음
+            get_http_session(base_url).head(base_url, timeout=timeout)
+            results[base_url] = True
+            logger.info(f"HTTP 커넥션 예열 완료: {base_url}")
+        except requests.exceptions.RequestException as e:
+            results[base_url] = False
+            logger.warning(f"HTTP 커넥션 예열 실패 (무시): {base_url}, {e}")
+    return results
+
+
+def close_sessions():
+    """모든 공유 세션을 닫습니다 (애플리케이션 종료 시 호출)."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
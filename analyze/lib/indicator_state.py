@@ -0,0 +1,381 @@
+"""
+증분 기술적 지표 상태 (봉 하나당 상수 시간 갱신)
+
+새 봉이 올 때마다 전체 이력으로 이동평균/EMA를 다시 계산하지 않고, 지표별 상태(EMA 값, 이동 창 합계,
+고가/저가 단조 덱 등)만 갱신합니다. 상태는 JSON으로 직렬화해 일봉 저장소의 종목 디렉터리에 함께 보관하므로
+장중 갱신과 야간 백필은 저장 이후 새로 들어온 봉만 처리합니다.
+
+- 지표 정의와 이름은 lib.panel_indicators.compute_indicators(= TechnicalAnalyzer._calculate_indicators)와 같음
+- 확정 봉은 update()로 상태에 반영, 진행 중인 봉(장중 마지막 봉/체결)은 preview()로 상태를 바꾸지 않고 계산
+- 저장된 상태는 저장소 세대와 수정 이벤트 표가 같을 때만 이어서 사용 (전체 재기록/새 권리락이면 처음부터 다시 계산)
+"""
+
+import copy
+import math
+from collections import deque
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+try:
+    from .bar_store import BarStore
+except ImportError:  # analyze/lib를 sys.path에 직접 추가해 'indicator_state'로 임포트한 경우
+    from bar_store import BarStore
+
+# 저장소에 보관하는 기본 상태 이름
+DEFAULT_STATE_NAME = 'indicators'
+
+
+class _State:
+    """지표 상태 공통 직렬화 (하위 상태는 _nested, 덱 속성은 _deques에 선언)"""
+
+    _nested: Dict[str, type] = {}
+    _deques: tuple = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            name: value.to_dict() if isinstance(value, _State) else list(value) if isinstance(value, deque) else value
+            for name, value in vars(self).items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> '_State':
+        state = cls.__new__(cls)
+        for name, value in data.items():
+            if name in cls._nested and value is not None:
+                value = cls._nested[name].from_dict(value)
+            elif name in cls._deques:
+                value = deque(tuple(item) if isinstance(item, list) else item for item in value)
+            setattr(state, name, value)
+        return state
+
+
+class EMAState(_State):
+    """지수 이동평균 (pandas ewm(adjust=False), 첫 값에서 시작)"""
+
+    def __init__(self, alpha: float, min_periods: int = 1):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value: Optional[float] = None
+        self.count = 0
+
+    @classmethod
+    def span(cls, span: int) -> 'EMAState':
+        """span 기간 EMA (alpha = 2 / (span + 1), span개부터 유효)"""
+        return cls(2 / (span + 1), span)
+
+    def update(self, x: float) -> float:
+        self.value = x if self.value is None else self.value + self.alpha * (x - self.value)
+        self.count += 1
+        return self.current
+
+    @property
+    def current(self) -> float:
+        return self.value if self.count >= self.min_periods else math.nan
+
+
+class RollingState(_State):
+    """이동 창 평균/모표준편차 (창 안에 NaN/무한대가 있으면 NaN)"""
+
+    _deques = ('values',)
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.invalid = 0
+        self.updates = 0
+
+    def update(self, x: float) -> float:
+        self.values.append(x)
+        self._add(x, 1)
+        if len(self.values) > self.window:
+            self._add(self.values.popleft(), -1)
+        self.updates += 1
+        if self.updates % self.window == 0:  # 누적 덧셈/뺄셈 오차를 창 단위로 정리 (분할 상환 O(1))
+            finite = [value for value in self.values if math.isfinite(value)]
+            self.total = math.fsum(finite)
+            self.total_sq = math.fsum(value * value for value in finite)
+        return self.mean
+
+    def _add(self, x: float, sign: int):
+        if math.isfinite(x):
+            self.total += sign * x
+            self.total_sq += sign * x * x
+        else:
+            self.invalid += sign
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.window and not self.invalid
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.window if self.ready else math.nan
+
+    @property
+    def std(self) -> float:
+        if not self.ready:
+            return math.nan
+        mean = self.total / self.window
+        return math.sqrt(max(self.total_sq / self.window - mean * mean, 0.0))
+
+
+class RollingExtremeState(_State):
+    """이동 창 최댓값/최솟값 (단조 덱, 분할 상환 O(1))"""
+
+    _deques = ('candidates',)
+
+    def __init__(self, window: int, maximum: bool = True):
+        self.window = window
+        self.maximum = maximum
+        self.candidates = deque()  # (봉 번호, 값), 값이 단조 감소(최댓값)/증가(최솟값)
+        self.count = 0
+
+    def update(self, x: float) -> float:
+        while self.candidates and (
+            self.candidates[-1][1] <= x if self.maximum else self.candidates[-1][1] >= x
+        ):
+            self.candidates.pop()
+        self.candidates.append((self.count, x))
+        if self.candidates[0][0] <= self.count - self.window:
+            self.candidates.popleft()
+        self.count += 1
+        return self.current
+
+    @property
+    def current(self) -> float:
+        return self.candidates[0][1] if self.count >= self.window else math.nan
+
+
+class RSIState(_State):
+    """Wilder RSI (첫 봉의 변화량은 0)"""
+
+    _nested = {'up': EMAState, 'down': EMAState}
+
+    def __init__(self, window: int = 14):
+        self.previous_close: Optional[float] = None
+        self.up = EMAState(1 / window, window)
+        self.down = EMAState(1 / window, window)
+
+    def update(self, close: float) -> float:
+        diff = 0.0 if self.previous_close is None else close - self.previous_close
+        self.up.update(max(diff, 0.0))
+        self.down.update(max(-diff, 0.0))
+        self.previous_close = close
+        return self.current
+
+    @property
+    def current(self) -> float:
+        up, down = self.up.current, self.down.current
+        if math.isnan(down):
+            return math.nan
+        return 100.0 if down == 0 else 100 - 100 / (1 + up / down)
+
+
+class MACDState(_State):
+    """MACD (빠른/느린 EMA 차이, 시그널은 MACD가 유효해진 뒤부터의 EMA)"""
+
+    _nested = {'fast': EMAState, 'slow': EMAState, 'signal': EMAState}
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EMAState.span(fast)
+        self.slow = EMAState.span(slow)
+        self.signal = EMAState.span(signal)
+
+    def update(self, close: float) -> float:
+        macd = self.fast.update(close) - self.slow.update(close)
+        if not math.isnan(macd):
+            self.signal.update(macd)
+        return macd
+
+    @property
+    def macd(self) -> float:
+        return self.fast.current - self.slow.current
+
+
+class ATRState(_State):
+    """ATR (첫 window개 TR 평균으로 시작하는 Wilder 평활)"""
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.previous_close: Optional[float] = None
+        self.seed_total = 0.0
+        self.count = 0
+        self.value: Optional[float] = None
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tr = high - low
+        if self.previous_close is not None:
+            tr = max(tr, abs(high - self.previous_close), abs(low - self.previous_close))
+        self.count += 1
+        if self.value is not None:
+            self.value = (self.value * (self.window - 1) + tr) / self.window
+        else:
+            self.seed_total += tr
+            if self.count == self.window:
+                self.value = self.seed_total / self.window
+        self.previous_close = close
+        return self.current
+
+    @property
+    def current(self) -> float:
+        return self.value if self.value is not None else math.nan
+
+
+class StochasticState(_State):
+    """스토캐스틱 %K(최근 window개 고가/저가 범위 내 종가 위치), %D(%K의 smooth개 평균)"""
+
+    _nested = {'highest': RollingExtremeState, 'lowest': RollingExtremeState, 'd': RollingState}
+
+    def __init__(self, window: int = 14, smooth: int = 3):
+        self.highest = RollingExtremeState(window, maximum=True)
+        self.lowest = RollingExtremeState(window, maximum=False)
+        self.d = RollingState(smooth)
+        self.k = math.nan
+
+    def update(self, high: float, low: float, close: float) -> float:
+        highest, lowest = self.highest.update(high), self.lowest.update(low)
+        span = highest - lowest
+        self.k = math.nan if math.isnan(span) or span == 0 else 100 * (close - lowest) / span
+        self.d.update(self.k)
+        return self.k
+
+
+class IndicatorSet(_State):
+    """
+    TechnicalAnalyzer 지표 묶음의 증분 상태.
+
+    update(bar)는 확정 봉 하나를 반영하고 최신 지표를 반환하며, preview(bar)는 상태를 바꾸지 않고
+    진행 중인 봉(또는 체결가로 갱신한 봉)을 반영했을 때의 지표를 반환합니다.
+    bar는 'high', 'low', 'close', 'volume' 키를 가진 dict입니다.
+    """
+
+    _nested = {
+        'rsi': RSIState, 'macd': MACDState, 'bollinger': RollingState, 'sma_5': RollingState,
+        'sma_20': RollingState, 'sma_60': RollingState, 'ema_12': EMAState, 'ema_26': EMAState, 'stochastic': StochasticState,
+        'volume_sma': RollingState, 'atr': ATRState,
+    }
+
+    def __init__(
+        self,
+        rsi_window: int = 14,
+        macd_fast: int = 12,
+        macd_slow: int = 26,
+        macd_signal: int = 9,
+        bollinger_window: int = 20,
+        bollinger_std: float = 2,
+        stoch_window: int = 14,
+        stoch_smooth: int = 3,
+        volume_window: int = 20,
+        atr_window: int = 14
+    ):
+        self.bollinger_std = bollinger_std
+        self.rsi = RSIState(rsi_window)
+        self.macd = MACDState(macd_fast, macd_slow, macd_signal)
+        self.bollinger = RollingState(bollinger_window)
+        self.sma_5 = RollingState(5)
+        self.sma_20 = None if bollinger_window == 20 else RollingState(20)  # 20일 볼린저 중심선과 같으면 공유
+        self.sma_60 = RollingState(60)
+        self.ema_12 = EMAState.span(12)
+        self.ema_26 = EMAState.span(26)
+        self.stochastic = StochasticState(stoch_window, stoch_smooth)
+        self.volume_sma = RollingState(volume_window)
+        self.atr = ATRState(atr_window)
+        self.count = 0
+        self.current_price = math.nan
+
+    def update(self, bar: Dict[str, float]) -> Dict[str, float]:
+        high, low, close = float(bar['high']), float(bar['low']), float(bar['close'])
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.bollinger.update(close)
+        self.sma_5.update(close)
+        if self.sma_20 is not None:
+            self.sma_20.update(close)
+        self.sma_60.update(close)
+        self.ema_12.update(close)
+        self.ema_26.update(close)
+        self.stochastic.update(high, low, close)
+        self.volume_sma.update(float(bar['volume']))
+        self.atr.update(high, low, close)
+        self.count += 1
+        self.current_price = close
+        return self.values()
+
+    def preview(self, bar: Dict[str, float]) -> Dict[str, float]:
+        """상태를 바꾸지 않고 bar를 반영한 지표 (상태 크기는 창 길이로 제한되므로 복사 비용은 이력 길이와 무관)"""
+        return copy.deepcopy(self).update(bar)
+
+    def values(self) -> Dict[str, float]:
+        """최신 지표 (compute_indicators와 같은 이름, 아직 계산할 수 없는 값은 NaN)"""
+        middle = self.bollinger.mean
+        deviation = self.bollinger.std * self.bollinger_std
+        macd = self.macd.macd
+        signal = self.macd.signal.current
+        return {
+            'rsi': self.rsi.current,
+            'macd': macd,
+            'macd_signal': signal,
+            'macd_histogram': macd - signal,
+            'bollinger_upper': middle + deviation,
+            'bollinger_lower': middle - deviation,
+            'bollinger_middle': middle,
+            'sma_5': self.sma_5.mean,
+            'sma_20': middle if self.sma_20 is None else self.sma_20.mean,
+            'sma_60': self.sma_60.mean,
+            'ema_12': self.ema_12.current,
+            'ema_26': self.ema_26.current,
+            'stoch_k': self.stochastic.k,
+            'stoch_d': self.stochastic.d.mean,
+            'volume_sma': self.volume_sma.mean,
+            'atr': self.atr.current,
+            'current_price': self.current_price,
+        }
+
+
+def refresh_indicators(
+    store: BarStore,
+    code: str,
+    name: str = DEFAULT_STATE_NAME,
+    indicators: Optional[IndicatorSet] = None
+) -> Dict[str, float]:
+    """
+    저장된 지표 상태를 새 봉만큼 갱신하고 최신 지표를 반환합니다 (저장소의 수정주가 기준).
+
+    마지막 봉은 장중 값일 수 있어 상태에 반영하지 않고 preview로 계산합니다
+    (다음 갱신 때 확정 값으로 반영). 저장 이후 저장소가 전체 재기록되었거나 수정 이벤트가 바뀌었으면 처음부터 계산합니다.
+
+    Args:
+        store: 봉 저장소 (일봉/분봉)
+        code: 종목코드
+        name: 상태 이름 (같은 저장소에 여러 지표 설정을 둘 때 구분)
+        indicators: 처음 계산할 때 쓸 빈 상태 (None이면 기본 설정의 IndicatorSet)
+
+    Returns:
+        dict: 최신 지표 (compute_indicators와 같은 이름, 봉이 없으면 빈 dict)
+    """
+    key = {'generation': store.generation(code), 'adjustments': [list(event) for event in store.adjustments(code)]}
+    saved = store.read_state(code, name)
+    through = None
+    if saved and saved.get('key') == key:
+        indicators = IndicatorSet.from_dict(saved['state'])
+        through = np.datetime64(saved['through'])
+    elif indicators is None:
+        indicators = IndicatorSet()
+
+    columns = store.read(code, start=through + np.timedelta64(1, 'ns') if through is not None else None)
+    count = len(columns['date'])
+    if not count:
+        return indicators.values() if indicators.count else {}
+
+    rows = {column: columns[column].tolist() for column in ('high', 'low', 'close', 'volume')}
+    bars = [dict(zip(rows, values)) for values in zip(*rows.values())]
+    for bar in bars[:-1]:
+        indicators.update(bar)
+    if count > 1:
+        store.write_state(code, name, {
+            'key': key, 'through': str(columns['date'][-2]), 'state': indicators.to_dict(),
+        })
+    return indicators.preview(bars[-1])
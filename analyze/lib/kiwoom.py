@@ -2,19 +2,289 @@
 키움증권 Open REST API를 이용한 주식 데이터 fetch
 """
 
+import os
 import requests
 import json
 import logging
 import asyncio
+import threading
 import websockets
-from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple, Iterator
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+try:
+    from .http_session import get_http_session
+    from .rate_limiter import get_rate_limiter, PRIORITY_DEFAULT, THROTTLE_BACKOFF_SEC
+    from .krx_calendar import recent_trading_days
+    from .kiwoom_ws import KiwoomWebSocketSession, resolve_websocket_url
+    from .kiwoom_decoder import decode_condition_results
+    from .metrics import get_metrics, measure
+    from .token_cache import TokenFileCache, token_cache_key
+    from .ohlcv import kiwoom_daily_bars, kiwoom_minute_bars
+except ImportError:  # analyze/lib를 sys.path에 직접 추가해 'kiwoom'으로 임포트한 경우
+    from http_session import get_http_session
+    from rate_limiter import get_rate_limiter, PRIORITY_DEFAULT, THROTTLE_BACKOFF_SEC
+    from krx_calendar import recent_trading_days
+    from kiwoom_ws import KiwoomWebSocketSession, resolve_websocket_url
+    from kiwoom_decoder import decode_condition_results
+    from metrics import get_metrics, measure
+    from token_cache import TokenFileCache, token_cache_key
+    from ohlcv import kiwoom_daily_bars, kiwoom_minute_bars
 
 logger = logging.getLogger(__name__)
 
+REAL_BASE_URL = 'https://api.kiwoom.com'
+MOCK_BASE_URL = 'https://mockapi.kiwoom.com'
+
+
+def resolve_base_url(use_mock: bool = False) -> str:
+    """
+    REST API 기본 URL을 반환합니다.
+    KIWOOM_BASE_URL 환경변수가 있으면 그 값을 사용합니다 (예: 로컬 대역 서버 lib.kiwoom_stub_server).
+    """
+    return os.getenv('KIWOOM_BASE_URL') or (MOCK_BASE_URL if use_mock else REAL_BASE_URL)
+
+
+# 일자별 매매내역(kt00007) 동시 조회 수 (실제 전송 속도는 rate_limiter가 제한)
+TRADE_HISTORY_WORKERS = int(os.getenv('KIWOOM_TRADE_HISTORY_WORKERS', '4'))
+
+# 토큰 디스크 캐시 기본 경로 (analyze/kiwoom_token.json)
+# KIWOOM_TOKEN_CACHE_PATH 환경변수로 변경 가능, 빈 문자열이면 디스크 캐시 비활성화
+DEFAULT_TOKEN_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'kiwoom_token.json'
+)
+
+
+class KiwoomTokenBroker:
+    """
+    키움증권 접근 토큰 브로커
+
+    같은 프로세스의 모든 KiwoomAPI 인스턴스가 (app_key, base_url) 단위로 하나의 브로커를 공유합니다.
+    - 만료 전에 미리 갱신 (refresh_margin)
+    - 동시에 여러 요청이 토큰을 요구해도 /oauth2/token 호출은 한 번만 수행 (single-flight)
+    - 디스크 캐시(lib.token_cache)를 통해 재시작/다른 워커에서도 유효한 토큰을 재사용하고,
+      발급은 파일 잠금 안에서 수행해 동시에 시작한 프로세스들도 한 번만 발급
+    """
+
+    _brokers: Dict[Tuple[str, str], 'KiwoomTokenBroker'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(
+        self,
+        app_key: str,
+        secret_key: str,
+        base_url: str,
+        cache_path: Optional[str] = None,
+        refresh_margin: timedelta = timedelta(minutes=10)
+    ):
+        """
+        Args:
+            app_key: 앱 키
+            secret_key: 시크릿 키
+            base_url: REST API 기본 URL
+            cache_path: 토큰 디스크 캐시 경로 (None이면 환경변수/기본 경로, 빈 문자열이면 비활성화)
+            refresh_margin: 만료 시각보다 이만큼 앞서 토큰을 갱신
+        """
+        self.app_key = app_key
+        self.secret_key = secret_key
+        self.base_url = base_url
+        if cache_path is None:
+            cache_path = os.getenv('KIWOOM_TOKEN_CACHE_PATH', DEFAULT_TOKEN_CACHE_PATH)
+        self.cache_path = cache_path
+        self.cache = TokenFileCache(cache_path) if cache_path else None
+        self.refresh_margin = refresh_margin
+
+        self.access_token: Optional[str] = None
+        self.token_expires_at: Optional[datetime] = None
+        # 서버가 거부한 토큰 (디스크 캐시에 남아 있어도 다시 불러오지 않음)
+        self._rejected_token: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls, app_key: str, secret_key: str, base_url: str) -> 'KiwoomTokenBroker':
+        """(app_key, base_url)에 해당하는 공유 브로커를 반환합니다 (없으면 생성)."""
+        key = (app_key, base_url)
+        broker = cls._brokers.get(key)
+        if broker is None:
+            with cls._registry_lock:
+                broker = cls._brokers.get(key)
+                if broker is None:
+                    broker = cls(app_key, secret_key, base_url)
+                    cls._brokers[key] = broker
+        return broker
+
+    @property
+    def cache_key(self) -> str:
+        """디스크 캐시에서 사용할 키 (앱 키 원문을 파일에 남기지 않기 위해 해시 사용)"""
+        return token_cache_key(self.app_key, self.base_url)
+
+    def _is_fresh(self, token: Optional[str], expires_at: Optional[datetime]) -> bool:
+        """토큰이 갱신 여유시간을 고려해도 유효한지 확인합니다."""
+        return bool(token and expires_at and datetime.now() < expires_at - self.refresh_margin)
+
+    def peek_token(self) -> Optional[str]:
+        """발급이나 디스크 조회 없이, 메모리에 있는 유효한 토큰만 반환합니다 (없으면 None)."""
+        token, expires_at = self.access_token, self.token_expires_at
+        return token if self._is_fresh(token, expires_at) else None
+
+    def get_token(self, force_refresh: bool = False) -> Optional[str]:
+        """
+        유효한 접근 토큰을 반환합니다.
+
+        Args:
+            force_refresh: True면 현재 토큰을 버리고 갱신 (다른 프로세스가 이미 새로 발급해 둔 토큰은 재사용)
+
+        Returns:
+            str: 접근 토큰, 실패시 None
+        """
+        # 빠른 경로: 락 없이 메모리 토큰 확인
+        if not force_refresh and self._is_fresh(self.access_token, self.token_expires_at):
+            return self.access_token
+
+        with self._lock:
+            # 다른 스레드가 이미 갱신했을 수 있으므로 다시 확인
+            if not force_refresh and self._is_fresh(self.access_token, self.token_expires_at):
+                return self.access_token
+
+            if not force_refresh and self._load_from_cache():
+                logger.info(f"디스크 캐시 토큰 재사용 (만료: {self.token_expires_at.strftime('%Y-%m-%d %H:%M:%S')})")
+                return self.access_token
+
+            if self.cache is None:
+                return self._issue_and_store()
+
+            # 잠금을 기다리는 동안 다른 프로세스가 발급했으면 그 토큰을 재사용
+            with self.cache.lock():
+                if self._load_from_cache(exclude=self.access_token if force_refresh else None):
+                    logger.info("다른 프로세스가 발급한 토큰 재사용")
+                    return self.access_token
+                return self._issue_and_store()
+
+    def _issue_and_store(self) -> Optional[str]:
+        """새 토큰을 발급받아 메모리와 디스크 캐시에 저장합니다 (self._lock 안에서 호출)."""
+        token, expires_at = self._issue_token()
+        if not token:
+            return None
+
+        self.access_token = token
+        self.token_expires_at = expires_at
+        self._save_to_cache()
+        return token
+
+    def invalidate(self, token: Optional[str] = None):
+        """
+        토큰을 무효화합니다 (서버에서 인증 오류를 받은 경우 등).
+
+        Args:
+            token: 무효화할 토큰. 지정하면 현재 토큰과 같을 때만 무효화 (이미 갱신된 토큰 보호)
+        """
+        with self._lock:
+            if token is None or token == self.access_token:
+                self._rejected_token = self.access_token
+                self.access_token = None
+                self.token_expires_at = None
+
+    def _issue_token(self) -> Tuple[Optional[str], Optional[datetime]]:
+        """/oauth2/token을 호출해 새 토큰을 발급받습니다."""
+        url = self.base_url + '/oauth2/token'
+
+        headers = {
+            'Content-Type': 'application/json;charset=UTF-8',
+        }
+
+        data = {
+            'grant_type': 'client_credentials',
+            'appkey': self.app_key,
+            'secretkey': self.secret_key,
+        }
+
+        try:
+            logger.info("접근 토큰 발급 요청 중...")
+            with measure('kiwoom', 'oauth2/token') as measurement:
+                response = get_http_session(self.base_url).post(url, headers=headers, json=data, timeout=10)
+                measurement.response(response)
+            response.raise_for_status()
+
+            result = response.json()
+
+            # 응답 검증
+            if result.get('return_code') != 0:
+                logger.error(f"토큰 발급 실패: {result.get('return_msg', 'Unknown error')}")
+                get_metrics().record_error('kiwoom', 'oauth2/token', f"return_code_{result.get('return_code')}")
+                return None, None
+
+            # 토큰 추출 (키움 API는 'token' 필드 사용)
+            token = result.get('token') or result.get('access_token')
+            if not token:
+                logger.error(f"토큰 발급 실패 (토큰 없음): {result}")
+                return None, None
+
+            # 만료 시간 설정
+            expires_dt = result.get('expires_dt')  # YYYYMMDDHHmmss 형식
+            if expires_dt:
+                try:
+                    expires_at = datetime.strptime(expires_dt, '%Y%m%d%H%M%S')
+                except Exception as e:
+                    logger.warning(f"만료 시간 파싱 실패: {e}, 기본값(24시간) 사용")
+                    expires_at = datetime.now() + timedelta(hours=24)
+            else:
+                # expires_in이 있으면 사용, 없으면 기본 24시간
+                expires_in = result.get('expires_in', 86400)
+                expires_at = datetime.now() + timedelta(seconds=expires_in)
+
+            get_metrics().record_token_refresh('kiwoom')
+            logger.info(f"접근 토큰 발급 성공 (만료: {expires_at.strftime('%Y-%m-%d %H:%M:%S')})")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Response: {json.dumps(result, indent=4, ensure_ascii=False)}")
+
+            return token, expires_at
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"접근 토큰 발급 HTTP 오류: {e}")
+            if hasattr(e, 'response') and e.response is not None:
+                logger.error(f"Response: {e.response.text}")
+            return None, None
+        except Exception as e:
+            logger.error(f"접근 토큰 발급 실패: {e}")
+            return None, None
+
+    def _load_from_cache(self, exclude: Optional[str] = None) -> bool:
+        """
+        디스크 캐시에서 유효한 토큰을 불러옵니다.
+
+        Args:
+            exclude: 이 토큰이면 불러오지 않음 (강제 갱신 시 현재 토큰)
+        """
+        if self.cache is None:
+            return False
+
+        entry = self.cache.load(self.cache_key)
+        if not entry:
+            return False
+
+        token, expires_at = entry
+        if token in (exclude, self._rejected_token) or not self._is_fresh(token, expires_at):
+            return False
+
+        self.access_token = token
+        self.token_expires_at = expires_at
+        return True
+
+    def _save_to_cache(self):
+        """현재 토큰을 디스크 캐시에 저장합니다."""
+        if self.cache is not None:
+            self.cache.store(self.cache_key, self.access_token, self.token_expires_at)
+
 
 class KiwoomWebSocketClient:
-    """키움증권 WebSocket 실시간 데이터 클라이언트"""
+    """
+    키움증권 WebSocket 실시간 데이터 클라이언트 (요청마다 연결/해제하는 단발성 클라이언트)
+
+    KiwoomAPI는 연결을 유지하는 kiwoom_ws.KiwoomWebSocketSession을 사용합니다.
+    """
 
     def __init__(self, access_token: str, use_mock: bool = False):
         """
@@ -23,7 +293,7 @@ class KiwoomWebSocketClient:
             use_mock: 모의투자 여부 (True: 모의투자, False: 실전투자)
         """
         self.access_token = access_token
-        self.websocket_url = 'wss://mockapi.kiwoom.com:10000/api/dostk/websocket' if use_mock else 'wss://api.kiwoom.com:10000/api/dostk/websocket'
+        self.websocket_url = resolve_websocket_url(use_mock)
         self.websocket = None
         self.connected = False
         self.keep_running = True
@@ -314,95 +584,57 @@ class KiwoomWebSocketClient:
 class KiwoomAPI:
     """키움증권 Open REST API 클래스"""
 
-    def __init__(self, app_key: str, secret_key: str, account_no: str, use_mock: bool = False):
+    # 지난 영업일의 체결내역은 바뀌지 않으므로 (app_key, account_no, ord_dt) 단위로 프로세스 내 재사용
+    _trade_history_cache: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+    _trade_history_lock = threading.Lock()
+
+    def __init__(
+        self,
+        app_key: str,
+        secret_key: str,
+        account_no: str,
+        use_mock: bool = False,
+        priority: int = PRIORITY_DEFAULT
+    ):
         """
         Args:
             app_key: 앱 키
             secret_key: 시크릿 키
             account_no: 계좌번호
             use_mock: 모의투자 여부 (True: 모의투자, False: 실전투자)
+            priority: 요청 한도 대기열 우선순위 (rate_limiter.PRIORITY_*)
+                      화면 조회는 PRIORITY_INTERACTIVE, 스케줄러/동기화는 PRIORITY_BACKGROUND
         """
         self.app_key = app_key
         self.secret_key = secret_key
         self.account_no = account_no
-        self.base_url = 'https://mockapi.kiwoom.com' if use_mock else 'https://api.kiwoom.com'
+        self.base_url = resolve_base_url(use_mock)
+        self.priority = priority
+        # keep-alive 커넥션 풀을 가진 공유 세션 (같은 base_url의 모든 인스턴스가 재사용)
+        self.session = get_http_session(self.base_url)
+        # (app_key, api_id)별 요청 한도를 프로세스 전체에서 공유
+        self.rate_limiter = get_rate_limiter()
         self.access_token: Optional[str] = None
         self.token_expires_at: Optional[datetime] = None
+        # 같은 app_key를 쓰는 모든 인스턴스가 토큰을 공유
+        self.token_broker = KiwoomTokenBroker.get(app_key, secret_key, self.base_url)
 
-    def get_access_token(self) -> Optional[str]:
+    def get_access_token(self, force_refresh: bool = False) -> Optional[str]:
         """
         접근 토큰을 발급받습니다.
-        이미 유효한 토큰이 있으면 재사용하고, 없거나 만료되었으면 새로 발급받습니다.
+        프로세스 공유 토큰 브로커를 통해 유효한 토큰을 재사용하고, 만료가 가까우면 새로 발급받습니다.
+
+        Args:
+            force_refresh: True면 기존 토큰을 무시하고 새로 발급
 
         Returns:
             str: 접근 토큰, 실패시 None
         """
-        # 기존 토큰이 유효하면 재사용
-        if self.access_token and self.token_expires_at:
-            if datetime.now() < self.token_expires_at:
-                logger.info("기존 토큰 재사용")
-                return self.access_token
-
-        # 새로운 토큰 발급
-        endpoint = '/oauth2/token'
-        url = self.base_url + endpoint
-
-        headers = {
-            'Content-Type': 'application/json;charset=UTF-8',
-        }
-
-        data = {
-            'grant_type': 'client_credentials',
-            'appkey': self.app_key,
-            'secretkey': self.secret_key,
-        }
-
-        try:
-            logger.info("접근 토큰 발급 요청 중...")
-            response = requests.post(url, headers=headers, json=data, timeout=10)
-            response.raise_for_status()
-
-            result = response.json()
-
-            # 응답 검증
-            if result.get('return_code') != 0:
-                logger.error(f"토큰 발급 실패: {result.get('return_msg', 'Unknown error')}")
-                return None
-
-            # 토큰 추출 (키움 API는 'token' 필드 사용)
-            token = result.get('token') or result.get('access_token')
-            if not token:
-                logger.error(f"토큰 발급 실패 (토큰 없음): {result}")
-                return None
-
+        token = self.token_broker.get_token(force_refresh=force_refresh)
+        if token:
             self.access_token = token
-
-            # 만료 시간 설정
-            expires_dt = result.get('expires_dt')  # YYYYMMDDHHmmss 형식
-            if expires_dt:
-                try:
-                    self.token_expires_at = datetime.strptime(expires_dt, '%Y%m%d%H%M%S') - timedelta(minutes=1)  # 여유시간 1분
-                except Exception as e:
-                    logger.warning(f"만료 시간 파싱 실패: {e}, 기본값(24시간) 사용")
-                    self.token_expires_at = datetime.now() + timedelta(hours=24)
-            else:
-                # expires_in이 있으면 사용, 없으면 기본 24시간
-                expires_in = result.get('expires_in', 86400)
-                self.token_expires_at = datetime.now() + timedelta(seconds=expires_in - 60)
-
-            logger.info(f"접근 토큰 발급 성공 (만료: {self.token_expires_at.strftime('%Y-%m-%d %H:%M:%S')})")
-            logger.debug(f"Response: {json.dumps(result, indent=4, ensure_ascii=False)}")
-
-            return self.access_token
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"접근 토큰 발급 HTTP 오류: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response: {e.response.text}")
-            return None
-        except Exception as e:
-            logger.error(f"접근 토큰 발급 실패: {e}")
-            return None
+            self.token_expires_at = self.token_broker.token_expires_at
+        return token
 
     def _make_request(
         self,
@@ -410,7 +642,8 @@ class KiwoomAPI:
         api_id: str,
         data: Dict[str, Any],
         cont_yn: str = 'N',
-        next_key: str = ''
+        next_key: str = '',
+        priority: Optional[int] = None
     ) -> Optional[Dict[str, Any]]:
         """
         API 요청을 수행합니다.
@@ -421,6 +654,7 @@ class KiwoomAPI:
             data: 요청 데이터
             cont_yn: 연속조회여부 ('N' 또는 'Y')
             next_key: 연속조회키
+            priority: 요청 한도 대기열 우선순위 (None이면 인스턴스 기본값)
 
         Returns:
             dict: 응답 데이터, 실패시 None
@@ -441,16 +675,60 @@ class KiwoomAPI:
             'api-id': api_id,
         }
 
+        limiter_key = (self.app_key, api_id)
+        if priority is None:
+            priority = self.priority
+        metrics = get_metrics()
+
         try:
-            response = requests.post(url, headers=headers, json=data, timeout=10)
+            auth_retried = False
+            throttle_retried = False
+            while True:
+                # 요청 한도 확인 (한도를 넘으면 실패하지 않고 차례를 기다림)
+                self.rate_limiter.acquire(limiter_key, priority)
+                with measure('kiwoom', api_id, continuation=cont_yn == 'Y') as measurement:
+                    response = self.session.post(url, headers=headers, json=data, timeout=10)
+                    measurement.response(response)
+
+                # 토큰이 서버에서 만료/폐기된 경우 공유 토큰을 무효화하고 한 번만 재시도
+                if response.status_code == 401 and not auth_retried:
+                    auth_retried = True
+                    metrics.record_retry('kiwoom', api_id, 'auth')
+                    logger.warning(f"인증 오류(401), 토큰 재발급 후 재시도: {api_id}")
+                    self.token_broker.invalidate(token)
+                    token = self.get_access_token()
+                    if not token:
+                        logger.error("유효한 토큰이 없습니다")
+                        return None
+                    headers['authorization'] = f'Bearer {token}'
+                    continue
+
+                # 서버 측 한도 초과: 버킷을 잠시 비우고 한 번만 재시도
+                if response.status_code == 429 and not throttle_retried:
+                    throttle_retried = True
+                    metrics.record_retry('kiwoom', api_id, 'throttle')
+                    self.rate_limiter.penalize(limiter_key, THROTTLE_BACKOFF_SEC)
+                    continue
+
+                break
+
             response.raise_for_status()
 
             result = response.json()
 
+            # 연속조회 정보는 응답 헤더로만 오므로 결과에 함께 담아 반환
+            if isinstance(result, dict):
+                result['cont-yn'] = response.headers.get('cont-yn', 'N')
+                result['next-key'] = response.headers.get('next-key', '')
+                if result.get('return_code', 0) != 0:
+                    metrics.record_error('kiwoom', api_id, f"return_code_{result.get('return_code')}")
+
             logger.info(f"API 요청 성공: {api_id}")
-            logger.debug(f"Response Code: {response.status_code}")
-            logger.debug(f"Response Headers: {json.dumps({key: response.headers.get(key) for key in ['next-key', 'cont-yn', 'api-id']}, indent=4, ensure_ascii=False)}")
-            logger.debug(f"Response Body: {json.dumps(result, indent=4, ensure_ascii=False)}")
+            # 응답 전체 직렬화는 DEBUG 로그가 켜져 있을 때만 수행
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Response Code: {response.status_code}")
+                logger.debug(f"Response Headers: {json.dumps({key: response.headers.get(key) for key in ['next-key', 'cont-yn', 'api-id']}, indent=4, ensure_ascii=False)}")
+                logger.debug(f"Response Body: {json.dumps(result, indent=4, ensure_ascii=False)}")
 
             return result
 
@@ -463,6 +741,53 @@ class KiwoomAPI:
             logger.error(f"API 요청 실패: {api_id}, {e}")
             return None
 
+    def iter_pages(
+        self,
+        endpoint: str,
+        api_id: str,
+        data: Dict[str, Any],
+        max_pages: Optional[int] = None,
+        priority: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        연속조회(cont-yn/next-key)를 따라가며 응답을 한 페이지씩 반환하는 제너레이터.
+        다음 페이지는 소비하는 쪽이 요청할 때만 조회하므로 전체 결과를 메모리에 올리지 않습니다.
+
+        Args:
+            endpoint: API 엔드포인트
+            api_id: API ID (TR명)
+            data: 요청 데이터 (모든 페이지에 동일하게 전송)
+            max_pages: 최대 페이지 수 (None이면 마지막 페이지까지)
+            priority: 요청 한도 대기열 우선순위 (None이면 인스턴스 기본값)
+
+        Yields:
+            dict: 페이지별 응답 데이터 (return_code가 0이 아니거나 요청이 실패하면 중단)
+        """
+        cont_yn = 'N'
+        next_key = ''
+        page = 0
+
+        while max_pages is None or page < max_pages:
+            result = self._make_request(
+                endpoint, api_id, data, cont_yn=cont_yn, next_key=next_key, priority=priority
+            )
+            if not result:
+                logger.error(f"연속조회 실패: {api_id}, {page + 1}페이지")
+                return
+            if result.get('return_code') != 0:
+                logger.error(f"연속조회 오류: {api_id}, {result.get('return_msg', 'Unknown error')}")
+                return
+
+            page += 1
+            yield result
+
+            next_key = result.get('next-key', '')
+            if result.get('cont-yn') != 'Y' or not next_key:
+                return
+            cont_yn = 'Y'
+
+        logger.info(f"연속조회 최대 페이지 도달: {api_id}, {max_pages}페이지")
+
     def get_daily_trading_diary(
         self,
         base_dt: str = '',
@@ -548,6 +873,134 @@ class KiwoomAPI:
         logger.info(f"일봉 차트 조회 성공: {stock_code} ({len(result.get('stk_dt_pole_chart_qry', []))}개 데이터)")
         return result
 
+    def iter_daily_chart(
+        self,
+        stock_code: str,
+        base_dt: str = '',
+        upd_stkpc_tp: str = '1',
+        max_pages: Optional[int] = None,
+        max_bars: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        일봉 차트(ka10081)를 연속조회로 과거 방향으로 따라가며 봉을 하나씩 반환합니다.
+
+        Args:
+            stock_code: 종목코드 (6자리)
+            base_dt: 기준일자 YYYYMMDD (공백입력시 금일데이터)
+            upd_stkpc_tp: 수정주가구분 ('0': 미수정, '1': 수정)
+            max_pages: 최대 페이지 수 (None이면 제한 없음)
+            max_bars: 최대 봉 개수 (None이면 제한 없음)
+
+        Yields:
+            dict: 일봉 데이터 (get_daily_chart의 stk_dt_pole_chart_qry 항목, 최신순)
+        """
+        data = {
+            'stk_cd': stock_code,
+            'base_dt': base_dt,
+            'upd_stkpc_tp': upd_stkpc_tp,
+        }
+
+        count = 0
+        for page in self.iter_pages('/api/dostk/chart', 'ka10081', data, max_pages=max_pages):
+            for bar in page.get('stk_dt_pole_chart_qry', []):
+                if max_bars is not None and count >= max_bars:
+                    return
+                count += 1
+                yield bar
+
+    def fetch_daily_bars(
+        self,
+        stock_code: str,
+        since: Optional[date] = None,
+        max_bars: Optional[int] = None,
+        adjusted: bool = True
+    ) -> pd.DataFrame:
+        """
+        일봉을 표준 일봉 프레임으로 조회합니다 (lib.bar_store.refresh_bars의 fetch 함수).
+
+        Args:
+            stock_code: 종목코드 (6자리)
+            since: 이 날짜까지 받으면 연속조회 중단 (None이면 max_bars개까지)
+            max_bars: 최대 봉 개수 (None이면 제한 없음)
+            adjusted: True면 수정주가, False면 원주가
+
+        Returns:
+            pd.DataFrame: 표준 일봉 프레임 (과거 → 최신)
+        """
+        since_ymd = since.strftime('%Y%m%d') if since is not None else None
+        rows = []
+        for bar in self.iter_daily_chart(
+            stock_code, upd_stkpc_tp='1' if adjusted else '0', max_bars=max_bars
+        ):
+            rows.append(bar)
+            if since_ymd is not None and str(bar.get('dt', '')) <= since_ymd:
+                break
+        return kiwoom_daily_bars(rows)
+
+    def iter_minute_chart(
+        self,
+        stock_code: str,
+        tic_scope: str = '1',
+        upd_stkpc_tp: str = '1',
+        max_pages: Optional[int] = None,
+        max_bars: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        분봉 차트(ka10080)를 연속조회로 과거 방향으로 따라가며 봉을 하나씩 반환합니다.
+
+        Args:
+            stock_code: 종목코드 (6자리)
+            tic_scope: 틱범위 (분, '1', '3', '5', '10', '15', '30', '45', '60')
+            upd_stkpc_tp: 수정주가구분 ('0': 미수정, '1': 수정)
+            max_pages: 최대 페이지 수 (None이면 제한 없음)
+            max_bars: 최대 봉 개수 (None이면 제한 없음)
+
+        Yields:
+            dict: 분봉 데이터 (stk_min_pole_chart_qry 항목, 최신순, cntr_tm: 'YYYYMMDDHHMMSS')
+        """
+        data = {
+            'stk_cd': stock_code,
+            'tic_scope': tic_scope,
+            'upd_stkpc_tp': upd_stkpc_tp,
+        }
+
+        count = 0
+        for page in self.iter_pages('/api/dostk/chart', 'ka10080', data, max_pages=max_pages):
+            for bar in page.get('stk_min_pole_chart_qry', []):
+                if max_bars is not None and count >= max_bars:
+                    return
+                count += 1
+                yield bar
+
+    def fetch_minute_bars(
+        self,
+        stock_code: str,
+        since: Optional[date] = None,
+        max_bars: Optional[int] = None,
+        adjusted: bool = True
+    ) -> pd.DataFrame:
+        """
+        1분봉을 표준 프레임으로 조회합니다 (분봉 저장소 refresh 함수의 fetch).
+
+        Args:
+            stock_code: 종목코드 (6자리)
+            since: 이 날짜 이전 분봉을 받으면 연속조회 중단 (None이면 max_bars개까지)
+            max_bars: 최대 봉 개수 (None이면 제한 없음)
+            adjusted: True면 수정주가, False면 원주가
+
+        Returns:
+            pd.DataFrame: 표준 프레임 (과거 → 최신, date는 분봉 시각)
+        """
+        since_ymd = since.strftime('%Y%m%d') if since is not None else None
+        rows = []
+        for bar in self.iter_minute_chart(
+            stock_code, upd_stkpc_tp='1' if adjusted else '0', max_bars=max_bars
+        ):
+            rows.append(bar)
+            if since_ymd is not None and str(bar.get('cntr_tm', ''))[:8] < since_ymd:
+                break
+        return kiwoom_minute_bars(rows)
+
     def get_account_evaluation(
         self,
         qry_tp: str = '0',
@@ -613,6 +1066,15 @@ class KiwoomAPI:
             logger.error(f"계좌평가현황 조회 오류: {result.get('return_msg', 'Unknown error')}")
             return None
 
+        self._normalize_account_evaluation(result)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"계좌평가현황: {json.dumps(result, indent=4, ensure_ascii=False)}")
+        return result
+
+    @staticmethod
+    def _normalize_account_evaluation(result: Dict[str, Any]):
+        """계좌평가현황(kt00004) 응답의 종목코드/숫자 문자열을 정규화합니다 (in-place)."""
         # 종목 정보 파싱
         stocks = result.get('stk_acnt_evlt_prst', [])
         logger.info(f"계좌평가현황 조회 성공: 총 {len(stocks)}개 보유종목")
@@ -649,9 +1111,6 @@ class KiwoomAPI:
                 except (ValueError, AttributeError):
                     result[field] = 0
 
-        logger.debug(f"계좌평가현황: {json.dumps(result, indent=4, ensure_ascii=False)}")
-        return result
-
     def get_stocks_info(
         self,
         mrkt_tp: str = '0',
@@ -728,12 +1187,39 @@ class KiwoomAPI:
 
         return result
 
+    def iter_stocks_info(
+        self,
+        mrkt_tp: str = '0',
+        max_pages: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        종목정보리스트(ka10099)를 연속조회로 끝까지 따라가며 페이지 단위로 반환합니다.
+
+        Args:
+            mrkt_tp: 시장구분 ('0': 코스피, '10': 코스닥 등, get_stocks_info 참고)
+            max_pages: 최대 페이지 수 (None이면 마지막 페이지까지)
+
+        Yields:
+            list: 페이지별 종목정보 리스트 (get_stocks_info의 list 항목)
+        """
+        data = {
+            'mrkt_tp': mrkt_tp,
+        }
+
+        total = 0
+        for page in self.iter_pages('/api/dostk/stkinfo', 'ka10099', data, max_pages=max_pages):
+            stocks = page.get('list', [])
+            total += len(stocks)
+            logger.info(f"종목정보리스트 페이지 조회: 시장={mrkt_tp}, {len(stocks)}개 (누적 {total}개)")
+            yield stocks
+
     def get_recent_trades(self, days: int = 5) -> List[Dict[str, Any]]:
         """
         최근 N일간의 매매(매수/매도) 데이터를 가져옵니다.
+        주말/KRX 휴장일은 건너뛰고, 남은 영업일은 동시에 조회하며, 지난 날짜는 캐시를 재사용합니다.
 
         Args:
-            days: 조회할 일수 (기본값: 5일)
+            days: 조회할 일수 (달력 기준, 기본값: 5일)
 
         Returns:
             list: 매매 데이터 리스트
@@ -749,97 +1235,167 @@ class KiwoomAPI:
                 ...
             ]
         """
-        endpoint = '/api/dostk/acnt'
-        api_id = 'kt00007'
+        # 주말/휴장일은 체결내역이 없으므로 조회하지 않음
+        trading_days = recent_trading_days(days)
+        all_trades, missing_days = self._get_cached_trade_history(self.app_key, self.account_no, trading_days)
 
-        all_trades = []
+        if missing_days:
+            logger.info(f"매매내역 조회 중: {len(missing_days)}일 (캐시 {len(trading_days) - len(missing_days)}일)")
 
-        # 최근 N일 조회
-        for i in range(days):
-            target_date = datetime.now() - timedelta(days=i)
-            ord_dt = target_date.strftime('%Y%m%d')
+            # 남은 영업일은 동시에 조회 (요청 한도 안에서 대기)
+            with ThreadPoolExecutor(max_workers=min(TRADE_HISTORY_WORKERS, len(missing_days))) as executor:
+                results = executor.map(self._fetch_trade_history, missing_days)
+                for trades in results:
+                    all_trades.extend(trades)
 
-            logger.info(f"매매내역 조회 중: {ord_dt}")
+        logger.info(f"총 {len(all_trades)}건의 매매내역 조회 완료")
 
-            data = {
-                'ord_dt': ord_dt,           # 주문일자
-                'qry_tp': '4',              # 조회구분: 4(체결내역만)
-                'stk_bond_tp': '1',         # 주식채권구분: 1(주식)
-                'sell_tp': '0',             # 매도수구분: 0(전체)
-                'stk_cd': '',               # 종목코드: 공백(전체종목)
-                'fr_ord_no': '',            # 시작주문번호: 공백(전체주문)
-                'dmst_stex_tp': '%',        # 국내거래소구분: %(전체)
-            }
+        # 최신순 정렬 (날짜시간 기준 내림차순)
+        all_trades.sort(key=lambda x: x['datetime'], reverse=True)
 
-            # API 호출
-            result = self._make_request(endpoint, api_id, data)
+        return all_trades
 
-            if not result:
-                logger.warning(f"{ord_dt} 매매내역 조회 실패")
-                continue
+    def _fetch_trade_history(self, ord_dt: str) -> List[Dict[str, Any]]:
+        """하루치 매매내역을 조회하고, 지난 날짜면 캐시에 저장합니다."""
+        result = self._make_request('/api/dostk/acnt', 'kt00007', self._build_trade_history_request(ord_dt))
+        trades = self._parse_trade_history(result, ord_dt)
+        self._store_trade_history(self.app_key, self.account_no, ord_dt, result, trades)
+        return trades
+
+    @classmethod
+    def _get_cached_trade_history(
+        cls,
+        app_key: str,
+        account_no: str,
+        trading_days: List[str]
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        캐시된 날짜의 매매내역과 조회가 필요한 날짜 목록을 반환합니다.
 
-            # 응답 데이터 파싱
-            if 'return_code' in result and result['return_code'] != 0:
-                logger.warning(f"{ord_dt} 조회 오류: {result.get('return_msg', 'Unknown error')}")
-                continue
+        Args:
+            app_key: 앱 키
+            account_no: 계좌번호
+            trading_days: 조회할 영업일 리스트 (YYYYMMDD)
 
-            # 응답 구조 디버깅
-            logger.debug(f"{ord_dt} 응답 키: {list(result.keys())}")
+        Returns:
+            tuple: (캐시된 매매내역 리스트, 조회가 필요한 날짜 리스트)
+        """
+        cached_trades = []
+        missing_days = []
+        with cls._trade_history_lock:
+            for ord_dt in trading_days:
+                trades = cls._trade_history_cache.get((app_key, account_no, ord_dt))
+                if trades is None:
+                    missing_days.append(ord_dt)
+                else:
+                    cached_trades.extend(dict(trade) for trade in trades)
+        return cached_trades, missing_days
+
+    @classmethod
+    def _store_trade_history(
+        cls,
+        app_key: str,
+        account_no: str,
+        ord_dt: str,
+        result: Optional[Dict[str, Any]],
+        trades: List[Dict[str, Any]]
+    ):
+        """정상 응답을 받은 지난 날짜의 매매내역만 캐시합니다 (당일은 체결이 계속 추가되므로 제외)."""
+        if not result or result.get('return_code', 0) != 0:
+            return
+        if ord_dt >= datetime.now().strftime('%Y%m%d'):
+            return
+        with cls._trade_history_lock:
+            cls._trade_history_cache[(app_key, account_no, ord_dt)] = [dict(trade) for trade in trades]
+
+    @staticmethod
+    def _build_trade_history_request(ord_dt: str) -> Dict[str, Any]:
+        """계좌별주문체결내역상세(kt00007) 요청 데이터를 만듭니다."""
+        return {
+            'ord_dt': ord_dt,           # 주문일자
+            'qry_tp': '4',              # 조회구분: 4(체결내역만)
+            'stk_bond_tp': '1',         # 주식채권구분: 1(주식)
+            'sell_tp': '0',             # 매도수구분: 0(전체)
+            'stk_cd': '',               # 종목코드: 공백(전체종목)
+            'fr_ord_no': '',            # 시작주문번호: 공백(전체주문)
+            'dmst_stex_tp': '%',        # 국내거래소구분: %(전체)
+        }
 
-            # 체결내역 데이터 추출 (키 이름: acnt_ord_cntr_prps_dtl)
-            trade_list = result.get('acnt_ord_cntr_prps_dtl', [])
+    @staticmethod
+    def _parse_trade_history(result: Optional[Dict[str, Any]], ord_dt: str) -> List[Dict[str, Any]]:
+        """
+        kt00007 응답에서 실제 체결된 매매내역만 추출합니다.
 
-            for trade in trade_list:
-                # 체결수량이 0보다 큰 경우만 추가 (실제 체결된 건만)
-                cntr_qty_str = trade.get('cntr_qty', '0').strip()
-                cntr_qty = int(cntr_qty_str) if cntr_qty_str else 0
+        Args:
+            result: kt00007 응답 (실패시 None)
+            ord_dt: 조회한 주문일자 YYYYMMDD
 
-                if cntr_qty <= 0:
-                    continue
+        Returns:
+            list: 매매 데이터 리스트 (조회 실패시 빈 리스트)
+        """
+        if not result:
+            logger.warning(f"{ord_dt} 매매내역 조회 실패")
+            return []
 
-                # 체결단가 파싱
-                cntr_uv_str = trade.get('cntr_uv', '0').strip()
-                cntr_uv = float(cntr_uv_str) if cntr_uv_str else 0.0
-
-                # 종목코드에서 'A' 접두사 제거
-                stock_code = trade.get('stk_cd', '').replace('A', '')
-
-                # 매매구분 파싱 (io_tp_nm: 현금매수, 현금매도 등)
-                io_tp_nm = trade.get('io_tp_nm', '')
-                trade_type = '매도' if '매도' in io_tp_nm else '매수'
-
-                # 체결시간 (cnfm_tm이 있으면 사용, 없으면 ord_tm 사용)
-                trade_time = trade.get('cnfm_tm', '') or trade.get('ord_tm', '')
-                trade_datetime = ord_dt + trade_time.replace(':', '')
-
-                trade_data = {
-                    'stock_code': stock_code,
-                    'stock_name': trade.get('stk_nm', ''),
-                    'trade_type': trade_type,
-                    'price': cntr_uv,
-                    'quantity': cntr_qty,
-                    'datetime': trade_datetime,
-                    'order_no': trade.get('ord_no', ''),
-                }
+        # 응답 데이터 파싱
+        if 'return_code' in result and result['return_code'] != 0:
+            logger.warning(f"{ord_dt} 조회 오류: {result.get('return_msg', 'Unknown error')}")
+            return []
 
-                all_trades.append(trade_data)
+        # 응답 구조 디버깅
+        logger.debug(f"{ord_dt} 응답 키: {list(result.keys())}")
 
-        logger.info(f"총 {len(all_trades)}건의 매매내역 조회 완료")
+        trades = []
 
-        # 최신순 정렬 (날짜시간 기준 내림차순)
-        all_trades.sort(key=lambda x: x['datetime'], reverse=True)
+        # 체결내역 데이터 추출 (키 이름: acnt_ord_cntr_prps_dtl)
+        trade_list = result.get('acnt_ord_cntr_prps_dtl', [])
 
-        return all_trades
+        for trade in trade_list:
+            # 체결수량이 0보다 큰 경우만 추가 (실제 체결된 건만)
+            cntr_qty_str = trade.get('cntr_qty', '0').strip()
+            cntr_qty = int(cntr_qty_str) if cntr_qty_str else 0
+
+            if cntr_qty <= 0:
+                continue
+
+            # 체결단가 파싱
+            cntr_uv_str = trade.get('cntr_uv', '0').strip()
+            cntr_uv = float(cntr_uv_str) if cntr_uv_str else 0.0
+
+            # 종목코드에서 'A' 접두사 제거
+            stock_code = trade.get('stk_cd', '').replace('A', '')
+
+            # 매매구분 파싱 (io_tp_nm: 현금매수, 현금매도 등)
+            io_tp_nm = trade.get('io_tp_nm', '')
+            trade_type = '매도' if '매도' in io_tp_nm else '매수'
+
+            # 체결시간 (cnfm_tm이 있으면 사용, 없으면 ord_tm 사용)
+            trade_time = trade.get('cnfm_tm', '') or trade.get('ord_tm', '')
+            trade_datetime = ord_dt + trade_time.replace(':', '')
+
+            trades.append({
+                'stock_code': stock_code,
+                'stock_name': trade.get('stk_nm', ''),
+                'trade_type': trade_type,
+                'price': cntr_uv,
+                'quantity': cntr_qty,
+                'datetime': trade_datetime,
+                'order_no': trade.get('ord_no', ''),
+            })
+
+        return trades
 
-    def get_condition_list(self, use_mock: bool = False) -> Optional[List[Dict[str, Any]]]:
+    def get_condition_list(self, use_mock: bool = False, force_refresh: bool = False) -> Optional[List[Dict[str, Any]]]:
         """
         사용자가 키움에 설정한 조건 검색 목록을 조회합니다.
 
-        이 메서드는 WebSocket을 사용하여 실시간으로 조건 검색 목록을 가져옵니다.
-        비동기 작업이므로 asyncio 이벤트 루프가 필요합니다.
+        이 메서드는 앱 키별로 유지되는 WebSocket 세션(KiwoomWebSocketSession)으로 조건 검색 목록을 가져옵니다.
+        세션은 백그라운드 이벤트 루프에서 동작하므로 호출하는 쪽에 이벤트 루프가 없어도 됩니다.
+        목록은 세션에 캐시되어 TTL(KIWOOM_CONDITION_CATALOG_TTL_SEC) 안에는 서버에 다시 요청하지 않습니다.
 
         Args:
             use_mock: 모의투자 여부 (True: 모의투자, False: 실전투자)
+            force_refresh: True면 캐시를 무시하고 다시 조회 (키움에서 조건식을 추가/변경한 경우)
 
         Returns:
             list: 조건 검색 목록
@@ -864,38 +1420,57 @@ class KiwoomAPI:
             ...         print(f"조건 ID: {condition['id']}, 조건명: {condition['name']}")
         """
         try:
-            # 접근 토큰 발급
-            token = self.get_access_token()
-            if not token:
-                logger.error("유효한 토큰이 없습니다")
-                return None
+            # 앱 키별로 유지되는 WebSocket 세션에서 조회 (연결/로그인은 필요할 때만)
+            session = KiwoomWebSocketSession.get(self.token_broker, use_mock=use_mock)
+            condition_list = session.call(session.get_condition_catalog(force_refresh=force_refresh))
 
-            # WebSocket 클라이언트 생성
-            ws_client = KiwoomWebSocketClient(access_token=token, use_mock=use_mock)
+            return self._format_condition_list(condition_list)
 
-            # 비동기 함수 실행
-            condition_list = asyncio.run(ws_client.request_condition_list())
+        except Exception as e:
+            logger.error(f"조건 검색 목록 조회 실패: {e}")
+            return None
 
-            if not condition_list:
-                logger.warning("조건 검색 목록이 없거나 조회 실패")
-                return None
+    def find_condition_id(self, condition_name: str, use_mock: bool = False) -> Optional[str]:
+        """
+        조건명으로 조건식 ID를 찾습니다.
 
-            # 응답 데이터를 딕셔너리 리스트로 변환
-            formatted_conditions = []
-            for condition in condition_list:
-                if isinstance(condition, list) and len(condition) >= 2:
-                    formatted_conditions.append({
-                        'id': condition[0],
-                        'name': condition[1]
-                    })
+        캐시된 조건식 목록에서 찾고, 없으면 목록을 한 번 새로 조회해 다시 찾습니다
+        (캐시 이후 키움에서 새로 만든 조건식 대응).
 
-            logger.info(f"조건 검색 목록 포맷팅 완료: {len(formatted_conditions)}개")
-            return formatted_conditions
+        Args:
+            condition_name: 조건명 (예: '신고가 돌파')
+            use_mock: 모의투자 여부
 
-        except Exception as e:
-            logger.error(f"조건 검색 목록 조회 실패: {e}")
+        Returns:
+            str: 조건식 ID, 찾지 못하면 None
+        """
+        for force_refresh in (False, True):
+            conditions = self.get_condition_list(use_mock=use_mock, force_refresh=force_refresh)
+            if conditions is None:
+                return None
+            for condition in conditions:
+                if condition.get('name') == condition_name:
+                    return condition.get('id')
+        return None
+
+    @staticmethod
+    def _format_condition_list(condition_list: Optional[List[List[str]]]) -> Optional[List[Dict[str, Any]]]:
+        """CNSRLST 응답의 [id, name] 목록을 딕셔너리 리스트로 변환합니다."""
+        if not condition_list:
+            logger.warning("조건 검색 목록이 없거나 조회 실패")
             return None
 
+        formatted_conditions = []
+        for condition in condition_list:
+            if isinstance(condition, list) and len(condition) >= 2:
+                formatted_conditions.append({
+                    'id': condition[0],
+                    'name': condition[1]
+                })
+
+        logger.info(f"조건 검색 목록 포맷팅 완료: {len(formatted_conditions)}개")
+        return formatted_conditions
+
     def search_condition(
         self,
         condition_id: str,
@@ -943,67 +1518,102 @@ class KiwoomAPI:
             ...             print(f"{stock['stock_name']}({stock['stock_code']}): {stock['current_price']}")
         """
         try:
-            # 접근 토큰 발급
-            token = self.get_access_token()
-            if not token:
-                logger.error("유효한 토큰이 없습니다")
-                return None
-
-            # WebSocket 클라이언트 생성
-            ws_client = KiwoomWebSocketClient(access_token=token, use_mock=use_mock)
-
-            # 비동기 함수 실행
-            response = asyncio.run(ws_client.request_condition_search(
+            # 앱 키별로 유지되는 WebSocket 세션에서 검색 (고정 대기 없이 응답 즉시 반환)
+            session = KiwoomWebSocketSession.get(self.token_broker, use_mock=use_mock)
+            response = session.call(session.request_condition_search(
                 condition_id=condition_id,
                 search_type=search_type,
                 stock_exchange_type=stock_exchange_type
             ))
 
-            if not response:
-                logger.warning("조건 검색 결과가 없거나 조회 실패")
-                return None
+            return self._format_condition_results(condition_id, response)
 
-            # 응답 데이터 파싱
-            data = response.get('data', [])
-            if not data:
-                logger.info(f"조건식 {condition_id}으로 검색한 결과가 없습니다")
-                return []
+        except Exception as e:
+            logger.error(f"조건 검색 실패: {e}")
+            return None
 
-            # 응답 데이터를 사용하기 쉬운 형식으로 변환
-            formatted_stocks = []
-            for stock_data in data:
-                try:
-                    # 종목코드에서 'A' 접두사 제거
-                    stock_code = stock_data.get('9001', '').replace('A', '')
-                    stock_name = stock_data.get('302', '')
-                    current_price_str = stock_data.get('10', '0').strip()
-                    status = stock_data.get('25', '')
+    def search_conditions(
+        self,
+        condition_ids: List[str],
+        search_type: str = '0',
+        stock_exchange_type: str = 'K',
+        use_mock: bool = False
+    ) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        """
+        여러 조건식으로 종목을 한 번에 검색합니다 (CNSRREQ 일괄 요청).
 
-                    # 현재가를 숫자로 변환
-                    try:
-                        current_price = float(current_price_str) if current_price_str else 0.0
-                    except (ValueError, TypeError):
-                        current_price = 0.0
-
-                    formatted_stocks.append({
-                        'stock_code': stock_code,
-                        'stock_name': stock_name,
-                        'current_price': current_price,
-                        'status': status,
-                        'raw_data': stock_data  # 원본 데이터 포함
-                    })
+        앱 키별 WebSocket 세션 하나에서 CNSRREQ를 연달아 보내고 응답을 seq로 모으므로,
+        조건식이 늘어나도 연결/로그인 없이 요청 한 건씩만 늘어납니다.
 
-                except Exception as e:
-                    logger.warning(f"종목 데이터 파싱 오류: {stock_data}, {e}")
-                    continue
+        Args:
+            condition_ids: 조건식 ID 목록
+            search_type: 조회 타입 ('0': 일반 조회, '1': 실시간 조회)
+            stock_exchange_type: 거래소 구분 ('K': 코스피, 'Q': 코스닥, '%': 전체)
+            use_mock: 모의투자 여부
 
-            logger.info(f"조건식 {condition_id}으로 {len(formatted_stocks)}개 종목 검색 완료")
-            return formatted_stocks
+        Returns:
+            dict: {조건식 ID: search_condition과 같은 형식의 종목 리스트 (실패시 None)}
 
+        Example:
+            >>> results = api.search_conditions(['7', '5'])
+            >>> for condition_id, stocks in results.items():
+            ...     print(condition_id, len(stocks or []))
+        """
+        condition_ids = [str(condition_id).strip() for condition_id in condition_ids]
+        try:
+            session = KiwoomWebSocketSession.get(self.token_broker, use_mock=use_mock)
+            responses = session.call(session.request_condition_searches(
+                condition_ids,
+                search_type=search_type,
+                stock_exchange_type=stock_exchange_type
+            ))
         except Exception as e:
-            logger.error(f"조건 검색 실패: {e}")
+            logger.error(f"조건 일괄 검색 실패: {e}")
+            return dict.fromkeys(condition_ids)
+
+        return {
+            condition_id: self._format_condition_results(condition_id, response)
+            for condition_id, response in responses.items()
+        }
+
+    @staticmethod
+    def _format_condition_results(
+        condition_id: str,
+        response: Optional[Dict[str, Any]]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """CNSRREQ 응답을 search_condition 반환 형식의 종목 리스트로 변환합니다."""
+        if not response:
+            logger.warning("조건 검색 결과가 없거나 조회 실패")
             return None
 
+        # 응답 데이터 파싱
+        data = response.get('data', [])
+        if not data:
+            logger.info(f"조건식 {condition_id}으로 검색한 결과가 없습니다")
+            return []
+
+        # 필드별로 한 번에 변환 (현재가의 등락 부호/0 채움 처리 포함)
+        columns = decode_condition_results(data)
+        formatted_stocks = [
+            {
+                'stock_code': stock_code,
+                'stock_name': stock_name,
+                'current_price': current_price,
+                'status': status,
+                'raw_data': stock_data  # 원본 데이터 포함
+            }
+            for stock_code, stock_name, current_price, status, stock_data in zip(
+                columns['stock_code'].tolist(),
+                columns['stock_name'].tolist(),
+                columns['current_price'].astype(float).tolist(),
+                columns['status'].tolist(),
+                data
+            )
+        ]
+
+        logger.info(f"조건식 {condition_id}으로 {len(formatted_stocks)}개 종목 검색 완료")
+        return formatted_stocks
+
 
 if __name__ == '__main__':
     # 테스트
@@ -0,0 +1,544 @@
+"""
+키움증권 Open REST API 비동기 클라이언트 (httpx 기반)
+
+FastAPI의 async 라우트에서 이벤트 루프를 막지 않도록 KiwoomAPI와 같은 메서드를 코루틴으로 제공합니다.
+토큰은 KiwoomAPI와 같은 KiwoomTokenBroker를 공유합니다.
+"""
+
+import os
+import json
+import asyncio
+import logging
+from datetime import date
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator
+
+import httpx
+import pandas as pd
+
+try:
+    from .kiwoom import KiwoomAPI, KiwoomTokenBroker, resolve_base_url
+    from .kiwoom import TRADE_HISTORY_WORKERS
+    from .rate_limiter import get_rate_limiter, PRIORITY_INTERACTIVE, THROTTLE_BACKOFF_SEC
+    from .krx_calendar import recent_trading_days
+    from .metrics import get_metrics, measure
+    from .ohlcv import kiwoom_daily_bars, kiwoom_minute_bars
+except ImportError:  # analyze/lib를 sys.path에 직접 추가해 'kiwoom_async'로 임포트한 경우
+    from kiwoom import KiwoomAPI, KiwoomTokenBroker, resolve_base_url
+    from kiwoom import TRADE_HISTORY_WORKERS
+    from rate_limiter import get_rate_limiter, PRIORITY_INTERACTIVE, THROTTLE_BACKOFF_SEC
+    from krx_calendar import recent_trading_days
+    from metrics import get_metrics, measure
+    from ohlcv import kiwoom_daily_bars, kiwoom_minute_bars
+
+logger = logging.getLogger(__name__)
+
+# 커넥션 풀/타임아웃 설정 (환경변수로 조정 가능)
+ASYNC_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '16'))
+REQUEST_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+# httpx.AsyncClient는 생성된 이벤트 루프에 묶이므로 (base_url, 이벤트 루프) 단위로 공유
+_clients: Dict[Tuple[str, int], httpx.AsyncClient] = {}
+
+
+def get_async_client(base_url: str) -> httpx.AsyncClient:
+    """
+    현재 이벤트 루프에서 base_url에 해당하는 공유 AsyncClient를 반환합니다 (없으면 생성).
+
+    Args:
+        base_url: API 기본 URL
+
+    Returns:
+        httpx.AsyncClient: keep-alive 커넥션 풀을 가진 비동기 클라이언트
+    """
+    key = (base_url, id(asyncio.get_running_loop()))
+    client = _clients.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=ASYNC_POOL_MAXSIZE,
+                max_keepalive_connections=ASYNC_POOL_MAXSIZE,
+            ),
+        )
+        _clients[key] = client
+    return client
+
+
+async def close_async_clients():
+    """현재 이벤트 루프에서 만든 AsyncClient를 모두 닫습니다 (애플리케이션 종료 시 호출)."""
+    loop_id = id(asyncio.get_running_loop())
+    for key in [key for key in _clients if key[1] == loop_id]:
+        await _clients.pop(key).aclose()
+
+
+class AsyncKiwoomAPI:
+    """키움증권 Open REST API 비동기 클래스"""
+
+    def __init__(
+        self,
+        app_key: str,
+        secret_key: str,
+        account_no: str,
+        use_mock: bool = False,
+        priority: int = PRIORITY_INTERACTIVE
+    ):
+        """
+        Args:
+            app_key: 앱 키
+            secret_key: 시크릿 키
+            account_no: 계좌번호
+            use_mock: 모의투자 여부 (True: 모의투자, False: 실전투자)
+            priority: 요청 한도 대기열 우선순위 (기본: 화면 조회용 PRIORITY_INTERACTIVE)
+        """
+        self.app_key = app_key
+        self.secret_key = secret_key
+        self.account_no = account_no
+        self.base_url = resolve_base_url(use_mock)
+        self.priority = priority
+        # 동기 KiwoomAPI와 같은 (app_key, api_id) 요청 한도를 공유
+        self.rate_limiter = get_rate_limiter()
+        self.token_broker = KiwoomTokenBroker.get(app_key, secret_key, self.base_url)
+
+    async def get_access_token(self, force_refresh: bool = False) -> Optional[str]:
+        """
+        접근 토큰을 반환합니다.
+        유효한 공유 토큰이 있으면 바로 반환하고, 발급이 필요할 때만 스레드에서 브로커를 호출합니다.
+
+        Args:
+            force_refresh: True면 기존 토큰을 무시하고 새로 발급
+
+        Returns:
+            str: 접근 토큰, 실패시 None
+        """
+        if not force_refresh:
+            token = self.token_broker.peek_token()
+            if token:
+                return token
+        return await asyncio.to_thread(self.token_broker.get_token, force_refresh)
+
+    async def _make_request(
+        self,
+        endpoint: str,
+        api_id: str,
+        data: Dict[str, Any],
+        cont_yn: str = 'N',
+        next_key: str = '',
+        priority: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        API 요청을 수행합니다.
+
+        Args:
+            endpoint: API 엔드포인트 (예: '/api/dostk/acnt')
+            api_id: API ID (TR명, 예: 'ka10170')
+            data: 요청 데이터
+            cont_yn: 연속조회여부 ('N' 또는 'Y')
+            next_key: 연속조회키
+            priority: 요청 한도 대기열 우선순위 (None이면 인스턴스 기본값)
+
+        Returns:
+            dict: 응답 데이터, 실패시 None
+        """
+        token = await self.get_access_token()
+        if not token:
+            logger.error("유효한 토큰이 없습니다")
+            return None
+
+        headers = {
+            'Content-Type': 'application/json;charset=UTF-8',
+            'authorization': f'Bearer {token}',
+            'cont-yn': cont_yn,
+            'next-key': next_key,
+            'api-id': api_id,
+        }
+
+        client = get_async_client(self.base_url)
+        limiter_key = (self.app_key, api_id)
+        if priority is None:
+            priority = self.priority
+        metrics = get_metrics()
+
+        try:
+            auth_retried = False
+            throttle_retried = False
+            while True:
+                # 요청 한도 확인 (한도를 넘으면 실패하지 않고 차례를 기다림)
+                await self.rate_limiter.acquire_async(limiter_key, priority)
+                with measure('kiwoom', api_id, continuation=cont_yn == 'Y') as measurement:
+                    response = await client.post(endpoint, headers=headers, json=data)
+                    measurement.response(response)
+
+                # 토큰이 서버에서 만료/폐기된 경우 공유 토큰을 무효화하고 한 번만 재시도
+                if response.status_code == 401 and not auth_retried:
+                    auth_retried = True
+                    metrics.record_retry('kiwoom', api_id, 'auth')
+                    logger.warning(f"인증 오류(401), 토큰 재발급 후 재시도: {api_id}")
+                    self.token_broker.invalidate(token)
+                    token = await self.get_access_token()
+                    if not token:
+                        logger.error("유효한 토큰이 없습니다")
+                        return None
+                    headers['authorization'] = f'Bearer {token}'
+                    continue
+
+                # 서버 측 한도 초과: 버킷을 잠시 비우고 한 번만 재시도
+                if response.status_code == 429 and not throttle_retried:
+                    throttle_retried = True
+                    metrics.record_retry('kiwoom', api_id, 'throttle')
+                    self.rate_limiter.penalize(limiter_key, THROTTLE_BACKOFF_SEC)
+                    continue
+
+                break
+
+            response.raise_for_status()
+
+            result = response.json()
+
+            # 연속조회 정보는 응답 헤더로만 오므로 결과에 함께 담아 반환
+            if isinstance(result, dict):
+                result['cont-yn'] = response.headers.get('cont-yn', 'N')
+                result['next-key'] = response.headers.get('next-key', '')
+                if result.get('return_code', 0) != 0:
+                    metrics.record_error('kiwoom', api_id, f"return_code_{result.get('return_code')}")
+
+            logger.info(f"API 요청 성공: {api_id}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Response Body: {json.dumps(result, indent=4, ensure_ascii=False)}")
+
+            return result
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"API 요청 HTTP 오류: {api_id}, {e}")
+            logger.error(f"Response: {e.response.text}")
+            return None
+        except httpx.HTTPError as e:
+            logger.error(f"API 요청 HTTP 오류: {api_id}, {e}")
+            return None
+        except Exception as e:
+            logger.error(f"API 요청 실패: {api_id}, {e}")
+            return None
+
+    async def iter_pages(
+        self,
+        endpoint: str,
+        api_id: str,
+        data: Dict[str, Any],
+        max_pages: Optional[int] = None,
+        priority: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        연속조회(cont-yn/next-key)를 따라가며 응답을 한 페이지씩 반환합니다 (KiwoomAPI.iter_pages와 동일).
+
+        Args:
+            endpoint: API 엔드포인트
+            api_id: API ID (TR명)
+            data: 요청 데이터 (모든 페이지에 동일하게 전송)
+            max_pages: 최대 페이지 수 (None이면 마지막 페이지까지)
+            priority: 요청 한도 대기열 우선순위 (None이면 인스턴스 기본값)
+
+        Yields:
+            dict: 페이지별 응답 데이터 (return_code가 0이 아니거나 요청이 실패하면 중단)
+        """
+        cont_yn = 'N'
+        next_key = ''
+        page = 0
+
+        while max_pages is None or page < max_pages:
+            result = await self._make_request(
+                endpoint, api_id, data, cont_yn=cont_yn, next_key=next_key, priority=priority
+            )
+            if not result:
+                logger.error(f"연속조회 실패: {api_id}, {page + 1}페이지")
+                return
+            if result.get('return_code') != 0:
+                logger.error(f"연속조회 오류: {api_id}, {result.get('return_msg', 'Unknown error')}")
+                return
+
+            page += 1
+            yield result
+
+            next_key = result.get('next-key', '')
+            if result.get('cont-yn') != 'Y' or not next_key:
+                return
+            cont_yn = 'Y'
+
+        logger.info(f"연속조회 최대 페이지 도달: {api_id}, {max_pages}페이지")
+
+    async def get_daily_chart(
+        self,
+        stock_code: str,
+        base_dt: str = '',
+        upd_stkpc_tp: str = '1'
+    ) -> Optional[Dict[str, Any]]:
+        """
+        주식 일봉 차트 데이터를 조회합니다 (ka10081 API).
+
+        Args:
+            stock_code: 종목코드 (6자리, 예: '005930')
+            base_dt: 기준일자 YYYYMMDD (공백입력시 금일데이터)
+            upd_stkpc_tp: 수정주가구분 ('0': 미수정, '1': 수정, 기본값: '1')
+
+        Returns:
+            dict: 일봉 차트 데이터 (KiwoomAPI.get_daily_chart와 동일), 실패시 None
+        """
+        data = {
+            'stk_cd': stock_code,
+            'base_dt': base_dt,
+            'upd_stkpc_tp': upd_stkpc_tp,
+        }
+
+        result = await self._make_request('/api/dostk/chart', 'ka10081', data)
+
+        if not result:
+            logger.error(f"일봉 차트 조회 실패: {stock_code}")
+            return None
+
+        # 응답 검증
+        if result.get('return_code') != 0:
+            logger.error(f"일봉 차트 조회 오류: {result.get('return_msg', 'Unknown error')}")
+            return None
+
+        logger.info(f"일봉 차트 조회 성공: {stock_code} ({len(result.get('stk_dt_pole_chart_qry', []))}개 데이터)")
+        return result
+
+    async def iter_daily_chart(
+        self,
+        stock_code: str,
+        base_dt: str = '',
+        upd_stkpc_tp: str = '1',
+        max_pages: Optional[int] = None,
+        max_bars: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        일봉 차트(ka10081)를 연속조회로 과거 방향으로 따라가며 봉을 하나씩 반환합니다.
+
+        Args:
+            stock_code: 종목코드 (6자리)
+            base_dt: 기준일자 YYYYMMDD (공백입력시 금일데이터)
+            upd_stkpc_tp: 수정주가구분 ('0': 미수정, '1': 수정)
+            max_pages: 최대 페이지 수 (None이면 제한 없음)
+            max_bars: 최대 봉 개수 (None이면 제한 없음)
+
+        Yields:
+            dict: 일봉 데이터 (KiwoomAPI.iter_daily_chart와 동일, 최신순)
+        """
+        data = {
+            'stk_cd': stock_code,
+            'base_dt': base_dt,
+            'upd_stkpc_tp': upd_stkpc_tp,
+        }
+
+        count = 0
+        async for page in self.iter_pages('/api/dostk/chart', 'ka10081', data, max_pages=max_pages):
+            for bar in page.get('stk_dt_pole_chart_qry', []):
+                if max_bars is not None and count >= max_bars:
+                    return
+                count += 1
+                yield bar
+
+    async def fetch_daily_bars(
+        self,
+        stock_code: str,
+        since: Optional[date] = None,
+        max_bars: Optional[int] = None,
+        adjusted: bool = True
+    ) -> pd.DataFrame:
+        """
+        일봉을 표준 일봉 프레임으로 조회합니다 (lib.bar_store.refresh_bars_async의 fetch 함수).
+        KiwoomAPI.fetch_daily_bars와 동일합니다.
+
+        Args:
+            stock_code: 종목코드 (6자리)
+            since: 이 날짜까지 받으면 연속조회 중단 (None이면 max_bars개까지)
+            max_bars: 최대 봉 개수 (None이면 제한 없음)
+            adjusted: True면 수정주가, False면 원주가
+
+        Returns:
+            pd.DataFrame: 표준 일봉 프레임 (과거 → 최신)
+        """
+        since_ymd = since.strftime('%Y%m%d') if since is not None else None
+        rows = []
+        async for bar in self.iter_daily_chart(
+            stock_code, upd_stkpc_tp='1' if adjusted else '0', max_bars=max_bars
+        ):
+            rows.append(bar)
+            if since_ymd is not None and str(bar.get('dt', '')) <= since_ymd:
+                break
+        return kiwoom_daily_bars(rows)
+
+    async def iter_minute_chart(
+        self,
+        stock_code: str,
+        tic_scope: str = '1',
+        upd_stkpc_tp: str = '1',
+        max_pages: Optional[int] = None,
+        max_bars: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        분봉 차트(ka10080)를 연속조회로 과거 방향으로 따라가며 봉을 하나씩 반환합니다.
+        KiwoomAPI.iter_minute_chart와 동일합니다.
+
+        Args:
+            stock_code: 종목코드 (6자리)
+            tic_scope: 틱범위 (분, '1', '3', '5', '10', '15', '30', '45', '60')
+            upd_stkpc_tp: 수정주가구분 ('0': 미수정, '1': 수정)
+            max_pages: 최대 페이지 수 (None이면 제한 없음)
+            max_bars: 최대 봉 개수 (None이면 제한 없음)
+
+        Yields:
+            dict: 분봉 데이터 (stk_min_pole_chart_qry 항목, 최신순, cntr_tm: 'YYYYMMDDHHMMSS')
+        """
+        data = {
+            'stk_cd': stock_code,
+            'tic_scope': tic_scope,
+            'upd_stkpc_tp': upd_stkpc_tp,
+        }
+
+        count = 0
+        async for page in self.iter_pages('/api/dostk/chart', 'ka10080', data, max_pages=max_pages):
+            for bar in page.get('stk_min_pole_chart_qry', []):
+                if max_bars is not None and count >= max_bars:
+                    return
+                count += 1
+                yield bar
+
+    async def fetch_minute_bars(
+        self,
+        stock_code: str,
+        since: Optional[date] = None,
+        max_bars: Optional[int] = None,
+        adjusted: bool = True
+    ) -> pd.DataFrame:
+        """
+        1분봉을 표준 프레임으로 조회합니다 (분봉 저장소 refresh 함수의 fetch).
+        KiwoomAPI.fetch_minute_bars와 동일합니다.
+
+        Args:
+            stock_code: 종목코드 (6자리)
+            since: 이 날짜 이전 분봉을 받으면 연속조회 중단 (None이면 max_bars개까지)
+            max_bars: 최대 봉 개수 (None이면 제한 없음)
+            adjusted: True면 수정주가, False면 원주가
+
+        Returns:
+            pd.DataFrame: 표준 프레임 (과거 → 최신, date는 분봉 시각)
+        """
+        since_ymd = since.strftime('%Y%m%d') if since is not None else None
+        rows = []
+        async for bar in self.iter_minute_chart(
+            stock_code, upd_stkpc_tp='1' if adjusted else '0', max_bars=max_bars
+        ):
+            rows.append(bar)
+            if since_ymd is not None and str(bar.get('cntr_tm', ''))[:8] < since_ymd:
+                break
+        return kiwoom_minute_bars(rows)
+
+    async def get_account_evaluation(
+        self,
+        qry_tp: str = '0',
+        dmst_stex_tp: str = 'KRX'
+    ) -> Optional[Dict[str, Any]]:
+        """
+        계좌평가현황을 조회합니다 (kt00004 API).
+
+        Args:
+            qry_tp: 상장폐지조회구분 ('0': 전체, '1': 상장폐지종목제외)
+            dmst_stex_tp: 국내거래소구분 ('KRX': 한국거래소, 'NXT': 넥스트트레이드)
+
+        Returns:
+            dict: 계좌평가현황 데이터 (KiwoomAPI.get_account_evaluation과 동일), 실패시 None
+        """
+        data = {
+            'qry_tp': qry_tp,
+            'dmst_stex_tp': dmst_stex_tp,
+        }
+
+        result = await self._make_request('/api/dostk/acnt', 'kt00004', data)
+
+        if not result:
+            logger.error("계좌평가현황 조회 실패")
+            return None
+
+        # 응답 검증
+        if result.get('return_code') != 0:
+            logger.error(f"계좌평가현황 조회 오류: {result.get('return_msg', 'Unknown error')}")
+            return None
+
+        KiwoomAPI._normalize_account_evaluation(result)
+        return result
+
+    async def get_stocks_info(
+        self,
+        mrkt_tp: str = '0',
+        cont_yn: str = 'N',
+        next_key: str = ''
+    ) -> Optional[Dict[str, Any]]:
+        """
+        종목정보리스트를 조회합니다 (ka10099 API).
+
+        Args:
+            mrkt_tp: 시장구분 ('0': 코스피, '10': 코스닥 등)
+            cont_yn: 연속조회여부 ('N' 또는 'Y')
+            next_key: 연속조회키
+
+        Returns:
+            dict: 종목정보 데이터 (KiwoomAPI.get_stocks_info와 동일), 실패시 None
+        """
+        data = {
+            'mrkt_tp': mrkt_tp,
+        }
+
+        result = await self._make_request('/api/dostk/stkinfo', 'ka10099', data, cont_yn=cont_yn, next_key=next_key)
+
+        if not result:
+            logger.error(f"종목정보리스트 조회 실패: mrkt_tp={mrkt_tp}")
+            return None
+
+        # 응답 검증
+        if result.get('return_code') != 0:
+            logger.error(f"종목정보리스트 조회 오류: {result.get('return_msg', 'Unknown error')}")
+            return None
+
+        logger.info(f"종목정보리스트 조회 성공: 시장={mrkt_tp}, 조회된 종목 수={len(result.get('list', []))}")
+        return result
+
+    async def get_recent_trades(self, days: int = 5) -> List[Dict[str, Any]]:
+        """
+        최근 N일간의 매매(매수/매도) 데이터를 가져옵니다.
+        주말/KRX 휴장일은 건너뛰고, 남은 영업일은 동시에 조회하며, 지난 날짜는 KiwoomAPI와 같은 캐시를 재사용합니다.
+
+        Args:
+            days: 조회할 일수 (달력 기준, 기본값: 5일)
+
+        Returns:
+            list: 매매 데이터 리스트 (KiwoomAPI.get_recent_trades와 동일, 최신순)
+        """
+        trading_days = recent_trading_days(days)
+        all_trades, missing_days = KiwoomAPI._get_cached_trade_history(
+            self.app_key, self.account_no, trading_days
+        )
+
+        if missing_days:
+            logger.info(f"매매내역 조회 중: {len(missing_days)}일 (캐시 {len(trading_days) - len(missing_days)}일)")
+
+            # 동시 요청 수 제한 (실제 전송 속도는 rate_limiter가 제한)
+            semaphore = asyncio.Semaphore(TRADE_HISTORY_WORKERS)
+
+            async def fetch(ord_dt: str) -> List[Dict[str, Any]]:
+                async with semaphore:
+                    result = await self._make_request(
+                        '/api/dostk/acnt', 'kt00007', KiwoomAPI._build_trade_history_request(ord_dt)
+                    )
+                trades = KiwoomAPI._parse_trade_history(result, ord_dt)
+                KiwoomAPI._store_trade_history(self.app_key, self.account_no, ord_dt, result, trades)
+                return trades
+
+            for trades in await asyncio.gather(*(fetch(ord_dt) for ord_dt in missing_days)):
+                all_trades.extend(trades)
+
+        logger.info(f"총 {len(all_trades)}건의 매매내역 조회 완료")
+
+        # 최신순 정렬 (날짜시간 기준 내림차순)
+        all_trades.sort(key=lambda x: x['datetime'], reverse=True)
+
+        return all_trades
@@ -0,0 +1,239 @@
+"""
+키움증권 응답 컬럼 디코더
+
+차트(ka10081 stk_dt_pole_chart_qry, ka10080 stk_min_pole_chart_qry)와 조건검색(CNSRREQ data) 응답의 JSON 리스트를
+필드별 NumPy 컬럼으로 한 번에 변환합니다. 이후 변화율/이동평균/ATR 같은 계산은
+행(dict)마다 반복하지 않고 컬럼 단위 벡터 연산으로 처리합니다.
+- 가격/거래량: int64 ('+70000', '-00000100' 같은 부호/0 채움 문자열 처리)
+- 등락율: float64
+- 일자: datetime64[D] ('YYYYMMDD'), 분봉 시각: datetime64[s] ('YYYYMMDDHHMMSS')
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# ka10081 일봉 필드 → 컬럼명
+DAILY_CHART_FIELDS = {
+    'open': 'open_pric',
+    'high': 'high_pric',
+    'low': 'low_pric',
+    'close': 'cur_prc',
+    'volume': 'trde_qty',
+    'trade_amount': 'trde_prica',
+}
+
+# ka10080 분봉 필드 → 컬럼명 (거래대금 없음)
+MINUTE_CHART_FIELDS = {
+    'open': 'open_pric',
+    'high': 'high_pric',
+    'low': 'low_pric',
+    'close': 'cur_prc',
+    'volume': 'trde_qty',
+}
+
+# DataFrame 변환 시 컬럼명 (TechnicalAnalyzer 등 기존 분석 코드 형식)
+DATAFRAME_COLUMNS = {
+    'date': 'Date',
+    'open': 'Open',
+    'high': 'High',
+    'low': 'Low',
+    'close': 'Close',
+    'volume': 'Volume',
+}
+
+
+def _column(rows: Sequence[Dict[str, Any]], key: str) -> List[Any]:
+    """행 리스트에서 한 필드의 값 목록을 꺼냅니다."""
+    return [row.get(key) for row in rows]
+
+
+def parse_signed(values: Iterable[Any], dtype=np.int64) -> np.ndarray:
+    """
+    부호/0 채움 문자열을 숫자 배열로 변환합니다 ('-00000100' → -100, '+0.71' → 0.71).
+    빈 값이나 변환할 수 없는 값은 0으로 처리합니다.
+
+    Args:
+        values: 문자열(또는 숫자) 목록
+        dtype: 결과 dtype (np.int64, np.float64)
+
+    Returns:
+        np.ndarray: 변환된 배열
+    """
+    values = values if isinstance(values, (list, tuple)) else list(values)
+    cast = float if np.dtype(dtype).kind == 'f' else int
+    try:
+        # int()/float()는 부호, 앞자리 0, 앞뒤 공백을 처리하므로 정상 응답은 한 번에 변환됨
+        return np.array([cast(value or 0) for value in values], dtype=dtype)
+    except (ValueError, TypeError):
+        # 빈 문자열(공백)이나 잘못된 값이 섞인 드문 경우만 원소별로 처리
+        return np.array([_to_number(value) for value in values]).astype(dtype)
+
+
+def _to_number(value: Any) -> float:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def parse_unsigned(values: Iterable[Any], dtype=np.int64) -> np.ndarray:
+    """부호를 제거한 숫자 배열로 변환합니다 (키움은 현재가에 등락 부호를 붙여 보냄)."""
+    return np.abs(parse_signed(values, dtype=dtype))
+
+
+def parse_dates(values: Iterable[Any]) -> np.ndarray:
+    """
+    'YYYYMMDD' 문자열 배열을 datetime64[D] 배열로 변환합니다.
+
+    Args:
+        values: 'YYYYMMDD' 문자열 목록 (또는 parse_signed로 변환한 정수 배열)
+
+    Returns:
+        np.ndarray: datetime64[D] 배열
+    """
+    ymd = values if isinstance(values, np.ndarray) and values.dtype.kind == 'i' else parse_signed(values)
+    years = (ymd // 10000 - 1970).astype('datetime64[Y]')
+    months = (ymd // 100 % 100 - 1).astype('timedelta64[M]')
+    days = (ymd % 100 - 1).astype('timedelta64[D]')
+    return (years + months).astype('datetime64[D]') + days
+
+
+def decode_daily_chart(rows: List[Dict[str, Any]], oldest_first: bool = False) -> Dict[str, np.ndarray]:
+    """
+    일봉 차트 행 리스트(stk_dt_pole_chart_qry)를 컬럼으로 변환합니다.
+
+    Args:
+        rows: ka10081 응답의 stk_dt_pole_chart_qry 항목 (API 순서: 최신순)
+        oldest_first: True면 과거 → 최신 순으로 뒤집어 반환 (지표 계산용)
+
+    Returns:
+        dict: {
+            'date': datetime64[D] 배열,
+            'open', 'high', 'low', 'close', 'volume', 'trade_amount': int64 배열
+        }
+    """
+    ymd = parse_signed(_column(rows, 'dt'))
+    columns = {'date': parse_dates(ymd)}
+    for column, key in DAILY_CHART_FIELDS.items():
+        columns[column] = parse_unsigned(_column(rows, key))
+
+    # 일자가 없는 행은 제외
+    valid = ymd >= 19000101
+    if not valid.all():
+        logger.warning(f'일자가 없는 일봉 {int((~valid).sum())}개 제외')
+        columns = {column: values[valid] for column, values in columns.items()}
+
+    if oldest_first:
+        columns = {column: values[::-1] for column, values in columns.items()}
+    return columns
+
+
+def parse_timestamps(values: Iterable[Any]) -> np.ndarray:
+    """
+    'YYYYMMDDHHMMSS' 문자열 배열을 datetime64[s] 배열로 변환합니다.
+
+    Args:
+        values: 'YYYYMMDDHHMMSS' 문자열 목록 (또는 parse_signed로 변환한 정수 배열)
+
+    Returns:
+        np.ndarray: datetime64[s] 배열
+    """
+    stamps = values if isinstance(values, np.ndarray) and values.dtype.kind == 'i' else parse_signed(values)
+    hms = stamps % 1000000
+    seconds = hms // 10000 * 3600 + hms // 100 % 100 * 60 + hms % 100
+    return parse_dates(stamps // 1000000).astype('datetime64[s]') + seconds.astype('timedelta64[s]')
+
+
+def decode_minute_chart(rows: List[Dict[str, Any]], oldest_first: bool = False) -> Dict[str, np.ndarray]:
+    """
+    분봉 차트 행 리스트(stk_min_pole_chart_qry)를 컬럼으로 변환합니다.
+
+    Args:
+        rows: ka10080 응답의 stk_min_pole_chart_qry 항목 (API 순서: 최신순)
+        oldest_first: True면 과거 → 최신 순으로 뒤집어 반환
+
+    Returns:
+        dict: {
+            'date': datetime64[s] 배열 (체결시간),
+            'open', 'high', 'low', 'close', 'volume': int64 배열
+        }
+    """
+    stamps = parse_signed(_column(rows, 'cntr_tm'))
+    columns = {'date': parse_timestamps(stamps)}
+    for column, key in MINUTE_CHART_FIELDS.items():
+        columns[column] = parse_unsigned(_column(rows, key))
+
+    # 시각이 없는 행은 제외
+    valid = stamps >= 19000101000000
+    if not valid.all():
+        logger.warning(f'시각이 없는 분봉 {int((~valid).sum())}개 제외')
+        columns = {column: values[valid] for column, values in columns.items()}
+
+    if oldest_first:
+        columns = {column: values[::-1] for column, values in columns.items()}
+    return columns
+
+
+def decode_condition_results(rows: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    조건검색(CNSRREQ) 응답 data 리스트를 컬럼으로 변환합니다.
+
+    Args:
+        rows: CNSRREQ 응답의 data 항목
+
+    Returns:
+        dict: {
+            'stock_code': 종목코드 배열 ('A' 접두사 제거, 일반 조회는 9001, 실시간 등록 응답은 jmcode),
+            'stock_name': 종목명 배열 (302),
+            'current_price': 현재가 int64 배열 (10, 부호 제거),
+            'change_price': 전일대비 int64 배열 (11),
+            'change_rate': 등락율 float64 배열 (12),
+            'volume': 누적거래량 int64 배열 (13),
+            'status': 전일대비기호 배열 (25)
+        }
+    """
+    return {
+        'stock_code': np.array(
+            [str(row.get('9001') or row.get('jmcode') or '').strip().lstrip('A') for row in rows], dtype=str
+        ),
+        'stock_name': np.array([str(row.get('302', '')).strip() for row in rows], dtype=str),
+        'current_price': parse_unsigned(_column(rows, '10')),
+        'change_price': parse_signed(_column(rows, '11')),
+        'change_rate': parse_signed(_column(rows, '12'), dtype=np.float64),
+        'volume': parse_unsigned(_column(rows, '13')),
+        'status': np.array([str(row.get('25', '')).strip() for row in rows], dtype=str),
+    }
+
+
+def chart_to_dataframe(columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    decode_daily_chart 결과를 분석 코드에서 쓰는 Date/Open/High/Low/Close/Volume DataFrame으로 변환합니다.
+    컬럼 배열을 그대로 사용하므로 행 단위 변환이 없습니다.
+    """
+    return pd.DataFrame({
+        name: columns[column] for column, name in DATAFRAME_COLUMNS.items() if column in columns
+    })
+
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    과거 → 최신 순 배열의 단순 이동평균 (누적합 이용, 창이 다 차지 않은 앞부분은 NaN).
+
+    Args:
+        values: 값 배열 (과거 → 최신)
+        window: 이동평균 기간
+
+    Returns:
+        np.ndarray: float64 이동평균 배열 (values와 같은 길이)
+    """
+    result = np.full(len(values), np.nan)
+    if window <= 0 or len(values) < window:
+        return result
+    cumsum = np.cumsum(np.concatenate(([0.0], values.astype(np.float64))))
+    result[window - 1:] = (cumsum[window:] - cumsum[:-window]) / window
+    return result
@@ -0,0 +1,727 @@
+"""
+키움증권 REST/WebSocket 대역(stand-in) 서버
+
+실제 증권사 서버 없이 kiwoom.py / kiwoom_async.py / kiwoom_ws.py와 라우터 전체를
+부하 테스트하고 처리량/지연(p50/p95/p99)을 측정하기 위한 로컬 서버입니다.
+- REST: /oauth2/token, /api/dostk/chart, /api/dostk/acnt, /api/dostk/stkinfo
+- WebSocket: LOGIN/PING/CNSRLST/CNSRREQ/CNSRCLR, REG/REMOVE (실시간 체결 REAL '0B')
+- 응답 재생: fixtures 디렉터리의 rest.jsonl / websocket.jsonl 기록을 우선 사용하고,
+  기록이 없으면 형식이 같은 합성 데이터를 생성
+- 설정: 응답 지연(latency + jitter), (토큰, api-id)별 초당 요청 한도(초과 시 429),
+  연속조회(cont-yn/next-key) 페이지 크기/페이지 수
+- 기록: upstream을 지정하면 REST 요청을 실제 서버로 전달하고 응답을 rest.jsonl에 추가
+
+사용 예:
+    cd analyze
+    python -m lib.kiwoom_stub_server --port 18080 --ws-port 18081 --latency-ms 30 --rate-limit 5
+    export KIWOOM_BASE_URL=http://127.0.0.1:18080
+    export KIWOOM_WEBSOCKET_URL=ws://127.0.0.1:18081/api/dostk/websocket
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import hashlib
+import logging
+import argparse
+import threading
+from collections import Counter, defaultdict, deque
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import requests
+import websockets
+
+logger = logging.getLogger(__name__)
+
+REST_FIXTURE_FILE = 'rest.jsonl'
+WEBSOCKET_FIXTURE_FILE = 'websocket.jsonl'
+
+# 키움 서버의 요청 한도 초과 응답
+THROTTLED_RESPONSE = {'return_code': 5, 'return_msg': '허용된 요청 개수를 초과하였습니다'}
+UNAUTHORIZED_RESPONSE = {'return_code': 3, 'return_msg': '유효하지 않은 토큰입니다'}
+
+DEFAULT_CONDITIONS = [['0', '골든크로스'], ['1', '거래량급증'], ['2', '신고가']]
+
+# 합성 데이터에 쓰는 종목 (종목정보리스트/조건검색 결과/계좌평가)
+SAMPLE_STOCKS = [
+    ('005930', '삼성전자'), ('000660', 'SK하이닉스'), ('035420', 'NAVER'), ('035720', '카카오'),
+    ('005380', '현대차'), ('051910', 'LG화학'), ('006400', '삼성SDI'), ('068270', '셀트리온'),
+]
+
+
+def _seed(*parts: Any) -> int:
+    """요청 내용으로 정해지는 난수 시드 (같은 요청은 항상 같은 합성 데이터)"""
+    return int(hashlib.md5('|'.join(str(part) for part in parts).encode()).hexdigest()[:8], 16)
+
+
+def _fixture_key(api_id: str, body: Dict[str, Any], next_key: str) -> str:
+    return f"{api_id}|{json.dumps(body, sort_keys=True, ensure_ascii=False)}|{next_key}"
+
+
+class StubFixtures:
+    """
+    기록된 응답 저장소 (JSONL)
+
+    rest.jsonl 한 줄:
+        {"path": "/api/dostk/chart", "api_id": "ka10081", "request": {...}, "next_key": "",
+         "response": {...}, "headers": {"cont-yn": "Y", "next-key": "..."}}
+    websocket.jsonl 한 줄:
+        {"trnm": "CNSRLST", "response": {...}}
+        {"trnm": "CNSRREQ", "seq": "0", "response": {...}}
+    """
+
+    def __init__(self, fixtures_dir: Optional[str] = None):
+        self.fixtures_dir = fixtures_dir
+        self._exact: Dict[str, Tuple[Dict[str, Any], Dict[str, str]]] = {}
+        self._by_api: Dict[Tuple[str, str], Tuple[Dict[str, Any], Dict[str, str]]] = {}
+        self._websocket: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if fixtures_dir:
+            self._load()
+
+    def _load(self):
+        for entry in self._read_lines(REST_FIXTURE_FILE):
+            self._add_rest(entry)
+        for entry in self._read_lines(WEBSOCKET_FIXTURE_FILE):
+            seq = entry.get('seq')
+            self._websocket[(entry.get('trnm'), None if seq is None else str(seq))] = entry.get('response', {})
+        logger.info(f"대역 서버 기록 로드: REST {len(self._exact)}건, WebSocket {len(self._websocket)}건")
+
+    def _read_lines(self, filename: str) -> List[Dict[str, Any]]:
+        path = os.path.join(self.fixtures_dir, filename)
+        if not os.path.exists(path):
+            return []
+        entries = []
+        with open(path, encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    logger.warning(f"기록 파싱 실패 (무시): {path}:{line_no}")
+        return entries
+
+    def _add_rest(self, entry: Dict[str, Any]):
+        api_id = entry.get('api_id', '')
+        next_key = entry.get('next_key', '')
+        value = (entry.get('response', {}), entry.get('headers', {}))
+        self._exact[_fixture_key(api_id, entry.get('request', {}), next_key)] = value
+        # 요청 본문이 다르더라도 같은 TR/페이지면 재생 (예: 한 종목 기록으로 여러 종목 부하 테스트)
+        self._by_api.setdefault((api_id, next_key), value)
+
+    def find_rest(
+        self,
+        api_id: str,
+        body: Dict[str, Any],
+        next_key: str
+    ) -> Optional[Tuple[Dict[str, Any], Dict[str, str]]]:
+        """기록된 REST 응답을 찾습니다 (본문까지 같은 기록 → 같은 TR/페이지 기록 순)."""
+        with self._lock:
+            return self._exact.get(_fixture_key(api_id, body, next_key)) or self._by_api.get((api_id, next_key))
+
+    def find_websocket(self, trnm: str, seq: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """기록된 WebSocket 응답을 찾습니다."""
+        return self._websocket.get((trnm, seq)) or self._websocket.get((trnm, None))
+
+    def record_rest(
+        self,
+        path: str,
+        api_id: str,
+        body: Dict[str, Any],
+        next_key: str,
+        response: Dict[str, Any],
+        headers: Dict[str, str],
+        record_dir: str
+    ):
+        """실제 서버 응답을 rest.jsonl에 추가하고 바로 재생에도 사용합니다."""
+        entry = {
+            'path': path, 'api_id': api_id, 'request': body, 'next_key': next_key,
+            'response': response, 'headers': headers,
+        }
+        os.makedirs(record_dir, exist_ok=True)
+        with self._lock:
+            with open(os.path.join(record_dir, REST_FIXTURE_FILE), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._add_rest(entry)
+
+
+class KiwoomStubServer:
+    """
+    키움증권 REST/WebSocket 대역 서버
+
+    REST는 스레드 HTTP 서버(HTTP/1.1 keep-alive), WebSocket은 전용 이벤트 루프 스레드에서 실행합니다.
+    start()/stop()으로 테스트나 벤치마크 안에서 띄우거나, 모듈을 직접 실행해 별도 프로세스로 띄웁니다.
+    """
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        ws_port: int = 0,
+        fixtures_dir: Optional[str] = None,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        rate_limit: int = 0,
+        page_size: int = 100,
+        pages: int = 3,
+        tick_interval: float = 1.0,
+        ping_interval: float = 30.0,
+        upstream: Optional[str] = None,
+        record_dir: Optional[str] = None,
+    ):
+        """
+        Args:
+            host: 바인딩 주소
+            port: REST 포트 (0이면 빈 포트 자동 선택)
+            ws_port: WebSocket 포트 (0이면 빈 포트 자동 선택)
+            fixtures_dir: 기록(rest.jsonl, websocket.jsonl) 디렉터리 (None이면 합성 데이터만 사용)
+            latency_ms: 모든 응답에 더할 지연 (밀리초)
+            jitter_ms: 지연에 더할 0~jitter_ms 무작위 지연 (밀리초)
+            rate_limit: (토큰, api-id)별 초당 최대 요청 수 (0이면 제한 없음, 초과 시 429)
+            page_size: 합성 데이터 한 페이지의 항목 수
+            pages: 합성 데이터 연속조회 페이지 수
+            tick_interval: 실시간 체결/조건검색 이벤트 전송 간격 (초)
+            ping_interval: 서버 PING 전송 간격 (초)
+            upstream: 기록 모드에서 요청을 전달할 실제 서버 URL (예: 'https://mockapi.kiwoom.com')
+            record_dir: 기록 저장 디렉터리 (None이면 fixtures_dir)
+        """
+        self.host = host
+        self.port = port
+        self.ws_port = ws_port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit
+        self.page_size = page_size
+        self.pages = pages
+        self.tick_interval = tick_interval
+        self.ping_interval = ping_interval
+        self.upstream = upstream.rstrip('/') if upstream else None
+        self.record_dir = record_dir or fixtures_dir
+        self.fixtures = StubFixtures(fixtures_dir)
+
+        self.stats: Counter = Counter()
+        self._tokens: Dict[str, datetime] = {}
+        self._windows: Dict[Tuple[str, str], Deque[float]] = defaultdict(deque)
+        self._lock = threading.Lock()
+
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._http_thread: Optional[threading.Thread] = None
+        self._ws_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ws_thread: Optional[threading.Thread] = None
+        self._ws_server = None
+
+    # ------------------------------------------------------------------
+    # 시작/종료
+    # ------------------------------------------------------------------
+
+    def start(self) -> 'KiwoomStubServer':
+        """REST/WebSocket 서버를 백그라운드 스레드에서 시작합니다."""
+        self._httpd = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._http_thread = threading.Thread(
+            target=self._httpd.serve_forever, name='kiwoom-stub-http', daemon=True
+        )
+        self._http_thread.start()
+
+        self._ws_loop = asyncio.new_event_loop()
+        self._ws_thread = threading.Thread(target=self._ws_loop.run_forever, name='kiwoom-stub-ws', daemon=True)
+        self._ws_thread.start()
+        asyncio.run_coroutine_threadsafe(self._start_websocket(), self._ws_loop).result(10)
+
+        logger.info(f"키움 대역 서버 시작: REST {self.base_url}, WebSocket {self.websocket_url}")
+        return self
+
+    async def _start_websocket(self):
+        self._ws_server = await websockets.serve(self._ws_handler, self.host, self.ws_port)
+        self.ws_port = self._ws_server.sockets[0].getsockname()[1]
+
+    def stop(self):
+        """서버를 종료합니다."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self._ws_loop is not None:
+            asyncio.run_coroutine_threadsafe(self._stop_websocket(), self._ws_loop).result(10)
+            self._ws_loop.call_soon_threadsafe(self._ws_loop.stop)
+            self._ws_thread.join(5)
+            self._ws_loop.close()
+            self._ws_loop = None
+        logger.info("키움 대역 서버 종료")
+
+    async def _stop_websocket(self):
+        self._ws_server.close()
+        await self._ws_server.wait_closed()
+
+    def __enter__(self) -> 'KiwoomStubServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        """REST 기본 URL (KIWOOM_BASE_URL로 사용)"""
+        return f'http://{self.host}:{self.port}'
+
+    @property
+    def websocket_url(self) -> str:
+        """WebSocket URL (KIWOOM_WEBSOCKET_URL로 사용)"""
+        return f'ws://{self.host}:{self.ws_port}/api/dostk/websocket'
+
+    def env(self) -> Dict[str, str]:
+        """클라이언트가 이 서버를 쓰도록 설정할 환경변수"""
+        return {'KIWOOM_BASE_URL': self.base_url, 'KIWOOM_WEBSOCKET_URL': self.websocket_url}
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _delay(self) -> float:
+        """응답 지연 시간 (초)"""
+        jitter = random.uniform(0, self.jitter_ms) if self.jitter_ms > 0 else 0.0
+        return (self.latency_ms + jitter) / 1000
+
+    # ------------------------------------------------------------------
+    # REST
+    # ------------------------------------------------------------------
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive (클라이언트 커넥션 풀 재사용)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def do_HEAD(self):
+                # http_session.warmup_sessions의 연결 예열
+                self._send(200, None, {})
+
+            def do_GET(self):
+                if self.path.rstrip('/') == '/stub/stats':
+                    with server._lock:
+                        stats = dict(server.stats)
+                    self._send(200, stats, {})
+                else:
+                    self._send(404, {'return_code': 1, 'return_msg': 'not found'}, {})
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length) if length else b''
+                try:
+                    body = json.loads(raw) if raw else {}
+                except ValueError:
+                    self._send(400, {'return_code': 1, 'return_msg': 'invalid json'}, {})
+                    return
+                status, response, headers = server.handle_rest(self.path, dict(self.headers), body)
+                delay = server._delay()
+                if delay > 0:
+                    time.sleep(delay)
+                self._send(status, response, headers)
+
+            def _send(self, status: int, response: Optional[Dict[str, Any]], headers: Dict[str, str]):
+                payload = b'' if response is None else json.dumps(response, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json;charset=UTF-8')
+                self.send_header('Content-Length', str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                if payload:
+                    self.wfile.write(payload)
+
+        return Handler
+
+    def handle_rest(
+        self,
+        path: str,
+        headers: Dict[str, str],
+        body: Dict[str, Any]
+    ) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        """
+        REST 요청 하나를 처리합니다.
+
+        Returns:
+            tuple: (HTTP 상태 코드, 응답 본문, 응답 헤더)
+        """
+        headers = {key.lower(): value for key, value in headers.items()}
+        api_id = headers.get('api-id', '')
+        next_key = headers.get('next-key', '') if headers.get('cont-yn') == 'Y' else ''
+        self._count('requests')
+        self._count(f'rest:{api_id or path}')
+
+        if self.upstream:
+            return self._proxy(path, headers, body, api_id, next_key)
+
+        if path == '/oauth2/token':
+            return 200, self._issue_token(body), {}
+
+        token = headers.get('authorization', '')[len('Bearer '):]
+        if not self._token_valid(token):
+            self._count('unauthorized')
+            return 401, UNAUTHORIZED_RESPONSE, {}
+
+        if self.rate_limit and not self._allow(token, api_id):
+            self._count('throttled')
+            return 429, THROTTLED_RESPONSE, {}
+
+        recorded = self.fixtures.find_rest(api_id, body, next_key)
+        if recorded is not None:
+            self._count('replayed')
+            response, response_headers = recorded
+            return 200, response, {'api-id': api_id, **response_headers}
+
+        generator = _SYNTHETIC_RESPONSES.get(api_id)
+        if generator is None:
+            return 200, {'return_code': 1, 'return_msg': f'지원하지 않는 api-id: {api_id}'}, {'api-id': api_id}
+
+        page = int(next_key) if next_key.isdigit() else 0
+        response = generator(self, body, page)
+        response.setdefault('return_code', 0)
+        response.setdefault('return_msg', '정상적으로 처리되었습니다')
+        has_next = response.pop('_has_next', False)
+        return 200, response, {
+            'api-id': api_id,
+            'cont-yn': 'Y' if has_next else 'N',
+            'next-key': str(page + 1) if has_next else '',
+        }
+
+    def _issue_token(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        if not body.get('appkey') or not body.get('secretkey'):
+            return {'return_code': 1, 'return_msg': 'appkey/secretkey가 없습니다'}
+        token = uuid.uuid4().hex
+        expires_at = datetime.now() + timedelta(hours=24)
+        with self._lock:
+            self._tokens[token] = expires_at
+        self._count('tokens_issued')
+        return {
+            'token': token,
+            'token_type': 'bearer',
+            'expires_dt': expires_at.strftime('%Y%m%d%H%M%S'),
+            'return_code': 0,
+            'return_msg': '정상적으로 처리되었습니다',
+        }
+
+    def _token_valid(self, token: str) -> bool:
+        with self._lock:
+            expires_at = self._tokens.get(token)
+        return expires_at is not None and expires_at > datetime.now()
+
+    def revoke_tokens(self):
+        """발급한 토큰을 모두 폐기합니다 (서버 측 토큰 만료 상황 재현)."""
+        with self._lock:
+            self._tokens.clear()
+
+    def _allow(self, token: str, api_id: str) -> bool:
+        """(토큰, api-id)별 최근 1초 요청 수가 한도 안인지 확인하고 기록합니다."""
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows[(token, api_id)]
+            while window and now - window[0] >= 1.0:
+                window.popleft()
+            if len(window) >= self.rate_limit:
+                return False
+            window.append(now)
+            return True
+
+    def _proxy(
+        self,
+        path: str,
+        headers: Dict[str, str],
+        body: Dict[str, Any],
+        api_id: str,
+        next_key: str
+    ) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        """기록 모드: 실제 서버로 전달하고 정상 응답을 기록합니다 (토큰 발급은 기록하지 않음)."""
+        forward = {key: value for key, value in headers.items()
+                   if key in ('content-type', 'authorization', 'cont-yn', 'next-key', 'api-id')}
+        try:
+            response = requests.post(self.upstream + path, headers=forward, json=body, timeout=10)
+            result = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"기록 모드 전달 실패: {path}, {e}")
+            return 502, {'return_code': 1, 'return_msg': str(e)}, {}
+
+        response_headers = {key: response.headers[key] for key in ('cont-yn', 'next-key') if key in response.headers}
+        if path != '/oauth2/token' and response.status_code == 200 and self.record_dir:
+            self.fixtures.record_rest(path, api_id, body, next_key, result, response_headers, self.record_dir)
+            self._count('recorded')
+        return response.status_code, result, {'api-id': api_id, **response_headers}
+
+    # ------------------------------------------------------------------
+    # 합성 응답 (기록이 없을 때)
+    # ------------------------------------------------------------------
+
+    def _daily_chart(self, body: Dict[str, Any], page: int) -> Dict[str, Any]:
+        """ka10081 일봉: 기준일부터 과거 방향으로 page_size개씩 (최신순)"""
+        stock_code = body.get('stk_cd', '005930')
+        base_dt = body.get('base_dt') or datetime.now().strftime('%Y%m%d')
+        day = datetime.strptime(base_dt, '%Y%m%d') - timedelta(days=page * self.page_size)
+        rng = random.Random(_seed(stock_code, base_dt, page))
+        price = 10000 + _seed(stock_code) % 90000
+
+        rows = []
+        for _ in range(self.page_size):
+            close = max(100, int(price * (1 + rng.uniform(-0.03, 0.03))))
+            high = int(close * (1 + rng.uniform(0, 0.02)))
+            low = int(close * (1 - rng.uniform(0, 0.02)))
+            volume = rng.randint(10000, 5000000)
+            rows.append({
+                'dt': day.strftime('%Y%m%d'),
+                'open_pric': str(rng.randint(low, high)),
+                'high_pric': str(high),
+                'low_pric': str(low),
+                'cur_prc': str(close),
+                'trde_qty': str(volume),
+                'trde_prica': str(close * volume // 1000000),
+            })
+            day -= timedelta(days=1)
+        return {'stk_cd': stock_code, 'stk_dt_pole_chart_qry': rows, '_has_next': page + 1 < self.pages}
+
+    def _stocks_info(self, body: Dict[str, Any], page: int) -> Dict[str, Any]:
+        """ka10099 종목정보리스트: 시장별 page_size개씩"""
+        market = body.get('mrkt_tp', '0')
+        rows = []
+        for index in range(page * self.page_size, (page + 1) * self.page_size):
+            code, name = SAMPLE_STOCKS[index] if index < len(SAMPLE_STOCKS) else (f'{900000 + index:06d}', f'종목{index}')
+            rows.append({
+                'code': code, 'name': name, 'listCount': '0000000100000000', 'auditInfo': '정상',
+                'regDay': '20000101', 'lastPrice': f'{10000 + index:08d}', 'state': '증거금20%',
+                'marketCode': market, 'marketName': '코스닥' if market == '10' else '거래소',
+                'upName': '', 'upSizeName': '', 'companyClassName': '', 'orderWarning': '0', 'nxtEnable': 'Y',
+            })
+        return {'list': rows, '_has_next': page + 1 < self.pages}
+
+    def _account_evaluation(self, body: Dict[str, Any], page: int) -> Dict[str, Any]:
+        """kt00004 계좌평가현황"""
+        holdings = []
+        for index, (code, name) in enumerate(SAMPLE_STOCKS[:3]):
+            quantity, avg_price, price = 10 * (index + 1), 50000 + index * 10000, 52000 + index * 9000
+            holdings.append({
+                'stk_cd': f'A{code}', 'stk_nm': name, 'rmnd_qty': str(quantity),
+                'avg_prc': str(avg_price), 'cur_prc': str(price),
+                'evlt_amt': str(quantity * price), 'pl_amt': str(quantity * (price - avg_price)),
+                'pl_rt': f'{(price - avg_price) / avg_price * 100:.4f}', 'pur_amt': str(quantity * avg_price),
+            })
+        total_purchase = sum(int(item['pur_amt']) for item in holdings)
+        total_eval = sum(int(item['evlt_amt']) for item in holdings)
+        return {
+            'acnt_nm': '대역서버', 'brch_nm': '로컬', 'tot_est_amt': str(total_eval),
+            'aset_evlt_amt': str(total_eval + 1000000), 'tot_pur_amt': str(total_purchase),
+            'prsm_dpst_aset_amt': '1000000', 'tdy_lspft_amt': '0', 'lspft_amt': str(total_eval - total_purchase),
+            'tdy_lspft_rt': '0.00', 'lspft_rt': f'{(total_eval - total_purchase) / total_purchase * 100:.2f}',
+            'stk_acnt_evlt_prst': holdings,
+        }
+
+    def _trade_history(self, body: Dict[str, Any], page: int) -> Dict[str, Any]:
+        """kt00007 계좌별주문체결내역상세: 주문일자마다 매수/매도 한 건씩"""
+        ord_dt = body.get('ord_dt', '')
+        code, name = SAMPLE_STOCKS[_seed(ord_dt) % len(SAMPLE_STOCKS)]
+        return {'acnt_ord_cntr_prps_dtl': [
+            {'ord_no': f'{ord_dt[-4:]}01', 'stk_cd': f'A{code}', 'stk_nm': name, 'io_tp_nm': '현금매수',
+             'cntr_qty': '10', 'cntr_uv': '50000', 'cnfm_tm': '09:30:00', 'ord_tm': '09:29:58'},
+            {'ord_no': f'{ord_dt[-4:]}02', 'stk_cd': f'A{code}', 'stk_nm': name, 'io_tp_nm': '현금매도',
+             'cntr_qty': '10', 'cntr_uv': '51000', 'cnfm_tm': '14:10:00', 'ord_tm': '14:09:58'},
+        ]}
+
+    def _trading_diary(self, body: Dict[str, Any], page: int) -> Dict[str, Any]:
+        """ka10170 당일매매일지"""
+        return {
+            'tot_sell_amt': '510000', 'tot_buy_amt': '500000', 'tot_pl_amt': '10000', 'tot_prft_rt': '2.00',
+            'tdy_trde_diary': [{'stk_nm': '삼성전자', 'stk_cd': 'A005930', 'buy_avg_pric': '50000',
+                                'buy_qty': '10', 'sel_avg_pric': '51000', 'sell_qty': '10', 'pl_amt': '10000'}],
+        }
+
+    # ------------------------------------------------------------------
+    # WebSocket
+    # ------------------------------------------------------------------
+
+    async def _ws_handler(self, websocket):
+        """연결 하나의 LOGIN/PING/CNSRLST/CNSRREQ/CNSRCLR/REG/REMOVE 처리"""
+        self._count('ws_connections')
+        tasks: Dict[str, asyncio.Task] = {}  # 조건식 ID/'REG' → 실시간 이벤트 전송 태스크
+        registered: set = set()
+        logged_in = False
+
+        async def reply(message: Dict[str, Any]):
+            delay = self._delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await websocket.send(json.dumps(message, ensure_ascii=False))
+
+        try:
+            async for raw in websocket:
+                try:
+                    message = json.loads(raw)
+                except ValueError:
+                    continue
+                trnm = message.get('trnm')
+                self._count(f'ws:{trnm}')
+
+                if trnm == 'PING':
+                    continue  # 클라이언트가 되돌려 보낸 PING
+
+                if trnm == 'LOGIN':
+                    logged_in = self.upstream is not None or self._token_valid(message.get('token', ''))
+                    if not logged_in:
+                        self._count('unauthorized')
+                        await reply({'trnm': 'LOGIN', 'return_code': 1, 'return_msg': UNAUTHORIZED_RESPONSE['return_msg']})
+                        await websocket.close()
+                        return
+                    await reply({'trnm': 'LOGIN', 'return_code': 0, 'return_msg': ''})
+                    tasks['PING'] = asyncio.create_task(self._send_pings(websocket))
+                    continue
+
+                if not logged_in:
+                    await reply({'trnm': trnm, 'return_code': 1, 'return_msg': '로그인이 필요합니다'})
+                    continue
+
+                if trnm == 'CNSRLST':
+                    recorded = self.fixtures.find_websocket('CNSRLST')
+                    await reply(recorded or {'trnm': 'CNSRLST', 'return_code': 0, 'return_msg': '', 'data': DEFAULT_CONDITIONS})
+
+                elif trnm == 'CNSRREQ':
+                    seq = str(message.get('seq', '')).strip()
+                    response = dict(self.fixtures.find_websocket('CNSRREQ', seq) or self._condition_results(seq))
+                    response['seq'] = seq
+                    await reply(response)
+                    if message.get('search_type') == '1':
+                        if seq in tasks:
+                            tasks.pop(seq).cancel()
+                        tasks[seq] = asyncio.create_task(self._send_condition_events(websocket, seq))
+
+                elif trnm == 'CNSRCLR':
+                    seq = str(message.get('seq', '')).strip()
+                    if seq in tasks:
+                        tasks.pop(seq).cancel()
+                    await reply({'trnm': 'CNSRCLR', 'seq': seq, 'return_code': 0, 'return_msg': ''})
+
+                elif trnm in ('REG', 'REMOVE'):
+                    for group in message.get('data', []):
+                        if '0B' in group.get('type', []):
+                            codes = {str(code).lstrip('A') for code in group.get('item', [])}
+                            registered = registered | codes if trnm == 'REG' else registered - codes
+                    await reply({'trnm': trnm, 'return_code': 0, 'return_msg': ''})
+                    if 'REG' in tasks:
+                        tasks.pop('REG').cancel()
+                    if registered:
+                        tasks['REG'] = asyncio.create_task(self._send_trade_ticks(websocket, set(registered)))
+
+                else:
+                    await reply({'trnm': trnm, 'return_code': 1, 'return_msg': f'지원하지 않는 trnm: {trnm}'})
+
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+    def _condition_results(self, seq: str) -> Dict[str, Any]:
+        """CNSRREQ 합성 결과: 조건식 ID로 정해지는 종목 몇 개"""
+        rng = random.Random(_seed('CNSRREQ', seq))
+        rows = []
+        for code, name in rng.sample(SAMPLE_STOCKS, 4):
+            price = rng.randint(10000, 200000)
+            change = rng.randint(-3000, 3000)
+            rows.append({
+                '9001': f'A{code}', '302': name, '10': f'{"+" if change >= 0 else "-"}{price:08d}',
+                '11': f'{change:+d}', '12': f'{change / price * 100:+.2f}', '13': str(rng.randint(1000, 900000)),
+                '25': '2' if change > 0 else '5' if change < 0 else '3',
+            })
+        return {'trnm': 'CNSRREQ', 'return_code': 0, 'return_msg': '', 'cont_yn': 'N', 'next_key': '', 'data': rows}
+
+    async def _send_pings(self, websocket):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await websocket.send(json.dumps({'trnm': 'PING'}))
+
+    async def _send_condition_events(self, websocket, seq: str):
+        """실시간 조건검색 편입/이탈 이벤트 (REAL type '02')"""
+        rng = random.Random(_seed('REAL02', seq))
+        while True:
+            await asyncio.sleep(self.tick_interval)
+            code, _ = rng.choice(SAMPLE_STOCKS)
+            await websocket.send(json.dumps({'trnm': 'REAL', 'data': [{
+                'type': '02', 'name': '조건검색', 'item': f'A{code}',
+                'values': {'841': seq, '9001': f'A{code}', '843': rng.choice(['I', 'D']),
+                           '20': datetime.now().strftime('%H%M%S'), '907': ''},
+            }]}))
+            self._count('ws_events')
+
+    async def _send_trade_ticks(self, websocket, codes: set):
+        """등록 종목의 실시간 체결 (REAL type '0B')"""
+        prices = {code: 10000 + _seed(code) % 90000 for code in codes}
+        volumes = dict.fromkeys(codes, 0)
+        rng = random.Random()
+        while True:
+            data = []
+            for code in sorted(codes):
+                prices[code] = max(100, prices[code] + rng.randint(-5, 5) * 10)
+                trade_volume = rng.randint(1, 500)
+                volumes[code] += trade_volume
+                change = prices[code] - (10000 + _seed(code) % 90000)
+                data.append({'type': '0B', 'name': '주식체결', 'item': code, 'values': {
+                    '10': f'{"+" if change >= 0 else "-"}{prices[code]}', '11': f'{change:+d}',
+                    '12': f'{change / prices[code] * 100:+.2f}', '13': str(volumes[code]),
+                    '15': f'+{trade_volume}', '20': datetime.now().strftime('%H%M%S'),
+                }})
+            await websocket.send(json.dumps({'trnm': 'REAL', 'data': data}))
+            self._count('ws_ticks', len(data))
+            await asyncio.sleep(self.tick_interval)
+
+
+_SYNTHETIC_RESPONSES = {
+    'ka10081': KiwoomStubServer._daily_chart,
+    'ka10099': KiwoomStubServer._stocks_info,
+    'kt00004': KiwoomStubServer._account_evaluation,
+    'kt00007': KiwoomStubServer._trade_history,
+    'ka10170': KiwoomStubServer._trading_diary,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='키움증권 REST/WebSocket 대역 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=18080, help='REST 포트')
+    parser.add_argument('--ws-port', type=int, default=18081, help='WebSocket 포트')
+    parser.add_argument('--fixtures', help='기록 디렉터리 (rest.jsonl, websocket.jsonl)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='응답 지연 (밀리초)')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='무작위 추가 지연 상한 (밀리초)')
+    parser.add_argument('--rate-limit', type=int, default=0, help='(토큰, api-id)별 초당 요청 한도 (0: 제한 없음)')
+    parser.add_argument('--page-size', type=int, default=100, help='합성 데이터 페이지 크기')
+    parser.add_argument('--pages', type=int, default=3, help='합성 데이터 연속조회 페이지 수')
+    parser.add_argument('--tick-interval', type=float, default=1.0, help='실시간 이벤트 간격 (초)')
+    parser.add_argument('--upstream', help='기록 모드: 요청을 전달할 실제 서버 (예: https://mockapi.kiwoom.com)')
+    parser.add_argument('--record-dir', help='기록 저장 디렉터리 (기본: --fixtures)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = KiwoomStubServer(
+        host=args.host, port=args.port, ws_port=args.ws_port, fixtures_dir=args.fixtures,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, rate_limit=args.rate_limit,
+        page_size=args.page_size, pages=args.pages, tick_interval=args.tick_interval,
+        upstream=args.upstream, record_dir=args.record_dir,
+    ).start()
+
+    for key, value in server.env().items():
+        print(f'export {key}={value}')
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,631 @@
+"""
+키움증권 WebSocket 세션 관리자
+
+앱 키마다 인증된 WebSocket 연결 하나를 백그라운드 이벤트 루프에서 계속 유지하고,
+요청마다 (trnm, seq) 키로 Future를 등록해 응답이 도착하는 즉시 돌려줍니다.
+- 고정 대기(sleep)나 폴링 없이 LOGIN/CNSRLST/CNSRREQ 응답을 기다림
+- 서버의 PING은 수신 태스크가 바로 되돌려 보냄
+- 연결이 끊기면 대기 중인 요청을 실패 처리하고, 다음 요청 때 다시 연결/로그인
+- 실시간 데이터(REAL)는 등록한 리스너로 전달
+- 조건식 목록(CNSRLST)은 세션마다 TTL 동안 캐시
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+import concurrent.futures
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import websockets
+
+try:
+    from .kiwoom_decoder import parse_signed, parse_unsigned
+    from .metrics import measure
+except ImportError:  # analyze/lib를 sys.path에 직접 추가해 'kiwoom_ws'로 임포트한 경우
+    from kiwoom_decoder import parse_signed, parse_unsigned
+    from metrics import measure
+
+logger = logging.getLogger(__name__)
+
+REAL_WEBSOCKET_URL = 'wss://api.kiwoom.com:10000/api/dostk/websocket'
+MOCK_WEBSOCKET_URL = 'wss://mockapi.kiwoom.com:10000/api/dostk/websocket'
+
+
+def resolve_websocket_url(use_mock: bool = False) -> str:
+    """
+    WebSocket 서버 URL을 반환합니다.
+    KIWOOM_WEBSOCKET_URL 환경변수가 있으면 그 값을 사용합니다 (예: 로컬 대역 서버 lib.kiwoom_stub_server).
+    """
+    return os.getenv('KIWOOM_WEBSOCKET_URL') or (MOCK_WEBSOCKET_URL if use_mock else REAL_WEBSOCKET_URL)
+
+
+LOGIN_TIMEOUT = 10.0           # 로그인 응답 대기 시간 (초)
+REQUEST_TIMEOUT = 20.0         # 일반 요청 응답 대기 시간 (초)
+REALTIME_REQUEST_TIMEOUT = 30.0  # 실시간 조건검색 등록 응답 대기 시간 (초)
+
+# 조건식 목록 캐시 유지 시간 (초, KIWOOM_CONDITION_CATALOG_TTL_SEC 환경변수로 변경)
+CONDITION_CATALOG_TTL = float(os.getenv('KIWOOM_CONDITION_CATALOG_TTL_SEC', '600'))
+
+# 응답을 seq(조건식 ID)로 구분하는 요청
+_SEQ_KEYED_TRNM = {'CNSRREQ', 'CNSRCLR'}
+
+# 모든 세션이 공유하는 백그라운드 이벤트 루프 (동기 코드와 여러 이벤트 루프에서 같은 연결을 쓰기 위함)
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """WebSocket 세션 전용 백그라운드 이벤트 루프를 반환합니다 (없으면 데몬 스레드로 시작)."""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='kiwoom-websocket', daemon=True)
+                thread.start()
+                _loop = loop
+    return _loop
+
+
+def _response_key(trnm: Optional[str], seq: Any = None) -> Tuple[Optional[str], Optional[str]]:
+    """응답을 기다리는 Future를 찾을 키 ((trnm, seq), seq는 조건식 요청에만 사용)"""
+    if trnm in _SEQ_KEYED_TRNM and seq is not None:
+        return trnm, str(seq).strip()
+    return trnm, None
+
+
+class KiwoomWebSocketSession:
+    """
+    앱 키별로 공유하는 키움증권 WebSocket 세션
+
+    코루틴은 모두 백그라운드 루프에서 실행되며, 다른 스레드/이벤트 루프에서는
+    call() (동기) 또는 acall() (비동기)로 호출합니다.
+    """
+
+    _sessions: Dict[Tuple[str, str], 'KiwoomWebSocketSession'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, token_broker, websocket_url: str):
+        """
+        Args:
+            token_broker: 접근 토큰 브로커 (get_token/invalidate 제공, 예: KiwoomTokenBroker)
+            websocket_url: WebSocket 서버 URL
+        """
+        self.token_broker = token_broker
+        self.websocket_url = websocket_url
+        self.websocket = None
+        self.connected = False
+        self.conditions_loaded = False  # 현재 연결에서 CNSRLST를 조회했는지 여부
+        self.catalog_ttl = CONDITION_CATALOG_TTL
+
+        # 조건식 목록 캐시 (연결이 바뀌어도 유지, TTL이 지나거나 invalidate하면 다시 조회)
+        self._catalog: Optional[List[List[str]]] = None
+        self._catalog_loaded_at = 0.0
+
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._conditions_lock: Optional[asyncio.Lock] = None
+        self._disconnected: Optional[asyncio.Event] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._login_future: Optional[asyncio.Future] = None
+        self._pending: Dict[Tuple[Optional[str], Optional[str]], Deque[asyncio.Future]] = {}
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    @classmethod
+    def get(cls, token_broker, use_mock: bool = False) -> 'KiwoomWebSocketSession':
+        """
+        앱 키와 서버(실전/모의)에 해당하는 공유 세션을 반환합니다 (없으면 생성).
+
+        Args:
+            token_broker: 접근 토큰 브로커
+            use_mock: 모의투자 여부
+
+        Returns:
+            KiwoomWebSocketSession: 공유 세션
+        """
+        websocket_url = resolve_websocket_url(use_mock)
+        key = (token_broker.app_key, websocket_url)
+        session = cls._sessions.get(key)
+        if session is None:
+            with cls._registry_lock:
+                session = cls._sessions.get(key)
+                if session is None:
+                    session = cls(token_broker, websocket_url)
+                    cls._sessions[key] = session
+        return session
+
+    # ------------------------------------------------------------------
+    # 다른 스레드/이벤트 루프에서 호출
+    # ------------------------------------------------------------------
+
+    def call(self, coro: Awaitable, timeout: Optional[float] = None):
+        """코루틴을 세션 루프에서 실행하고 결과를 기다립니다 (동기 코드용)."""
+        return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result(timeout)
+
+    def submit(self, coro: Awaitable) -> 'concurrent.futures.Future':
+        """코루틴을 세션 루프에서 실행하도록 예약하고 바로 반환합니다 (오래 실행되는 구독 작업용)."""
+        return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+    async def acall(self, coro: Awaitable):
+        """코루틴을 세션 루프에서 실행하고 결과를 기다립니다 (다른 이벤트 루프의 비동기 코드용)."""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, _get_loop()))
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """
+        실시간 데이터(REAL 등 요청과 짝이 없는 메시지) 수신 콜백을 등록합니다.
+        콜백은 세션 루프에서 호출되므로 오래 걸리는 작업을 하면 안 됩니다.
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """등록한 실시간 데이터 콜백을 제거합니다."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    # ------------------------------------------------------------------
+    # 세션 루프에서 실행되는 코루틴
+    # ------------------------------------------------------------------
+
+    async def ensure_connected(self):
+        """연결/로그인이 되어 있지 않으면 연결하고 로그인 응답까지 기다립니다."""
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+
+        async with self._connect_lock:
+            if self.connected:
+                return
+
+            for attempt in range(2):
+                token = await asyncio.to_thread(self.token_broker.get_token)
+                if not token:
+                    raise ConnectionError("유효한 토큰이 없습니다")
+
+                self.websocket = await websockets.connect(self.websocket_url)
+                self._login_future = asyncio.get_running_loop().create_future()
+                self._reader_task = asyncio.create_task(self._read_messages(self.websocket))
+
+                try:
+                    logger.info('WebSocket 로그인 패킷을 전송합니다')
+                    await self.websocket.send(json.dumps({'trnm': 'LOGIN', 'token': token}))
+                    response = await asyncio.wait_for(self._login_future, LOGIN_TIMEOUT)
+                except BaseException:
+                    await self._close_socket()
+                    raise
+
+                if response.get('return_code') == 0:
+                    self.connected = True
+                    self.conditions_loaded = False
+                    self._disconnected = asyncio.Event()
+                    logger.info(f'WebSocket 로그인 성공: {self.websocket_url}')
+                    return
+
+                # 토큰이 서버에서 만료/폐기된 경우 한 번만 재발급 후 재시도
+                logger.error(f'WebSocket 로그인 실패: {response.get("return_msg")}')
+                await self._close_socket()
+                if attempt == 0:
+                    self.token_broker.invalidate(token)
+
+            raise ConnectionError("WebSocket 로그인 실패")
+
+    async def request(
+        self,
+        message: Dict[str, Any],
+        timeout: float = REQUEST_TIMEOUT
+    ) -> Dict[str, Any]:
+        """
+        메시지를 보내고 짝이 맞는 응답(trnm, seq)이 올 때까지 기다립니다.
+
+        Args:
+            message: 요청 메시지 (trnm 필수, 조건식 요청은 seq 포함)
+            timeout: 응답 대기 시간 (초)
+
+        Returns:
+            dict: 응답 메시지
+
+        Raises:
+            asyncio.TimeoutError: timeout 안에 응답이 오지 않은 경우
+            ConnectionError: 연결/로그인 실패 또는 대기 중 연결이 끊긴 경우
+        """
+        await self.ensure_connected()
+
+        key = _response_key(message.get('trnm'), message.get('seq'))
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._pending.setdefault(key, deque())
+        waiters.append(future)
+
+        payload = json.dumps(message)
+        try:
+            with measure('kiwoom_ws', message.get('trnm')) as measurement:
+                measurement.request_bytes = len(payload)
+                await self.websocket.send(payload)
+                logger.debug(f'메시지 전송: {message}')
+                return await asyncio.wait_for(future, timeout)
+        finally:
+            if future in waiters:
+                waiters.remove(future)
+
+    async def send(self, message: Dict[str, Any]):
+        """응답을 기다리지 않는 메시지를 보냅니다 (예: 실시간 등록 REG)."""
+        await self.ensure_connected()
+        await self.websocket.send(json.dumps(message))
+        logger.debug(f'메시지 전송: {message}')
+
+    async def request_condition_list(self) -> Optional[List[List[str]]]:
+        """
+        조건 검색 목록을 조회합니다 (CNSRLST).
+
+        Returns:
+            list: 조건 검색 목록 [['0', '조건1'], ['1', '조건2'], ...], 실패시 None
+        """
+        try:
+            response = await self.request({'trnm': 'CNSRLST'})
+        except asyncio.TimeoutError:
+            logger.error("조건 검색 목록 조회 타임아웃")
+            return None
+        except Exception as e:
+            logger.error(f"조건 검색 목록 조회 실패: {e}")
+            return None
+
+        if response.get('return_code') != 0:
+            logger.error(f"조건 검색 목록 조회 오류: {response.get('return_msg', 'Unknown error')}")
+            return None
+
+        self.conditions_loaded = True
+        condition_list = response.get('data', [])
+        self._catalog = condition_list
+        self._catalog_loaded_at = time.monotonic()
+        logger.info(f"조건 검색 목록 조회 성공: 총 {len(condition_list)}개")
+        return condition_list
+
+    async def get_condition_catalog(self, force_refresh: bool = False) -> Optional[List[List[str]]]:
+        """
+        조건식 목록을 반환합니다. TTL 안에 조회한 목록이 있으면 서버에 요청하지 않습니다.
+
+        Args:
+            force_refresh: True면 캐시를 무시하고 CNSRLST로 다시 조회
+
+        Returns:
+            list: 조건 검색 목록 [['0', '조건1'], ...], 실패시 None
+        """
+        if not force_refresh and self.catalog_fresh:
+            return self._catalog
+
+        if self._conditions_lock is None:
+            self._conditions_lock = asyncio.Lock()
+        async with self._conditions_lock:
+            # 기다리는 동안 다른 요청이 조회했으면 그 결과 사용
+            if not force_refresh and self.catalog_fresh:
+                return self._catalog
+            return await self.request_condition_list()
+
+    @property
+    def catalog_fresh(self) -> bool:
+        """조건식 목록 캐시가 TTL 안에 있는지 여부"""
+        return self._catalog is not None and time.monotonic() - self._catalog_loaded_at < self.catalog_ttl
+
+    def invalidate_condition_catalog(self):
+        """조건식 목록 캐시를 비웁니다 (다음 조회에서 CNSRLST 요청)."""
+        self._catalog = None
+        self._catalog_loaded_at = 0.0
+
+    async def request_condition_search(
+        self,
+        condition_id: str,
+        search_type: str = '0',
+        stock_exchange_type: str = 'K',
+        cont_yn: str = 'N',
+        next_key: str = ''
+    ) -> Optional[Dict[str, Any]]:
+        """
+        조건식으로 종목을 검색합니다 (CNSRREQ).
+        인자와 반환값은 KiwoomWebSocketClient.request_condition_search와 같습니다.
+        """
+        try:
+            # CNSRREQ 전에 CNSRLST를 먼저 호출해야 하는 경우가 있으므로 연결마다 한 번 조회
+            await self.ensure_connected()
+            if not self.conditions_loaded:
+                if self._conditions_lock is None:
+                    self._conditions_lock = asyncio.Lock()
+                async with self._conditions_lock:
+                    if not self.conditions_loaded:
+                        await self.request_condition_list()
+
+            if search_type == '1':
+                # 실시간 조회 (ka10173): stex_tp 없음
+                request_param = {
+                    'trnm': 'CNSRREQ',
+                    'seq': condition_id,
+                    'search_type': '1',
+                }
+                timeout = REALTIME_REQUEST_TIMEOUT
+                logger.info(f"조건 검색 요청 시작 (실시간): condition_id={condition_id}")
+            else:
+                # 일반 조회 (ka10172): stex_tp, cont_yn, next_key 포함
+                request_param = {
+                    'trnm': 'CNSRREQ',
+                    'seq': condition_id,
+                    'search_type': '0',
+                    'stex_tp': stock_exchange_type,
+                    'cont_yn': cont_yn,
+                    'next_key': next_key,
+                }
+                timeout = REQUEST_TIMEOUT
+                logger.info(f"조건 검색 요청 시작 (일반): condition_id={condition_id}, stex_tp={stock_exchange_type}")
+
+            response = await self.request(request_param, timeout=timeout)
+
+        except asyncio.TimeoutError:
+            logger.error(f"조건 검색 요청 타임아웃: condition_id={condition_id}")
+            return None
+        except Exception as e:
+            logger.error(f"조건 검색 요청 실패: {e}", exc_info=True)
+            return None
+
+        if response.get('return_code') != 0:
+            logger.error(f"조건 검색 요청 오류: {response.get('return_msg', 'Unknown error')}")
+            return None
+
+        logger.info(f"조건 검색 결과: 조건식 {condition_id}, 총 {len(response.get('data', []))}개 종목")
+        return response
+
+    async def request_condition_searches(
+        self,
+        condition_ids: List[str],
+        search_type: str = '0',
+        stock_exchange_type: str = 'K'
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        여러 조건식을 한 연결에서 한 번에 검색합니다.
+        CNSRREQ를 응답을 기다리지 않고 연달아 보내고, 응답은 seq(조건식 ID)로 짝을 맞춰 모읍니다.
+
+        Args:
+            condition_ids: 조건식 ID 목록 (중복은 한 번만 요청)
+            search_type: 조회 타입 ('0': 일반, '1': 실시간)
+            stock_exchange_type: 거래소 구분 (일반 조회만 사용)
+
+        Returns:
+            dict: {조건식 ID: request_condition_search 응답 (실패시 None)}
+        """
+        condition_ids = list(dict.fromkeys(str(condition_id).strip() for condition_id in condition_ids))
+        responses = await asyncio.gather(*[
+            self.request_condition_search(
+                condition_id, search_type=search_type, stock_exchange_type=stock_exchange_type
+            )
+            for condition_id in condition_ids
+        ])
+        return dict(zip(condition_ids, responses))
+
+    async def request_condition_clear(self, condition_id: str) -> bool:
+        """
+        실시간 조건검색 등록을 해제합니다 (CNSRCLR).
+
+        Args:
+            condition_id: 조건식 ID
+
+        Returns:
+            bool: 해제 성공 여부
+        """
+        try:
+            response = await self.request({'trnm': 'CNSRCLR', 'seq': condition_id})
+        except Exception as e:
+            logger.error(f"조건 검색 실시간 해제 실패: condition_id={condition_id}, {e}")
+            return False
+
+        if response.get('return_code') != 0:
+            logger.error(f"조건 검색 실시간 해제 오류: {response.get('return_msg', 'Unknown error')}")
+            return False
+        return True
+
+    async def close(self):
+        """연결을 닫고 대기 중인 요청을 실패 처리합니다."""
+        await self._close_socket()
+        logger.info('WebSocket 세션을 종료했습니다')
+
+    async def _close_socket(self):
+        self._mark_disconnected()
+        websocket, self.websocket = self.websocket, None
+        if websocket is not None:
+            await websocket.close()
+        if self._reader_task is not None and self._reader_task is not asyncio.current_task():
+            self._reader_task.cancel()
+        self._reader_task = None
+        self._fail_pending(ConnectionError("WebSocket 연결이 종료되었습니다"))
+
+    def _mark_disconnected(self):
+        self.connected = False
+        if self._disconnected is not None:
+            self._disconnected.set()
+
+    async def wait_disconnected(self):
+        """현재 연결이 끊어질 때까지 기다립니다 (연결되어 있지 않으면 바로 반환)."""
+        if self.connected and self._disconnected is not None:
+            await self._disconnected.wait()
+
+    def _fail_pending(self, error: Exception):
+        """대기 중인 모든 요청(로그인 포함)을 error로 실패 처리합니다."""
+        if self._login_future is not None and not self._login_future.done():
+            self._login_future.set_exception(error)
+        for waiters in self._pending.values():
+            while waiters:
+                future = waiters.popleft()
+                if not future.done():
+                    future.set_exception(error)
+
+    async def _read_messages(self, websocket):
+        """수신 태스크: 응답을 기다리는 Future에 전달하고, PING에 응답하고, 실시간 데이터를 리스너로 보냅니다."""
+        try:
+            async for raw in websocket:
+                try:
+                    response = json.loads(raw)
+                except ValueError:
+                    logger.warning(f'WebSocket 메시지 파싱 실패: {raw!r}')
+                    continue
+
+                trnm = response.get('trnm')
+
+                if trnm == 'PING':
+                    # PING을 받으면 그대로 다시 보내기
+                    await websocket.send(raw)
+                    continue
+
+                if trnm == 'LOGIN':
+                    if self._login_future is not None and not self._login_future.done():
+                        self._login_future.set_result(response)
+                    continue
+
+                waiters = self._pending.get(_response_key(trnm, response.get('seq')))
+                while waiters:
+                    future = waiters.popleft()
+                    if not future.done():
+                        future.set_result(response)
+                        break
+                else:
+                    self._dispatch(response)
+
+        except websockets.ConnectionClosed:
+            logger.warning('WebSocket 연결이 서버에 의해 종료됨')
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            logger.error(f'WebSocket 메시지 수신 오류: {e}')
+
+        # 연결이 끊기면 다음 요청에서 다시 연결
+        if websocket is self.websocket:
+            self._mark_disconnected()
+            self.websocket = None
+            self._reader_task = None
+            self._fail_pending(ConnectionError("WebSocket 연결이 끊어졌습니다"))
+
+    def _dispatch(self, message: Dict[str, Any]):
+        """요청과 짝이 없는 메시지(실시간 데이터 등)를 리스너로 전달합니다."""
+        if not self._listeners:
+            logger.debug(f"WebSocket 메시지 [{message.get('trnm')}]: {message}")
+            return
+        for callback in list(self._listeners):
+            try:
+                callback(message)
+            except Exception as e:
+                logger.error(f'WebSocket 리스너 오류: {e}', exc_info=True)
+
+
+def parse_condition_events(message: Dict[str, Any]) -> List[Dict[str, str]]:
+    """
+    실시간 조건검색(REAL, type '02') 메시지에서 편입/이탈 이벤트를 추출합니다.
+
+    Args:
+        message: WebSocket 수신 메시지
+
+    Returns:
+        list: 이벤트 리스트 (조건검색 실시간 데이터가 아니면 빈 리스트)
+        [
+            {
+                'condition_id': '7',       # 조건식 ID (841)
+                'stock_code': '005930',    # 종목코드 (9001, 'A' 접두사 제거)
+                'action': 'I',             # 'I': 편입, 'D': 이탈 (843)
+                'time': '152028'           # 체결시간 (20)
+            },
+            ...
+        ]
+    """
+    if message.get('trnm') != 'REAL':
+        return []
+
+    events = []
+    for item in message.get('data') or []:
+        if item.get('type') != '02':
+            continue
+        values = item.get('values') or {}
+        stock_code = str(values.get('9001') or item.get('item') or '').strip()
+        if stock_code.startswith('A'):
+            stock_code = stock_code[1:]
+        action = str(values.get('843', '')).strip()
+        condition_id = str(values.get('841', '')).strip()
+        if not stock_code or not condition_id or action not in ('I', 'D'):
+            logger.debug(f'실시간 조건검색 데이터 무시: {item}')
+            continue
+        events.append({
+            'condition_id': condition_id,
+            'stock_code': stock_code,
+            'action': action,
+            'time': str(values.get('20', '')).strip(),
+        })
+    return events
+
+
+def parse_trade_ticks(message: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    실시간 주식체결(REAL, type '0B') 메시지에서 체결 데이터를 추출합니다.
+
+    Args:
+        message: WebSocket 수신 메시지
+
+    Returns:
+        list: 체결 리스트 (주식체결 실시간 데이터가 아니면 빈 리스트)
+        [
+            {
+                'stock_code': '005930',    # 종목코드 (item, 'A' 접두사 제거)
+                'current_price': 70000,    # 현재가 (10, 부호 제거)
+                'change_price': -500,      # 전일대비 (11)
+                'change_rate': -0.71,      # 등락율 (12)
+                'volume': 1234567,         # 누적거래량 (13)
+                'trade_volume': 10,        # 체결 거래량 (15, 부호 제거)
+                'trade_time': '093012'     # 체결시간 (20)
+            },
+            ...
+        ]
+    """
+    if message.get('trnm') != 'REAL':
+        return []
+
+    rows = []
+    for item in message.get('data') or []:
+        if item.get('type') != '0B':
+            continue
+        stock_code = str(item.get('item') or '').strip()
+        if stock_code.startswith('A'):
+            stock_code = stock_code[1:]
+        rows.append((stock_code, item))
+    if not rows:
+        return []
+
+    # 메시지 하나에 여러 종목 체결이 묶여 오므로 필드별로 한 번에 변환 (kiwoom_decoder와 같은 규칙)
+    values = [item.get('values') or {} for _, item in rows]
+    current_prices = parse_unsigned([v.get('10') for v in values]).tolist()
+    change_prices = parse_signed([v.get('11') for v in values]).tolist()
+    change_rates = parse_signed([v.get('12') for v in values], dtype=float).tolist()
+    volumes = parse_unsigned([v.get('13') for v in values]).tolist()
+    trade_volumes = parse_unsigned([v.get('15') for v in values]).tolist()
+
+    ticks = []
+    for i, (stock_code, item) in enumerate(rows):
+        if not stock_code or not current_prices[i]:
+            logger.debug(f'실시간 체결 데이터 무시: {item}')
+            continue
+        ticks.append({
+            'stock_code': stock_code,
+            'current_price': current_prices[i],
+            'change_price': change_prices[i],
+            'change_rate': change_rates[i],
+            'volume': volumes[i],
+            'trade_volume': trade_volumes[i],
+            'trade_time': str(values[i].get('20', '')).strip(),
+        })
+    return ticks
+
+
+def close_websocket_sessions(timeout: float = 5.0):
+    """모든 WebSocket 세션을 닫습니다 (애플리케이션 종료 시 호출)."""
+    if _loop is None:
+        return
+    with KiwoomWebSocketSession._registry_lock:
+        sessions = list(KiwoomWebSocketSession._sessions.values())
+        KiwoomWebSocketSession._sessions.clear()
+    for session in sessions:
+        try:
+            session.call(session.close(), timeout=timeout)
+        except Exception as e:
+            logger.warning(f'WebSocket 세션 종료 실패 (무시): {e}')
@@ -0,0 +1,128 @@
+"""
+한국거래소(KRX) 영업일 달력
+
+주말과 KRX 휴장일에는 체결/시세 데이터가 없으므로, 일자별 조회 전에 이 달력으로 걸러 불필요한 API 호출을 줄입니다.
+휴장일은 연도별로 직접 관리하며, 임시 휴장일은 KRX_EXTRA_HOLIDAYS 환경변수(YYYYMMDD, 쉼표 구분)로 추가할 수 있습니다.
+휴장일 표가 없는 연도는 주말만 휴장으로 보므로, 그런 날짜를 조회하면 연도마다 한 번 경고를 남깁니다.
+"""
+
+import os
+import logging
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Union
+
+# KRX 휴장일 (주말 제외, 대체공휴일/선거일/연말 휴장일 포함)
+KRX_HOLIDAYS = {
+    # 2024
+    '20240101', '20240209', '20240212', '20240301', '20240410', '20240501', '20240506',
+    '20240515', '20240606', '20240815', '20240916', '20240917', '20240918', '20241001',
+    '20241003', '20241009', '20241225', '20241231',
+    # 2025
+    '20250101', '20250127', '20250128', '20250129', '20250130', '20250303', '20250501',
+    '20250505', '20250506', '20250603', '20250606', '20250815', '20251003', '20251006',
+    '20251007', '20251008', '20251009', '20251225', '20251231',
+    # 2026
+    '20260101', '20260216', '20260217', '20260218', '20260302', '20260501', '20260505',
+    '20260525', '20260603', '20260817', '20260924', '20260925', '20261005', '20261009',
+    '20261225', '20261231',
+    # 2027
+    '20270101', '20270208', '20270209', '20270301', '20270505', '20270513', '20270816',
+    '20270914', '20270915', '20270916', '20271004', '20271011', '20271227', '20271231',
+}
+
+# 휴장일 표의 마지막 연도 (이후 날짜는 주말만 휴장으로 판단)
+KRX_HOLIDAYS_LAST_YEAR = max(int(day[:4]) for day in KRX_HOLIDAYS)
+
+# 임시 휴장일 추가 (예: KRX_EXTRA_HOLIDAYS=20261002,20261230)
+KRX_HOLIDAYS.update(
+    day.strip() for day in os.getenv('KRX_EXTRA_HOLIDAYS', '').split(',') if day.strip()
+)
+
+
+logger = logging.getLogger(__name__)
+
+# 휴장일 표 범위를 벗어나 경고한 연도
+_warned_years = set()
+
+
+def _to_date(day: Union[date, datetime, str]) -> date:
+    """date/datetime/'YYYYMMDD' 문자열을 date로 변환합니다."""
+    if isinstance(day, datetime):
+        return day.date()
+    if isinstance(day, date):
+        return day
+    return datetime.strptime(day, '%Y%m%d').date()
+
+
+def is_trading_day(day: Union[date, datetime, str]) -> bool:
+    """
+    KRX 영업일 여부를 반환합니다.
+
+    Args:
+        day: 확인할 날짜 (date, datetime 또는 'YYYYMMDD')
+
+    Returns:
+        bool: 주말/휴장일이 아니면 True
+    """
+    day = _to_date(day)
+    if day.year > KRX_HOLIDAYS_LAST_YEAR and day.year not in _warned_years:
+        _warned_years.add(day.year)
+        logger.warning(
+            f"KRX 휴장일 표는 {KRX_HOLIDAYS_LAST_YEAR}년까지만 있어 {day.year}년은 주말만 휴장으로 판단합니다 "
+            f"(lib/krx_calendar.py에 휴장일 추가 필요, 임시로 KRX_EXTRA_HOLIDAYS 사용 가능)"
+        )
+    return day.weekday() < 5 and day.strftime('%Y%m%d') not in KRX_HOLIDAYS
+
+
+def recent_trading_days(days: int, end: Optional[Union[date, datetime, str]] = None) -> List[str]:
+    """
+    end부터 과거 방향으로 days일(달력 기준) 안에 있는 영업일 목록을 반환합니다.
+
+    Args:
+        days: 조회할 달력 일수 (end 포함)
+        end: 기준일 (None이면 오늘)
+
+    Returns:
+        list: 영업일 'YYYYMMDD' 리스트 (최신순)
+    """
+    end = _to_date(end) if end is not None else date.today()
+    trading_days = []
+    for i in range(days):
+        day = end - timedelta(days=i)
+        if is_trading_day(day):
+            trading_days.append(day.strftime('%Y%m%d'))
+    return trading_days
+
+
+def previous_trading_day(day: Optional[Union[date, datetime, str]] = None) -> str:
+    """
+    day 이전(당일 제외)의 가장 최근 영업일을 반환합니다.
+
+    Args:
+        day: 기준일 (None이면 오늘)
+
+    Returns:
+        str: 영업일 'YYYYMMDD'
+    """
+    day = _to_date(day) if day is not None else date.today()
+    day -= timedelta(days=1)
+    while not is_trading_day(day):
+        day -= timedelta(days=1)
+    return day.strftime('%Y%m%d')
+
+
+def next_trading_day(day: Optional[Union[date, datetime, str]] = None) -> str:
+    """
+    day 이후(당일 제외)의 가장 가까운 영업일을 반환합니다.
+
+    Args:
+        day: 기준일 (None이면 오늘)
+
+    Returns:
+        str: 영업일 'YYYYMMDD'
+    """
+    day = _to_date(day) if day is not None else date.today()
+    day += timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return day.strftime('%Y%m%d')
@@ -0,0 +1,234 @@
+"""
+증권사 API 호출 계측
+
+키움(REST/WebSocket), 한국투자증권(KIS), 네이버 금융 호출을 (provider, api_id) 단위로 집계합니다.
+- 지연 히스토그램 (고정 구간, p50/p95/p99 추정)
+- 요청/응답 바이트 수
+- 재시도(401 토큰 재발급, 429 한도 초과) / 연속조회 횟수
+- 토큰 발급 횟수, 오류 코드 (HTTP 상태, return_code, 예외 종류)
+기록은 락 안에서 숫자 몇 개를 더하는 정도라 요청 경로에 부담이 거의 없고,
+백엔드 /api/metrics에서 총 소요 시간이 큰 TR 순서로 조회합니다.
+"""
+
+import time
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+# 지연 히스토그램 구간 상한 (밀리초, 마지막 구간은 그 이상)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class _Series:
+    """(provider, api_id) 하나의 누적 통계 (BrokerMetrics의 락 안에서만 접근)"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.continuations = 0
+        self.retries: Counter = Counter()
+        self.error_codes: Counter = Counter()
+
+    def observe(self, latency_ms: float):
+        self.count += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+        for index, upper in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= upper:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """히스토그램에서 추정한 분위수 (해당 구간의 상한, 마지막 구간은 최댓값)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return float(LATENCY_BUCKETS_MS[index]) if index < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'total_ms': round(self.total_ms, 1),
+            'avg_ms': round(self.total_ms / self.count, 1) if self.count else None,
+            'max_ms': round(self.max_ms, 1),
+            'p50_ms': self.quantile(0.50),
+            'p95_ms': self.quantile(0.95),
+            'p99_ms': self.quantile(0.99),
+            'histogram': {
+                **{f'le_{upper}': count for upper, count in zip(LATENCY_BUCKETS_MS, self.buckets)},
+                'inf': self.buckets[-1],
+            },
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+            'continuations': self.continuations,
+            'retries': dict(self.retries),
+            'error_codes': dict(self.error_codes),
+        }
+
+
+class BrokerMetrics:
+    """증권사 API 호출 통계 수집기"""
+
+    def __init__(self):
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._token_refreshes: Counter = Counter()
+        self._lock = threading.Lock()
+        self.started_at = datetime.now()
+
+    def _get(self, provider: str, api_id: str) -> _Series:
+        key = (provider, api_id or 'unknown')
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+        return series
+
+    def observe(
+        self,
+        provider: str,
+        api_id: str,
+        latency: float,
+        status: Optional[int] = None,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+        continuation: bool = False
+    ):
+        """
+        요청 한 건(한 번의 HTTP 왕복)을 기록합니다.
+
+        Args:
+            provider: 'kiwoom', 'kiwoom_ws', 'kis', 'naver'
+            api_id: TR명 (키움 api-id, KIS tr_id, WebSocket trnm 등)
+            latency: 소요 시간 (초)
+            status: HTTP 상태 코드 (400 이상이면 오류로 집계)
+            request_bytes: 요청 본문 크기
+            response_bytes: 응답 본문 크기
+            continuation: 연속조회(cont-yn=Y) 요청 여부
+        """
+        with self._lock:
+            series = self._get(provider, api_id)
+            series.observe(latency * 1000)
+            series.request_bytes += request_bytes
+            series.response_bytes += response_bytes
+            if continuation:
+                series.continuations += 1
+            if status is not None and status >= 400:
+                series.errors += 1
+                series.error_codes[f'http_{status}'] += 1
+
+    def record_error(self, provider: str, api_id: str, code: Any):
+        """응답 오류 코드(return_code, rt_cd)나 예외 종류를 기록합니다."""
+        with self._lock:
+            series = self._get(provider, api_id)
+            series.errors += 1
+            series.error_codes[str(code)] += 1
+
+    def record_retry(self, provider: str, api_id: str, reason: str):
+        """재시도를 기록합니다 (reason: 'auth', 'throttle' 등)."""
+        with self._lock:
+            self._get(provider, api_id).retries[reason] += 1
+
+    def record_token_refresh(self, provider: str):
+        """접근 토큰 발급을 기록합니다."""
+        with self._lock:
+            self._token_refreshes[provider] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        현재까지의 통계를 반환합니다.
+
+        Returns:
+            dict: {
+                'since': 집계 시작 시각,
+                'token_refreshes': {provider: 발급 횟수},
+                'calls': {'provider:api_id': {...}}  # 총 소요 시간이 큰 순서
+            }
+        """
+        with self._lock:
+            calls = sorted(self._series.items(), key=lambda item: item[1].total_ms, reverse=True)
+            return {
+                'since': self.started_at.isoformat(),
+                'token_refreshes': dict(self._token_refreshes),
+                'calls': {f'{provider}:{api_id}': series.to_dict() for (provider, api_id), series in calls},
+            }
+
+    def reset(self):
+        """통계를 초기화합니다."""
+        with self._lock:
+            self._series.clear()
+            self._token_refreshes.clear()
+            self.started_at = datetime.now()
+
+
+class _Measurement:
+    """measure()가 반환하는 컨텍스트 매니저"""
+
+    def __init__(self, provider: str, api_id: str, continuation: bool = False):
+        self.provider = provider
+        self.api_id = api_id
+        self.continuation = continuation
+        self.status: Optional[int] = None
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def response(self, response):
+        """requests/httpx 응답에서 상태 코드와 바이트 수를 읽습니다 (없는 속성은 건너뜀)."""
+        self.status = getattr(response, 'status_code', None)
+        self.response_bytes = len(getattr(response, 'content', None) or b'')
+        request = getattr(response, 'request', None)
+        body = getattr(request, 'body', None) if request is not None else None
+        if body is None and request is not None and hasattr(request, 'content'):
+            body = request.content
+        self.request_bytes = len(body or b'')
+
+    def __enter__(self) -> '_Measurement':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        metrics = get_metrics()
+        metrics.observe(
+            self.provider, self.api_id, time.perf_counter() - self.started, self.status,
+            self.request_bytes, self.response_bytes, self.continuation
+        )
+        if exc_type is not None:
+            metrics.record_error(self.provider, self.api_id, exc_type.__name__)
+        return False
+
+
+def measure(provider: str, api_id: str, continuation: bool = False) -> _Measurement:
+    """
+    with 블록의 소요 시간을 observe로 기록합니다 (블록에서 예외가 나면 예외 이름을 오류 코드로 기록).
+
+    Example:
+        >>> with measure('naver', 'frgn') as measurement:
+        ...     response = requests.get(url)
+        ...     measurement.response(response)
+    """
+    return _Measurement(provider, api_id, continuation)
+
+
+_metrics: Optional[BrokerMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> BrokerMetrics:
+    """프로세스에서 공유하는 증권사 API 통계 수집기를 반환합니다 (싱글톤)."""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = BrokerMetrics()
+    return _metrics
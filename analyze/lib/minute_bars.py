@@ -0,0 +1,139 @@
+"""
+분봉 수집/조회
+
+관심 종목의 키움 1분봉(ka10080)을 로컬 저장소(lib.bar_store, 'kiwoom_minute')에 쌓고,
+차트/실시간 모니터가 요청마다 며칠치 분봉을 다시 받지 않고 저장된 분봉에서 N분봉을 만들어 씁니다.
+
+- 갱신은 일봉과 같은 refresh_bars 흐름: 마지막 저장일부터 증분 조회 → 마지막(진행 중) 분봉 교체 + 새 분봉 덧붙이기
+  (장 마감 후 저장되었으면 다음 장까지 조회 없음)
+- 처음 조회하는 종목은 최근 MINUTE_HISTORY_BARS개(약 5거래일)만 받음
+- N분봉은 lib.ohlcv.resample_bars로 저장된 1분봉에서 계산 (3/5/15/60분 등)
+"""
+
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Sequence
+
+import pandas as pd
+
+try:
+    from .bar_store import BarStore, get_bar_store, refresh_bars, refresh_bars_async
+    from .krx_calendar import recent_trading_days
+    from .ohlcv import empty_bars, resample_bars
+except ImportError:  # analyze/lib를 sys.path에 직접 추가해 'minute_bars'로 임포트한 경우
+    from bar_store import BarStore, get_bar_store, refresh_bars, refresh_bars_async
+    from krx_calendar import recent_trading_days
+    from ohlcv import empty_bars, resample_bars
+
+logger = logging.getLogger(__name__)
+
+# 분봉 저장소 이름 (lib.bar_store 공급자 디렉터리)
+MINUTE_SOURCE = 'kiwoom_minute'
+
+# 처음 조회 시 받을 분봉 수 (하루 약 381개, 5거래일)
+MINUTE_HISTORY_BARS = int(os.getenv('MINUTE_HISTORY_BARS', '1950'))
+
+# 여러 종목 동시 수집 스레드 수 (실제 전송 속도는 rate_limiter가 제한)
+MINUTE_INGEST_WORKERS = int(os.getenv('MINUTE_INGEST_WORKERS', '4'))
+
+
+def get_minute_store() -> BarStore:
+    """공유 분봉 저장소"""
+    return get_bar_store(MINUTE_SOURCE)
+
+
+def refresh_minute_bars(api, stock_code: str, store: Optional[BarStore] = None) -> pd.DataFrame:
+    """
+    종목의 1분봉을 최신으로 갱신하고 저장된 분봉 전체를 반환합니다.
+
+    Args:
+        api: lib.kiwoom.KiwoomAPI 인스턴스
+        stock_code: 종목코드
+        store: 분봉 저장소 (None이면 공유 저장소)
+
+    Returns:
+        pd.DataFrame: 1분봉 표준 프레임 (메모리 맵 뷰)
+    """
+    def fetch(since: Optional[date], adjusted: bool = True) -> pd.DataFrame:
+        return api.fetch_minute_bars(
+            stock_code, since=since, max_bars=None if since else MINUTE_HISTORY_BARS, adjusted=adjusted
+        )
+
+    return refresh_bars(store or get_minute_store(), stock_code, fetch)
+
+
+async def refresh_minute_bars_async(api, stock_code: str, store: Optional[BarStore] = None) -> pd.DataFrame:
+    """refresh_minute_bars의 비동기 버전 (api는 lib.kiwoom_async.AsyncKiwoomAPI)"""
+    async def fetch(since: Optional[date], adjusted: bool = True) -> pd.DataFrame:
+        return await api.fetch_minute_bars(
+            stock_code, since=since, max_bars=None if since else MINUTE_HISTORY_BARS, adjusted=adjusted
+        )
+
+    return await refresh_bars_async(store or get_minute_store(), stock_code, fetch)
+
+
+def ingest_minute_bars(
+    api,
+    stock_codes: Sequence[str],
+    store: Optional[BarStore] = None,
+    workers: int = MINUTE_INGEST_WORKERS
+) -> Dict[str, Optional[pd.Series]]:
+    """
+    여러 종목의 1분봉을 동시에 갱신합니다 (관심 종목 실시간 모니터링용).
+
+    Args:
+        api: lib.kiwoom.KiwoomAPI 인스턴스
+        stock_codes: 종목코드 목록
+        store: 분봉 저장소 (None이면 공유 저장소)
+        workers: 동시 조회 스레드 수
+
+    Returns:
+        dict: {종목코드: 마지막 분봉 행 (실패하거나 분봉이 없으면 None)}
+    """
+    store = store or get_minute_store()
+    codes = list(dict.fromkeys(stock_codes))
+
+    def ingest(code: str) -> Optional[pd.Series]:
+        try:
+            bars = refresh_minute_bars(api, code, store)
+            return bars.iloc[-1] if len(bars) else None
+        except Exception as e:
+            logger.warning(f"분봉 수집 실패: {code}, {e}")
+            return None
+
+    if not codes:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(codes))), thread_name_prefix='minute') as executor:
+        return dict(zip(codes, executor.map(ingest, codes)))
+
+
+def read_minute_candles(
+    stock_code: str,
+    minutes: int = 1,
+    days: int = 1,
+    store: Optional[BarStore] = None
+) -> pd.DataFrame:
+    """
+    저장된 1분봉에서 최근 days거래일의 N분봉을 만듭니다 (API 호출 없음).
+
+    Args:
+        stock_code: 종목코드
+        minutes: 봉 간격 (lib.ohlcv.MINUTE_INTERVALS 중 하나)
+        days: 최근 거래일 수 (저장된 마지막 분봉의 날짜 기준)
+        store: 분봉 저장소 (None이면 공유 저장소)
+
+    Returns:
+        pd.DataFrame: N분봉 표준 프레임 (과거 → 최신)
+    """
+    store = store or get_minute_store()
+    last = store.last_date(stock_code)
+    if last is None:
+        return empty_bars()
+
+    end = last.astype('datetime64[D]').item()
+    # 달력 기준 여유 있게 잡아 그 안의 최근 days 영업일 중 가장 이른 날부터
+    trading_days = recent_trading_days(days * 2 + 10, end=end)[:days]
+    start = datetime.strptime(trading_days[-1], '%Y%m%d') if trading_days else end - timedelta(days=days - 1)
+    return resample_bars(store.read_frame(stock_code, start=start), minutes)
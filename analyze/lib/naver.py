@@ -6,8 +6,21 @@ import requests
 from bs4 import BeautifulSoup
 import logging
 
+try:
+    from .metrics import measure
+except ImportError:  # analyze/lib를 sys.path에 직접 추가해 'naver'로 임포트한 경우
+    from metrics import measure
+
 logger = logging.getLogger(__name__)
 
+
+def _fetch(url: str, headers: dict, timeout: float, page: str) -> requests.Response:
+    """페이지를 요청합니다 (page 이름별 지연/바이트/오류 기록)."""
+    with measure('naver', page) as measurement:
+        response = requests.get(url, headers=headers, timeout=timeout)
+        measurement.response(response)
+    return response
+
 def get_trading_firm_data(stock_code: str) -> dict:
     """
     네이버 금융에서 특정 종목의 거래원 정보를 크롤링
@@ -35,7 +48,7 @@ def get_trading_firm_data(stock_code: str) -> dict:
     }
 
     try:
-        response = requests.get(url, headers=headers, timeout=5)
+        response = _fetch(url, headers, 5, 'trading_firm')
         response.raise_for_status()
 
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -168,7 +181,7 @@ def get_financial_summary(stock_code: str) -> dict:
     }
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _fetch(url, headers, 10, 'financial_summary')
         response.raise_for_status()
 
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -303,7 +316,7 @@ def get_foreign_institutional_data(stock_code: str) -> dict:
     }
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _fetch(url, headers, 10, 'foreign_institutional')
         response.raise_for_status()
         
         soup = BeautifulSoup(response.text, 'html.parser')
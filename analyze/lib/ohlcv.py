@@ -0,0 +1,307 @@
+"""
+일봉(OHLCV) 어댑터
+
+키움(ka10081), 한국투자증권(FHKST03010100), yfinance에서 오는 서로 다른 형태의 일봉을
+하나의 표준 DataFrame으로 변환합니다. 분석 코드, 차트 엔드포인트, 캐시가 같은 형식을 공유하므로
+받은 뒤 다시 파싱하거나 정렬할 필요가 없습니다.
+
+표준 일봉 프레임 (BAR_DTYPES):
+- 컬럼: date, open, high, low, close, volume, trade_amount
+- dtype: date datetime64[ns], 가격 int32 (원), 거래량/거래대금 int64
+- 정렬: 과거 → 최신 (date 오름차순, 중복 일자 없음), RangeIndex
+
+분봉(ka10080)도 같은 형식을 쓰며 date에 봉 시각이 들어갑니다. resample_bars로 N분봉을 만듭니다.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .kiwoom_decoder import DATAFRAME_COLUMNS, decode_daily_chart, decode_minute_chart, parse_dates, parse_signed
+except ImportError:  # analyze/lib를 sys.path에 직접 추가해 'ohlcv'로 임포트한 경우
+    from kiwoom_decoder import DATAFRAME_COLUMNS, decode_daily_chart, decode_minute_chart, parse_dates, parse_signed
+
+logger = logging.getLogger(__name__)
+
+BAR_DTYPES = {
+    'date': 'datetime64[ns]',
+    'open': np.int32,
+    'high': np.int32,
+    'low': np.int32,
+    'close': np.int32,
+    'volume': np.int64,
+    'trade_amount': np.int64,
+}
+BAR_COLUMNS = tuple(BAR_DTYPES)
+
+# resample_bars가 지원하는 분봉 간격 (분)
+MINUTE_INTERVALS = (1, 3, 5, 10, 15, 30, 60)
+# N분봉 구간 기준 시각 (정규장 시작 09:00, 자정부터의 분)
+SESSION_OPEN_MINUTE = 9 * 60
+
+# KIS 일봉 필드 후보 (응답 종류에 따라 이름이 다름, 첫 행에서 한 번만 결정)
+KIS_DAILY_FIELDS = {
+    'date': ('stck_bsop_date', 'bsop_date', 'date'),
+    'open': ('stck_oprc', 'oprc', 'open'),
+    'high': ('stck_hgpr', 'hgpr', 'high'),
+    'low': ('stck_lwpr', 'lwpr', 'low'),
+    'close': ('stck_clpr', 'clpr', 'close'),
+    'volume': ('acml_vol', 'vol', 'volume'),
+    'trade_amount': ('acml_tr_pbmn', 'tr_pbmn', 'trade_amount'),
+}
+
+
+def empty_bars() -> pd.DataFrame:
+    """행이 없는 표준 일봉 프레임"""
+    return pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in BAR_DTYPES.items()})
+
+
+def make_bars(columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    컬럼 배열로 표준 일봉 프레임을 만듭니다.
+
+    종가가 0 이하인 행(거래 없음/빈 응답)은 제외하고, 이미 오름차순이면 정렬하지 않으며
+    내림차순(증권사 API 기본 순서)이면 뒤집기만 합니다. 같은 일자가 여러 번 있으면 마지막 값을 사용합니다.
+
+    Args:
+        columns: {'date': datetime64 배열, 'open'...'volume': 숫자 배열, 'trade_amount'(선택)}
+
+    Returns:
+        pd.DataFrame: 표준 일봉 프레임
+    """
+    if not len(columns.get('date', ())):
+        return empty_bars()
+
+    if 'trade_amount' not in columns:
+        columns = {**columns, 'trade_amount': np.asarray(columns['volume'], dtype=np.int64) * columns['close']}
+
+    bars = pd.DataFrame({column: np.asarray(columns[column]).astype(dtype) for column, dtype in BAR_DTYPES.items()})
+    bars = bars[bars['close'].to_numpy() > 0]
+
+    dates = bars['date']
+    if not dates.is_monotonic_increasing:
+        bars = bars.iloc[::-1] if dates.is_monotonic_decreasing else bars.sort_values('date', kind='stable')
+    if not bars['date'].is_unique:
+        bars = bars.drop_duplicates('date', keep='last')
+    return bars.reset_index(drop=True)
+
+
+def kiwoom_daily_bars(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """키움 ka10081 응답의 stk_dt_pole_chart_qry 항목을 표준 일봉 프레임으로 변환"""
+    return make_bars(decode_daily_chart(rows, oldest_first=True))
+
+
+def kiwoom_minute_bars(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """키움 ka10080 응답의 stk_min_pole_chart_qry 항목을 표준 프레임(분봉)으로 변환 (거래대금은 종가×거래량)"""
+    return make_bars(decode_minute_chart(rows, oldest_first=True))
+
+
+def resample_bars(bars: pd.DataFrame, minutes: int) -> pd.DataFrame:
+    """
+    1분봉 표준 프레임을 N분봉으로 합칩니다 (행 반복 없이 구간 경계 인덱스와 reduceat으로 계산).
+
+    구간은 매일 09:00 기준으로 나누고 (5분봉: 09:00, 09:05, ...), 각 봉의 date는 구간 시작 시각입니다.
+    시가는 구간 첫 분봉, 종가는 마지막 분봉, 고가/저가는 최대/최소, 거래량/거래대금은 합계입니다.
+
+    Args:
+        bars: 1분봉 표준 프레임 (과거 → 최신)
+        minutes: 간격 (MINUTE_INTERVALS 중 하나)
+
+    Returns:
+        pd.DataFrame: N분봉 표준 프레임
+    """
+    if minutes not in MINUTE_INTERVALS:
+        raise ValueError(f"지원하지 않는 분봉 간격: {minutes} (가능: {MINUTE_INTERVALS})")
+    if minutes == 1 or bars.empty:
+        return bars
+
+    stamps = bars['date'].to_numpy().astype('datetime64[m]').astype(np.int64)
+    day_start = stamps // 1440 * 1440
+    labels = day_start + SESSION_OPEN_MINUTE + (stamps - day_start - SESSION_OPEN_MINUTE) // minutes * minutes
+
+    starts = np.flatnonzero(np.concatenate(([True], labels[1:] != labels[:-1])))
+    ends = np.concatenate((starts[1:], [len(labels)])) - 1
+    return make_bars({
+        'date': labels[starts].astype('datetime64[m]'),
+        'open': bars['open'].to_numpy()[starts],
+        'high': np.maximum.reduceat(bars['high'].to_numpy(), starts),
+        'low': np.minimum.reduceat(bars['low'].to_numpy(), starts),
+        'close': bars['close'].to_numpy()[ends],
+        'volume': np.add.reduceat(bars['volume'].to_numpy(), starts),
+        'trade_amount': np.add.reduceat(bars['trade_amount'].to_numpy(), starts),
+    })
+
+
+def _pick_field(row: Dict[str, Any], candidates: Sequence[str]) -> Optional[str]:
+    """후보 필드명 중 값이 있는 첫 번째 이름"""
+    for name in candidates:
+        if row.get(name) not in (None, ''):
+            return name
+    return None
+
+
+def kis_daily_bars(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    KIS 일봉 응답(output/output2) 항목을 표준 일봉 프레임으로 변환
+
+    필드명은 첫 행에서 한 번만 결정하고 컬럼 단위로 변환합니다 (행마다 strptime/후보 필드 조회 없음).
+    """
+    if not rows:
+        return empty_bars()
+
+    fields = {column: _pick_field(rows[0], candidates) for column, candidates in KIS_DAILY_FIELDS.items()}
+    if fields['date'] is None or fields['close'] is None:
+        logger.warning(f"KIS 일봉 응답에서 일자/종가 필드를 찾을 수 없음: {list(rows[0])}")
+        return empty_bars()
+
+    ymd = parse_signed([row.get(fields['date']) for row in rows])
+    columns = {'date': parse_dates(ymd)}
+    for column, name in fields.items():
+        if column != 'date' and name is not None:
+            columns[column] = np.abs(parse_signed([row.get(name) for row in rows]))
+    for column in ('open', 'high', 'low'):
+        columns.setdefault(column, columns['close'])
+    columns.setdefault('volume', np.zeros(len(rows), dtype=np.int64))
+
+    valid = ymd >= 19000101
+    if not valid.all():
+        columns = {column: values[valid] for column, values in columns.items()}
+    return make_bars(columns)
+
+
+def yfinance_bars(history: pd.DataFrame) -> pd.DataFrame:
+    """
+    yfinance Ticker.history() 결과(DatetimeIndex + Open/High/Low/Close/Volume)를 표준 일봉 프레임으로 변환
+
+    시간대가 있는 인덱스는 현지 날짜로 바꾸고, 가격은 원 단위 정수로 반올림합니다 (국내 주식 기준).
+    거래대금은 제공되지 않으므로 종가 × 거래량으로 근사합니다.
+    """
+    if history is None or history.empty:
+        return empty_bars()
+
+    index = pd.DatetimeIndex(history.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+
+    columns = {'date': index.normalize().to_numpy()}
+    for column in ('open', 'high', 'low', 'close'):
+        columns[column] = np.rint(history[column.capitalize()].to_numpy(dtype=np.float64))
+    columns['volume'] = history['Volume'].to_numpy(dtype=np.int64)
+    columns['trade_amount'] = (columns['close'] * columns['volume']).astype(np.int64)
+    return make_bars(columns)
+
+
+def to_analysis_frame(bars: pd.DataFrame) -> pd.DataFrame:
+    """
+    표준 일봉 프레임을 분석 코드(TechnicalAnalyzer)의 Date/Open/High/Low/Close/Volume 형식으로 바꿉니다.
+    이미 그 형식이면 그대로 반환합니다 (컬럼 이름만 바꾸므로 데이터 복사 없음).
+    """
+    if 'close' not in bars.columns:
+        return bars
+    return bars.rename(columns=DATAFRAME_COLUMNS)
+
+
+class OHLCVAdapter(ABC):
+    """
+    일봉 조회 어댑터 공통 인터페이스 (공급자별 어댑터는 parse/fetch를 구현)
+
+    fetch()는 항상 표준 일봉 프레임(과거 → 최신, 최근 days개)을 반환합니다.
+    """
+
+    source = ''
+
+    @abstractmethod
+    def parse(self, payload: Any) -> pd.DataFrame:
+        """공급자 응답을 표준 일봉 프레임으로 변환"""
+
+    @abstractmethod
+    def fetch(self, stock_code: str, days: int = 100) -> pd.DataFrame:
+        """
+        최근 days개 일봉을 조회합니다.
+
+        Args:
+            stock_code: 종목코드 (6자리)
+            days: 조회할 일봉 수
+
+        Returns:
+            pd.DataFrame: 표준 일봉 프레임
+        """
+
+
+class KiwoomOHLCVAdapter(OHLCVAdapter):
+    """키움 ka10081 일봉 어댑터 (연속조회로 days개를 채움)"""
+
+    source = 'kiwoom'
+
+    def __init__(self, api):
+        """
+        Args:
+            api: lib.kiwoom.KiwoomAPI 인스턴스
+        """
+        self.api = api
+
+    def parse(self, payload: Any) -> pd.DataFrame:
+        rows = payload.get('stk_dt_pole_chart_qry', []) if isinstance(payload, dict) else payload
+        return kiwoom_daily_bars(rows or [])
+
+    def fetch(self, stock_code: str, days: int = 100) -> pd.DataFrame:
+        rows = []
+        for row in self.api.iter_daily_chart(stock_code):
+            rows.append(row)
+            if len(rows) >= days:
+                break
+        return self.parse(rows)
+
+
+class KISOHLCVAdapter(OHLCVAdapter):
+    """한국투자증권 일봉 어댑터"""
+
+    source = 'kis'
+
+    def __init__(self, api=None):
+        """
+        Args:
+            api: lib.hantu.KISApi 인스턴스 (None이면 공유 인스턴스 사용)
+        """
+        self.api = api
+
+    def parse(self, payload: Any) -> pd.DataFrame:
+        rows = payload.get('output', payload.get('output2', [])) if isinstance(payload, dict) else payload
+        return kis_daily_bars(rows or [])
+
+    def fetch(self, stock_code: str, days: int = 100) -> pd.DataFrame:
+        if self.api is None:
+            try:
+                from .hantu import get_kis_api
+            except ImportError:
+                from hantu import get_kis_api
+            self.api = get_kis_api()
+        return self.api.get_stock_data_combined(stock_code, days)
+
+
+class YFinanceOHLCVAdapter(OHLCVAdapter):
+    """yfinance 일봉 어댑터 (yfinance는 선택 의존성이므로 조회할 때 임포트)"""
+
+    source = 'yfinance'
+
+    def __init__(self, suffix: str = '.KS'):
+        """
+        Args:
+            suffix: 야후 종목 접미사 (코스피 '.KS', 코스닥 '.KQ'), 종목코드에 '.'이 있으면 무시
+        """
+        self.suffix = suffix
+
+    def parse(self, payload: Any) -> pd.DataFrame:
+        return yfinance_bars(payload)
+
+    def fetch(self, stock_code: str, days: int = 100) -> pd.DataFrame:
+        import yfinance as yf
+
+        symbol = stock_code if '.' in stock_code else f'{stock_code}{self.suffix}'
+        # 휴장일을 고려해 달력 기준으로 여유 있게 조회한 뒤 최근 days개만 사용
+        history = yf.Ticker(symbol).history(period=f'{max(days * 3 // 2 + 10, 5)}d')
+        return self.parse(history).tail(days).reset_index(drop=True)
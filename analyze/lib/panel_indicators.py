@@ -0,0 +1,208 @@
+"""
+여러 종목 기술적 지표 일괄 계산 (종목 × 일자 2차원 배열)
+
+전 종목 일일 분석에서 종목마다 지표 객체를 만들어 같은 종가 시계열을 반복해 훑지 않고,
+종목 × 일자 패널 하나에서 RSI/MACD/볼린저 밴드/SMA/EMA/스토캐스틱/거래량 SMA/ATR을 한 번에 계산합니다.
+
+- 패널은 오른쪽 정렬: 마지막 열이 종목별 최신 봉, 이력이 짧은 종목은 앞부분을 NaN으로 채움
+- 이동 창 지표는 누적합/슬라이딩 창으로 종목 축 전체를 한 번에 계산
+- 지수 이동평균류(EMA/RSI/ATR)는 일자 축으로만 반복하고 종목 축은 벡터 연산 (일자 수만큼만 반복)
+- 정의는 ta 라이브러리(TechnicalAnalyzer._calculate_indicators)와 같음:
+  EMA는 adjust=False, RSI는 Wilder 평활(alpha=1/window), 볼린저 표준편차는 모표준편차, ATR은 첫 window개 TR 평균으로 시작
+"""
+
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+PANEL_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class BarPanel:
+    """종목 × 일자 OHLCV 패널 (float64, 오른쪽 정렬)"""
+
+    def __init__(self, symbols: Sequence[str], columns: Dict[str, np.ndarray]):
+        """
+        Args:
+            symbols: 행 순서의 종목코드
+            columns: {'open'|'high'|'low'|'close'|'volume': (종목 수, 일자 수) float64 배열}
+        """
+        self.symbols = list(symbols)
+        self.columns = columns
+        self.index = {symbol: row for row, symbol in enumerate(self.symbols)}
+
+    @property
+    def shape(self):
+        return self.columns['close'].shape
+
+    @classmethod
+    def from_frames(cls, frames: Mapping[str, pd.DataFrame], length: Optional[int] = None) -> 'BarPanel':
+        """
+        종목별 일봉 프레임으로 패널을 만듭니다.
+
+        Args:
+            frames: {종목코드: 일봉 프레임 (lib.ohlcv 표준 프레임 또는 Date/Open/... 분석 프레임, 과거 → 최신)}
+            length: 종목별 최근 length개 봉만 사용 (None이면 가장 긴 이력 길이)
+
+        Returns:
+            BarPanel: 패널
+        """
+        symbols = list(frames)
+        if length is None:
+            length = max((len(frame) for frame in frames.values()), default=0)
+        columns = {column: np.full((len(symbols), length), np.nan) for column in PANEL_COLUMNS}
+        for row, symbol in enumerate(symbols):
+            frame = frames[symbol]
+            count = min(len(frame), length)
+            if not count:
+                continue
+            for column in PANEL_COLUMNS:
+                name = column if column in frame.columns else column.capitalize()
+                columns[column][row, length - count:] = frame[name].to_numpy(dtype=np.float64)[-count:]
+        return cls(symbols, columns)
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """일자 축 단순 이동평균 (창 안에 NaN/무한대가 있으면 NaN, 누적합 이용)"""
+    result = np.full(values.shape, np.nan)
+    if window <= 0 or values.shape[1] < window:
+        return result
+    valid = np.isfinite(values)
+    zero = np.zeros((values.shape[0], 1))
+    sums = np.concatenate([zero, np.cumsum(np.where(valid, values, 0.0), axis=1)], axis=1)
+    counts = np.concatenate([zero, np.cumsum(valid, axis=1)], axis=1)
+    window_sums = sums[:, window:] - sums[:, :-window]
+    window_counts = counts[:, window:] - counts[:, :-window]
+    result[:, window - 1:] = np.where(window_counts == window, window_sums / window, np.nan)
+    return result
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """일자 축 이동 모표준편차 (ddof=0, 종목별 기준값을 빼서 누적합 상쇄 오차를 줄임)"""
+    first_valid = np.argmax(~np.isnan(values), axis=1) if values.shape[1] else np.zeros(values.shape[0], dtype=int)
+    reference = values[np.arange(values.shape[0]), first_valid] if values.shape[1] else np.zeros(values.shape[0])
+    centered = values - np.nan_to_num(reference)[:, None]
+    mean = rolling_mean(centered, window)
+    variance = rolling_mean(centered * centered, window) - mean * mean
+    return np.sqrt(np.maximum(variance, 0.0))
+
+
+def rolling_extreme(values: np.ndarray, window: int, func=np.max) -> np.ndarray:
+    """일자 축 이동 최댓값/최솟값 (func: np.max 또는 np.min, 창 안에 NaN이 있으면 NaN)"""
+    result = np.full(values.shape, np.nan)
+    if window <= 0 or values.shape[1] < window:
+        return result
+    result[:, window - 1:] = func(sliding_window_view(values, window, axis=1), axis=-1)
+    return result
+
+
+def ewm_mean(values: np.ndarray, alpha: float, min_periods: int = 1, seed: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    일자 축 지수 이동평균 (pandas ewm(adjust=False)와 같음, 종목별로 첫 유효값에서 시작).
+
+    Args:
+        values: (종목 수, 일자 수) 배열
+        alpha: 평활 계수 (EMA: 2 / (span + 1), Wilder: 1 / window)
+        min_periods: 유효값이 이 개수 미만인 구간은 NaN
+        seed: 시작값 배열 (주면 seed가 처음 유효한 열에서 그 값으로 시작, ATR용)
+
+    Returns:
+        np.ndarray: values와 같은 모양의 float64 배열
+    """
+    result = np.full(values.shape, np.nan)
+    state = np.full(values.shape[0], np.nan)
+    counts = np.zeros(values.shape[0], dtype=np.int64)
+    for t in range(values.shape[1]):
+        x = values[:, t]
+        valid = ~np.isnan(x)
+        counts += valid
+        start = seed[:, t] if seed is not None else x
+        state = np.where(np.isnan(state), start, np.where(valid, state + alpha * (x - state), state))
+        result[:, t] = np.where(counts >= min_periods, state, np.nan)
+    return result
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True Range (종목별 첫 봉은 고가 - 저가)"""
+    previous_close = np.concatenate([np.full((close.shape[0], 1), np.nan), close[:, :-1]], axis=1)
+    return np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+
+
+def compute_indicators(
+    panel: BarPanel,
+    rsi_window: int = 14,
+    macd_fast: int = 12,
+    macd_slow: int = 26,
+    macd_signal: int = 9,
+    bollinger_window: int = 20,
+    bollinger_std: float = 2,
+    stoch_window: int = 14,
+    stoch_smooth: int = 3,
+    volume_window: int = 20,
+    atr_window: int = 14
+) -> Dict[str, np.ndarray]:
+    """
+    패널 전체의 기술적 지표를 계산합니다.
+
+    Returns:
+        dict: {지표명: (종목 수, 일자 수) float64 배열}
+              지표명은 TechnicalAnalyzer._calculate_indicators와 같음
+              (rsi, macd, macd_signal, macd_histogram, bollinger_upper/lower/middle, sma_5/20/60,
+               ema_12/26, stoch_k, stoch_d, volume_sma, atr, current_price)
+    """
+    close = panel.columns['close']
+    high = panel.columns['high']
+    low = panel.columns['low']
+    indicators: Dict[str, np.ndarray] = {}
+
+    # RSI (Wilder 평활, 종목별 첫 봉의 변화량은 0)
+    diff = np.diff(close, axis=1, prepend=np.nan)
+    diff = np.where(np.isnan(diff) & ~np.isnan(close), 0.0, diff)
+    up = ewm_mean(np.where(diff > 0, diff, np.where(np.isnan(diff), np.nan, 0.0)), 1 / rsi_window, rsi_window)
+    down = ewm_mean(np.where(diff < 0, -diff, np.where(np.isnan(diff), np.nan, 0.0)), 1 / rsi_window, rsi_window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        indicators['rsi'] = np.where(down == 0, 100.0, 100 - 100 / (1 + up / down))
+
+    # MACD
+    ema = {window: ewm_mean(close, 2 / (window + 1), window) for window in {macd_fast, macd_slow, 12, 26}}
+    macd = ema[macd_fast] - ema[macd_slow]
+    indicators['macd'] = macd
+    indicators['macd_signal'] = ewm_mean(macd, 2 / (macd_signal + 1), macd_signal)
+    indicators['macd_histogram'] = macd - indicators['macd_signal']
+
+    # 볼린저 밴드
+    middle = rolling_mean(close, bollinger_window)
+    deviation = rolling_std(close, bollinger_window) * bollinger_std
+    indicators['bollinger_upper'] = middle + deviation
+    indicators['bollinger_lower'] = middle - deviation
+    indicators['bollinger_middle'] = middle
+
+    # 이동평균선
+    for window in (5, 20, 60):
+        indicators[f'sma_{window}'] = middle if window == bollinger_window else rolling_mean(close, window)
+    indicators['ema_12'] = ema[12]
+    indicators['ema_26'] = ema[26]
+
+    # 스토캐스틱
+    lowest = rolling_extreme(low, stoch_window, np.min)
+    highest = rolling_extreme(high, stoch_window, np.max)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        indicators['stoch_k'] = 100 * (close - lowest) / (highest - lowest)
+    indicators['stoch_d'] = rolling_mean(indicators['stoch_k'], stoch_smooth)
+
+    # 거래량 지표
+    indicators['volume_sma'] = rolling_mean(panel.columns['volume'], volume_window)
+
+    # ATR (첫 atr_window개 TR 평균으로 시작하는 Wilder 평활)
+    tr = true_range(high, low, close)
+    indicators['atr'] = ewm_mean(tr, 1 / atr_window, atr_window, seed=rolling_mean(tr, atr_window))
+
+    indicators['current_price'] = close
+    return indicators
+
+
+def latest_values(indicators: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """지표별 종목의 최신 값 (마지막 열 뷰, 복사 없음)"""
+    return {name: values[:, -1] for name, values in indicators.items()}
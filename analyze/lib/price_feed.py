@@ -0,0 +1,216 @@
+"""
+키움증권 실시간 체결(REG, type '0B') 피드
+
+구독한 종목을 앱 키별 공유 WebSocket 세션에 실시간 등록하고, 체결이 도착할 때마다
+최근 체결 저장소(lib.price_store)를 갱신합니다.
+- 연결이 끊기면 다시 연결해 구독 종목 전체를 재등록
+- 실행 중에 subscribe()로 추가한 종목은 바로 등록
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+try:
+    from .kiwoom import KiwoomTokenBroker, resolve_base_url
+    from .kiwoom_ws import KiwoomWebSocketSession, parse_trade_ticks
+    from .price_store import PriceStore, get_price_store
+except ImportError:  # analyze/lib를 sys.path에 직접 추가해 'price_feed'로 임포트한 경우
+    from kiwoom import KiwoomTokenBroker, resolve_base_url
+    from kiwoom_ws import KiwoomWebSocketSession, parse_trade_ticks
+    from price_store import PriceStore, get_price_store
+
+logger = logging.getLogger(__name__)
+
+TRADE_TICK_TYPE = '0B'           # 실시간 항목: 주식체결
+REG_GROUP_NO = '1'               # 실시간 등록 그룹 번호
+REG_BATCH_SIZE = 100             # REG 한 번에 등록할 종목 수
+RECONNECT_DELAY_SEC = 5.0        # 재연결 첫 대기 시간
+MAX_RECONNECT_DELAY_SEC = 60.0   # 재연결 최대 대기 시간 (실패할 때마다 두 배씩 증가)
+
+# 기본 구독 종목 (REALTIME_PRICE_SYMBOLS 환경변수로 변경, 쉼표 구분)
+DEFAULT_SYMBOLS = ['005930', '035420', '000660', '207940', '051910']
+
+
+class RealtimePriceFeed:
+    """구독 종목의 실시간 체결을 받아 PriceStore에 반영하는 장기 실행 구독자"""
+
+    def __init__(self, token_broker, use_mock: bool = False, store: Optional[PriceStore] = None):
+        """
+        Args:
+            token_broker: 접근 토큰 브로커 (예: KiwoomTokenBroker)
+            use_mock: 모의투자 여부
+            store: 체결을 저장할 저장소 (기본: 프로세스 공유 저장소)
+        """
+        self.ws_session = KiwoomWebSocketSession.get(token_broker, use_mock=use_mock)
+        self.store = store or get_price_store()
+
+        self._symbols: Set[str] = set()
+        self._symbols_lock = threading.Lock()
+        self._future = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    @property
+    def symbols(self) -> List[str]:
+        """구독 중인 종목코드 목록"""
+        with self._symbols_lock:
+            return sorted(self._symbols)
+
+    def is_subscribed(self, stock_code: str) -> bool:
+        """종목이 구독 중이고 피드가 연결되어 있어 저장소 값이 계속 갱신되는지 여부"""
+        return self.running and self.ws_session.connected and stock_code in self._symbols
+
+    def subscribe(self, stock_codes: Iterable[str]):
+        """
+        종목을 구독 목록에 추가합니다. 실행 중이면 새 종목을 바로 실시간 등록합니다.
+
+        Args:
+            stock_codes: 종목코드 목록 (6자리)
+        """
+        with self._symbols_lock:
+            added = [code for code in dict.fromkeys(stock_codes) if code and code not in self._symbols]
+            self._symbols.update(added)
+
+        if added and self.running and self.ws_session.connected:
+            self.ws_session.submit(self._register(added))
+
+    def start(self):
+        """구독을 시작합니다 (이미 실행 중이면 무시)."""
+        if self.running:
+            return
+        self._stopping = False
+        self.ws_session.add_listener(self._on_message)
+        self._future = self.ws_session.submit(self._run())
+        logger.info(f"[실시간 체결] 구독 시작: {len(self._symbols)}개 종목")
+
+    def stop(self, timeout: float = 5.0):
+        """구독을 중지하고 실시간 등록을 해제합니다."""
+        self._stopping = True
+        self.ws_session.remove_listener(self._on_message)
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+        if self.ws_session.connected:
+            try:
+                self.ws_session.call(self._unregister(self.symbols), timeout=timeout)
+            except Exception as e:
+                logger.warning(f"[실시간 체결] 등록 해제 실패 (무시): {e}")
+        logger.info("[실시간 체결] 구독 중지")
+
+    async def _run(self):
+        """연결 → 구독 종목 실시간 등록 → 연결이 끊길 때까지 대기를 반복합니다 (세션 루프에서 실행)."""
+        delay = RECONNECT_DELAY_SEC
+        while not self._stopping:
+            try:
+                await self.ws_session.ensure_connected()
+                await self._register(self.symbols)
+                delay = RECONNECT_DELAY_SEC
+                await self.ws_session.wait_disconnected()
+                if not self._stopping:
+                    logger.warning("[실시간 체결] WebSocket 연결 끊김, 재등록 예정")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[실시간 체결] 구독 오류: {e}")
+
+            if not self._stopping:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY_SEC)
+
+    async def _register(self, stock_codes: List[str]):
+        """종목을 REG_BATCH_SIZE개씩 실시간 등록합니다 (refresh='1': 기존 등록 유지)."""
+        for start in range(0, len(stock_codes), REG_BATCH_SIZE):
+            batch = stock_codes[start:start + REG_BATCH_SIZE]
+            response = await self.ws_session.request({
+                'trnm': 'REG',
+                'grp_no': REG_GROUP_NO,
+                'refresh': '1',
+                'data': [{'item': batch, 'type': [TRADE_TICK_TYPE]}],
+            })
+            if response.get('return_code') != 0:
+                raise ConnectionError(f"실시간 등록 실패: {response.get('return_msg', 'Unknown error')}")
+            logger.info(f"[실시간 체결] {len(batch)}개 종목 등록")
+
+    async def _unregister(self, stock_codes: List[str]):
+        """종목의 실시간 등록을 해제합니다 (응답은 기다리지 않음)."""
+        for start in range(0, len(stock_codes), REG_BATCH_SIZE):
+            await self.ws_session.send({
+                'trnm': 'REMOVE',
+                'grp_no': REG_GROUP_NO,
+                'refresh': '1',
+                'data': [{'item': stock_codes[start:start + REG_BATCH_SIZE], 'type': [TRADE_TICK_TYPE]}],
+            })
+
+    def _on_message(self, message: Dict[str, Any]):
+        """WebSocket 리스너: 체결을 저장소에 바로 반영합니다."""
+        for tick in parse_trade_ticks(message):
+            self.store.update(tick)
+
+
+# 프로세스 공유 피드
+_price_feed: Optional[RealtimePriceFeed] = None
+
+
+def get_price_feed() -> Optional[RealtimePriceFeed]:
+    """실행 중인 실시간 체결 피드를 반환합니다 (시작하지 않았으면 None)."""
+    return _price_feed
+
+
+def get_realtime_price(stock_code: str) -> Optional[Dict[str, Any]]:
+    """
+    실시간 피드가 갱신 중인 종목의 최근 체결 정보를 반환합니다.
+    피드가 없거나 구독하지 않은 종목, 아직 체결이 없는 종목은 None (호출한 쪽에서 REST로 조회).
+    """
+    feed = get_price_feed()
+    if feed is None or not feed.is_subscribed(stock_code):
+        return None
+    return feed.store.get(stock_code)
+
+
+def start_price_feed(symbols: Optional[Iterable[str]] = None) -> Optional[RealtimePriceFeed]:
+    """
+    환경변수의 키움 자격증명으로 실시간 체결 피드를 시작합니다.
+    REALTIME_PRICE_ENABLED=false 이거나 자격증명이 없으면 시작하지 않습니다.
+
+    Args:
+        symbols: 처음 구독할 종목 (기본: REALTIME_PRICE_SYMBOLS 환경변수 또는 DEFAULT_SYMBOLS)
+    """
+    global _price_feed
+
+    if os.getenv('REALTIME_PRICE_ENABLED', 'true').lower() != 'true':
+        logger.info("[실시간 체결] 비활성화됨 (REALTIME_PRICE_ENABLED)")
+        return None
+
+    app_key = os.getenv('KIWOOM_APP_KEY')
+    secret_key = os.getenv('KIWOOM_SECRET_KEY')
+    if not app_key or not secret_key:
+        logger.warning("[실시간 체결] 키움 API 자격증명이 설정되지 않아 시작하지 않습니다")
+        return None
+
+    if symbols is None:
+        env_symbols = os.getenv('REALTIME_PRICE_SYMBOLS', '')
+        symbols = [code.strip() for code in env_symbols.split(',') if code.strip()] or DEFAULT_SYMBOLS
+
+    if _price_feed is None:
+        use_mock = os.getenv('KIWOOM_USE_MOCK', 'False').lower() == 'true'
+        token_broker = KiwoomTokenBroker.get(app_key, secret_key, resolve_base_url(use_mock))
+        _price_feed = RealtimePriceFeed(token_broker, use_mock=use_mock)
+    _price_feed.subscribe(symbols)
+    _price_feed.start()
+    return _price_feed
+
+
+def stop_price_feed():
+    """실시간 체결 피드를 중지합니다."""
+    global _price_feed
+    if _price_feed is not None:
+        _price_feed.stop()
+        _price_feed = None
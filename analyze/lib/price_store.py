@@ -0,0 +1,91 @@
+"""
+종목별 최근 체결 정보 저장소
+
+실시간 체결 피드(lib.price_feed)가 받은 체결을 종목코드별 마지막 값 하나로 메모리에 보관합니다.
+백엔드 라우터와 분석 서비스는 현재가가 필요할 때 증권사 API를 호출하는 대신 이 저장소를 조회합니다 (O(1)).
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+
+class PriceStore:
+    """종목코드 → 최근 체결 정보 (스레드 안전)"""
+
+    def __init__(self):
+        self._prices: Dict[str, Dict[str, Any]] = {}
+        self._received_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def update(self, tick: Dict[str, Any]):
+        """
+        체결 하나로 종목의 최근 값을 바꿉니다.
+
+        Args:
+            tick: 체결 데이터 (kiwoom_ws.parse_trade_ticks 반환 형식, stock_code 필수)
+        """
+        entry = dict(tick)
+        entry.setdefault('updated_at', datetime.now().isoformat())
+        stock_code = entry['stock_code']
+        with self._lock:
+            self._prices[stock_code] = entry
+            self._received_at[stock_code] = time.monotonic()
+
+    def get(self, stock_code: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        종목의 최근 체결 정보를 반환합니다.
+
+        Args:
+            stock_code: 종목코드 (6자리)
+            max_age: 이 시간(초)보다 오래된 값이면 None
+
+        Returns:
+            dict: current_price, change_price, change_rate, volume, updated_at 등 (없으면 None)
+        """
+        with self._lock:
+            entry = self._prices.get(stock_code)
+            received_at = self._received_at.get(stock_code)
+        if entry is None:
+            return None
+        if max_age is not None and time.monotonic() - received_at > max_age:
+            return None
+        return dict(entry)
+
+    def get_many(self, stock_codes: Iterable[str], max_age: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """여러 종목의 최근 체결 정보를 {종목코드: 정보}로 반환합니다 (값이 없는 종목은 제외)."""
+        result = {}
+        for stock_code in stock_codes:
+            entry = self.get(stock_code, max_age=max_age)
+            if entry is not None:
+                result[stock_code] = entry
+        return result
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """저장된 모든 종목의 최근 체결 정보를 복사해 반환합니다."""
+        with self._lock:
+            return {stock_code: dict(entry) for stock_code, entry in self._prices.items()}
+
+    def clear(self):
+        """저장된 값을 모두 지웁니다."""
+        with self._lock:
+            self._prices.clear()
+            self._received_at.clear()
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+
+_price_store: Optional[PriceStore] = None
+_price_store_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """프로세스에서 공유하는 최근 체결 저장소를 반환합니다 (싱글톤)."""
+    global _price_store
+    if _price_store is None:
+        with _price_store_lock:
+            if _price_store is None:
+                _price_store = PriceStore()
+    return _price_store
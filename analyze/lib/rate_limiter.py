@@ -0,0 +1,279 @@
+"""
+증권사 API 클라이언트 측 요청 속도 제한기 (토큰 버킷 + 우선순위 대기열)
+
+키움증권은 앱 키와 TR(api-id)별로 초당 요청 수를 제한합니다.
+사용자 요청, 스케줄러 작업, 일자별 반복 조회가 동시에 몰려도 한도를 넘지 않도록
+(app_key, api_id) 단위 토큰 버킷에서 토큰을 받아야 요청을 보낼 수 있게 합니다.
+- 한도를 넘으면 실패하지 않고 대기열에서 기다림
+- 대기열은 우선순위 순서 (화면 조회 > 기본 > 백그라운드 동기화), 같은 우선순위는 도착 순서
+- 동기(스레드)와 비동기(asyncio) 호출자가 같은 버킷을 공유
+한국투자증권(KIS)은 TR 구분 없이 앱 키 단위로 제한하므로 (app_key, 'kis') 버킷 하나를 사용합니다.
+"""
+
+import os
+import time
+import heapq
+import asyncio
+import itertools
+import logging
+import threading
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 우선순위 (숫자가 작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0  # 사용자 화면 조회 (차트, ATR 등)
+PRIORITY_DEFAULT = 1
+PRIORITY_BACKGROUND = 2   # 스케줄러/동기화 작업
+
+# 기본 한도 (환경변수로 조정 가능)
+DEFAULT_RATE = float(os.getenv('KIWOOM_RATE_LIMIT_PER_SEC', '5'))   # 초당 토큰 충전량
+DEFAULT_BURST = float(os.getenv('KIWOOM_RATE_LIMIT_BURST', '5'))    # 버킷 최대 토큰 수
+THROTTLE_BACKOFF_SEC = 1.0  # 서버가 한도 초과(429)를 응답했을 때 해당 버킷을 쉬게 할 시간
+
+# 한국투자증권 (app_key, 'kis') 버킷 한도 (실전 초당 20건보다 약간 낮게)
+KIS_RATE_LIMIT_KEY = 'kis'
+KIS_RATE_LIMIT_PER_SEC = float(os.getenv('KIS_RATE_LIMIT_PER_SEC', '15'))
+
+# 공유 속도 제한기의 키(또는 api_id)별 개별 한도
+DEFAULT_LIMITS: Dict[Hashable, Tuple[float, float]] = {
+    KIS_RATE_LIMIT_KEY: (KIS_RATE_LIMIT_PER_SEC, KIS_RATE_LIMIT_PER_SEC),
+}
+
+# 비동기 대기자가 자기 차례를 다시 확인하는 최소/최대 간격 (초)
+_MIN_ASYNC_SLEEP = 0.005
+_MAX_ASYNC_SLEEP = 0.5
+
+
+class _Bucket:
+    """토큰 버킷 하나의 상태 (RateLimiter의 락 안에서만 접근)"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.waiters: List[Tuple[int, int]] = []  # (priority, seq) 힙
+
+    def refill(self, now: float):
+        """경과 시간만큼 토큰을 충전합니다."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, needed: float) -> float:
+        """토큰이 needed개 쌓이기까지 남은 시간 (초)"""
+        return max(0.0, (needed - self.tokens) / self.rate)
+
+
+class RateLimiter:
+    """키별 토큰 버킷 속도 제한기"""
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        capacity: float = DEFAULT_BURST,
+        limits: Optional[Dict[Hashable, Tuple[float, float]]] = None
+    ):
+        """
+        Args:
+            rate: 기본 초당 요청 수
+            capacity: 기본 순간 최대 요청 수 (버킷 크기)
+            limits: 키(또는 api_id)별 (rate, capacity) 개별 설정
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.limits = limits or {}
+        self._buckets: Dict[Hashable, _Bucket] = {}
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+
+    def _get_bucket(self, key: Hashable) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            # (app_key, api_id) 키는 api_id만으로도 개별 설정을 찾음
+            api_id = key[-1] if isinstance(key, tuple) else key
+            rate, capacity = self.limits.get(key) or self.limits.get(api_id) or (self.rate, self.capacity)
+            bucket = _Bucket(rate, capacity)
+            self._buckets[key] = bucket
+        return bucket
+
+    def _try_take(self, bucket: _Bucket, entry: Tuple[int, int]) -> bool:
+        """대기열 맨 앞이고 토큰이 있으면 토큰을 가져갑니다 (락 안에서 호출)."""
+        bucket.refill(time.monotonic())
+        if bucket.waiters[0] == entry and bucket.tokens >= 1:
+            heapq.heappop(bucket.waiters)
+            bucket.tokens -= 1
+            self._cond.notify_all()  # 다음 대기자에게 차례를 알림
+            return True
+        return False
+
+    def _estimated_wait(self, bucket: _Bucket, entry: Tuple[int, int]) -> float:
+        """대기열에서 entry 앞에 있는 요청 수를 기준으로 예상 대기 시간을 계산합니다."""
+        ahead = sum(1 for waiter in bucket.waiters if waiter < entry)
+        return bucket.time_until(ahead + 1)
+
+    def _remove(self, bucket: _Bucket, entry: Tuple[int, int]):
+        """타임아웃/취소된 대기자를 대기열에서 제거합니다 (락 안에서 호출)."""
+        if entry in bucket.waiters:
+            bucket.waiters.remove(entry)
+            heapq.heapify(bucket.waiters)
+            self._cond.notify_all()
+
+    def acquire(
+        self,
+        key: Hashable,
+        priority: int = PRIORITY_DEFAULT,
+        timeout: Optional[float] = None
+    ) -> float:
+        """
+        토큰을 받을 때까지 대기합니다 (스레드용).
+
+        Args:
+            key: 버킷 키 (예: (app_key, api_id))
+            priority: 우선순위 (PRIORITY_INTERACTIVE / PRIORITY_DEFAULT / PRIORITY_BACKGROUND)
+            timeout: 최대 대기 시간 (초, None이면 무제한)
+
+        Returns:
+            float: 실제로 대기한 시간 (초)
+
+        Raises:
+            TimeoutError: timeout 안에 토큰을 받지 못한 경우
+        """
+        started = time.monotonic()
+        deadline = started + timeout if timeout is not None else None
+
+        with self._cond:
+            bucket = self._get_bucket(key)
+            entry = (priority, next(self._seq))
+            heapq.heappush(bucket.waiters, entry)
+
+            while not self._try_take(bucket, entry):
+                # 맨 앞이면 토큰 충전 시각까지, 아니면 앞 요청이 처리될 때까지 대기
+                wait = bucket.time_until(1) if bucket.waiters[0] == entry else None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._remove(bucket, entry)
+                        raise TimeoutError(f"요청 한도 대기 시간 초과: {key}")
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._cond.wait(wait)
+
+        waited = time.monotonic() - started
+        if waited > 0.1:
+            logger.debug(f"요청 한도 대기: {key}, {waited:.2f}초")
+        return waited
+
+    async def acquire_async(
+        self,
+        key: Hashable,
+        priority: int = PRIORITY_DEFAULT,
+        timeout: Optional[float] = None
+    ) -> float:
+        """
+        토큰을 받을 때까지 대기합니다 (asyncio용, 이벤트 루프를 막지 않음).
+
+        Args:
+            key: 버킷 키 (예: (app_key, api_id))
+            priority: 우선순위
+            timeout: 최대 대기 시간 (초, None이면 무제한)
+
+        Returns:
+            float: 실제로 대기한 시간 (초)
+
+        Raises:
+            TimeoutError: timeout 안에 토큰을 받지 못한 경우
+        """
+        started = time.monotonic()
+        deadline = started + timeout if timeout is not None else None
+
+        with self._cond:
+            bucket = self._get_bucket(key)
+            entry = (priority, next(self._seq))
+            heapq.heappush(bucket.waiters, entry)
+
+        try:
+            while True:
+                with self._cond:
+                    if self._try_take(bucket, entry):
+                        return time.monotonic() - started
+                    wait = self._estimated_wait(bucket, entry)
+
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"요청 한도 대기 시간 초과: {key}")
+                    wait = min(wait, remaining)
+                await asyncio.sleep(min(max(wait, _MIN_ASYNC_SLEEP), _MAX_ASYNC_SLEEP))
+        except BaseException:
+            # 타임아웃/취소 시 대기열에서 빠져 뒤 요청을 막지 않음
+            with self._cond:
+                self._remove(bucket, entry)
+            raise
+
+    def penalize(self, key: Hashable, seconds: float):
+        """
+        서버가 한도 초과를 응답한 경우, 해당 버킷을 seconds 동안 비워 이후 요청을 늦춥니다.
+
+        Args:
+            key: 버킷 키
+            seconds: 요청을 멈출 시간 (초)
+        """
+        with self._cond:
+            bucket = self._get_bucket(key)
+            bucket.refill(time.monotonic())
+            bucket.tokens = min(bucket.tokens, 0) - seconds * bucket.rate
+            logger.warning(f"요청 한도 초과 응답, {seconds:.1f}초 대기: {key}")
+
+    def get_wait_times(self) -> Dict[str, Dict[str, Any]]:
+        """
+        버킷별 현재 상태를 반환합니다.
+
+        Returns:
+            dict: 키별 상태
+            {
+                'app_key_prefix:ka10081': {
+                    'queued': 3,             # 대기 중인 요청 수
+                    'tokens': 0.4,           # 남은 토큰
+                    'estimated_wait': 0.52,  # 지금 요청하면 기다릴 예상 시간 (초)
+                    'rate': 5.0,
+                    'capacity': 5.0
+                },
+                ...
+            }
+        """
+        status = {}
+        with self._cond:
+            now = time.monotonic()
+            for key, bucket in self._buckets.items():
+                bucket.refill(now)
+                status[_format_key(key)] = {
+                    'queued': len(bucket.waiters),
+                    'tokens': round(bucket.tokens, 3),
+                    'estimated_wait': round(bucket.time_until(len(bucket.waiters) + 1), 3),
+                    'rate': bucket.rate,
+                    'capacity': bucket.capacity,
+                }
+        return status
+
+
+def _format_key(key: Hashable) -> str:
+    """상태 출력용 키 문자열 (앱 키는 앞 6자리만 노출)"""
+    if isinstance(key, tuple) and len(key) == 2:
+        app_key, api_id = key
+        return f'{str(app_key)[:6]}:{api_id}'
+    return str(key)
+
+
+# 프로세스 공유 속도 제한기
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """프로세스에서 공유하는 증권사 API 속도 제한기를 반환합니다 (싱글톤, DEFAULT_LIMITS 적용)."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter(limits=dict(DEFAULT_LIMITS))
+    return _rate_limiter
@@ -0,0 +1,124 @@
+"""
+증권사 접근 토큰 디스크 캐시 (프로세스 간 공유)
+
+같은 호스트의 백엔드 워커와 분석 스크립트가 하나의 파일로 토큰을 공유합니다.
+- 파일 잠금(fcntl.flock)으로 여러 프로세스가 동시에 발급하지 않도록 직렬화
+- 임시 파일 작성 후 os.replace로 원자적 저장 (읽는 쪽은 항상 완전한 파일만 봄)
+- 항목 키는 앱 키 해시를 사용해 앱 키 원문을 파일에 남기지 않음
+키움(kiwoom.KiwoomTokenBroker)과 한국투자증권(hantu.KISApi)이 함께 사용합니다.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 프로세스 내 잠금만 사용
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def token_cache_key(app_key: str, base_url: str) -> str:
+    """캐시 항목 키 (앱 키 원문 대신 (app_key, base_url) 해시)"""
+    return hashlib.sha256(f'{app_key}|{base_url}'.encode('utf-8')).hexdigest()[:32]
+
+
+class TokenFileCache:
+    """
+    JSON 파일 하나에 {키: {'token', 'expires_at'}}를 저장하는 토큰 캐시
+
+    발급은 lock() 안에서 load()로 다시 확인한 뒤 수행합니다. 잠금을 기다리는 동안 다른 프로세스가
+    발급해 저장했다면 그 토큰을 재사용하게 되어, 동시에 시작한 워커들도 발급은 한 번만 합니다.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: 캐시 파일 경로 (잠금 파일은 '<path>.lock')
+        """
+        self.path = path
+        self.lock_path = f'{path}.lock'
+        self._thread_lock = threading.RLock()
+        self._local = threading.local()
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """
+        캐시 파일에 대한 배타 잠금 (프로세스 간 + 스레드 간, 같은 스레드에서는 재진입 가능)
+        """
+        with self._thread_lock:
+            depth = getattr(self._local, 'depth', 0)
+            if depth or fcntl is None:
+                self._local.depth = depth + 1
+                try:
+                    yield
+                finally:
+                    self._local.depth = depth
+                return
+
+            os.makedirs(os.path.dirname(self.lock_path) or '.', exist_ok=True)
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                self._local.depth = 1
+                try:
+                    yield
+                finally:
+                    self._local.depth = 0
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+            finally:
+                os.close(fd)
+
+    def _read(self) -> Dict[str, Any]:
+        """캐시 파일 전체를 읽습니다 (없거나 손상되었으면 빈 dict)."""
+        try:
+            with open(self.path, 'r') as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"토큰 캐시 파일 읽기 실패 (무시): {e}")
+            return {}
+
+    def load(self, key: str) -> Optional[Tuple[str, datetime]]:
+        """
+        저장된 토큰을 반환합니다 (만료 여부는 호출한 쪽에서 판단).
+
+        Returns:
+            (token, expires_at), 없거나 형식이 잘못되었으면 None
+        """
+        entry = self._read().get(key)
+        if not isinstance(entry, dict):
+            return None
+        try:
+            return entry['token'], datetime.fromisoformat(entry['expires_at'])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def store(self, key: str, token: str, expires_at: datetime):
+        """토큰을 원자적으로 저장합니다 (다른 키의 항목은 유지, 실패해도 예외를 내지 않음)."""
+        try:
+            with self.lock():
+                cache = self._read()
+                cache[key] = {
+                    'token': token,
+                    'expires_at': expires_at.isoformat(),
+                }
+
+                tmp_path = f'{self.path}.{os.getpid()}.{threading.get_ident()}.tmp'
+                with open(tmp_path, 'w') as f:
+                    json.dump(cache, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.chmod(tmp_path, 0o600)
+                os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"토큰 캐시 파일 저장 실패 (무시): {e}")
@@ -13,6 +13,7 @@ from src.data_collector import DataCollector
 from src.technical_analyzer import TechnicalAnalyzer
 from src.news_analyzer import NewsAnalyzer
 from src.database import Database
+from lib.price_feed import start_price_feed
 
 load_dotenv()
 
@@ -33,9 +34,10 @@ class AnalysisService:
             stocks_data = await self.data_collector.collect_stock_data()
             print(f"수집된 종목 수: {len(stocks_data)}")
             
-            # 2. 기술적 분석
+            # 2. 기술적 분석 (전 종목 지표를 종목 × 일자 패널에서 한 번에 계산)
+            technical_results = self.technical_analyzer.analyze_panel(stocks_data)
             for stock_data in stocks_data:
-                technical_signals = self.technical_analyzer.analyze(stock_data)
+                technical_signals = technical_results[stock_data['symbol']]
                 
                 # 3. 뉴스 분석
                 news_sentiment = await self.news_analyzer.analyze_stock_news(
@@ -102,6 +104,9 @@ class AnalysisService:
         """실시간 모니터링 (장중)"""
         print(f"[{datetime.now()}] 실시간 모니터링 시작")
         
+        # 키움 실시간 체결 구독 (자격증명이 없으면 yfinance 조회만 사용)
+        start_price_feed(self.data_collector.get_realtime_symbols())
+        
         while True:
             try:
                 # 실시간 데이터 수집 및 분석
@@ -9,8 +9,14 @@ import requests
 from bs4 import BeautifulSoup
 import asyncio
 import aiohttp
+import os
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from lib.price_feed import get_realtime_price
+from lib.ohlcv import yfinance_bars
+from lib.kiwoom import KiwoomAPI
+from lib.minute_bars import ingest_minute_bars
 
 
 class DataCollector:
@@ -40,6 +46,9 @@ class DataCollector:
             '214150.KQ',  # 클래시스
             '950140.KQ',  # 잉글우드랩
         ]
+        
+        # 분봉 수집용 키움 API (처음 필요할 때 생성)
+        self._minute_api: Optional[KiwoomAPI] = None
     
     async def collect_stock_data(self) -> List[Dict[str, Any]]:
         """주요 종목의 주식 데이터 수집"""
@@ -66,7 +75,7 @@ class DataCollector:
                         'current_price': float(current_price),
                         'change_rate': float(change_rate),
                         'volume': int(hist['Volume'][-1]),
-                        'historical_data': hist,
+                        'historical_data': yfinance_bars(hist),  # 표준 일봉 프레임 (과거 → 최신)
                         'updated_at': datetime.now()
                     }
                     
@@ -84,27 +93,77 @@ class DataCollector:
         all_symbols = self.kospi_symbols + self.kosdaq_symbols
         realtime_data = []
         
+        # 실시간 체결 피드가 갱신 중인 종목은 메모리 저장소에서 바로 읽음
+        pending_symbols = []
+        for symbol in all_symbols:
+            price_data = get_realtime_price(self._to_stock_code(symbol))
+            if price_data:
+                realtime_data.append({
+                    'symbol': price_data['stock_code'],
+                    'price': float(price_data['current_price']),
+                    'volume': int(price_data['volume']),
+                    'timestamp': datetime.fromisoformat(price_data['updated_at'])
+                })
+            else:
+                pending_symbols.append(symbol)
+        
+        if not pending_symbols:
+            return realtime_data
+        
+        # 키움 자격증명이 있으면 1분봉을 로컬 분봉 저장소에 증분 수집하고 마지막 분봉을 사용
+        minute_api = self._get_minute_api()
+        if minute_api is not None:
+            latest_bars = await asyncio.to_thread(
+                ingest_minute_bars, minute_api, [self._to_stock_code(symbol) for symbol in pending_symbols]
+            )
+            remaining = []
+            for symbol in pending_symbols:
+                bar = latest_bars.get(self._to_stock_code(symbol))
+                if bar is None:
+                    remaining.append(symbol)
+                    continue
+                realtime_data.append({
+                    'symbol': self._to_stock_code(symbol),
+                    'price': float(bar['close']),
+                    'volume': int(bar['volume']),
+                    'timestamp': bar['date'].to_pydatetime()
+                })
+            pending_symbols = remaining
+            if not pending_symbols:
+                return realtime_data
+        
         async with aiohttp.ClientSession() as session:
             tasks = []
-            for symbol in all_symbols:
+            for symbol in pending_symbols:
                 task = self._fetch_realtime_price(session, symbol)
                 tasks.append(task)
             
             results = await asyncio.gather(*tasks, return_exceptions=True)
             
             for result in results:
-                if isinstance(result, dict):
+                if isinstance(result, dict) and result:
                     realtime_data.append(result)
         
         return realtime_data
     
+    def _get_minute_api(self) -> Optional[KiwoomAPI]:
+        """분봉 수집용 키움 API (자격증명이 없으면 None)"""
+        if self._minute_api is None:
+            app_key = os.getenv('KIWOOM_APP_KEY')
+            secret_key = os.getenv('KIWOOM_SECRET_KEY')
+            account_no = os.getenv('KIWOOM_ACCOUNT_NO')
+            if app_key and secret_key and account_no:
+                use_mock = os.getenv('KIWOOM_USE_MOCK', 'False').lower() == 'true'
+                self._minute_api = KiwoomAPI(app_key, secret_key, account_no, use_mock=use_mock)
+        return self._minute_api
+    
     async def _fetch_realtime_price(self, session: aiohttp.ClientSession, symbol: str) -> Dict[str, Any]:
-        """개별 종목의 실시간 가격 조회"""
+        """개별 종목의 실시간 가격 조회 (키움 자격증명이 없을 때만 사용)"""
         try:
             ticker = yf.Ticker(symbol)
             
-            # 최근 5일 데이터로 실시간 가격 조회
-            hist = ticker.history(period="5d", interval="1m")
+            # 당일 1분봉의 마지막 값만 필요하므로 하루치만 조회
+            hist = ticker.history(period="1d", interval="1m")
             
             if not hist.empty:
                 latest_data = hist.iloc[-1]
@@ -119,6 +178,15 @@ class DataCollector:
             print(f"실시간 데이터 수집 실패 {symbol}: {e}")
             return {}
     
+    @staticmethod
+    def _to_stock_code(symbol: str) -> str:
+        """야후 심볼(005930.KS)을 종목코드(005930)로 변환"""
+        return symbol.replace('.KS', '').replace('.KQ', '')
+    
+    def get_realtime_symbols(self) -> List[str]:
+        """실시간 체결을 구독할 종목코드 목록"""
+        return [self._to_stock_code(symbol) for symbol in self.kospi_symbols + self.kosdaq_symbols]
+    
     def _get_stock_name(self, symbol: str) -> str:
         """종목 코드로 종목명 조회"""
         stock_names = {
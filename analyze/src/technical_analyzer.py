@@ -7,6 +7,9 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Any
 
+from lib.ohlcv import to_analysis_frame
+from lib.panel_indicators import BarPanel, compute_indicators, latest_values
+
 # ta 모듈이 없을 경우 대비
 try:
     import ta
@@ -24,9 +27,13 @@ class TechnicalAnalyzer:
         self.macd_slow = 26
         self.macd_signal = 9
     
+    def _history(self, stock_data: Dict[str, Any]) -> pd.DataFrame:
+        """historical_data를 Date/Open/High/Low/Close/Volume 형식으로 반환 (lib.ohlcv 표준 일봉 프레임도 허용)"""
+        return to_analysis_frame(stock_data['historical_data']).copy()
+    
     def analyze(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
         """종목의 기술적 분석 수행"""
-        df = stock_data['historical_data'].copy()
+        df = self._history(stock_data)
         
         if len(df) < 50:  # 최소 데이터 요구사항
             return {'error': '분석을 위한 충분한 데이터가 없습니다'}
@@ -52,6 +59,46 @@ class TechnicalAnalyzer:
             'analysis_timestamp': pd.Timestamp.now()
         }
     
+    def analyze_panel(self, stocks_data: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        여러 종목의 기술적 분석을 한 번에 수행합니다 (전 종목 일일 분석용).
+        지표는 종목 × 일자 패널에서 한 번에 계산하고(lib.panel_indicators), 종목별 결과는 analyze()와 같은 형식입니다.
+
+        Returns:
+            dict: {종목코드: analyze() 결과}
+        """
+        histories = {stock_data['symbol']: self._history(stock_data) for stock_data in stocks_data}
+        eligible = {symbol: df for symbol, df in histories.items() if len(df) >= 50}  # 최소 데이터 요구사항
+        results = {
+            symbol: {'error': '분석을 위한 충분한 데이터가 없습니다'}
+            for symbol in histories if symbol not in eligible
+        }
+        if not eligible:
+            return results
+
+        panel = BarPanel.from_frames(eligible)
+        latest = latest_values(compute_indicators(
+            panel,
+            macd_fast=self.macd_fast,
+            macd_slow=self.macd_slow,
+            macd_signal=self.macd_signal,
+            bollinger_window=self.bollinger_period,
+            bollinger_std=self.bollinger_std
+        ))
+        analysis_timestamp = pd.Timestamp.now()
+        for row, symbol in enumerate(panel.symbols):
+            df = eligible[symbol]
+            indicators = {name: float(values[row]) for name, values in latest.items()}
+            results[symbol] = {
+                'symbol': symbol,
+                'indicators': indicators,
+                'signals': self._generate_signals(indicators),
+                'support_resistance': self._calculate_support_resistance(df),
+                'trend_analysis': self._analyze_trend(df, indicators),
+                'analysis_timestamp': analysis_timestamp
+            }
+        return results
+    
     def _calculate_indicators(self, df: pd.DataFrame) -> Dict[str, Any]:
         """기술적 지표 계산"""
         indicators = {}
@@ -257,7 +304,7 @@ class TechnicalAnalyzer:
     
     def calculate_target_price(self, stock_data: Dict[str, Any]) -> Dict[str, float]:
         """목표가 계산"""
-        df = stock_data['historical_data'].copy()
+        df = self._history(stock_data)
         current_price = df['Close'].iloc[-1]
 
         # 볼린저 밴드 기반 목표가
@@ -299,7 +346,7 @@ class TechnicalAnalyzer:
                     'atr_history': ATR 추이
                 }
         """
-        df = stock_data['historical_data'].copy()
+        df = self._history(stock_data)
 
         if len(df) < period:
             return {
@@ -373,7 +420,7 @@ class TechnicalAnalyzer:
         if periods is None:
             periods = [14, 20, 40, 60]
 
-        df = stock_data['historical_data'].copy()
+        df = self._history(stock_data)
 
         if len(df) < max(periods):
             return {
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+수정주가 계수 테스트
+
+원주가/수정주가 봉 비교로 권리락 이벤트 찾기, 누적 계수 적용(가격 곱하기, 거래량 나누기),
+이벤트가 없는 구간의 복사 없는 반환, 이벤트 합치기를 확인합니다.
+"""
+
+import numpy as np
+
+from lib.adjustment import apply_adjustment, cumulative_factors, derive_adjustment_events, merge_events
+from lib.ohlcv import make_bars
+
+DAYS = np.busday_offset('2025-03-03', np.arange(60), roll='forward')
+
+
+def make_raw(count=60):
+    """원주가 일봉 (20번째 봉에 1:5 액면분할, 45번째 봉에 무상증자 권리락 반영)"""
+    close = np.where(np.arange(count) < 20, 250000, 50000) + np.arange(count) * 10
+    close = np.where(np.arange(count) < 45, close, (close / 1.25).astype(int))
+    return make_bars({'date': DAYS[:count], 'open': close - 100, 'high': close + 300,
+                      'low': close - 300, 'close': close, 'volume': np.full(count, 1000)})
+
+
+def test_apply_factors():
+    """권리락일 이전 봉에만 그 이후 이벤트 비율의 곱을 적용"""
+    raw = make_raw()
+    events = [(str(DAYS[20]), 0.2), (str(DAYS[45]), 0.8)]
+    factors = cumulative_factors(raw['date'].to_numpy(), events)
+    assert np.allclose(factors[[0, 19, 20, 44, 45, 59]], [0.16, 0.16, 0.8, 0.8, 1.0, 1.0])
+
+    columns = {column: raw[column].to_numpy() for column in raw.columns}
+    adjusted = apply_adjustment(columns, events)
+    assert adjusted['close'][0] == round(250000 * 0.16) and adjusted['close'][-1] == raw['close'].iloc[-1]
+    assert adjusted['volume'][0] == 6250 and adjusted['volume'][-1] == 1000  # 거래량은 계수로 나눔
+    assert adjusted['trade_amount'] is columns['trade_amount']
+    assert adjusted['close'].dtype == columns['close'].dtype
+
+    recent = {column: values[45:] for column, values in columns.items()}
+    assert apply_adjustment(recent, events) is recent  # 마지막 권리락일 이후 구간은 그대로
+    print("✅ 누적 수정 계수 적용 확인")
+
+
+def test_derive_events():
+    """원주가/수정주가 비교로 권리락일과 비율을 찾음 (원 단위 반올림 잡음 허용)"""
+    raw = make_raw()
+    events = [(str(DAYS[20]), 0.2), (str(DAYS[45]), 0.8)]
+    adjusted = make_bars(apply_adjustment({column: raw[column].to_numpy() for column in raw.columns}, events))
+
+    derived = derive_adjustment_events(raw, adjusted)
+    assert [ex_date for ex_date, _ in derived] == ['2025-03-31', '2025-05-05']
+    assert np.allclose([ratio for _, ratio in derived], [0.2, 0.8], atol=1e-5)
+    assert derive_adjustment_events(raw, raw) == []
+
+    # 일부 기간만 받은 경우에도 겹치는 날짜로 비교
+    assert [ex_date for ex_date, _ in derive_adjustment_events(raw.iloc[30:], adjusted.iloc[:50])] == ['2025-05-05']
+    print(f"✅ 수정 이벤트 찾기 확인 {derived}")
+
+
+def test_merge_events():
+    """같은 권리락일은 비율을 곱하고 날짜순으로 정렬"""
+    merged = merge_events([('2025-05-05', 0.8)], [('2025-03-31', 0.2), ('2025-05-05', 0.5)])
+    assert merged == [('2025-03-31', 0.2), ('2025-05-05', 0.4)]
+    print("✅ 수정 이벤트 합치기 확인")
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("수정주가 계수 테스트")
+    print("="*70)
+
+    try:
+        test_apply_factors()
+        test_derive_events()
+        test_merge_events()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
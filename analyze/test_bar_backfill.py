@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+전 종목 일봉 백필 테스트
+
+가짜 조회 함수로 동시 처리, 이미 최신인 종목 건너뛰기, 중단 후 체크포인트에서 재개,
+실패 종목 재시도, 다음 거래일의 새 작업을 확인합니다.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from lib.bar_backfill import BackfillCheckpoint, backfill_bars
+from lib.bar_store import BarStore
+from lib.ohlcv import make_bars
+
+# 2025-09-08(월) 장 마감 후
+NOW = datetime(2025, 9, 8, 18, 30)
+DAYS = np.busday_offset('2025-06-02', np.arange(70), roll='forward')  # 마지막 2025-09-05
+
+
+def make_history(until=len(DAYS)):
+    close = 10000 + np.arange(until)
+    return make_bars({'date': DAYS[:until], 'open': close, 'high': close, 'low': close,
+                      'close': close, 'volume': close})
+
+
+class FakeFetch:
+    """종목별 호출 기록, 동시 실행 수 측정, 지정 종목 실패"""
+
+    def __init__(self, failing=(), delay=0.01):
+        self.failing = set(failing)
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, code, since, adjusted=True):
+        with self._lock:
+            self.calls.append((code, since))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if code in self.failing:
+                raise RuntimeError('연결 오류')
+            bars = make_bars({
+                'date': np.array(['2025-09-08'], dtype='datetime64[D]'),
+                'open': [20000], 'high': [20000], 'low': [20000], 'close': [20000], 'volume': [1],
+            })
+            history = make_history()
+            if since is None:
+                return make_bars({column: np.concatenate([history[column], bars[column]]) for column in history})
+            recent = history[history['date'] >= np.datetime64(since)]
+            return make_bars({column: np.concatenate([recent[column], bars[column]]) for column in history})
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_concurrent_backfill():
+    """전체 종목을 동시에 채우고, 이미 최신인 종목은 조회하지 않음"""
+    codes = [f'{i:06d}' for i in range(1, 41)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BarStore(tmp_dir)
+        store.write('000001', make_history(60))  # 증분 조회 대상
+        fetch = FakeFetch()
+
+        report = backfill_bars(store, codes, fetch, workers=8, now=NOW)
+        assert report['updated'] == 40 and not report['failed'] and report['run_id'] == '2025-09-08'
+        assert report['symbols_per_min'] > 0 and fetch.max_active > 1
+        assert dict(fetch.calls)['000001'] is not None  # 저장된 봉이 있으면 증분 조회
+        assert store.count('000001') == 71 and store.count('000040') == 71
+
+        calls = len(fetch.calls)
+        again = backfill_bars(store, codes, fetch, workers=8, now=NOW)
+        assert again['resumed'] == 40 and len(fetch.calls) == calls
+        print(f"✅ 40개 종목 백필: 최대 동시 {fetch.max_active}건, {report['symbols_per_min']}종목/분")
+
+
+def test_resume_after_failure():
+    """실패/중단된 종목만 다음 실행에서 다시 처리"""
+    codes = [f'{i:06d}' for i in range(1, 31)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BarStore(tmp_dir)
+        checkpoint_path = os.path.join(tmp_dir, 'checkpoint.json')
+
+        first = backfill_bars(store, codes, FakeFetch(failing={'000003', '000017'}), workers=4,
+                              checkpoint_path=checkpoint_path, now=NOW)
+        assert sorted(first['failed']) == ['000003', '000017'] and first['updated'] == 28
+        with open(checkpoint_path) as f:
+            saved = json.load(f)
+        assert len(saved['done']) == 28 and sorted(saved['failed']) == ['000003', '000017']
+
+        fetch = FakeFetch()
+        second = backfill_bars(store, codes, fetch, workers=4, checkpoint_path=checkpoint_path, now=NOW)
+        assert sorted({code for code, _ in fetch.calls}) == ['000003', '000017']
+        assert second['resumed'] == 28 and second['updated'] == 2 and not second['failed']
+        print("✅ 실패 종목만 재시도 확인")
+
+
+def test_new_run_ignores_old_checkpoint():
+    """다른 기준 거래일의 체크포인트는 무시 (다음 날 작업은 처음부터)"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'checkpoint.json')
+        checkpoint = BackfillCheckpoint(path, '2025-09-05')
+        checkpoint.mark('005930')
+        checkpoint.save()
+
+        assert BackfillCheckpoint(path, '2025-09-05').is_done('005930')
+        assert not BackfillCheckpoint(path, '2025-09-08').is_done('005930')
+        print("✅ 기준 거래일별 체크포인트 확인")
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("전 종목 일봉 백필 테스트")
+    print("="*70)
+
+    try:
+        test_concurrent_backfill()
+        test_resume_after_failure()
+        test_new_run_ignores_old_checkpoint()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
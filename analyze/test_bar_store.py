@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+로컬 일봉 저장소 테스트
+
+임시 디렉터리에 만든 저장소로 덧붙이기, 마지막(장중) 봉 교체, 수정주가 변경/공백 감지와 전체 재기록,
+메모리 맵 읽기(복사 없음), 원주가/수정주가 읽기, 최신 여부 판단, 증분 갱신과 권리락 반영 흐름,
+읽는 중 전체 재기록과 종목별 쓰기 잠금, 메모리 맵 캐시 상한(열린 파일 수 유지)을 확인합니다.
+"""
+
+import asyncio
+import gc
+import os
+import tempfile
+import threading
+from datetime import date, datetime
+
+import numpy as np
+
+from lib.bar_store import (
+    MERGE_ADJUSTED, MERGE_APPENDED, MERGE_GAP, MERGE_UNCHANGED, OVERLAP_BARS,
+    BarStore, latest_final_day, refresh_bars, refresh_bars_async
+)
+from lib.adjustment import apply_adjustment
+from lib.ohlcv import make_bars
+
+# 평일 영업일 (2025-06-02 월 ~)
+DAYS = np.busday_offset('2025-06-02', np.arange(80), roll='forward')
+
+
+def make_series(start, stop, bump=0):
+    """DAYS[start:stop] 구간의 표준 일봉 (종가 = 10000 + 인덱스 + bump)"""
+    index = np.arange(start, stop)
+    close = 10000 + index + bump
+    return make_bars({
+        'date': DAYS[start:stop], 'open': close - 5, 'high': close + 10,
+        'low': close - 10, 'close': close, 'volume': index * 100 + 1,
+    })
+
+
+def test_write_append_and_read():
+    """전체 기록 후 새 봉 덧붙이기, 마지막 봉은 덮어씀, 기간 조회는 메모리 맵 뷰"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BarStore(tmp_dir)
+        store.write('005930', make_series(0, 50))
+        before = store.columns('005930')['close']
+
+        # 마지막 저장 봉(장중 값)을 바뀐 값으로 다시 받고 새 봉 3개 추가
+        delta = make_series(45, 53)
+        delta.loc[delta.index[4], 'close'] = 99999  # DAYS[49] = 저장된 마지막 봉
+        assert store.merge('005930', delta) == MERGE_APPENDED
+        assert store.merge('005930', make_series(48, 49)) == MERGE_UNCHANGED
+
+        frame = store.read_frame('005930')
+        assert len(frame) == 53 and frame['date'].is_monotonic_increasing and frame['date'].is_unique
+        assert frame['close'].iloc[49] == 99999 and frame['close'].iloc[-1] == 10052
+        assert before[-1] == 99999  # 이미 매핑한 배열에도 반영 (같은 파일)
+
+        window = store.read('005930', start='2025-06-10', end=date(2025, 6, 13))
+        assert np.datetime_as_string(window['date'], unit='D').tolist() == \
+            ['2025-06-10', '2025-06-11', '2025-06-12', '2025-06-13']
+        recent = store.read('005930', last=5)
+        assert isinstance(recent['close'], np.memmap) and len(recent['close']) == 5
+
+        tail = store.read_frame('005930', last=10)
+        assert np.shares_memory(tail['close'].to_numpy(), store.columns('005930')['close'])
+        print("✅ 덧붙이기/마지막 봉 교체/메모리 맵 읽기 확인")
+
+
+def test_gap_and_adjustment_rewrite():
+    """받은 봉이 이어지지 않거나 과거 값이 바뀌면 병합하지 않고 새 세대로 재기록"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BarStore(tmp_dir)
+        store.write('000660', make_series(0, 30))
+        old = store.columns('000660')
+
+        assert store.merge('000660', make_series(31, 35)) == MERGE_GAP
+        assert store.merge('000660', make_series(25, 35, bump=-5000)) == MERGE_ADJUSTED
+        assert store.count('000660') == 30
+
+        store.write('000660', make_series(0, 35, bump=-5000))
+        assert store.read_frame('000660')['close'].iloc[0] == 5000
+        assert old['close'][0] == 10000  # 이전 세대를 읽던 쪽은 기존 값 그대로
+        print("✅ 공백/수정주가 변경 시 전체 재기록 확인")
+
+
+def test_is_fresh():
+    """확정된 최근 영업일 봉이 장 마감 후에 저장되어야 최신"""
+    assert latest_final_day(datetime(2025, 6, 13, 10, 0)) == date(2025, 6, 12)
+    assert latest_final_day(datetime(2025, 6, 13, 16, 0)) == date(2025, 6, 13)
+    assert latest_final_day(datetime(2025, 6, 14, 12, 0)) == date(2025, 6, 13)  # 토요일
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BarStore(tmp_dir)
+        assert not store.is_fresh('035420')
+        store.write('035420', make_series(0, 10))  # 마지막 봉 2025-06-13 (금)
+        # 저장 시각(현재)은 2025-06-13 장 마감 이후이므로 주말에는 최신
+        assert store.is_fresh('035420', now=datetime(2025, 6, 15, 9, 0))
+        assert not store.is_fresh('035420', now=datetime(2025, 6, 16, 16, 0))
+        print("✅ 최신 여부 판단 확인")
+
+
+def test_raw_and_adjusted_reads():
+    """원주가로 저장, 수정주가는 읽을 때 계수 적용 (권리락 이전 구간만 새 배열)"""
+    raw = make_series(0, 30)
+    adjusted = make_series(0, 30)
+    for column in ('open', 'high', 'low', 'close'):
+        adjusted.loc[:9, column] = (adjusted.loc[:9, column] * 0.5).round().astype(np.int32)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BarStore(tmp_dir)
+        store.write('005930', raw, adjusted=adjusted)
+        [(ex_date, ratio)] = store.adjustments('005930')
+        assert ex_date == str(DAYS[10]) and abs(ratio - 0.5) < 1e-4
+
+        assert (np.abs(store.read_frame('005930')['close'] - adjusted['close']) <= 1).all()  # 원 단위 반올림 차이
+        assert store.read_frame('005930', adjusted=False)['close'].tolist() == raw['close'].tolist()
+        assert store.read('005930', end=DAYS[3].astype(object))['volume'][0] == 2  # 거래량은 계수로 나눔
+        recent = store.read('005930', start=DAYS[10].astype(object))
+        assert isinstance(recent['close'], np.memmap)  # 권리락일 이후 구간은 복사 없음
+        print("✅ 원주가/수정주가 읽기 확인")
+
+
+class FakeSource:
+    """원주가와 수정 이벤트를 가진 가짜 공급자 (수정주가는 이벤트를 적용해 만듦)"""
+
+    def __init__(self, raw, events=()):
+        self.raw = raw
+        self.events = list(events)
+        self.calls = []
+
+    def __call__(self, since, adjusted=True):
+        self.calls.append((since, adjusted))
+        bars = self.raw
+        if adjusted:
+            bars = make_bars(apply_adjustment({column: bars[column].to_numpy() for column in bars.columns}, self.events))
+        if since is None:
+            return bars
+        return bars[bars['date'] >= np.datetime64(since)].reset_index(drop=True)
+
+
+def test_refresh_bars():
+    """처음에는 전체 조회, 이후에는 마지막 봉 앞 OVERLAP_BARS개부터 증분 조회, 새 권리락은 증분 원주가로 이벤트만 추가"""
+    source = FakeSource(make_series(0, 40), [(str(DAYS[20]), 0.5)])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BarStore(tmp_dir)
+        now = datetime(2025, 7, 30, 16, 0)
+
+        frame = refresh_bars(store, '005930', source, now=now)
+        assert len(frame) == 40 and frame['close'].iloc[0] == 5000
+        assert source.calls == [(None, False), (None, True)]
+        source.raw = make_series(0, 44)
+        assert len(refresh_bars(store, '005930', source, now=now)) == 44
+        assert source.calls[-1] == (DAYS[40 - OVERLAP_BARS].astype(object), True)
+
+        # 액면분할(1:5) 권리락: 전체 재조회 없이 같은 구간의 원주가만 한 번 더 받음
+        source.raw = make_series(0, 45)
+        source.raw.loc[43:, ['open', 'high', 'low', 'close']] //= 5
+        source.events.append((str(DAYS[43]), 0.2))
+        frame = refresh_bars(store, '005930', source, now=now)
+        since = DAYS[44 - OVERLAP_BARS].astype(object)
+        assert source.calls[-2:] == [(since, True), (since, False)]
+        events = store.adjustments('005930')
+        assert [ex_date for ex_date, _ in events] == [str(DAYS[20]), str(DAYS[43])]
+        assert np.allclose([ratio for _, ratio in events], [0.5, 0.2], atol=1e-4)
+        assert len(frame) == 45 and frame['close'].iloc[0] == 1000 and frame['close'].iloc[42] == 2008
+        assert store.read_frame('005930', adjusted=False)['close'].tolist() == source.raw['close'].tolist()
+
+        async def fetch_async(since, adjusted=True):
+            return source(since, adjusted)
+
+        source.raw = make_series(0, 46)
+        source.raw.loc[43:, ['open', 'high', 'low', 'close']] //= 5
+        frame = asyncio.run(refresh_bars_async(store, '005930', fetch_async, now=now))
+        assert len(frame) == 46 and source.calls[-1][0] is not None
+        assert all(since is not None for since, _ in source.calls[2:])
+        print(f"✅ 증분 갱신 확인 ({len(source.calls)}회 조회)")
+
+
+def test_concurrent_rewrite_and_locks():
+    """meta를 읽은 뒤 다른 쪽이 재기록해 이전 세대가 지워져도 새 세대로 읽고, 쓰기 잠금은 종목별"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        writer = BarStore(tmp_dir)
+        writer.write('005930', make_series(0, 30))
+
+        class RacingStore(BarStore):
+            """첫 meta 읽기 직후 다른 저장소 인스턴스(다른 프로세스 역할)가 전체 재기록"""
+            racing = True
+
+            def _meta(self, code):
+                meta = super()._meta(code)
+                if self.racing:
+                    self.racing = False
+                    writer.write(code, make_series(0, 35, bump=-5000))
+                return meta
+
+        frame = RacingStore(tmp_dir).read_frame('005930')
+        assert len(frame) == 35 and frame['close'].iloc[0] == 5000
+
+        # 한 종목의 쓰기 잠금을 잡고 있어도 다른 종목은 기다리지 않음
+        held, release = threading.Event(), threading.Event()
+
+        def hold():
+            with writer._locked('005930'):
+                held.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        held.wait(5)
+        done = threading.Thread(target=writer.write, args=('000660', make_series(0, 10)))
+        done.start()
+        done.join(2)
+        blocked = done.is_alive()
+        release.set()
+        thread.join()
+        done.join()
+        assert not blocked and writer.count('000660') == 10
+        print("✅ 읽는 중 재기록/종목별 쓰기 잠금 확인")
+
+
+def open_fd_count():
+    """현재 프로세스의 열린 파일 디스크립터 수 (Linux /proc 기준, 없으면 None)"""
+    try:
+        return len(os.listdir('/proc/self/fd'))
+    except OSError:
+        return None
+
+
+def test_map_cache_bound():
+    """캐시 상한보다 많은 종목을 읽어도 메모리 맵(파일 디스크립터)은 최근 종목만큼만 남음"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BarStore(tmp_dir, map_cache_size=4)
+        codes = [f'{i:06d}' for i in range(40)]
+        for code in codes:
+            store.write(code, make_series(0, 10))
+
+        for code in codes[:4]:
+            assert len(store.read(code)['close']) == 10
+        gc.collect()
+        before = open_fd_count()
+        for code in codes:
+            assert len(store.read(code)['close']) == 10
+        gc.collect()
+        after = open_fd_count()
+
+        assert list(store._maps) == codes[-4:]
+        if before is not None:
+            assert after <= before, (before, after)
+        print(f"✅ 메모리 맵 캐시 상한 확인 (열린 파일 {before} → {after})")
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("로컬 일봉 저장소 테스트")
+    print("="*70)
+
+    try:
+        test_write_append_and_read()
+        test_gap_and_adjustment_rewrite()
+        test_is_fresh()
+        test_raw_and_adjusted_reads()
+        test_refresh_bars()
+        test_concurrent_rewrite_and_locks()
+        test_map_cache_bound()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+테스트 공용 도우미
+
+여러 테스트 파일에서 함께 쓰는 임의 일봉 생성과 가짜 토큰 브로커입니다 (테스트 함수 없음).
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+from lib.ohlcv import make_bars
+
+
+def make_history(seed, count):
+    """임의 보행 일봉 (표준 프레임)"""
+    rng = np.random.default_rng(seed)
+    close = np.maximum(1000, 50000 + np.cumsum(rng.normal(0, 800, count))).round()
+    spread = rng.uniform(100, 1500, count).round()
+    return make_bars({
+        'date': np.busday_offset('2024-01-02', np.arange(count), roll='forward'),
+        'open': close + rng.uniform(-500, 500, count).round(), 'high': close + spread,
+        'low': close - spread, 'close': close, 'volume': rng.integers(1000, 100000, count),
+    })
+
+
+class FakeTokenBroker:
+    """항상 같은 토큰을 돌려주고 무효화 요청을 기록하는 브로커 (KiwoomTokenBroker 대체)"""
+
+    token_expires_at = None
+
+    def __init__(self, app_key: str = 'test-app'):
+        """
+        Args:
+            app_key: 앱 키 (WebSocket 세션 레지스트리 키, 테스트 파일마다 다르게)
+        """
+        self.app_key = app_key
+        self.invalidated: List[Optional[str]] = []
+
+    def get_token(self, force_refresh=False):
+        return 'token'
+
+    def peek_token(self):
+        return 'token'
+
+    def invalidate(self, token=None):
+        self.invalidated.append(token)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+증분 지표 상태 테스트
+
+봉을 하나씩 반영한 지표가 전체 이력 일괄 계산(lib.panel_indicators)과 같은지, JSON 직렬화 후 이어서 갱신,
+진행 중인 봉 미리보기, 일봉 저장소와 함께 저장한 상태의 증분 갱신/재계산 조건을 확인합니다.
+"""
+
+import json
+import tempfile
+
+import numpy as np
+
+from lib.bar_store import BarStore
+from lib.indicator_state import IndicatorSet, refresh_indicators
+from lib.ohlcv import make_bars
+from lib.panel_indicators import BarPanel, compute_indicators
+from test_helpers import make_history
+
+NAMES = list(IndicatorSet().values())
+
+
+def bar_dicts(bars):
+    return bars[['high', 'low', 'close', 'volume']].to_dict('records')
+
+
+def assert_close(actual, expected, label):
+    for name in NAMES:
+        assert np.isclose(actual[name], expected[name], rtol=1e-9, atol=1e-6, equal_nan=True), (label, name)
+
+
+def panel_values(bars):
+    indicators = compute_indicators(BarPanel.from_frames({'x': bars}))
+    return {name: values[0, -1] for name, values in indicators.items()}
+
+
+def test_matches_batch():
+    """봉마다 갱신한 지표가 전체 이력 일괄 계산의 같은 시점 값과 같음"""
+    bars = make_history(1, 150)
+    indicators = compute_indicators(BarPanel.from_frames({'x': bars}))
+    state = IndicatorSet()
+    for i, bar in enumerate(bar_dicts(bars)):
+        assert_close(state.update(bar), {name: values[0, i] for name, values in indicators.items()}, i)
+    print("✅ 봉별 증분 갱신이 일괄 계산과 일치")
+
+
+def test_serialize_and_preview():
+    """JSON으로 저장했다 복원해도 이어서 같은 값, preview는 상태를 바꾸지 않음"""
+    bars = bar_dicts(make_history(2, 120))
+    state = IndicatorSet()
+    for bar in bars[:80]:
+        state.update(bar)
+
+    restored = IndicatorSet.from_dict(json.loads(json.dumps(state.to_dict())))
+    before = state.values()
+    tick = {**bars[80], 'close': bars[80]['close'] + 300}
+    assert_close(restored.preview(tick), state.preview(tick), 'preview')
+    assert_close(state.values(), before, 'unchanged')
+
+    for bar in bars[80:]:
+        assert_close(restored.update(bar), state.update(bar), 'restored')
+    print("✅ 직렬화/미리보기 확인")
+
+
+def test_refresh_with_store():
+    """저장소 상태는 새 봉만 반영, 마지막(장중) 봉은 미리보기, 전체 재기록/새 권리락이면 다시 계산"""
+    history = make_history(3, 130)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BarStore(tmp_dir)
+        partial = history.head(100).copy()
+        partial.loc[99, ['high', 'close']] += 700  # 장중 값
+        store.write('005930', partial)
+        assert_close(refresh_indicators(store, '005930'), panel_values(partial), 'initial')
+        saved = store.read_state('005930', 'indicators')
+        assert saved['state']['count'] == 99 and saved['through'].startswith(str(history['date'].iloc[98].date()))
+
+        # 장중 마지막 봉 교체 + 새 봉 덧붙이기 → 99번째 이후만 반영
+        store.merge('005930', history.iloc[95:103])
+        assert_close(refresh_indicators(store, '005930'), panel_values(history.head(103)), 'delta')
+        assert store.read_state('005930', 'indicators')['state']['count'] == 102
+
+        # 전체 재기록(권리락 이벤트 포함)이면 과거 수정주가가 바뀌므로 처음부터 다시 계산
+        adjusted = history.copy()
+        for column in ('open', 'high', 'low', 'close'):
+            adjusted.loc[:49, column] = (adjusted.loc[:49, column] * 0.5).round()
+        store.write('005930', history, adjusted=make_bars({column: adjusted[column].to_numpy() for column in adjusted}))
+        expected = panel_values(store.read_frame('005930'))
+        assert_close(refresh_indicators(store, '005930'), expected, 'rebuild')
+        assert store.read_state('005930', 'indicators')['state']['count'] == 129
+        assert refresh_indicators(store, '999999') == {}
+        print("✅ 저장소 지표 상태 증분 갱신/재계산 확인")
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("증분 지표 상태 테스트")
+    print("="*70)
+
+    try:
+        test_matches_batch()
+        test_serialize_and_preview()
+        test_refresh_with_store()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+KIS 일봉 구간 분할 조회 테스트
+
+한 번에 100개 봉까지만 주는 기간별시세 API를 흉내 낸 가짜 세션으로
+구간 분할, 동시 조회, 병합/중복 제거, 요청 한도 버킷 공유, 거부된 토큰만 갱신하는 재시도를 확인합니다.
+"""
+
+import os
+import json
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+import lib.hantu as hantu
+from lib.rate_limiter import KIS_RATE_LIMIT_PER_SEC
+from lib.token_cache import TokenFileCache, token_cache_key
+
+MAX_ROWS = 100
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode('utf-8')
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeKISSession:
+    """inquire-daily-itemchartprice 흉내 (평일만, 최신순, 최대 100개)"""
+
+    def __init__(self, listed_on=None, delay=0.02):
+        self.listed_on = listed_on
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        with self._lock:
+            self.calls.append((params['FID_INPUT_DATE_1'], params['FID_INPUT_DATE_2']))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+
+        start = np.datetime64(datetime.strptime(params['FID_INPUT_DATE_1'], '%Y%m%d').date())
+        end = np.datetime64(datetime.strptime(params['FID_INPUT_DATE_2'], '%Y%m%d').date())
+        if self.listed_on is not None:
+            start = max(start, self.listed_on)
+        days = np.arange(start, end + 1) if start <= end else np.array([], dtype='datetime64[D]')
+        days = days[np.is_busday(days)][::-1][:MAX_ROWS]
+        rows = [
+            {
+                'stck_bsop_date': str(day).replace('-', ''),
+                'stck_oprc': '1000', 'stck_hgpr': '1010', 'stck_lwpr': '990',
+                'stck_clpr': str(1000 + int((day - np.datetime64('2020-01-01')).astype(int))),
+                'acml_vol': '10', 'acml_tr_pbmn': '10000',
+            }
+            for day in days
+        ]
+        with self._lock:
+            self.active -= 1
+        return FakeResponse({'rt_cd': '0', 'msg1': '정상처리', 'output1': {}, 'output2': rows})
+
+
+class FakeAuthSession:
+    """valid_token이 아닌 토큰은 만료 오류로 거부하고, 발급 요청에는 새 토큰을 줌 (요청마다 timeout 기록)"""
+
+    def __init__(self, valid_token):
+        self.valid_token = valid_token
+        self.timeouts = []
+        self.issued = 0
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        self.timeouts.append(timeout)
+        if headers['authorization'] != f'Bearer {self.valid_token}':
+            return FakeResponse({'rt_cd': '1', 'msg_cd': 'EGW00123', 'msg1': '기간이 만료된 token 입니다.'}, 401)
+        return FakeResponse({'rt_cd': '0', 'output': {}})
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        self.timeouts.append(timeout)
+        self.issued += 1
+        self.valid_token = f'issued-{self.issued}'
+        return FakeResponse({'access_token': self.valid_token, 'expires_in': 86400})
+
+
+def make_api(session):
+    """토큰 캐시에 미리 저장한 토큰으로 네트워크 없이 KISApi 생성"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, 'kis_token.json')
+        os.environ.update({
+            'PROD_APP_KEY': 'kis-daily-app', 'PROD_APP_SECRET': 'secret',
+            'PROD_ACCOUNT_NO': '00000000', 'KIS_TOKEN_CACHE_PATH': cache_path,
+        })
+        TokenFileCache(cache_path).store(
+            token_cache_key('kis-daily-app', hantu.KIS_BASE_URL), 'cached-token', datetime.now() + timedelta(hours=12)
+        )
+        try:
+            api = hantu.KISApi()
+        finally:
+            for key in ('PROD_APP_KEY', 'PROD_APP_SECRET', 'PROD_ACCOUNT_NO', 'KIS_TOKEN_CACHE_PATH'):
+                os.environ.pop(key, None)
+    api.session = session
+    return api
+
+
+def test_windows_cover_range():
+    """구간은 빈틈/겹침 없이 전체 기간을 덮고, 각 구간은 평일 100일 미만"""
+    start, end = datetime(2023, 1, 1), datetime(2025, 9, 8)
+    windows = hantu.KISApi._daily_windows(start, end)
+
+    assert windows[0][1] == end and windows[-1][0] == start
+    for (newer_start, _), (_, older_end) in zip(windows, windows[1:]):
+        assert older_end == newer_start - timedelta(days=1)
+    for window_start, window_end in windows:
+        weekdays = np.busday_count(window_start.date(), window_end.date() + timedelta(days=1))
+        assert weekdays < MAX_ROWS
+    print(f"✅ {len(windows)}개 구간 분할 확인")
+
+
+def test_deep_history_concurrent():
+    """300개 봉 요청 → 여러 구간을 동시에 조회해 중복 없이 오름차순으로 병합"""
+    session = FakeKISSession()
+    api = make_api(session)
+    end = datetime(2025, 9, 8)
+
+    bars = api.get_daily_bars('005930', days=300, end_date=end)
+
+    assert len(bars) == 300
+    assert bars['date'].is_monotonic_increasing and bars['date'].is_unique
+    assert str(bars['date'].iloc[-1].date()) == '2025-09-08'
+    assert len(session.calls) >= 4 and session.max_active > 1
+    print(f"✅ 300개 봉: {len(session.calls)}개 구간, 최대 동시 {session.max_active}건")
+
+
+def test_explicit_range_and_listing_date():
+    """start_date 지정 시 기간 전체 반환, 상장 전 구간은 비어 있어도 무시"""
+    session = FakeKISSession(listed_on=np.datetime64('2025-03-03'))
+    api = make_api(session)
+
+    bars = api.get_daily_bars('005930', start_date=datetime(2024, 1, 1), end_date=datetime(2025, 9, 8))
+    expected = int(np.busday_count('2025-03-03', '2025-09-09'))
+    assert len(bars) == expected
+    assert str(bars['date'].iloc[0].date()) == '2025-03-03'
+
+    combined = api.get_stock_data_combined('005930', days=20)
+    assert len(combined) == 20 and combined['date'].is_monotonic_increasing
+    print(f"✅ 기간 지정 조회: {len(bars)}개 봉 (상장일 이후)")
+
+
+def test_shared_rate_limit_bucket():
+    """KIS 요청은 앱 키 단위 버킷 하나를 공유 (한도는 공유 속도 제한기 설정, KISApi 생성 전에 잡은 버킷도 같음)"""
+    limiter = hantu.get_rate_limiter()
+    limiter.acquire(('kis-early', 'kis'))
+    assert limiter.get_wait_times()['kis-ea:kis']['rate'] == KIS_RATE_LIMIT_PER_SEC
+
+    session = FakeKISSession(delay=0)
+    api = make_api(session)
+    api.get_daily_bars('005930', days=250)
+
+    status = api.rate_limiter.get_wait_times()
+    assert 'kis-da:kis' in status
+    assert status['kis-da:kis']['rate'] == KIS_RATE_LIMIT_PER_SEC
+    print("✅ 요청 한도 버킷 공유 확인")
+
+
+def test_rejected_token_refresh():
+    """거부된 토큰이 이미 교체됐으면 새로 발급하지 않고, 현재 토큰이 거부됐을 때만 발급 (모든 요청에 timeout)"""
+    session = FakeAuthSession('cached-token')
+    api = make_api(session)
+    url = f'{api.base_url}/uapi/domestic-stock/v1/quotations/inquire-price'
+
+    # 다른 스레드가 이미 갱신한 뒤 도착한 옛 토큰 요청의 거부 → 현재 토큰으로 재시도
+    stale_headers = {**api._get_headers('FHKST01010100'), 'authorization': 'Bearer stale-token'}
+    assert api._get(url, stale_headers, {})['rt_cd'] == '0'
+    assert session.issued == 0 and api.access_token == 'cached-token'
+
+    # 현재 토큰이 거부되면 발급 (디스크 캐시의 같은 토큰은 다시 쓰지 않음)
+    session.valid_token = 'server-side-new'
+    assert api._get(url, api._get_headers('FHKST01010100'), {})['rt_cd'] == '0'
+    assert session.issued == 1 and api.access_token == 'issued-1'
+    assert session.timeouts and all(timeout == hantu.REQUEST_TIMEOUT for timeout in session.timeouts)
+    print("✅ 거부된 토큰만 갱신 + 요청 타임아웃 확인")
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("KIS 일봉 구간 분할 조회 테스트")
+    print("="*70)
+
+    try:
+        test_windows_cover_range()
+        test_deep_history_concurrent()
+        test_explicit_range_and_listing_date()
+        test_shared_rate_limit_bucket()
+        test_rejected_token_refresh()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+키움증권 응답 컬럼 디코더 테스트
+
+일봉 차트/조건검색 응답이 행 단위 변환과 같은 값의 NumPy 컬럼으로 바뀌는지 확인합니다.
+"""
+
+import time
+
+import numpy as np
+
+from lib.kiwoom import KiwoomAPI
+from lib.kiwoom_decoder import (
+    chart_to_dataframe, decode_condition_results, decode_daily_chart,
+    moving_average, parse_dates, parse_signed
+)
+
+
+def make_chart_rows(count):
+    """최신순 일봉 행 (ka10081 형식)"""
+    rows = []
+    for i in range(count):
+        day = np.datetime64('2025-09-08') - np.timedelta64(i, 'D')
+        rows.append({
+            'dt': str(day).replace('-', ''),
+            'open_pric': f'+{70000 + i}',
+            'high_pric': f'{70500 + i}',
+            'low_pric': f'-{69500 + i}',
+            'cur_prc': f'{70100 + i}',
+            'trde_qty': f'{1000 + i}',
+            'trde_prica': f'{50 + i}',
+        })
+    return rows
+
+
+def test_parse_signed_and_dates():
+    """부호/0 채움 문자열과 YYYYMMDD 일자 변환"""
+    assert parse_signed(['-00000100', '+0070000', ' 12', '', None]).tolist() == [-100, 70000, 12, 0, 0]
+    assert parse_signed(['-0.71', '+1.5'], dtype=np.float64).tolist() == [-0.71, 1.5]
+    assert parse_signed(['abc', '7']).tolist() == [0, 7]
+    assert parse_dates(['20240229', '20251231']).tolist() == [
+        np.datetime64('2024-02-29').item(), np.datetime64('2025-12-31').item()
+    ]
+    print("✅ 부호 문자열/일자 변환 확인")
+
+
+def test_decode_daily_chart():
+    """일봉 행 → int64/datetime64 컬럼, 부호 제거, 순서 뒤집기, 일자 없는 행 제외"""
+    rows = make_chart_rows(3) + [{'cur_prc': '100'}]
+    columns = decode_daily_chart(rows)
+
+    assert columns['date'].dtype == np.dtype('datetime64[D]')
+    assert columns['close'].dtype == np.int64
+    assert columns['close'].tolist() == [70100, 70101, 70102]
+    assert columns['low'].tolist() == [69500, 69501, 69502]  # '-' 부호 제거
+    assert str(columns['date'][0]) == '2025-09-08'
+
+    oldest_first = decode_daily_chart(rows, oldest_first=True)
+    assert oldest_first['close'].tolist() == [70102, 70101, 70100]
+
+    df = chart_to_dataframe(oldest_first)
+    assert list(df.columns) == ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+    assert df['Close'].iloc[-1] == 70100
+    print("✅ 일봉 컬럼 변환 확인")
+
+
+def test_decode_condition_results():
+    """조건검색 결과: 'A' 접두사 제거, 현재가 부호 제거 (하락 종목도 양수)"""
+    rows = [
+        {'9001': 'A005930', '302': '삼성전자', '10': '-00069900', '11': '-600', '12': '-0.85', '25': '5'},
+        {'jmcode': '000660', '302': 'SK하이닉스', '10': '+00180000', '25': '2'},
+    ]
+    columns = decode_condition_results(rows)
+
+    assert columns['stock_code'].tolist() == ['005930', '000660']
+    assert columns['current_price'].tolist() == [69900, 180000]
+    assert columns['change_price'].tolist() == [-600, 0]
+    assert columns['change_rate'].tolist() == [-0.85, 0.0]
+
+    stocks = KiwoomAPI._format_condition_results('7', {'data': rows})
+    assert stocks[0]['current_price'] == 69900.0
+    assert stocks[1]['stock_code'] == '000660' and stocks[1]['raw_data'] is rows[1]
+    print("✅ 조건검색 컬럼 변환 확인")
+
+
+def test_moving_average():
+    """누적합 이동평균이 단순 합계 결과와 같음"""
+    values = np.arange(1, 11, dtype=np.int64)
+    result = moving_average(values, 5)
+
+    assert np.isnan(result[:4]).all()
+    assert result[4:].tolist() == [sum(range(i - 3, i + 2)) / 5 for i in range(4, 10)]
+    assert np.isnan(moving_average(values, 20)).all()
+    print("✅ 이동평균 확인")
+
+
+def test_decode_speed():
+    """600봉 변환 + 변화율/이동평균 계산: 컬럼 연산이 행 단위 반복보다 빠름"""
+    rows = make_chart_rows(600)
+
+    def columnar():
+        columns = decode_daily_chart(rows, oldest_first=True)
+        closes = columns['close'].astype(float)
+        change_rates = np.diff(closes) / closes[:-1] * 100
+        return change_rates, [moving_average(closes, window) for window in (5, 10, 20, 60)]
+
+    def row_by_row():
+        # 기존 라우터 방식: 행마다 float() 변환 후 슬라이스 합계로 이동평균
+        closes = [float(row['cur_prc']) for row in rows]
+        data = []
+        for i, row in enumerate(rows):
+            item = {
+                'date': row['dt'][:4] + '-' + row['dt'][4:6] + '-' + row['dt'][6:8],
+                'open': float(row['open_pric']), 'high': float(row['high_pric']),
+                'low': float(row['low_pric']), 'close': closes[i],
+                'volume': int(row['trde_qty']), 'trade_amount': int(row['trde_prica']),
+            }
+            for window in (5, 10, 20, 60):
+                if i + window - 1 < len(closes):
+                    item[f'ma{window}'] = sum(closes[i:i + window]) / window
+            data.append(item)
+        return data
+
+    timings = {}
+    for name, fn in (('columnar', columnar), ('row_by_row', row_by_row)):
+        started = time.perf_counter()
+        for _ in range(20):
+            fn()
+        timings[name] = (time.perf_counter() - started) / 20
+
+    assert timings['columnar'] < timings['row_by_row']
+    print(f"✅ 600봉 변환+지표: 컬럼 {timings['columnar'] * 1000:.2f}ms, 행 단위 {timings['row_by_row'] * 1000:.2f}ms")
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("키움증권 응답 컬럼 디코더 테스트")
+    print("="*70)
+
+    try:
+        test_parse_signed_and_dates()
+        test_decode_daily_chart()
+        test_decode_condition_results()
+        test_moving_average()
+        test_decode_speed()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+키움증권 연속조회(cont-yn/next-key) 반복자 테스트
+
+실제 API 호출 없이 가짜 세션으로 페이지를 흉내 내어 연속조회 동작을 확인합니다.
+"""
+
+import asyncio
+
+import httpx
+
+from lib.kiwoom import KiwoomAPI
+from lib.kiwoom_async import AsyncKiwoomAPI
+from lib.rate_limiter import RateLimiter
+from test_helpers import FakeTokenBroker
+
+
+def make_chart_pages(num_pages, bars_per_page):
+    """ka10081 응답 페이지 목록 생성 (최신순)"""
+    pages = []
+    day = 0
+    for page in range(num_pages):
+        bars = []
+        for _ in range(bars_per_page):
+            bars.append({'dt': f'D{day:04d}', 'cur_prc': str(1000 + day)})
+            day += 1
+        pages.append({'stk_dt_pole_chart_qry': bars, 'return_code': 0, 'return_msg': 'OK'})
+    return pages
+
+
+class FakeResponse:
+    def __init__(self, body, headers):
+        self.status_code = 200
+        self._body = body
+        self.headers = headers
+
+    def json(self):
+        return dict(self._body)
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """next-key를 페이지 번호로 사용하는 가짜 requests 세션"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        self.requests.append(dict(headers))
+        index = int(headers['next-key'] or 0)
+        has_next = index + 1 < len(self.pages)
+        return FakeResponse(self.pages[index], {
+            'cont-yn': 'Y' if has_next else 'N',
+            'next-key': str(index + 1) if has_next else '',
+        })
+
+
+def make_api(pages):
+    api = KiwoomAPI('app', 'secret', '')
+    api.token_broker = FakeTokenBroker()
+    api.rate_limiter = RateLimiter(rate=1000, capacity=1000)
+    api.session = FakeSession(pages)
+    return api
+
+
+def test_follows_continuation():
+    """마지막 페이지까지 next-key를 따라감"""
+    api = make_api(make_chart_pages(3, 4))
+
+    bars = list(api.iter_daily_chart('005930'))
+
+    assert [bar['dt'] for bar in bars] == [f'D{i:04d}' for i in range(12)]
+    assert [req['cont-yn'] for req in api.session.requests] == ['N', 'Y', 'Y']
+    assert [req['next-key'] for req in api.session.requests] == ['', '1', '2']
+    print(f"✅ 3페이지 연속조회 → {len(bars)}개 봉")
+
+
+def test_lazy_and_bounded():
+    """필요한 만큼만 페이지를 요청 (max_bars, max_pages)"""
+    api = make_api(make_chart_pages(5, 4))
+    bars = list(api.iter_daily_chart('005930', max_bars=6))
+    assert len(bars) == 6
+    assert len(api.session.requests) == 2
+    print(f"✅ max_bars=6 → {len(api.session.requests)}페이지만 요청")
+
+    api = make_api(make_chart_pages(5, 4))
+    pages = list(api.iter_pages('/api/dostk/chart', 'ka10081', {}, max_pages=2))
+    assert len(pages) == 2
+    assert len(api.session.requests) == 2
+
+    api = make_api(make_chart_pages(5, 4))
+    iterator = api.iter_daily_chart('005930')
+    next(iterator)
+    assert len(api.session.requests) == 1  # 소비한 만큼만 조회
+    print("✅ max_pages 및 지연 조회 확인")
+
+
+def test_stops_on_error():
+    """오류 응답을 받으면 연속조회 중단"""
+    pages = make_chart_pages(3, 2)
+    pages[1] = {'return_code': 1, 'return_msg': 'error'}
+    api = make_api(pages)
+
+    bars = list(api.iter_daily_chart('005930'))
+    assert len(bars) == 2
+    assert len(api.session.requests) == 2
+    print("✅ 오류 응답 시 중단 확인")
+
+
+def test_stocks_info_pages():
+    """ka10099는 페이지 단위 리스트를 반환"""
+    pages = [
+        {'list': [{'code': '000001'}, {'code': '000002'}], 'return_code': 0},
+        {'list': [{'code': '000003'}], 'return_code': 0},
+    ]
+    api = make_api(pages)
+
+    sizes = [len(stocks) for stocks in api.iter_stocks_info('0')]
+    assert sizes == [2, 1]
+    print(f"✅ 종목정보 페이지 크기: {sizes}")
+
+
+def test_async_iterator():
+    """비동기 클라이언트도 같은 방식으로 연속조회"""
+    pages = make_chart_pages(3, 4)
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers['next-key'])
+        index = int(request.headers['next-key'] or 0)
+        has_next = index + 1 < len(pages)
+        return httpx.Response(200, json=pages[index], headers={
+            'cont-yn': 'Y' if has_next else 'N',
+            'next-key': str(index + 1) if has_next else '',
+        })
+
+    async def run():
+        import lib.kiwoom_async as kiwoom_async
+
+        api = AsyncKiwoomAPI('app', 'secret', '')
+        api.token_broker = FakeTokenBroker()
+        api.rate_limiter = RateLimiter(rate=1000, capacity=1000)
+
+        client = httpx.AsyncClient(base_url=api.base_url, transport=httpx.MockTransport(handler))
+        kiwoom_async._clients[(api.base_url, id(asyncio.get_running_loop()))] = client
+        try:
+            return [bar async for bar in api.iter_daily_chart('005930', max_bars=10)]
+        finally:
+            await kiwoom_async.close_async_clients()
+
+    bars = asyncio.run(run())
+    assert len(bars) == 10
+    assert seen == ['', '1', '2']
+    print(f"✅ 비동기 연속조회 → {len(bars)}개 봉")
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("키움증권 연속조회 반복자 테스트")
+    print("="*70)
+
+    try:
+        test_follows_continuation()
+        test_lazy_and_bounded()
+        test_stops_on_error()
+        test_stocks_info_pages()
+        test_async_iterator()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
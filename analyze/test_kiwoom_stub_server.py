@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+키움증권 대역 서버 테스트
+
+실제 서버 없이 KiwoomAPI/AsyncKiwoomAPI/WebSocket 세션이 대역 서버로 토큰 발급,
+연속조회, 기록 재생, 요청 한도(429), 조건검색을 수행하는지 확인합니다.
+"""
+
+import os
+import json
+import time
+import asyncio
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import requests
+
+from lib.kiwoom import KiwoomAPI
+from lib.kiwoom_async import AsyncKiwoomAPI, close_async_clients
+from lib.kiwoom_ws import KiwoomWebSocketSession, parse_condition_events
+from lib.kiwoom_stub_server import KiwoomStubServer
+
+
+@contextmanager
+def stub_env(stub):
+    """클라이언트가 대역 서버를 쓰도록 환경변수 설정 (토큰 디스크 캐시 비활성화)"""
+    env = {**stub.env(), 'KIWOOM_TOKEN_CACHE_PATH': ''}
+    saved = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def issue_token(stub):
+    response = requests.post(stub.base_url + '/oauth2/token', json={
+        'grant_type': 'client_credentials', 'appkey': 'raw-app', 'secretkey': 'raw-secret',
+    })
+    return response.json()['token']
+
+
+def test_chart_paging():
+    """ka10081 연속조회: 페이지를 따라 과거 방향으로 끊김 없이 조회, 토큰은 한 번만 발급"""
+    with KiwoomStubServer(page_size=50, pages=3) as stub, stub_env(stub):
+        api = KiwoomAPI('stub-paging-app', 'secret', '00000000')
+        assert api.base_url == stub.base_url
+
+        bars = list(api.iter_daily_chart('005930', base_dt='20250908'))
+        dates = [bar['dt'] for bar in bars]
+        assert len(bars) == 150
+        assert dates[0] == '20250908' and dates == sorted(dates, reverse=True) and len(set(dates)) == 150
+
+        # 같은 요청은 같은 합성 데이터
+        assert api.get_daily_chart('005930', base_dt='20250908')['stk_dt_pole_chart_qry'] == bars[:50]
+        assert stub.stats['rest:ka10081'] == 4 and stub.stats['tokens_issued'] == 1
+        print(f"✅ 연속조회 {len(bars)}봉, 요청 {stub.stats['rest:ka10081']}회")
+
+
+def test_fixture_replay():
+    """rest.jsonl 기록 재생: 본문이 같은 기록 우선, 없으면 같은 TR/페이지 기록"""
+    with tempfile.TemporaryDirectory() as fixtures_dir:
+        recorded = {
+            'stk_cd': '005930', 'return_code': 0, 'return_msg': '정상적으로 처리되었습니다',
+            'stk_dt_pole_chart_qry': [{'dt': '20240102', 'open_pric': '+78200', 'high_pric': '79800',
+                                       'low_pric': '78200', 'cur_prc': '79600', 'trde_qty': '17142847',
+                                       'trde_prica': '1356958'}],
+        }
+        with open(os.path.join(fixtures_dir, 'rest.jsonl'), 'w', encoding='utf-8') as f:
+            f.write(json.dumps({
+                'path': '/api/dostk/chart', 'api_id': 'ka10081', 'next_key': '',
+                'request': {'stk_cd': '005930', 'base_dt': '20240102', 'upd_stkpc_tp': '1'},
+                'response': recorded, 'headers': {'cont-yn': 'N', 'next-key': ''},
+            }, ensure_ascii=False) + '\n')
+
+        with KiwoomStubServer(fixtures_dir=fixtures_dir) as stub, stub_env(stub):
+            api = KiwoomAPI('stub-replay-app', 'secret', '00000000')
+            result = api.get_daily_chart('005930', base_dt='20240102')
+            assert result['stk_dt_pole_chart_qry'] == recorded['stk_dt_pole_chart_qry']
+            assert result['cont-yn'] == 'N'
+
+            other = api.get_daily_chart('000660', base_dt='20250101')
+            assert other['stk_dt_pole_chart_qry'][0]['cur_prc'] == '79600'
+            assert stub.stats['replayed'] == 2
+
+            # 기록이 없는 TR은 합성 데이터
+            assert api.get_account_evaluation()['stk_acnt_evlt_prst'][0]['stk_cd'] == '005930'
+        print("✅ 기록 재생 확인")
+
+
+def test_auth_and_rate_limit():
+    """발급하지 않은 토큰은 401, (토큰, api-id)별 초당 한도를 넘으면 429 (return_code 5)"""
+    with KiwoomStubServer(rate_limit=2) as stub:
+        url = stub.base_url + '/api/dostk/stkinfo'
+        response = requests.post(url, headers={'authorization': 'Bearer unknown', 'api-id': 'ka10099'}, json={})
+        assert response.status_code == 401
+
+        headers = {'authorization': f'Bearer {issue_token(stub)}', 'api-id': 'ka10099'}
+        codes = [requests.post(url, headers=headers, json={'mrkt_tp': '0'}).status_code for _ in range(5)]
+        assert codes == [200, 200, 429, 429, 429]
+        assert requests.post(url, headers=headers, json={}).json()['return_code'] == 5
+
+        # 다른 TR은 별도 한도
+        headers['api-id'] = 'kt00004'
+        assert requests.post(stub.base_url + '/api/dostk/acnt', headers=headers, json={}).status_code == 200
+
+        time.sleep(1.0)
+        headers['api-id'] = 'ka10099'
+        assert requests.post(url, headers=headers, json={'mrkt_tp': '0'}).status_code == 200
+        assert requests.get(stub.base_url + '/stub/stats').json()['throttled'] == 4
+        print("✅ 인증 401 / 요청 한도 429 확인")
+
+
+def test_latency_with_async_client():
+    """응답 지연이 있어도 비동기 클라이언트는 동시에 요청하므로 전체 시간이 지연 합보다 짧음"""
+    latency = 0.2
+    codes = ('005930', '000660', '035420', '035720')
+    with KiwoomStubServer(latency_ms=latency * 1000, page_size=20, pages=1) as stub, stub_env(stub):
+        api = AsyncKiwoomAPI('stub-async-app', 'secret', '00000000')
+
+        async def fetch_all():
+            try:
+                await api.get_access_token()
+                started = time.perf_counter()
+                results = await asyncio.gather(*[
+                    api.get_daily_chart(code) for code in codes
+                ])
+                return results, time.perf_counter() - started
+            finally:
+                await close_async_clients()
+
+        results, elapsed = asyncio.run(fetch_all())
+        assert all(len(result['stk_dt_pole_chart_qry']) == 20 for result in results)
+        # 벽시계 상한은 스레드 스케줄링/연결 수립에 따라 흔들리므로 순차 처리 하한(지연 합)과만 비교
+        assert latency <= elapsed < len(codes) * latency, elapsed
+        print(f"✅ 지연 {latency * 1000:.0f}ms x {len(codes)}요청 동시 처리: {elapsed * 1000:.0f}ms")
+
+
+def test_websocket_conditions():
+    """WebSocket LOGIN/CNSRLST/CNSRREQ, 실시간 조건검색(REAL '02') 이벤트"""
+    with KiwoomStubServer(tick_interval=0.05) as stub, stub_env(stub):
+        api = KiwoomAPI('stub-ws-app', 'secret', '00000000')
+        session = KiwoomWebSocketSession.get(api.token_broker)
+        assert session.websocket_url == stub.websocket_url
+        try:
+            conditions = api.get_condition_list()
+            assert [condition['name'] for condition in conditions] == ['골든크로스', '거래량급증', '신고가']
+
+            stocks = api.search_condition('1')
+            assert len(stocks) == 4 and all(stock['current_price'] > 0 for stock in stocks)
+
+            events = []
+            received = threading.Event()
+
+            def on_message(message):
+                events.extend(parse_condition_events(message))
+                if len(events) >= 3:
+                    received.set()
+
+            session.add_listener(on_message)
+            assert session.call(session.request_condition_search('2', search_type='1'), timeout=5)
+            assert received.wait(5)
+            assert all(event['condition_id'] == '2' for event in events)
+            assert session.call(session.request_condition_clear('2'), timeout=5)
+            session.remove_listener(on_message)
+            print(f"✅ 조건검색 목록/검색/실시간 이벤트 {len(events)}건 확인")
+        finally:
+            KiwoomWebSocketSession._sessions.pop((api.token_broker.app_key, stub.websocket_url), None)
+            session.call(session.close(), timeout=5)
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("키움증권 대역 서버 테스트")
+    print("="*70)
+
+    try:
+        test_chart_paging()
+        test_fixture_replay()
+        test_auth_and_rate_limit()
+        test_latency_with_async_client()
+        test_websocket_conditions()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+키움증권/KIS 토큰 브로커 테스트
+
+실제 토큰 발급 호출 없이 토큰 공유, single-flight 갱신, 디스크 캐시(프로세스 간 잠금) 동작을 확인합니다.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import multiprocessing
+from datetime import datetime, timedelta
+
+from lib.kiwoom import KiwoomAPI, KiwoomTokenBroker
+from lib.token_cache import TokenFileCache, token_cache_key
+import lib.hantu as hantu
+
+
+class FakeBroker(KiwoomTokenBroker):
+    """_issue_token을 가짜로 대체한 브로커 (호출 횟수 기록)"""
+
+    def __init__(self, *args, lifetime: timedelta = timedelta(hours=24), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lifetime = lifetime
+        self.issue_count = 0
+
+    def _issue_token(self):
+        self.issue_count += 1
+        time.sleep(0.05)  # 네트워크 지연 흉내
+        return f'token-{self.issue_count}', datetime.now() + self.lifetime
+
+
+def test_single_flight_refresh():
+    """동시 요청이 몰려도 토큰 발급은 한 번만 수행"""
+    broker = FakeBroker('app', 'secret', 'https://example.com', cache_path='')
+
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(broker.get_token())) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert broker.issue_count == 1
+    assert set(tokens) == {'token-1'}
+    print(f"✅ 10개 동시 요청 → 토큰 발급 {broker.issue_count}회")
+
+
+def test_refresh_ahead_of_expiry():
+    """만료 여유시간 안으로 들어오면 미리 갱신"""
+    broker = FakeBroker('app', 'secret', 'https://example.com', cache_path='',
+                        lifetime=timedelta(minutes=5), refresh_margin=timedelta(minutes=10))
+
+    assert broker.get_token() == 'token-1'
+    # 유효기간(5분)이 여유시간(10분)보다 짧으므로 다음 호출에서 재발급
+    assert broker.get_token() == 'token-2'
+    print("✅ 만료 전 선제 갱신 확인")
+
+
+def test_invalidate_only_stale_token():
+    """이미 갱신된 토큰은 오래된 토큰 무효화 요청에 영향받지 않음"""
+    broker = FakeBroker('app', 'secret', 'https://example.com', cache_path='')
+
+    stale = broker.get_token()
+    broker.invalidate(stale)
+    fresh = broker.get_token()
+    broker.invalidate(stale)
+
+    assert fresh != stale
+    assert broker.get_token() == fresh
+    assert broker.issue_count == 2
+    print("✅ 오래된 토큰만 무효화 확인")
+
+
+def test_disk_cache_shared_between_brokers():
+    """디스크 캐시로 다른 프로세스(브로커)가 토큰을 재사용"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, 'kiwoom_token.json')
+
+        first = FakeBroker('app', 'secret', 'https://example.com', cache_path=cache_path)
+        token = first.get_token()
+
+        second = FakeBroker('app', 'secret', 'https://example.com', cache_path=cache_path)
+        assert second.get_token() == token
+        assert second.issue_count == 0
+
+        # 다른 app_key는 별도 항목
+        other = FakeBroker('other-app', 'secret', 'https://example.com', cache_path=cache_path)
+        other.get_token()
+        assert other.issue_count == 1
+
+        with open(cache_path, 'r') as f:
+            assert 'other-app' not in f.read()  # 앱 키 원문은 저장하지 않음
+
+    print("✅ 디스크 캐시 공유 확인")
+
+
+def _issue_in_process(cache_path, start_event, results):
+    """별도 프로세스에서 새 브로커로 토큰 요청 (발급 여부와 토큰 반환)"""
+    broker = FakeBroker('app', 'secret', 'https://example.com', cache_path=cache_path)
+    start_event.wait()
+    token = broker.get_token()
+    results.put((token, broker.issue_count))
+
+
+def test_cross_process_single_issue():
+    """동시에 시작한 여러 프로세스 중 한 곳만 발급하고 나머지는 캐시 토큰 재사용"""
+    context = multiprocessing.get_context('fork')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, 'kiwoom_token.json')
+        start_event, results = context.Event(), context.Queue()
+        processes = [
+            context.Process(target=_issue_in_process, args=(cache_path, start_event, results))
+            for _ in range(6)
+        ]
+        for process in processes:
+            process.start()
+        start_event.set()
+        outcomes = [results.get(timeout=10) for _ in processes]
+        for process in processes:
+            process.join()
+
+    assert len({token for token, _ in outcomes}) == 1
+    assert sum(issue_count for _, issue_count in outcomes) == 1
+    print("✅ 6개 프로세스 동시 시작 → 토큰 발급 1회")
+
+
+def test_rejected_token_not_reloaded():
+    """서버가 거부한 토큰은 디스크 캐시에 남아 있어도 다시 쓰지 않음"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, 'kiwoom_token.json')
+        broker = FakeBroker('app', 'secret', 'https://example.com', cache_path=cache_path)
+
+        rejected = broker.get_token()
+        broker.invalidate(rejected)
+        assert broker.get_token() == 'token-2'
+
+        # 새 토큰이 캐시에 저장되어 다른 브로커도 그것을 사용
+        other = FakeBroker('app', 'secret', 'https://example.com', cache_path=cache_path)
+        assert other.get_token() == 'token-2' and other.issue_count == 0
+    print("✅ 거부된 토큰 재사용 방지 확인")
+
+
+def test_kis_reuses_cached_token():
+    """KISApi는 캐시에 유효한 토큰이 있으면 발급 없이 재사용, 만료가 가까우면 재발급"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, 'kis_token.json')
+        saved_env = {key: os.environ.get(key) for key in
+                     ('PROD_APP_KEY', 'PROD_APP_SECRET', 'PROD_ACCOUNT_NO', 'KIS_TOKEN_CACHE_PATH')}
+        os.environ.update({
+            'PROD_APP_KEY': 'kis-app', 'PROD_APP_SECRET': 'secret',
+            'PROD_ACCOUNT_NO': '00000000', 'KIS_TOKEN_CACHE_PATH': cache_path,
+        })
+        issued = []
+        original_issue = hantu.KISApi._issue_access_token
+
+        def fake_issue(self):
+            issued.append(self)
+            self.access_token = f'kis-token-{len(issued)}'
+            self.token_expires_at = datetime.now() + timedelta(hours=24)
+            self.token_cache.store(token_cache_key(self.app_key, self.base_url),
+                                   self.access_token, self.token_expires_at)
+            return self.access_token
+
+        hantu.KISApi._issue_access_token = fake_issue
+        try:
+            cache = TokenFileCache(cache_path)
+            key = token_cache_key('kis-app', hantu.KIS_BASE_URL)
+            cache.store(key, 'cached-token', datetime.now() + timedelta(hours=12))
+            api = hantu.KISApi()
+            assert api.access_token == 'cached-token' and not issued
+            assert api._get_headers('FHKST01010100')['authorization'] == 'Bearer cached-token'
+
+            # 만료 30분 전 이내로 들어온 토큰은 갱신
+            cache.store(key, 'expiring-token', datetime.now() + timedelta(minutes=10))
+            api = hantu.KISApi()
+            assert api.access_token == 'kis-token-1' and len(issued) == 1
+            assert cache.load(key)[0] == 'kis-token-1'
+        finally:
+            hantu.KISApi._issue_access_token = original_issue
+            for key_name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key_name, None)
+                else:
+                    os.environ[key_name] = value
+    print("✅ KIS 토큰 캐시 재사용/선제 갱신 확인")
+
+
+def test_instances_share_broker():
+    """같은 app_key로 만든 KiwoomAPI 인스턴스는 같은 브로커를 공유"""
+    api1 = KiwoomAPI('shared-app', 'secret', '')
+    api2 = KiwoomAPI('shared-app', 'secret', '')
+    api3 = KiwoomAPI('shared-app', 'secret', '', use_mock=True)
+
+    assert api1.token_broker is api2.token_broker
+    assert api1.token_broker is not api3.token_broker
+    print("✅ 인스턴스 간 브로커 공유 확인")
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("키움증권 토큰 브로커 테스트")
+    print("="*70)
+
+    try:
+        test_single_flight_refresh()
+        test_refresh_ahead_of_expiry()
+        test_invalidate_only_stale_token()
+        test_disk_cache_shared_between_brokers()
+        test_cross_process_single_issue()
+        test_rejected_token_not_reloaded()
+        test_kis_reuses_cached_token()
+        test_instances_share_broker()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+키움증권 WebSocket 세션 테스트
+
+로컬 WebSocket 서버로 키움 서버를 흉내 내어 연결 재사용, PING 응답,
+(trnm, seq) 기반 응답 매칭, 실시간 데이터 전달을 확인합니다.
+"""
+
+import asyncio
+import json
+import time
+
+import websockets
+
+from lib.kiwoom import KiwoomAPI
+from lib.kiwoom_ws import KiwoomWebSocketSession, REAL_WEBSOCKET_URL, _get_loop, parse_condition_events
+from test_helpers import FakeTokenBroker
+
+
+class FakeKiwoomServer:
+    """키움 WebSocket 서버 흉내 (조건식별 응답 지연을 다르게 줘서 순서를 뒤섞음)"""
+
+    def __init__(self):
+        self.connections = 0
+        self.received = []
+        self.replied = 0
+        self.pending_at_request = []  # CNSRREQ를 받을 때까지 보낸 검색 응답 수
+        self.pong = asyncio.Event()
+        self.server = None
+        self.url = None
+
+    async def start(self):
+        self.server = await websockets.serve(self.handler, '127.0.0.1', 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.url = f'ws://127.0.0.1:{port}'
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handler(self, websocket):
+        self.connections += 1
+        async for raw in websocket:
+            message = json.loads(raw)
+            self.received.append(message)
+            trnm = message['trnm']
+
+            if trnm == 'LOGIN':
+                await websocket.send(json.dumps({'trnm': 'LOGIN', 'return_code': 0}))
+                await websocket.send(json.dumps({'trnm': 'PING'}))
+            elif trnm == 'PING':
+                self.pong.set()
+            elif trnm == 'CNSRLST':
+                await websocket.send(json.dumps({
+                    'trnm': 'CNSRLST', 'return_code': 0, 'data': [['5', '대왕개미'], ['7', '신고가']]
+                }))
+            elif trnm == 'CNSRREQ':
+                self.pending_at_request.append(self.replied)
+                asyncio.create_task(self.reply_search(websocket, message['seq']))
+
+    async def reply_search(self, websocket, seq):
+        await asyncio.sleep(0.1 if seq == '5' else 0.02)
+        await websocket.send(json.dumps({
+            'trnm': 'CNSRREQ', 'return_code': 0, 'seq': f' {seq} ',
+            'data': [{'9001': f'A00000{seq}', '302': f'종목{seq}', '10': '1000'}],
+        }))
+        self.replied += 1
+        # 요청과 짝이 없는 실시간 데이터
+        await websocket.send(json.dumps({'trnm': 'REAL', 'data': [{'item': f'00000{seq}'}]}))
+
+
+def run(coro):
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result(10)
+
+
+def test_session_reuses_connection_and_matches_responses():
+    """여러 요청이 한 연결을 공유하고, 응답 순서와 상관없이 요청에 맞는 응답을 받음"""
+    server = FakeKiwoomServer()
+    run(server.start())
+    session = KiwoomWebSocketSession(FakeTokenBroker('ws-app'), server.url)
+    real_messages = []
+    session.add_listener(real_messages.append)
+
+    try:
+        started = time.monotonic()
+
+        async def search_both():
+            return await asyncio.gather(
+                session.request_condition_search('5'),
+                session.request_condition_search('7'),
+            )
+
+        slow, fast = session.call(search_both(), timeout=10)
+        elapsed = time.monotonic() - started
+
+        assert slow['data'][0]['9001'] == 'A000005'
+        assert fast['data'][0]['9001'] == 'A000007'
+        assert elapsed < 1.0, elapsed  # 고정 대기 없음
+
+        assert session.call(session.request_condition_list(), timeout=10) == [['5', '대왕개미'], ['7', '신고가']]
+        assert server.connections == 1
+        # CNSRLST 사전 조회는 동시 검색이 있어도 연결당 한 번 (+ 직접 조회 1회)
+        assert [m['trnm'] for m in server.received].count('CNSRLST') == 2
+
+        run(asyncio.wait_for(server.pong.wait(), 5))
+        assert len(real_messages) == 2
+        print(f"✅ 조건검색 2건 동시 처리 {elapsed:.2f}초, 연결 {server.connections}회, PING 응답 확인")
+    finally:
+        session.call(session.close(), timeout=5)
+        run(server.stop())
+
+
+def test_reconnects_after_disconnect():
+    """서버가 연결을 끊으면 다음 요청에서 다시 연결"""
+    server = FakeKiwoomServer()
+    run(server.start())
+    session = KiwoomWebSocketSession(FakeTokenBroker('ws-app'), server.url)
+
+    try:
+        assert session.call(session.request_condition_list(), timeout=10)
+        session.call(session.websocket.close(), timeout=5)
+        time.sleep(0.1)
+        assert session.call(session.request_condition_list(), timeout=10)
+        assert server.connections == 2
+        print("✅ 연결 종료 후 재연결 확인")
+    finally:
+        session.call(session.close(), timeout=5)
+        run(server.stop())
+
+
+def test_kiwoom_api_uses_shared_session():
+    """KiwoomAPI.search_condition은 앱 키별 공유 세션을 사용"""
+    server = FakeKiwoomServer()
+    run(server.start())
+    broker = FakeTokenBroker('ws-app')
+    session = KiwoomWebSocketSession(broker, server.url)
+    KiwoomWebSocketSession._sessions[(broker.app_key, REAL_WEBSOCKET_URL)] = session
+
+    try:
+        api = KiwoomAPI(broker.app_key, 'secret', '')
+        api.token_broker = broker
+
+        conditions = api.get_condition_list()
+        results = api.search_condition('7')
+
+        assert conditions == [{'id': '5', 'name': '대왕개미'}, {'id': '7', 'name': '신고가'}]
+        assert results[0]['stock_code'] == '000007'
+        assert results[0]['current_price'] == 1000.0
+        assert server.connections == 1
+        print("✅ KiwoomAPI 공유 세션 사용 확인")
+    finally:
+        KiwoomWebSocketSession._sessions.pop((broker.app_key, REAL_WEBSOCKET_URL), None)
+        session.call(session.close(), timeout=5)
+        run(server.stop())
+
+
+def test_condition_catalog_cache():
+    """조건식 목록은 앱 키별 세션에 캐시되어 이름 조회 + 검색이 검색 1회 왕복으로 끝남"""
+    server = FakeKiwoomServer()
+    run(server.start())
+    broker = FakeTokenBroker('ws-app')
+    session = KiwoomWebSocketSession(broker, server.url)
+    KiwoomWebSocketSession._sessions[(broker.app_key, REAL_WEBSOCKET_URL)] = session
+
+    def sent(trnm):
+        return [m['trnm'] for m in server.received].count(trnm)
+
+    try:
+        api = KiwoomAPI(broker.app_key, 'secret', '')
+        api.token_broker = broker
+
+        assert api.find_condition_id('신고가') == '7'
+        assert api.search_condition('7')[0]['stock_code'] == '000007'
+        assert api.find_condition_id('대왕개미') == '5'
+        assert sent('CNSRLST') == 1  # 목록 조회가 연결당 사전 조회를 겸함
+
+        # 명시적 새로고침과 TTL 만료 시에만 다시 조회
+        assert api.get_condition_list(force_refresh=True)
+        assert sent('CNSRLST') == 2
+        session.catalog_ttl = 0
+        assert api.get_condition_list()
+        assert sent('CNSRLST') == 3
+        session.catalog_ttl = 600
+
+        # 목록에 없는 이름은 한 번 새로 조회한 뒤 None
+        assert api.find_condition_id('없는조건') is None
+        assert sent('CNSRLST') == 4
+
+        session.invalidate_condition_catalog()
+        assert api.get_condition_list() == [{'id': '5', 'name': '대왕개미'}, {'id': '7', 'name': '신고가'}]
+        assert sent('CNSRLST') == 5
+        assert server.connections == 1
+        print(f"✅ 조건식 목록 캐시 확인 (CNSRLST {sent('CNSRLST')}회)")
+    finally:
+        KiwoomWebSocketSession._sessions.pop((broker.app_key, REAL_WEBSOCKET_URL), None)
+        session.call(session.close(), timeout=5)
+        run(server.stop())
+
+
+def test_search_conditions_pipelined():
+    """search_conditions: 한 세션에서 CNSRREQ를 응답을 기다리지 않고 연달아 보내고 seq로 결과를 모음"""
+    server = FakeKiwoomServer()
+    run(server.start())
+    broker = FakeTokenBroker('ws-app')
+    session = KiwoomWebSocketSession(broker, server.url)
+    KiwoomWebSocketSession._sessions[(broker.app_key, REAL_WEBSOCKET_URL)] = session
+
+    try:
+        api = KiwoomAPI(broker.app_key, 'secret', '')
+        api.token_broker = broker
+
+        results = api.search_conditions(['5', '7', ' 7', '3'])
+
+        assert list(results) == ['5', '7', '3']  # 중복 조건식은 한 번만 요청
+        assert results['5'][0]['stock_code'] == '000005'
+        assert results['7'][0]['stock_name'] == '종목7'
+        assert results['3'][0]['stock_code'] == '000003'
+
+        # 모든 CNSRREQ가 첫 응답 전에 전송됨 (조건식마다 왕복을 기다리지 않음)
+        assert server.pending_at_request == [0, 0, 0]
+        assert [m['trnm'] for m in server.received].count('CNSRLST') == 1
+        assert server.connections == 1
+        print(f"✅ 조건식 {len(results)}개 일괄 검색 (연결 {server.connections}회)")
+    finally:
+        KiwoomWebSocketSession._sessions.pop((broker.app_key, REAL_WEBSOCKET_URL), None)
+        session.call(session.close(), timeout=5)
+        run(server.stop())
+
+
+def test_parse_condition_events():
+    """실시간 조건검색(REAL type '02') 편입/이탈 이벤트 파싱"""
+    message = {
+        'trnm': 'REAL',
+        'data': [
+            {'type': '02', 'name': '조건검색', 'item': '005930',
+             'values': {'841': '7 ', '9001': 'A005930', '843': 'I', '20': '093012'}},
+            {'type': '02', 'item': '000660', 'values': {'841': '5', '9001': '000660', '843': 'D', '20': '100000'}},
+            {'type': '0B', 'item': '005930', 'values': {'10': '70000'}},  # 체결 데이터는 무시
+        ],
+    }
+
+    events = parse_condition_events(message)
+
+    assert events == [
+        {'condition_id': '7', 'stock_code': '005930', 'action': 'I', 'time': '093012'},
+        {'condition_id': '5', 'stock_code': '000660', 'action': 'D', 'time': '100000'},
+    ]
+    assert parse_condition_events({'trnm': 'CNSRREQ', 'data': []}) == []
+    print("✅ 실시간 조건검색 이벤트 파싱 확인")
+
+
+def test_wait_disconnected():
+    """구독자는 연결이 끊길 때까지 기다렸다가 재등록"""
+    server = FakeKiwoomServer()
+    run(server.start())
+    session = KiwoomWebSocketSession(FakeTokenBroker('ws-app'), server.url)
+
+    try:
+        session.call(session.ensure_connected(), timeout=10)
+        waiter = session.submit(session.wait_disconnected())
+        time.sleep(0.05)
+        assert not waiter.done()
+
+        run(server.stop())
+        waiter.result(5)
+        assert not session.connected
+        print("✅ 연결 끊김 대기 확인")
+    finally:
+        session.call(session.close(), timeout=5)
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("키움증권 WebSocket 세션 테스트")
+    print("="*70)
+
+    try:
+        test_session_reuses_connection_and_matches_responses()
+        test_reconnects_after_disconnect()
+        test_kiwoom_api_uses_shared_session()
+        test_condition_catalog_cache()
+        test_search_conditions_pipelined()
+        test_parse_condition_events()
+        test_wait_disconnected()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+증권사 API 호출 계측 테스트
+
+지연 히스토그램/분위수, 예외 기록, 그리고 대역 서버를 상대로 한 키움 호출에서
+TR별 횟수/바이트/연속조회/재시도/토큰 발급이 기록되는지 확인합니다.
+"""
+
+import os
+import json
+import logging
+
+import lib.kiwoom as kiwoom
+from lib.kiwoom import KiwoomAPI
+from lib.kiwoom_stub_server import KiwoomStubServer
+from lib.metrics import BrokerMetrics, get_metrics, measure
+
+
+def test_histogram_and_quantiles():
+    """고정 구간 히스토그램에서 p50/p95 추정, 총 소요 시간 순 정렬"""
+    metrics = BrokerMetrics()
+    for _ in range(90):
+        metrics.observe('kiwoom', 'ka10081', 0.020)
+    for _ in range(10):
+        metrics.observe('kiwoom', 'ka10081', 0.400, status=200, response_bytes=1000)
+    metrics.observe('kis', 'FHKST01010100', 0.003, status=500)
+
+    snapshot = metrics.snapshot()
+    chart = snapshot['calls']['kiwoom:ka10081']
+    assert list(snapshot['calls']) == ['kiwoom:ka10081', 'kis:FHKST01010100']
+    assert chart['count'] == 100 and chart['errors'] == 0
+    assert chart['p50_ms'] == 25.0 and chart['p95_ms'] == 500.0
+    assert chart['histogram']['le_25'] == 90 and chart['histogram']['le_500'] == 10
+    assert chart['response_bytes'] == 10000
+    assert snapshot['calls']['kis:FHKST01010100']['error_codes'] == {'http_500': 1}
+
+    metrics.reset()
+    assert metrics.snapshot()['calls'] == {}
+    print("✅ 지연 히스토그램/분위수 확인")
+
+
+def test_measure_records_exceptions():
+    """measure 블록에서 예외가 나면 예외 이름을 오류 코드로 기록"""
+    metrics = get_metrics()
+    metrics.reset()
+    try:
+        with measure('naver', 'frgn'):
+            raise TimeoutError('timeout')
+    except TimeoutError:
+        pass
+
+    series = metrics.snapshot()['calls']['naver:frgn']
+    assert series['count'] == 1 and series['error_codes'] == {'TimeoutError': 1}
+    print("✅ 예외 기록 확인")
+
+
+def test_kiwoom_calls_are_recorded():
+    """대역 서버 상대로 연속조회/429 재시도/토큰 발급 기록, INFO 레벨에서는 응답 직렬화 없음"""
+    metrics = get_metrics()
+    metrics.reset()
+    dumps_calls = []
+    original_dumps = kiwoom.json.dumps
+
+    def counting_dumps(*args, **kwargs):
+        # json 모듈은 requests도 공유하므로 디버그 로그용 들여쓰기 직렬화만 집계
+        if 'indent' in kwargs:
+            dumps_calls.append(args)
+        return original_dumps(*args, **kwargs)
+
+    saved_env = {key: os.environ.get(key) for key in ('KIWOOM_BASE_URL', 'KIWOOM_WEBSOCKET_URL', 'KIWOOM_TOKEN_CACHE_PATH')}
+    with KiwoomStubServer(page_size=30, pages=3, rate_limit=3) as stub:
+        os.environ.update({**stub.env(), 'KIWOOM_TOKEN_CACHE_PATH': ''})
+        kiwoom.json.dumps = counting_dumps
+        logging.getLogger(kiwoom.__name__).setLevel(logging.INFO)
+        try:
+            api = KiwoomAPI('metrics-app', 'secret', '00000000')
+            bars = list(api.iter_daily_chart('005930'))
+            assert len(bars) == 90
+            assert api.get_daily_chart('000660')  # 네 번째 요청은 서버 한도(초당 3회) 초과 후 재시도
+        finally:
+            kiwoom.json.dumps = original_dumps
+            logging.getLogger(kiwoom.__name__).setLevel(logging.NOTSET)
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+    snapshot = metrics.snapshot()
+    chart = snapshot['calls']['kiwoom:ka10081']
+    assert chart['count'] == 5  # 3페이지 + 429 1회 + 재시도 1회
+    assert chart['continuations'] == 2
+    assert chart['retries'] == {'throttle': 1}
+    assert chart['error_codes'] == {'http_429': 1}
+    assert chart['request_bytes'] > 0 and chart['response_bytes'] > 30 * 4 * 50
+    assert snapshot['token_refreshes'] == {'kiwoom': 1}
+    assert snapshot['calls']['kiwoom:oauth2/token']['count'] == 1
+    assert dumps_calls == []
+    print(f"✅ 키움 호출 기록: {json.dumps({k: chart[k] for k in ('count', 'continuations', 'p50_ms')})}")
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("증권사 API 호출 계측 테스트")
+    print("="*70)
+
+    try:
+        test_histogram_and_quantiles()
+        test_measure_records_exceptions()
+        test_kiwoom_calls_are_recorded()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
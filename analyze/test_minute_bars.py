@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+분봉 수집/N분봉 변환 테스트
+
+ka10080 분봉 행 변환, N분봉 합치기(pandas resample 결과와 비교), 가짜 API로 분봉 증분 수집과
+저장된 분봉에서 N분봉 조회를 확인합니다.
+"""
+
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from lib.bar_store import BarStore
+from lib.minute_bars import ingest_minute_bars, read_minute_candles
+from lib.ohlcv import kiwoom_minute_bars, make_bars, resample_bars
+
+
+def make_minute_rows(day, count, start='0900'):
+    """최신순 1분봉 행 (ka10080 형식)"""
+    first = np.datetime64(f'{day}T{start[:2]}:{start[2:]}')
+    rows = []
+    for i in reversed(range(count)):
+        stamp = first + np.timedelta64(i, 'm')
+        price = 70000 + (i * 37) % 500
+        rows.append({
+            'cntr_tm': str(stamp).replace('-', '').replace('T', '').replace(':', '') + '00',
+            'open_pric': f'+{price}', 'high_pric': f'+{price + 50}',
+            'low_pric': f'-{price - 50}', 'cur_prc': f'-{price + 10}', 'trde_qty': str(100 + i),
+        })
+    return rows
+
+
+def test_minute_rows():
+    """분봉 행 → 표준 프레임 (부호 제거, 과거 → 최신, 분 단위 시각)"""
+    bars = kiwoom_minute_bars(make_minute_rows('2025-09-08', 3))
+    assert str(bars['date'].iloc[0]) == '2025-09-08 09:00:00'
+    assert str(bars['date'].iloc[-1]) == '2025-09-08 09:02:00'
+    assert bars['close'].tolist() == [70010, 70047, 70084]
+    assert bars['trade_amount'].iloc[0] == 70010 * 100
+    print("✅ 분봉 행 변환 확인")
+
+
+def test_resample_matches_pandas():
+    """N분봉은 09:00 기준 구간으로 pandas resample과 같은 값 (여러 날, 빈 분 포함)"""
+    bars = kiwoom_minute_bars(make_minute_rows('2025-09-08', 391) + make_minute_rows('2025-09-05', 391))
+    bars = bars.drop(index=[7, 8, 100]).reset_index(drop=True)  # 체결 없는 분
+
+    for minutes in (3, 5, 15, 60):
+        result = resample_bars(bars, minutes)
+        expected = bars.set_index('date').resample(f'{minutes}min', origin='start_day', offset='9h').agg({
+            'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum', 'trade_amount': 'sum',
+        }).dropna()
+        assert result['date'].tolist() == expected.index.tolist()
+        for column in ('open', 'high', 'low', 'close', 'volume', 'trade_amount'):
+            assert result[column].tolist() == expected[column].astype(np.int64).tolist(), (minutes, column)
+    assert str(resample_bars(bars, 60)['date'].iloc[-1]) == '2025-09-08 15:00:00'
+    print("✅ 3/5/15/60분봉 변환 확인 (pandas resample과 일치)")
+
+
+class FakeMinuteAPI:
+    """fetch_minute_bars 흉내: since가 있으면 그날 이후만, 없으면 max_bars개"""
+
+    def __init__(self, minutes):
+        self.minutes = minutes
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def fetch_minute_bars(self, stock_code, since=None, max_bars=None, adjusted=True):
+        with self._lock:
+            self.calls.append((stock_code, since))
+        bars = self.minutes
+        if since is not None:
+            bars = bars[bars['date'] >= np.datetime64(since)]
+        elif max_bars is not None:
+            bars = bars.tail(max_bars)
+        return make_bars({column: bars[column].to_numpy() for column in bars.columns})
+
+
+def test_ingest_and_read():
+    """처음에는 최근 분봉 전체, 이후에는 당일분만 증분 조회, N분봉은 저장된 분봉에서 계산"""
+    day1 = kiwoom_minute_bars(make_minute_rows('2025-09-05', 391))
+    day2 = kiwoom_minute_bars(make_minute_rows('2025-09-08', 391))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BarStore(tmp_dir)
+        api = FakeMinuteAPI(pd.concat([day1, day2.head(30)], ignore_index=True))
+
+        latest = ingest_minute_bars(api, ['005930', '000660'], store=store)
+        assert str(latest['005930']['date']) == '2025-09-08 09:29:00'
+
+        api.minutes = pd.concat([day1, day2.head(60)], ignore_index=True)
+        latest = ingest_minute_bars(api, ['005930'], store=store)
+        assert str(latest['005930']['date']) == '2025-09-08 09:59:00'
+        assert str(api.calls[-1][1]) == '2025-09-08'  # 당일분만 증분 조회
+        assert store.count('005930') == 391 + 60
+
+        candles = read_minute_candles('005930', 15, days=1, store=store)
+        assert candles['date'].dt.strftime('%H:%M').tolist() == ['09:00', '09:15', '09:30', '09:45']
+        assert candles['volume'].sum() == day2.head(60)['volume'].sum()
+        assert len(read_minute_candles('005930', 60, days=2, store=store)) == 7 + 1
+        assert read_minute_candles('999999', 5, store=store).empty
+        print("✅ 분봉 증분 수집/N분봉 조회 확인")
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("분봉 수집/N분봉 변환 테스트")
+    print("="*70)
+
+    try:
+        test_minute_rows()
+        test_resample_matches_pandas()
+        test_ingest_and_read()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
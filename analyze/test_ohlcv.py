@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+일봉(OHLCV) 어댑터 테스트
+
+키움/KIS/yfinance 응답이 같은 표준 일봉 프레임(dtype, 오름차순, 중복 없음)으로 바뀌고,
+TechnicalAnalyzer가 표준 프레임을 기존 Date/Open/... 프레임과 같은 결과로 분석하는지 확인합니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from lib.ohlcv import (
+    BAR_COLUMNS, BAR_DTYPES, KISOHLCVAdapter, KiwoomOHLCVAdapter, OHLCVAdapter,
+    kis_daily_bars, kiwoom_daily_bars, make_bars, to_analysis_frame, yfinance_bars
+)
+from src.technical_analyzer import TechnicalAnalyzer
+from test_kiwoom_decoder import make_chart_rows
+
+
+def assert_canonical(bars):
+    """표준 일봉 프레임 형식 검사"""
+    assert tuple(bars.columns) == BAR_COLUMNS
+    assert {column: bars[column].dtype for column in BAR_COLUMNS} == {
+        column: np.dtype(dtype) for column, dtype in BAR_DTYPES.items()
+    }
+    assert bars['date'].is_monotonic_increasing and bars['date'].is_unique
+    assert isinstance(bars.index, pd.RangeIndex)
+
+
+def make_kis_rows(count):
+    """최신순 KIS 일봉 행 (FHKST03010100 output2 형식)"""
+    return [
+        {
+            'stck_bsop_date': str(np.datetime64('2025-09-08') - np.timedelta64(i, 'D')).replace('-', ''),
+            'stck_oprc': str(70000 + i), 'stck_hgpr': str(70500 + i),
+            'stck_lwpr': str(69500 + i), 'stck_clpr': str(70100 + i),
+            'acml_vol': str(1000 + i), 'acml_tr_pbmn': str(70100000 + i),
+        }
+        for i in range(count)
+    ]
+
+
+def test_kiwoom_bars():
+    """키움 일봉 → 표준 프레임 (최신순 응답을 뒤집기만 하고 정렬하지 않음)"""
+    bars = KiwoomOHLCVAdapter(api=None).parse({'stk_dt_pole_chart_qry': make_chart_rows(5)})
+    assert_canonical(bars)
+    assert bars['close'].tolist() == [70104, 70103, 70102, 70101, 70100]
+    assert str(bars['date'].iloc[-1].date()) == '2025-09-08'
+    assert bars.equals(kiwoom_daily_bars(make_chart_rows(5)))
+    print("✅ 키움 일봉 변환 확인")
+
+
+def test_kis_bars():
+    """KIS 일봉 → 표준 프레임 (대체 필드명, 종가 0 행 제외, 거래대금 없으면 종가×거래량)"""
+    rows = make_kis_rows(4)
+    rows[1]['stck_clpr'] = '0'  # 거래 없는 날
+    bars = KISOHLCVAdapter().parse({'rt_cd': '0', 'output2': rows})
+    assert_canonical(bars)
+    assert bars['close'].tolist() == [70103, 70102, 70100]
+    assert bars['trade_amount'].tolist() == [70100003, 70100002, 70100000]
+
+    short_rows = [{'bsop_date': '20250905', 'clpr': '1000', 'vol': '7'},
+                  {'bsop_date': '20250904', 'clpr': '990', 'vol': '3'}]
+    bars = kis_daily_bars(short_rows)
+    assert_canonical(bars)
+    assert bars['open'].tolist() == [990, 1000]  # 시가가 없으면 종가로 채움
+    assert bars['trade_amount'].tolist() == [2970, 7000]
+    assert kis_daily_bars([]).empty and tuple(kis_daily_bars([]).columns) == BAR_COLUMNS
+    print("✅ KIS 일봉 변환 확인")
+
+
+def test_yfinance_bars():
+    """yfinance 프레임 → 표준 프레임 (시간대 제거, 원 단위 반올림)"""
+    index = pd.date_range('2025-09-01', periods=3, freq='D', tz='Asia/Seoul')
+    history = pd.DataFrame({
+        'Open': [100.4, 101.0, 102.0], 'High': [103.0, 104.6, 105.0],
+        'Low': [99.0, 100.0, 101.0], 'Close': [101.2, 102.5, 103.0],
+        'Volume': [10, 20, 30], 'Dividends': [0.0, 0.0, 0.0],
+    }, index=index)
+    bars = yfinance_bars(history)
+    assert_canonical(bars)
+    assert str(bars['date'].iloc[0]) == '2025-09-01 00:00:00'
+    assert bars['open'].tolist() == [100, 101, 102]
+    assert bars['close'].tolist() == [101, 102, 103]
+    assert bars['trade_amount'].tolist() == [1010, 2040, 3090]
+    print("✅ yfinance 일봉 변환 확인")
+
+
+def test_make_bars_order():
+    """이미 오름차순이면 그대로, 섞여 있으면 정렬, 중복 일자는 마지막 값"""
+    dates = np.array(['2025-09-03', '2025-09-01', '2025-09-02', '2025-09-02'], dtype='datetime64[D]')
+    prices = np.array([3, 1, 2, 20])
+    bars = make_bars({'date': dates, 'open': prices, 'high': prices, 'low': prices,
+                      'close': prices, 'volume': prices})
+    assert_canonical(bars)
+    assert bars['close'].tolist() == [1, 20, 3]
+    print("✅ 정렬/중복 처리 확인")
+
+
+def test_adapter_interface():
+    """parse/fetch를 모두 구현해야 어댑터를 만들 수 있음"""
+    class ParseOnly(OHLCVAdapter):
+        def parse(self, payload):
+            return kiwoom_daily_bars(payload)
+
+    for adapter in (OHLCVAdapter, ParseOnly):
+        try:
+            adapter()
+        except TypeError:
+            continue
+        raise AssertionError(f"{adapter.__name__}는 추상 클래스여야 함")
+    assert isinstance(KiwoomOHLCVAdapter(api=None), OHLCVAdapter)
+    print("✅ 어댑터 인터페이스 확인")
+
+
+def test_analyzer_accepts_canonical_bars():
+    """TechnicalAnalyzer는 표준 프레임과 기존 Date/Open/... 프레임에서 같은 ATR을 계산"""
+    bars = kiwoom_daily_bars(make_chart_rows(60))
+    legacy = to_analysis_frame(bars).astype({'Open': float, 'High': float, 'Low': float, 'Close': float})
+
+    analyzer = TechnicalAnalyzer()
+    from_bars = analyzer.calculate_atr_40days({'symbol': 'TEST', 'historical_data': bars})
+    from_legacy = analyzer.calculate_atr_40days({'symbol': 'TEST', 'historical_data': legacy})
+    assert from_bars['atr_40d'] == from_legacy['atr_40d']
+    assert from_bars['current_price'] == 70100
+    assert 'TR' not in bars.columns  # 원본 프레임은 변경하지 않음
+    print("✅ TechnicalAnalyzer 표준 프레임 입력 확인")
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("일봉(OHLCV) 어댑터 테스트")
+    print("="*70)
+
+    try:
+        test_kiwoom_bars()
+        test_kis_bars()
+        test_yfinance_bars()
+        test_make_bars_order()
+        test_adapter_interface()
+        test_analyzer_accepts_canonical_bars()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+여러 종목 기술적 지표 일괄 계산 테스트
+
+이력 길이가 다른 종목들의 패널 지표가 종목별 pandas 계산(ta 라이브러리와 같은 정의)과 같은지,
+최신 값이 복사 없는 뷰인지, TechnicalAnalyzer.analyze_panel 결과 형식과 전 종목 계산 시간을 확인합니다.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from lib.panel_indicators import BarPanel, compute_indicators, latest_values
+from src.technical_analyzer import TechnicalAnalyzer
+from test_helpers import make_history
+
+
+def reference_indicators(bars):
+    """종목 하나의 지표를 pandas로 계산 (ta 라이브러리 구현과 같은 정의)"""
+    close, high, low = (bars[column].astype(float) for column in ('close', 'high', 'low'))
+
+    def ema(series, span):
+        return series.ewm(span=span, min_periods=span, adjust=False).mean()
+
+    diff = close.diff()
+    up = diff.where(diff > 0, 0.0).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    down = (-diff.where(diff < 0, 0.0)).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    macd = ema(close, 12) - ema(close, 26)
+    signal = ema(macd, 9)
+    middle = close.rolling(20).mean()
+    std = close.rolling(20).std(ddof=0)
+    lowest, highest = low.rolling(14).min(), high.rolling(14).max()
+    stoch_k = 100 * (close - lowest) / (highest - lowest)
+
+    tr = pd.concat([high - low, (high - close.shift()).abs(), (low - close.shift()).abs()], axis=1).max(axis=1)
+    atr = np.full(len(tr), np.nan)
+    atr[13] = tr[:14].mean()
+    for i in range(14, len(tr)):
+        atr[i] = (atr[i - 1] * 13 + tr.iloc[i]) / 14
+
+    return {
+        'rsi': 100 - 100 / (1 + up / down), 'macd': macd, 'macd_signal': signal, 'macd_histogram': macd - signal,
+        'bollinger_upper': middle + 2 * std, 'bollinger_lower': middle - 2 * std, 'bollinger_middle': middle,
+        'sma_5': close.rolling(5).mean(), 'sma_20': middle, 'sma_60': close.rolling(60).mean(),
+        'ema_12': ema(close, 12), 'ema_26': ema(close, 26),
+        'stoch_k': stoch_k, 'stoch_d': stoch_k.rolling(3).mean(),
+        'volume_sma': bars['volume'].astype(float).rolling(20).mean(), 'atr': pd.Series(atr), 'current_price': close,
+    }
+
+
+def test_matches_per_symbol():
+    """이력 길이가 다른 종목들도 종목별 계산과 같은 값 (오른쪽 정렬, 앞부분은 NaN)"""
+    frames = {f'{i:06d}': make_history(i, count) for i, count in enumerate([250, 120, 61, 250, 30])}
+    panel = BarPanel.from_frames(frames)
+    indicators = compute_indicators(panel)
+    assert panel.shape == (5, 250)
+
+    for row, (symbol, bars) in enumerate(frames.items()):
+        expected = reference_indicators(bars)
+        for name, values in expected.items():
+            actual = indicators[name][row, -len(bars):]
+            assert np.allclose(actual, values.to_numpy(), rtol=1e-9, atol=1e-6, equal_nan=True), (symbol, name)
+            assert np.isnan(indicators[name][row, :-len(bars)]).all()
+    print("✅ 종목별 pandas 계산과 일치")
+
+
+def test_latest_views():
+    """최신 값은 마지막 열 뷰, length로 최근 봉만 사용"""
+    frames = {'005930': make_history(1, 200), '000660': make_history(2, 80)}
+    indicators = compute_indicators(BarPanel.from_frames(frames))
+    latest = latest_values(indicators)
+    assert np.shares_memory(latest['rsi'], indicators['rsi'])
+    assert latest['current_price'].tolist() == [frames['005930']['close'].iloc[-1], frames['000660']['close'].iloc[-1]]
+
+    short = BarPanel.from_frames(frames, length=100)
+    assert short.shape == (2, 100) and short.index['000660'] == 1
+    assert np.isnan(short.columns['close'][1, :20]).all() and not np.isnan(short.columns['close'][0]).any()
+    print("✅ 최신 값 뷰/최근 봉 제한 확인")
+
+
+def test_analyze_panel():
+    """analyze_panel은 종목별로 analyze()와 같은 형식의 결과 (데이터가 부족하면 오류)"""
+    stocks_data = [{'symbol': f'{i:06d}', 'historical_data': make_history(i, 250)} for i in range(3)]
+    stocks_data.append({'symbol': '999999', 'historical_data': make_history(9, 40)})
+    results = TechnicalAnalyzer().analyze_panel(stocks_data)
+
+    assert 'error' in results['999999']
+    result = results['000001']
+    assert set(result) == {'symbol', 'indicators', 'signals', 'support_resistance', 'trend_analysis', 'analysis_timestamp'}
+    expected = reference_indicators(stocks_data[1]['historical_data'])
+    assert abs(result['indicators']['rsi'] - expected['rsi'].iloc[-1]) < 1e-9
+    assert set(result['signals'].values()) <= {'buy', 'sell', 'hold'}
+    print("✅ analyze_panel 결과 형식 확인")
+
+
+def test_universe_speed():
+    """2,500종목 × 250일 전체 지표 계산"""
+    rng = np.random.default_rng(0)
+    close = 50000 + np.cumsum(rng.normal(0, 500, (2500, 250)), axis=1)
+    columns = {'open': close, 'high': close + 300, 'low': close - 300, 'close': close,
+               'volume': rng.integers(1000, 100000, close.shape).astype(float)}
+    panel = BarPanel([f'{i:06d}' for i in range(2500)], columns)
+
+    started = time.perf_counter()
+    latest = latest_values(compute_indicators(panel))
+    elapsed = time.perf_counter() - started
+    assert latest['atr'].shape == (2500,) and not np.isnan(latest['macd_signal']).any()
+    print(f"✅ 2,500종목 × 250일 지표 계산: {elapsed:.2f}초")
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("여러 종목 기술적 지표 일괄 계산 테스트")
+    print("="*70)
+
+    try:
+        test_matches_per_symbol()
+        test_latest_views()
+        test_analyze_panel()
+        test_universe_speed()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+실시간 체결 피드 / 최근 체결 저장소 테스트
+
+로컬 WebSocket 서버로 키움 서버를 흉내 내어 REG 등록, 체결(REAL '0B') 반영,
+재연결 후 재등록을 확인합니다.
+"""
+
+import asyncio
+import json
+import time
+
+import websockets
+
+import lib.price_feed as price_feed
+from lib.kiwoom_ws import KiwoomWebSocketSession, REAL_WEBSOCKET_URL, parse_trade_ticks, _get_loop
+from lib.price_feed import RealtimePriceFeed, get_realtime_price
+from lib.price_store import PriceStore
+from test_helpers import FakeTokenBroker
+
+
+class FakeTickServer:
+    """REG를 받으면 등록한 종목마다 체결 한 건씩 보내는 서버"""
+
+    def __init__(self):
+        self.connections = 0
+        self.registered = []
+        self.websockets = []
+        self.server = None
+        self.url = None
+
+    async def start(self):
+        self.server = await websockets.serve(self.handler, '127.0.0.1', 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.url = f'ws://127.0.0.1:{port}'
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handler(self, websocket):
+        self.connections += 1
+        self.websockets.append(websocket)
+        async for raw in websocket:
+            message = json.loads(raw)
+            if message['trnm'] == 'LOGIN':
+                await websocket.send(json.dumps({'trnm': 'LOGIN', 'return_code': 0}))
+            elif message['trnm'] == 'REG':
+                items = message['data'][0]['item']
+                self.registered.append(items)
+                await websocket.send(json.dumps({'trnm': 'REG', 'return_code': 0}))
+                await websocket.send(json.dumps({'trnm': 'REAL', 'data': [
+                    {'type': '0B', 'item': code, 'values': {'10': '-70000', '11': '-500', '12': '-0.71', '13': '1000', '20': '093000'}}
+                    for code in items
+                ]}))
+
+
+def run(coro):
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result(10)
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_parse_trade_ticks():
+    """주식체결(REAL type '0B') 파싱: 현재가/거래량 부호 제거, 전일대비/등락율 부호 유지"""
+    message = {
+        'trnm': 'REAL',
+        'data': [
+            {'type': '0B', 'item': 'A005930',
+             'values': {'10': '-69900', '11': '-600', '12': '-0.85', '13': '1234567', '15': '-10', '20': '093012'}},
+            {'type': '02', 'item': '000660', 'values': {'841': '5', '843': 'I'}},  # 조건검색 이벤트는 무시
+            {'type': '0B', 'item': '000660', 'values': {'10': ''}},  # 현재가 없는 데이터 무시
+            {'type': '0B', 'item': '035720', 'values': {'10': '+40000', '11': ' ', '12': '', '20': '093013'}},
+        ],
+    }
+
+    assert parse_trade_ticks(message) == [{
+        'stock_code': '005930', 'current_price': 69900, 'change_price': -600, 'change_rate': -0.85,
+        'volume': 1234567, 'trade_volume': 10, 'trade_time': '093012',
+    }, {
+        'stock_code': '035720', 'current_price': 40000, 'change_price': 0, 'change_rate': 0.0,
+        'volume': 0, 'trade_volume': 0, 'trade_time': '093013',
+    }]
+    assert parse_trade_ticks({'trnm': 'REG', 'return_code': 0}) == []
+    print("✅ 실시간 체결 파싱 확인")
+
+
+def test_price_store():
+    """마지막 체결만 보관하고, max_age보다 오래된 값은 반환하지 않음"""
+    store = PriceStore()
+    store.update({'stock_code': '005930', 'current_price': 70000, 'volume': 10})
+    store.update({'stock_code': '005930', 'current_price': 70100, 'volume': 12})
+
+    entry = store.get('005930')
+    assert entry['current_price'] == 70100 and entry['updated_at']
+    entry['current_price'] = 0  # 반환값을 바꿔도 저장소는 그대로
+    assert store.get('005930')['current_price'] == 70100
+    assert store.get('000660') is None
+    assert list(store.get_many(['005930', '000660'])) == ['005930']
+
+    time.sleep(0.05)
+    assert store.get('005930', max_age=0.01) is None
+    assert store.get('005930', max_age=10)['current_price'] == 70100
+    print("✅ 최근 체결 저장소 확인")
+
+
+def test_feed_registers_and_updates_store():
+    """구독 종목을 REG로 등록하고, 체결이 오면 저장소 갱신, 재연결 시 재등록"""
+    server = FakeTickServer()
+    run(server.start())
+    broker = FakeTokenBroker('price-feed-app')
+    session = KiwoomWebSocketSession(broker, server.url)
+    KiwoomWebSocketSession._sessions[(broker.app_key, REAL_WEBSOCKET_URL)] = session
+    feed = RealtimePriceFeed(broker, store=PriceStore())
+    reconnect_delay = price_feed.RECONNECT_DELAY_SEC
+    price_feed.RECONNECT_DELAY_SEC = 0.05
+
+    try:
+        feed.subscribe(['005930', '000660'])
+        feed.start()
+        price_feed._price_feed = feed
+
+        assert wait_until(lambda: len(feed.store) == 2)
+        assert server.registered == [['000660', '005930']]
+        assert feed.store.get('005930')['current_price'] == 70000
+
+        # 모듈 함수는 구독 중인 종목만 저장소에서 반환
+        assert get_realtime_price('005930')['change_rate'] == -0.71
+        assert get_realtime_price('035420') is None
+
+        # 실행 중 추가한 종목은 바로 등록
+        feed.subscribe(['005930', '035420'])
+        assert wait_until(lambda: feed.store.get('035420') is not None)
+        assert server.registered[-1] == ['035420']
+
+        # 서버가 연결을 끊으면 다시 연결해 전체 재등록
+        run(server.websockets[-1].close())
+        assert wait_until(lambda: server.connections == 2 and len(server.registered) == 3, timeout=10)
+        assert server.registered[-1] == ['000660', '005930', '035420']
+        print(f"✅ 실시간 체결 등록/갱신/재등록 확인 (연결 {server.connections}회)")
+    finally:
+        price_feed._price_feed = None
+        price_feed.RECONNECT_DELAY_SEC = reconnect_delay
+        feed.stop()
+        KiwoomWebSocketSession._sessions.pop((broker.app_key, REAL_WEBSOCKET_URL), None)
+        session.call(session.close(), timeout=5)
+        run(server.stop())
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("실시간 체결 피드 테스트")
+    print("="*70)
+
+    try:
+        test_parse_trade_ticks()
+        test_price_store()
+        test_feed_registers_and_updates_store()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
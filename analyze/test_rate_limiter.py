@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+키움증권 요청 속도 제한기 테스트
+
+실제 API 호출 없이 토큰 버킷 한도, 우선순위 대기열, 타임아웃, 비동기 대기를 확인합니다.
+"""
+
+import asyncio
+import threading
+import time
+
+from lib.rate_limiter import (
+    RateLimiter,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_BACKGROUND,
+)
+
+
+def test_burst_then_rate():
+    """버킷 크기만큼은 바로 통과하고, 이후에는 초당 rate로 제한"""
+    limiter = RateLimiter(rate=20, capacity=3)
+    key = ('app', 'ka10081')
+
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.acquire(key)
+    assert time.monotonic() - started < 0.05
+
+    for _ in range(4):
+        limiter.acquire(key)
+    elapsed = time.monotonic() - started
+    # 버스트 이후 4개 요청 → 최소 4/20초
+    assert elapsed >= 0.18, elapsed
+    print(f"✅ 버스트 3개 + 4개 요청 → {elapsed:.2f}초")
+
+
+def test_keys_are_independent():
+    """TR(api_id)이 다르면 별도 버킷"""
+    limiter = RateLimiter(rate=1, capacity=1)
+
+    limiter.acquire(('app', 'ka10081'))
+    started = time.monotonic()
+    limiter.acquire(('app', 'kt00007'))
+    assert time.monotonic() - started < 0.05
+    print("✅ TR별 버킷 분리 확인")
+
+
+def test_per_api_limits():
+    """api_id 단위 개별 한도 설정"""
+    limiter = RateLimiter(rate=5, capacity=5, limits={'kt00007': (2, 1)})
+
+    status_key = ('app-key-123', 'kt00007')
+    limiter.acquire(status_key)
+    status = limiter.get_wait_times()['app-ke:kt00007']
+    assert status['rate'] == 2 and status['capacity'] == 1
+    print("✅ TR별 개별 한도 확인")
+
+
+def test_priority_order():
+    """대기 중인 요청은 우선순위 순서로 처리"""
+    limiter = RateLimiter(rate=20, capacity=1)
+    key = ('app', 'ka10081')
+    limiter.acquire(key)  # 버킷을 비워 이후 요청이 대기하도록 함
+
+    order = []
+
+    def worker(name, priority):
+        limiter.acquire(key, priority=priority)
+        order.append(name)
+
+    threads = [threading.Thread(target=worker, args=(f'bg{i}', PRIORITY_BACKGROUND)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.005)  # 도착 순서를 고정하고, 백그라운드 요청이 먼저 대기열에 들어가도록
+
+    interactive = threading.Thread(target=worker, args=('ui', PRIORITY_INTERACTIVE))
+    interactive.start()
+    for thread in threads + [interactive]:
+        thread.join()
+
+    assert order[0] == 'ui', order
+    assert order[1:] == ['bg0', 'bg1', 'bg2'], order
+    print(f"✅ 우선순위 처리 순서: {order}")
+
+
+def test_timeout_leaves_queue():
+    """타임아웃된 요청은 대기열에서 제거"""
+    limiter = RateLimiter(rate=1, capacity=1)
+    key = ('app', 'ka10081')
+    limiter.acquire(key)
+
+    try:
+        limiter.acquire(key, timeout=0.05)
+        assert False, "TimeoutError가 발생해야 함"
+    except TimeoutError:
+        pass
+
+    assert limiter.get_wait_times()['app:ka10081']['queued'] == 0
+    print("✅ 타임아웃 시 대기열 정리 확인")
+
+
+def test_penalize():
+    """서버 한도 초과 응답 후에는 지정 시간 동안 대기"""
+    limiter = RateLimiter(rate=50, capacity=5)
+    key = ('app', 'ka10081')
+
+    limiter.penalize(key, 0.1)
+    started = time.monotonic()
+    limiter.acquire(key)
+    assert time.monotonic() - started >= 0.1
+    print("✅ 한도 초과 후 대기 확인")
+
+
+def test_async_acquire():
+    """비동기 대기는 이벤트 루프를 막지 않고 한도를 지킴"""
+    limiter = RateLimiter(rate=20, capacity=2)
+    key = ('app', 'ka10081')
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        tick_task = asyncio.create_task(ticker())
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.acquire_async(key) for _ in range(6)))
+        elapsed = time.monotonic() - started
+        tick_task.cancel()
+        return elapsed, ticks
+
+    elapsed, ticks = asyncio.run(run())
+    # 버스트 2개 이후 4개 요청 → 최소 4/20초, 대기 중에도 다른 코루틴이 실행됨
+    assert elapsed >= 0.18, elapsed
+    assert ticks >= 5, ticks
+    print(f"✅ 비동기 6개 요청 → {elapsed:.2f}초 (다른 작업 {ticks}회 실행)")
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("키움증권 요청 속도 제한기 테스트")
+    print("="*70)
+
+    try:
+        test_burst_then_rate()
+        test_keys_are_independent()
+        test_per_api_limits()
+        test_priority_order()
+        test_timeout_leaves_queue()
+        test_penalize()
+        test_async_acquire()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+매매내역(kt00007) 조회 테스트
+
+실제 API 호출 없이 KRX 영업일 필터링, 동시 조회, 지난 날짜 캐시 동작을 확인합니다.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import date, datetime
+
+from lib.kiwoom import KiwoomAPI
+from lib.kiwoom_async import AsyncKiwoomAPI
+import lib.krx_calendar as krx_calendar
+from lib.krx_calendar import is_trading_day, recent_trading_days, previous_trading_day, next_trading_day
+
+
+def test_trading_calendar():
+    """주말과 휴장일 제외"""
+    assert not is_trading_day('20251004')  # 토요일
+    assert not is_trading_day('20251006')  # 추석
+    assert not is_trading_day(date(2025, 12, 31))  # 연말 휴장일
+    assert is_trading_day('20251010')
+
+    # 2025-10-03(금, 개천절) ~ 10-12(일): 영업일은 10/10 하루
+    assert recent_trading_days(10, end='20251012') == ['20251010']
+    assert previous_trading_day('20251010') == '20251002'
+    assert next_trading_day('20251002') == '20251010'
+
+    # 2027 추석(9/14~16), 개천절/한글날 대체공휴일
+    assert next_trading_day('20270913') == '20270917'
+    assert not is_trading_day('20271004') and not is_trading_day('20271011')
+
+    # 휴장일 표 이후 연도는 연도마다 한 번 경고
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    krx_calendar.logger.addHandler(handler)
+    try:
+        beyond = krx_calendar.KRX_HOLIDAYS_LAST_YEAR + 1
+        is_trading_day(f'{beyond}0104')
+        is_trading_day(f'{beyond}0105')
+        is_trading_day('20270104')
+    finally:
+        krx_calendar.logger.removeHandler(handler)
+    assert len(records) == 1 and str(beyond) in records[0].getMessage()
+    print("✅ KRX 영업일 달력 확인")
+
+
+def trade_response(ord_dt):
+    return {
+        'return_code': 0,
+        'acnt_ord_cntr_prps_dtl': [{
+            'stk_cd': 'A005930', 'stk_nm': '삼성전자', 'io_tp_nm': '현금매수',
+            'cntr_qty': '1', 'cntr_uv': '70000', 'cnfm_tm': '09:00:00', 'ord_no': ord_dt,
+        }],
+    }
+
+
+class FakeKiwoomAPI(KiwoomAPI):
+    """_make_request를 가짜로 대체한 API (호출 날짜와 동시 실행 수 기록)"""
+
+    def __init__(self, account_no):
+        super().__init__('trade-app', 'secret', account_no)
+        self.requested = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def _make_request(self, endpoint, api_id, data, cont_yn='N', next_key='', priority=None):
+        with self.lock:
+            self.requested.append(data['ord_dt'])
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.02)  # 네트워크 지연 흉내
+        with self.lock:
+            self.active -= 1
+        return trade_response(data['ord_dt'])
+
+
+def test_skips_non_trading_days_and_runs_concurrently():
+    """영업일만 동시에 조회"""
+    api = FakeKiwoomAPI('acct-concurrent')
+    trades = api.get_recent_trades(days=14)
+
+    expected_days = recent_trading_days(14)
+    assert sorted(api.requested) == sorted(expected_days)
+    assert all(is_trading_day(ord_dt) for ord_dt in api.requested)
+    assert len(trades) == len(expected_days)
+    assert api.max_active > 1
+    assert [t['datetime'] for t in trades] == sorted((t['datetime'] for t in trades), reverse=True)
+    print(f"✅ 14일 중 영업일 {len(api.requested)}일 조회 (최대 동시 {api.max_active}건)")
+
+
+def test_past_days_are_cached():
+    """지난 날짜는 캐시, 오늘은 매번 조회"""
+    today = datetime.now().strftime('%Y%m%d')
+    first = FakeKiwoomAPI('acct-cache')
+    first.get_recent_trades(days=10)
+
+    second = FakeKiwoomAPI('acct-cache')
+    trades = second.get_recent_trades(days=10)
+
+    assert second.requested == ([today] if is_trading_day(today) else [])
+    assert len(trades) == len(recent_trading_days(10))
+
+    # 계좌가 다르면 별도 캐시
+    other = FakeKiwoomAPI('acct-other')
+    other.get_recent_trades(days=10)
+    assert len(other.requested) == len(recent_trading_days(10))
+    print(f"✅ 두 번째 조회는 {len(second.requested)}일만 요청")
+
+
+def test_failed_days_are_not_cached():
+    """조회 실패한 날짜는 캐시하지 않음"""
+    class FailingAPI(FakeKiwoomAPI):
+        def _make_request(self, endpoint, api_id, data, cont_yn='N', next_key='', priority=None):
+            super()._make_request(endpoint, api_id, data)
+            return None
+
+    FailingAPI('acct-fail').get_recent_trades(days=10)
+
+    api = FakeKiwoomAPI('acct-fail')
+    api.get_recent_trades(days=10)
+    assert len(api.requested) == len(recent_trading_days(10))
+    print("✅ 실패한 날짜는 재조회")
+
+
+def test_async_recent_trades():
+    """비동기 클라이언트도 같은 캐시와 동시 조회 사용"""
+    requested = []
+
+    class FakeAsyncKiwoomAPI(AsyncKiwoomAPI):
+        async def _make_request(self, endpoint, api_id, data, cont_yn='N', next_key='', priority=None):
+            requested.append(data['ord_dt'])
+            await asyncio.sleep(0.02)
+            return trade_response(data['ord_dt'])
+
+    api = FakeAsyncKiwoomAPI('trade-app', 'secret', 'acct-async')
+    started = time.monotonic()
+    trades = asyncio.run(api.get_recent_trades(days=14))
+    elapsed = time.monotonic() - started
+
+    assert sorted(requested) == sorted(recent_trading_days(14))
+    assert len(trades) == len(requested)
+    assert elapsed < 0.02 * len(requested)
+
+    # 동기 클라이언트가 같은 캐시를 재사용
+    sync_api = FakeKiwoomAPI('acct-async')
+    sync_api.get_recent_trades(days=14)
+    today = datetime.now().strftime('%Y%m%d')
+    assert sync_api.requested == ([today] if is_trading_day(today) else [])
+    print(f"✅ 비동기 {len(requested)}일 조회 {elapsed:.2f}초")
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("매매내역 조회 테스트")
+    print("="*70)
+
+    try:
+        test_trading_calendar()
+        test_skips_non_trading_days_and_runs_concurrently()
+        test_past_days_are_cached()
+        test_failed_days_are_not_cached()
+        test_async_recent_trades()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,25 +3,90 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import uvicorn
 import logging
+import asyncio
+import os
 
 from app.database import database
 from app.routers import auth, stocks, trading_plans, recap, trading, trading_stocks, stocks_info, rec_stocks, algorithm, principles
-from app.scheduler import start_scheduler, stop_scheduler, get_scheduler_jobs, scheduler, sync_stocks_info_job
+from app.scheduler import start_scheduler, stop_scheduler, get_scheduler_jobs, scheduler, sync_stocks_info_job, backfill_bars_job
+from app.services.realtime_condition_service import start_realtime_subscriber, stop_realtime_subscriber
 
 logger = logging.getLogger(__name__)
 
 
+def warmup_broker_connections():
+    """증권사 API 서버와 미리 커넥션을 맺어 첫 요청의 TCP+TLS 핸드셰이크를 없앱니다."""
+    try:
+        # lib 경로는 app.routers.stocks 임포트 시 sys.path에 추가됨
+        from lib.http_session import warmup_sessions
+        from lib.kiwoom import resolve_base_url
+        from lib.hantu import KIS_BASE_URL
+
+        use_mock = os.getenv('KIWOOM_USE_MOCK', 'False').lower() == 'true'
+        warmup_sessions([resolve_base_url(use_mock), KIS_BASE_URL])
+    except Exception as e:
+        logger.warning(f"증권사 API 커넥션 예열 실패 (무시): {e}")
+
+
+def close_broker_connections():
+    """공유 HTTP 커넥션 풀과 WebSocket 세션을 정리합니다."""
+    try:
+        from lib.http_session import close_sessions
+        close_sessions()
+    except Exception as e:
+        logger.warning(f"HTTP 커넥션 정리 실패 (무시): {e}")
+
+    try:
+        from lib.kiwoom_ws import close_websocket_sessions
+        close_websocket_sessions()
+    except Exception as e:
+        logger.warning(f"WebSocket 세션 정리 실패 (무시): {e}")
+
+
+def start_realtime_price_feed():
+    """실시간 체결 피드를 시작합니다 (실패해도 현재가는 REST 조회로 대체되므로 무시)."""
+    try:
+        from lib.price_feed import start_price_feed
+        start_price_feed()
+    except Exception as e:
+        logger.warning(f"실시간 체결 피드 시작 실패 (무시): {e}")
+
+
+def stop_realtime_price_feed():
+    """실시간 체결 피드를 중지합니다."""
+    try:
+        from lib.price_feed import stop_price_feed
+        stop_price_feed()
+    except Exception as e:
+        logger.warning(f"실시간 체결 피드 중지 실패 (무시): {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await database.connect()
+    # 증권사 API 커넥션 예열 (시작을 막지 않도록 백그라운드에서 실행)
+    warmup_task = asyncio.create_task(asyncio.to_thread(warmup_broker_connections))
     # 스케줄러 시작
     start_scheduler()
     logger.info("애플리케이션 시작: 스케줄러 활성화")
+    # 실시간 조건검색 구독 시작 (연결/등록은 WebSocket 세션 루프에서 진행)
+    start_realtime_subscriber()
+    # 주요 종목 실시간 체결 구독 시작 (현재가 조회가 메모리 저장소를 사용)
+    start_realtime_price_feed()
     yield
     # Shutdown
     # 스케줄러 종료
     stop_scheduler()
+    await asyncio.to_thread(stop_realtime_subscriber)
+    await asyncio.to_thread(stop_realtime_price_feed)
+    await warmup_task
+    await asyncio.to_thread(close_broker_connections)
+    try:
+        from lib.kiwoom_async import close_async_clients
+        await close_async_clients()
+    except Exception as e:
+        logger.warning(f"비동기 HTTP 클라이언트 정리 실패 (무시): {e}")
     await database.disconnect()
     logger.info("애플리케이션 종료: 스케줄러 비활성화")
 
@@ -93,6 +158,125 @@ async def get_scheduler_status():
     }
 
 
+@app.get("/api/rate-limits")
+async def get_rate_limits():
+    """
+    키움 API 요청 한도(토큰 버킷) 상태 조회
+
+    Returns:
+        dict: (앱 키 앞 6자리:TR)별 대기 요청 수와 예상 대기 시간
+        {
+            "buckets": {
+                "AbCdEf:ka10081": {
+                    "queued": 2,
+                    "tokens": 0.0,
+                    "estimated_wait": 0.6,
+                    "rate": 5.0,
+                    "capacity": 5.0
+                }
+            }
+        }
+    """
+    # lib 경로는 app.routers.stocks 임포트 시 sys.path에 추가됨
+    from lib.rate_limiter import get_rate_limiter
+
+    return {"buckets": get_rate_limiter().get_wait_times()}
+
+
+@app.get("/api/metrics")
+async def get_broker_metrics():
+    """
+    증권사 API(키움 REST/WebSocket, KIS, 네이버) 호출 통계 조회
+
+    Returns:
+        dict: provider:TR별 통계 (총 소요 시간이 큰 순서)
+        {
+            "since": "2025-11-10T07:30:00",
+            "token_refreshes": {"kiwoom": 1, "kis": 1},
+            "calls": {
+                "kiwoom:ka10081": {
+                    "count": 120,
+                    "errors": 1,
+                    "total_ms": 9630.5,
+                    "avg_ms": 80.3,
+                    "max_ms": 812.0,
+                    "p50_ms": 100.0,
+                    "p95_ms": 250.0,
+                    "p99_ms": 1000.0,
+                    "histogram": {"le_5": 0, ..., "inf": 0},
+                    "request_bytes": 7200,
+                    "response_bytes": 5242880,
+                    "continuations": 40,
+                    "retries": {"throttle": 1},
+                    "error_codes": {"http_429": 1}
+                }
+            }
+        }
+    """
+    # lib 경로는 app.routers.stocks 임포트 시 sys.path에 추가됨
+    from lib.metrics import get_metrics
+
+    return get_metrics().snapshot()
+
+
+@app.post("/api/metrics/reset")
+async def reset_broker_metrics():
+    """
+    증권사 API 호출 통계 초기화
+
+    Returns:
+        dict: 초기화 직전 통계 (GET /api/metrics 형식)
+    """
+    # lib 경로는 app.routers.stocks 임포트 시 sys.path에 추가됨
+    from lib.metrics import get_metrics
+
+    metrics = get_metrics()
+    snapshot = metrics.snapshot()
+    metrics.reset()
+    return snapshot
+
+
+@app.get("/api/chart-cache")
+async def get_chart_cache_stats():
+    """
+    차트/지표 응답 캐시 통계 조회
+
+    Returns:
+        dict: 적중/실패 통계와 사용량
+        {
+            "since": "2025-11-10T07:30:00",
+            "hits": 940,
+            "misses": 52,
+            "coalesced": 8,
+            "hit_rate": 0.948,
+            "expirations": 40,
+            "evictions": 0,
+            "entries": 12,
+            "bytes": 1835008,
+            "max_bytes": 67108864
+        }
+    """
+    from app.services.chart_cache import get_chart_cache
+
+    return get_chart_cache().stats()
+
+
+@app.post("/api/chart-cache/reset")
+async def reset_chart_cache_stats():
+    """
+    차트/지표 응답 캐시 적중/실패 통계 초기화 (캐시 내용은 유지)
+
+    Returns:
+        dict: 초기화 직전 통계 (GET /api/chart-cache 형식)
+    """
+    from app.services.chart_cache import get_chart_cache
+
+    cache = get_chart_cache()
+    stats = cache.stats()
+    cache.reset_stats()
+    return stats
+
+
 @app.post("/api/scheduler/manual-sync")
 async def manual_sync_stocks_info():
     """
@@ -117,5 +301,29 @@ async def manual_sync_stocks_info():
     }
 
 
+@app.post("/api/scheduler/bar-backfill")
+async def manual_bar_backfill():
+    """
+    전 종목 일봉 백필 수동 실행 (중단된 작업은 체크포인트부터 이어서 진행)
+
+    Returns:
+        dict: 작업 상태
+        {
+            "status": "success",
+            "message": "일봉 백필 작업이 시작되었습니다"
+        }
+    """
+    import threading
+
+    # 백그라운드 스레드에서 작업 실행
+    thread = threading.Thread(target=backfill_bars_job, daemon=True)
+    thread.start()
+
+    return {
+        "status": "success",
+        "message": "일봉 백필 작업이 시작되었습니다. 로그를 확인해주세요.",
+    }
+
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
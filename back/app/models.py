@@ -194,6 +194,7 @@ class Algorithm(Base):
     id = sa.Column(sa.Integer, primary_key=True, index=True)
     name = sa.Column(sa.String, nullable=False)  # 알고리즘 이름
     description = sa.Column(sa.Text, nullable=True)  # 알고리즘 설명
+    condition_id = sa.Column(sa.String, nullable=True)  # 키움 조건식 ID (실시간 조건검색 등록용)
 
     # 스케줄 정보
     update_time = sa.Column(sa.String, nullable=True)  # 업데이트 시간 (예: "18:10", HH:MM 형식)
@@ -39,6 +39,7 @@ def get_algorithms(
                 "id": algo.id,
                 "name": algo.name,
                 "description": algo.description,
+                "condition_id": algo.condition_id,
                 "created_at": algo.created_at,
                 "updated_at": algo.updated_at
             })
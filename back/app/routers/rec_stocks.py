@@ -16,6 +16,7 @@ from app.database import get_db
 from app.models import RecStock, Algorithm
 from app import schemas
 from app.services.recommendation_service import RecommendationService
+from app.services.realtime_condition_service import get_realtime_subscriber
 
 logger = logging.getLogger(__name__)
 
@@ -118,9 +119,10 @@ def update_rec_stocks_by_condition(
                 detail=f"조건식 '{condition_name}'을(를) 찾을 수 없습니다"
             )
 
-        # 추천 종목 검색 및 업데이트
+        # 추천 종목 검색 및 업데이트 (조회한 조건 ID를 넘겨 조건명을 다시 찾지 않음)
         success = service.search_and_update_rec_stocks(
             condition_name=condition_name,
+            condition_id=condition_id,
             algorithm_id=algorithm_id,
             db=db,
             stock_exchange_type='%'  # 전체
@@ -157,6 +159,74 @@ def update_rec_stocks_by_condition(
 
 
 # 더 구체적인 경로들을 먼저 정의 (/{id}보다 먼저)
+@router.get("/live/{algorithm_id}", response_model=dict)
+def get_live_rec_stocks(
+    algorithm_id: int = Path(..., description="알고리즘 ID")
+):
+    """
+    실시간 조건검색으로 현재 편입되어 있는 종목 조회 (메모리 상태, DB 조회 없음)
+
+    - **algorithm_id**: 알고리즘 ID (condition_id가 지정된 알고리즘)
+
+    Returns:
+        dict: {
+            "algorithm_id": 1,
+            "running": true,
+            "count": 2,
+            "data": [{"stock_code": "005930", "inserted_at": "093012"}, ...]
+        }
+    """
+    subscriber = get_realtime_subscriber()
+    live_stocks = subscriber.get_live_stocks(algorithm_id) if subscriber else {}
+
+    return {
+        "algorithm_id": algorithm_id,
+        "running": bool(subscriber and subscriber.running),
+        "count": len(live_stocks),
+        "data": [
+            {"stock_code": stock_code, "inserted_at": inserted_at}
+            for stock_code, inserted_at in sorted(live_stocks.items())
+        ]
+    }
+
+
+@router.get("/conditions", response_model=dict)
+def get_conditions(
+    refresh: bool = Query(False, description="캐시를 무시하고 키움에서 다시 조회")
+):
+    """
+    키움에 설정된 조건식 목록 조회 (앱 키별 캐시 사용)
+
+    - **refresh**: true면 캐시를 비우고 다시 조회 (키움에서 조건식을 추가/변경한 후 사용)
+
+    Returns:
+        dict: {
+            "count": 2,
+            "data": [{"id": "5", "name": "대왕개미"}, ...]
+        }
+    """
+    app_key = os.getenv('KIWOOM_APP_KEY')
+    secret_key = os.getenv('KIWOOM_SECRET_KEY')
+    account_no = os.getenv('KIWOOM_ACCOUNT_NO')
+
+    if not app_key or not secret_key or not account_no:
+        logger.error("키움 API 자격증명이 설정되지 않았습니다")
+        raise HTTPException(
+            status_code=500,
+            detail="키움 API 자격증명이 설정되지 않았습니다"
+        )
+
+    service = RecommendationService(app_key, secret_key, account_no)
+    conditions = service.kiwoom_api.get_condition_list(force_refresh=refresh)
+    if conditions is None:
+        raise HTTPException(status_code=502, detail="조건식 목록 조회 실패")
+
+    return {
+        "count": len(conditions),
+        "data": conditions
+    }
+
+
 @router.get("/latest/{days}", response_model=dict)
 def get_latest_rec_stocks(
     days: int = Path(ge=1, le=30, description="최근 N일"),
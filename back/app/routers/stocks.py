@@ -1,73 +1,119 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+from typing import List, Dict, Any, Optional
+import asyncio
 import sys
 import os
+import numpy as np
 import pandas as pd
 
 # analyze 모듈 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../..', 'analyze'))
 
-from app.database import get_database
+from app.database import get_database, get_db
 from app import schemas
 from app.routers.auth import get_current_user
+from app.services.chart_cache import chart_cache_key, get_chart_cache
+from app.services.quote_service import (
+    MAX_QUOTE_CONCURRENCY, QUOTE_CONCURRENCY, QUOTE_TIMEOUT_SEC, fetch_quotes, lookup_stock_names
+)
 
 router = APIRouter()
 
 
+def _nan_to_none(values: List[Any]) -> List[Any]:
+    """NaN을 JSON의 null(None)로 바꿉니다."""
+    return [None if isinstance(value, float) and value != value else value for value in values]
+
+
+# 일봉 차트/ATR 응답 봉 수 (ka10081 한 페이지 분량)
+DAILY_CHART_BARS = 600
+
+
+async def _refresh_kiwoom_bars(api, stock_code: str) -> pd.DataFrame:
+    """
+    키움 수정주가 일봉을 로컬 일봉 저장소에서 읽습니다.
+    저장소가 최신이 아니면 마지막 저장일 이후만 증분 조회해 덧붙입니다 (새 권리락은 수정 이벤트만 추가, 없으면 전체 조회).
+    """
+    from lib.bar_store import HISTORY_BARS, get_bar_store, refresh_bars_async
+
+    async def fetch(since, adjusted=True):
+        return await api.fetch_daily_bars(
+            stock_code, since=since, max_bars=None if since else HISTORY_BARS, adjusted=adjusted
+        )
+
+    return await refresh_bars_async(get_bar_store('kiwoom'), stock_code, fetch)
+
+
+# 종목 목록을 지정하지 않았을 때의 시세 개요 종목
+MAJOR_STOCKS = [
+    {"symbol": "005930", "name": "삼성전자", "market": "KOSPI"},
+    {"symbol": "035420", "name": "NAVER", "market": "KOSPI"},
+    {"symbol": "000660", "name": "SK하이닉스", "market": "KOSPI"},
+    {"symbol": "207940", "name": "삼성바이오로직스", "market": "KOSPI"},
+    {"symbol": "051910", "name": "LG화학", "market": "KOSPI"},
+]
+
+
 @router.get("/", response_model=List[schemas.Stock])
 async def get_stocks(
+    response: Response,
     skip: int = 0, 
-    limit: int = 100
+    limit: int = 100,
+    symbols: Optional[str] = Query(None, description="쉼표로 구분한 종목코드 (예: 관심종목), 없으면 주요 종목"),
+    concurrency: int = Query(QUOTE_CONCURRENCY, ge=1, le=MAX_QUOTE_CONCURRENCY, description="동시 현재가 조회 수"),
+    timeout: float = Query(QUOTE_TIMEOUT_SEC, gt=0, le=30, description="종목별 조회 타임아웃 (초)"),
+    db: Session = Depends(get_db)
 ):
-    """주식 목록 조회"""
-    # 실제 구현에서는 데이터베이스에서 주식 정보 조회
-    # 주요 종목들의 실시간 데이터를 반환
-    major_stocks = [
-        {"id": 1, "symbol": "005930", "name": "삼성전자", "market": "KOSPI"},
-        {"id": 2, "symbol": "035420", "name": "NAVER", "market": "KOSPI"},
-        {"id": 3, "symbol": "000660", "name": "SK하이닉스", "market": "KOSPI"},
-        {"id": 4, "symbol": "207940", "name": "삼성바이오로직스", "market": "KOSPI"},
-        {"id": 5, "symbol": "051910", "name": "LG화학", "market": "KOSPI"},
-    ]
+    """
+    주식 시세 개요 조회 (종목별 현재가를 동시에 조회)
     
-    # 각 종목의 실시간 가격 정보 조회 (실제 KIS API만 사용)
-    import sys
-    sys.path.append(os.path.join(os.path.dirname(__file__), '../../..', 'analyze'))
+    일부 종목이 실패하거나 타임아웃되면 성공한 종목만 반환하고,
+    실패한 종목코드는 X-Failed-Symbols 응답 헤더로 알려줍니다.
+    """
+    if symbols:
+        codes = [code.strip() for code in symbols.split(',') if code.strip()]
+        codes = list(dict.fromkeys(codes))[skip:skip + limit]
+        names = await asyncio.to_thread(lookup_stock_names, db, codes)
+        stock_list = [
+            {"symbol": code, **names.get(code, {"name": code, "market": ""})}
+            for code in codes
+        ]
+    else:
+        stock_list = MAJOR_STOCKS[skip:skip + limit]
     
     try:
-        from lib.hantu import get_current_price_data
+        quotes, failed_stocks = await fetch_quotes(
+            [stock["symbol"] for stock in stock_list], concurrency=concurrency, timeout=timeout
+        )
     except ImportError:
         raise HTTPException(status_code=500, detail="KIS API 모듈을 불러올 수 없습니다.")
     
     result = []
-    failed_stocks = []
-    
-    for stock_info in major_stocks:
-        try:
-            # 실제 현재가 데이터 조회
-            price_data = get_current_price_data(stock_info["symbol"])
-            result.append({
-                "id": stock_info["id"],
-                "symbol": stock_info["symbol"],
-                "name": stock_info["name"],
-                "market": stock_info["market"],
-                "current_price": price_data["current_price"],
-                "change_rate": price_data["change_rate"],
-                "change_price": price_data.get("change_price", 0),
-                "volume": price_data["volume"],
-                "updated_at": price_data["updated_at"]
-            })
-        except Exception as e:
-            print(f"주식 {stock_info['symbol']} 현재가 조회 실패: {e}")
-            failed_stocks.append(stock_info['symbol'])
+    for index, stock_info in enumerate(stock_list, start=skip + 1):
+        price_data = quotes.get(stock_info["symbol"])
+        if not price_data:
+            continue
+        result.append({
+            "id": index,
+            "symbol": stock_info["symbol"],
+            "name": stock_info["name"],
+            "market": stock_info["market"],
+            "current_price": price_data["current_price"],
+            "change_rate": price_data["change_rate"],
+            "change_price": price_data.get("change_price", 0),
+            "volume": price_data["volume"],
+            "updated_at": price_data["updated_at"]
+        })
     
     # 모든 종목이 실패한 경우 오류 반환
-    if not result:
+    if stock_list and not result:
         raise HTTPException(status_code=500, detail="모든 종목의 데이터 조회가 실패했습니다.")
     
     # 일부 종목이 실패한 경우 성공한 종목만 반환
     if failed_stocks:
         print(f"⚠️ 실패한 종목들: {', '.join(failed_stocks)}")
+        response.headers["X-Failed-Symbols"] = ",".join(failed_stocks)
     
     return result
 
@@ -138,10 +184,21 @@ async def get_stock_chart_data(
         load_dotenv(analyze_env_path)
         
         try:
-            # hantu.py 모듈 import 및 실제 데이터 조회
-            from lib.hantu import get_combined_data
-            print(f"🔍 KIS API 호출 시작: {stock_code}, {days}일")
-            df = get_combined_data(stock_code, days)
+            # 로컬 일봉 저장소에서 읽고, 최신이 아니면 마지막 저장일 이후만 KIS에서 증분 조회
+            from datetime import datetime, time as dt_time
+            from lib.bar_store import HISTORY_BARS, get_bar_store, refresh_bars
+            from lib.hantu import get_kis_api
+            api = get_kis_api()
+
+            def fetch(since, adjusted=True):
+                if since is None:
+                    return api.get_daily_bars(stock_code, days=max(days, HISTORY_BARS), adjusted=adjusted)
+                return api.get_daily_bars(stock_code, start_date=datetime.combine(since, dt_time()), adjusted=adjusted)
+
+            print(f"🔍 KIS 일봉 조회 시작: {stock_code}, {days}일")
+            # 동기 KIS 조회 + 파일 기록이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+            df = await asyncio.to_thread(refresh_bars, get_bar_store('kis'), stock_code, fetch)
+            df = df.tail(days).reset_index(drop=True)
             
             if df.empty:
                 print(f"❌ KIS API 응답이 비어있음: {stock_code}")
@@ -156,22 +213,24 @@ async def get_stock_chart_data(
             print(f"❌ KIS API 오류: {api_error}")
             raise HTTPException(status_code=500, detail=f"차트 데이터 조회 중 API 오류가 발생했습니다: {str(api_error)}")
         
-        # 거래량 변화 계산 (전일 대비)
-        df['volume_change'] = df['volume'].pct_change()
-        
-        # JSON 직렬화를 위해 데이터 변환
-        chart_data = []
-        for _, row in df.iterrows():
-            chart_data.append({
-                'date': row['date'].strftime('%Y-%m-%d'),
-                'open': float(row['open']),
-                'high': float(row['high']),
-                'low': float(row['low']),
-                'close': float(row['close']),
-                'volume': int(row['volume']),
-                'trade_amount': int(row['trade_amount']),
-                'volume_change': float(row['volume_change']) if not pd.isna(row['volume_change']) else None
-            })
+        # df는 lib.ohlcv 표준 일봉 프레임 (과거 → 최신 정렬, 숫자 dtype)이므로 컬럼 단위로 바로 직렬화
+        volume = df['volume'].to_numpy()
+        volume_change = np.full(len(volume), np.nan)
+        if len(volume) > 1:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                volume_change[1:] = np.where(volume[:-1] != 0, volume[1:] / volume[:-1] - 1, np.nan)
+
+        output_columns = {
+            'date': np.datetime_as_string(df['date'].to_numpy(), unit='D').tolist(),
+            'open': df['open'].to_numpy(dtype=float).tolist(),
+            'high': df['high'].to_numpy(dtype=float).tolist(),
+            'low': df['low'].to_numpy(dtype=float).tolist(),
+            'close': df['close'].to_numpy(dtype=float).tolist(),
+            'volume': volume.tolist(),
+            'trade_amount': df['trade_amount'].to_numpy().tolist(),
+            'volume_change': _nan_to_none(volume_change.tolist()),
+        }
+        chart_data = [dict(zip(output_columns, row)) for row in zip(*output_columns.values())]
         
         return {
             "stock_code": stock_code,
@@ -352,7 +411,15 @@ async def get_stock_daily_chart(
             ],
             'total_records': 100
         }
+
+    같은 (종목, 수정주가구분, 기준일) 응답은 차트 캐시에서 반환합니다 (app.services.chart_cache 만료 규칙).
     """
+    key = chart_cache_key('daily-chart', 'kiwoom', stock_code, upd_stkpc_tp, base_dt)
+    return await get_chart_cache().get_or_load(key, lambda: _load_daily_chart(stock_code, key[-1], upd_stkpc_tp))
+
+
+async def _load_daily_chart(stock_code: str, base_dt: str, upd_stkpc_tp: str) -> Dict[str, Any]:
+    """키움 일봉 차트 응답 생성 (차트 캐시 실패 시)"""
     try:
         # .env 파일 경로 설정
         import os
@@ -378,103 +445,79 @@ async def get_stock_daily_chart(
                 detail="키움증권 API 설정이 완료되지 않았습니다 (.env 파일에서 KIWOOM_APP_KEY, KIWOOM_SECRET_KEY, KIWOOM_ACCOUNT_NO 확인)"
             )
 
-        # KiwoomAPI 인스턴스 생성
-        from lib.kiwoom import KiwoomAPI
-        api = KiwoomAPI(
+        # AsyncKiwoomAPI 인스턴스 생성 (이벤트 루프를 막지 않는 비동기 클라이언트)
+        from lib.kiwoom_async import AsyncKiwoomAPI
+        api = AsyncKiwoomAPI(
             app_key=app_key,
             secret_key=secret_key,
             account_no=account_no,
             use_mock=use_mock
         )
 
-        # 일봉 차트 조회
-        print(f"🔍 키움증권 일봉 차트 조회 시작: {stock_code}, base_dt={base_dt}")
-        chart_result = api.get_daily_chart(
-            stock_code=stock_code,
-            base_dt=base_dt,
-            upd_stkpc_tp=upd_stkpc_tp
-        )
-
-        if not chart_result:
-            print(f"❌ 키움증권 일봉 차트 조회 실패: {stock_code}")
-            raise HTTPException(
-                status_code=500,
-                detail=f"종목 {stock_code}의 일봉 차트 데이터를 조회할 수 없습니다"
+        from lib.bar_store import get_bar_store
+        from lib.kiwoom_decoder import moving_average
+        from lib.ohlcv import kiwoom_daily_bars
+
+        # 로컬 일봉 저장소를 갱신(새 봉만 증분 조회)한 뒤 기준일까지 읽음
+        # (원주가로 저장, 수정주가는 읽을 때 수정 계수를 곱하므로 두 구분 모두 추가 조회 없음)
+        await _refresh_kiwoom_bars(api, stock_code)
+        store = get_bar_store('kiwoom')
+        stored_dates = store.columns(stock_code)['date']
+        if len(stored_dates) and stored_dates[0] <= np.datetime64(datetime.strptime(base_dt, '%Y%m%d')):
+            bars = store.read_frame(
+                stock_code, end=datetime.strptime(base_dt, '%Y%m%d'), last=DAILY_CHART_BARS,
+                adjusted=upd_stkpc_tp == '1'
+            )
+            print(f"🔍 키움증권 일봉 저장소 조회: {stock_code}, base_dt={base_dt}, {len(bars)}개")
+            if bars.empty:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"종목 {stock_code}의 일봉 차트 데이터를 조회할 수 없습니다"
+                )
+        else:
+            # 저장된 기간보다 이전 기준일은 저장소를 거치지 않고 직접 조회
+            print(f"🔍 키움증권 일봉 차트 조회 시작: {stock_code}, base_dt={base_dt}")
+            chart_result = await api.get_daily_chart(
+                stock_code=stock_code,
+                base_dt=base_dt,
+                upd_stkpc_tp=upd_stkpc_tp
             )
 
-        # 응답 데이터 변환
-        chart_data_list = chart_result.get('stk_dt_pole_chart_qry', [])
-
-        # 데이터 포맷 변환 (문자열 -> 숫자)
-        transformed_data = []
-        close_prices = []  # 종가 수집 (이동평균선 계산용)
-
-        for i, chart_data in enumerate(chart_data_list):
-            try:
-                current_close = float(chart_data.get('cur_prc', 0))
-                close_prices.append(current_close)
-
-                # 이전 봉(더 이전 날짜)의 종가 가져오기 (변화율 계산용)
-                # API 응답에서 가장 최신(index 0)부터 과거 순서이므로,
-                # index+1이 이전 날짜 데이터
-                prev_close = None
-                if i + 1 < len(chart_data_list):
-                    try:
-                        prev_chart_data = chart_data_list[i + 1]
-                        prev_close = float(prev_chart_data.get('cur_prc', 0))
-                    except (ValueError, KeyError):
-                        prev_close = None
-
-                # 변화율 계산 (전일대비)
-                change_rate = None
-                if prev_close and prev_close != 0:
-                    change_rate = ((current_close - prev_close) / prev_close) * 100
-
-                transformed_item = {
-                    'date': chart_data['dt'][:4] + '-' + chart_data['dt'][4:6] + '-' + chart_data['dt'][6:8],  # YYYYMMDD -> YYYY-MM-DD
-                    'open': float(chart_data.get('open_pric', 0)),
-                    'high': float(chart_data.get('high_pric', 0)),
-                    'low': float(chart_data.get('low_pric', 0)),
-                    'close': current_close,
-                    'volume': int(chart_data.get('trde_qty', 0)),
-                    'trade_amount': int(chart_data.get('trde_prica', 0)),
-                    'change_rate': change_rate,
-                    'ma5': None,
-                    'ma10': None,
-                    'ma20': None,
-                    'ma60': None,
-                }
-                transformed_data.append(transformed_item)
-
-            except (ValueError, KeyError) as e:
-                print(f"⚠️ 데이터 변환 오류: {e}, 데이터: {chart_data}")
-                continue
-
-        # 이동평균선 계산
-        # 데이터는 최신순(index 0 = 가장 최신)이므로, 역순으로 처리해야 함
-        for i in range(len(transformed_data)):
-            # 현재 인덱스 기준으로 과거 데이터 가져오기
-            # i부터 과거 방향(i+1, i+2, ...)으로 N일치 데이터 수집
-
-            # 5일 이동평균선
-            if i + 4 < len(close_prices):
-                ma5 = sum(close_prices[i:i+5]) / 5
-                transformed_data[i]['ma5'] = ma5
-
-            # 10일 이동평균선
-            if i + 9 < len(close_prices):
-                ma10 = sum(close_prices[i:i+10]) / 10
-                transformed_data[i]['ma10'] = ma10
-
-            # 20일 이동평균선
-            if i + 19 < len(close_prices):
-                ma20 = sum(close_prices[i:i+20]) / 20
-                transformed_data[i]['ma20'] = ma20
-
-            # 60일 이동평균선
-            if i + 59 < len(close_prices):
-                ma60 = sum(close_prices[i:i+60]) / 60
-                transformed_data[i]['ma60'] = ma60
+            if not chart_result:
+                print(f"❌ 키움증권 일봉 차트 조회 실패: {stock_code}")
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"종목 {stock_code}의 일봉 차트 데이터를 조회할 수 없습니다"
+                )
+
+            # 응답 데이터를 표준 일봉 프레임으로 한 번에 변환 (과거 → 최신 순)
+            bars = kiwoom_daily_bars(chart_result.get('stk_dt_pole_chart_qry', []))
+        closes = bars['close'].to_numpy(dtype=float)
+
+        # 변화율 (전일대비, 가장 과거 봉은 None)
+        change_rates = np.full(len(closes), np.nan)
+        if len(closes) > 1:
+            prev_closes = closes[:-1]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                change_rates[1:] = np.where(prev_closes != 0, (closes[1:] - prev_closes) / prev_closes * 100, np.nan)
+
+        # 이동평균선
+        moving_averages = {f'ma{window}': moving_average(closes, window) for window in (5, 10, 20, 60)}
+
+        # 응답은 기존과 같이 최신순 (index 0 = 가장 최신)
+        output_columns = {
+            'date': np.datetime_as_string(bars['date'].to_numpy(), unit='D'),
+            'open': bars['open'].to_numpy(dtype=float),
+            'high': bars['high'].to_numpy(dtype=float),
+            'low': bars['low'].to_numpy(dtype=float),
+            'close': closes,
+            'volume': bars['volume'].to_numpy(),
+            'trade_amount': bars['trade_amount'].to_numpy(),
+            'change_rate': change_rates,
+            **moving_averages,
+        }
+        output_columns = {name: _nan_to_none(values[::-1].tolist()) for name, values in output_columns.items()}
+        transformed_data = [dict(zip(output_columns, row)) for row in zip(*output_columns.values())]
 
         print(f"✅ 키움증권 일봉 차트 조회 성공: {stock_code}, {len(transformed_data)}개 데이터")
 
@@ -502,6 +545,164 @@ async def get_stock_daily_chart(
         )
 
 
+@router.get("/{stock_code}/minute-chart")
+async def get_stock_minute_chart(
+    stock_code: str,
+    interval: int = Query(1, description="봉 간격 (분): 1, 3, 5, 10, 15, 30, 60"),
+    days: int = Query(1, ge=1, le=5, description="최근 거래일 수")
+) -> Dict[str, Any]:
+    """
+    분봉 차트 조회 (키움 ka10080 1분봉을 로컬 분봉 저장소에 증분 수집한 뒤 N분봉으로 합침)
+
+    Args:
+        stock_code (str): 종목코드 (6자리)
+        interval (int): 봉 간격 (분, 09:00 기준 구간)
+        days (int): 최근 거래일 수 (기본값: 1)
+
+    Returns:
+        Dict: 분봉 차트 데이터 (과거 → 최신)
+        {
+            'stock_code': '005930',
+            'interval': 5,
+            'data': [
+                {'datetime': '2025-09-08T09:00', 'open': 69800, 'high': 70000, 'low': 69700,
+                 'close': 69900, 'volume': 152340, 'trade_amount': 10648566000},
+                ...
+            ],
+            'total_records': 78
+        }
+    """
+    from lib.ohlcv import MINUTE_INTERVALS
+
+    if interval not in MINUTE_INTERVALS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 분봉 간격입니다: {interval} (가능: {list(MINUTE_INTERVALS)})")
+
+    key = chart_cache_key(f'minute-chart:{interval}:{days}', 'kiwoom', stock_code)
+    return await get_chart_cache().get_or_load(key, lambda: _load_minute_chart(stock_code, interval, days))
+
+
+async def _load_minute_chart(stock_code: str, interval: int, days: int) -> Dict[str, Any]:
+    """분봉 차트 응답 생성 (차트 캐시 실패 시)"""
+    try:
+        from dotenv import load_dotenv
+        analyze_env_path = os.path.join(os.path.dirname(__file__), '../../../analyze/.env')
+        load_dotenv(analyze_env_path)
+
+        app_key = os.getenv('KIWOOM_APP_KEY')
+        secret_key = os.getenv('KIWOOM_SECRET_KEY')
+        account_no = os.getenv('KIWOOM_ACCOUNT_NO')
+        if not all([app_key, secret_key, account_no]):
+            raise HTTPException(
+                status_code=500,
+                detail="키움증권 API 설정이 완료되지 않았습니다 (.env 파일에서 KIWOOM_APP_KEY, KIWOOM_SECRET_KEY, KIWOOM_ACCOUNT_NO 확인)"
+            )
+
+        from lib.kiwoom_async import AsyncKiwoomAPI
+        from lib.minute_bars import read_minute_candles, refresh_minute_bars_async
+        api = AsyncKiwoomAPI(
+            app_key=app_key,
+            secret_key=secret_key,
+            account_no=account_no,
+            use_mock=os.getenv('KIWOOM_USE_MOCK', 'False').lower() == 'true'
+        )
+
+        await refresh_minute_bars_async(api, stock_code)
+        bars = read_minute_candles(stock_code, interval, days)
+        if bars.empty:
+            raise HTTPException(status_code=500, detail=f"종목 {stock_code}의 분봉 데이터를 조회할 수 없습니다")
+
+        output_columns = {
+            'datetime': np.datetime_as_string(bars['date'].to_numpy(), unit='m').tolist(),
+            **{column: bars[column].to_numpy().tolist() for column in ('open', 'high', 'low', 'close', 'volume', 'trade_amount')},
+        }
+        data = [dict(zip(output_columns, row)) for row in zip(*output_columns.values())]
+        print(f"✅ 분봉 차트 조회 성공: {stock_code}, {interval}분봉 {len(data)}개")
+
+        return {
+            'stock_code': stock_code,
+            'interval': interval,
+            'data': data,
+            'total_records': len(data)
+        }
+
+    except HTTPException:
+        raise  # HTTPException은 그대로 전달
+    except Exception as e:
+        print(f"❌ 분봉 차트 조회 중 오류: {e}")
+        raise HTTPException(status_code=500, detail=f"분봉 차트 조회 중 오류가 발생했습니다: {str(e)}")
+
+
+@router.get("/{stock_code}/indicators")
+async def get_stock_indicators(stock_code: str) -> Dict[str, Any]:
+    """
+    최신 기술적 지표 조회 (RSI, MACD, 볼린저 밴드, 이동평균, 스토캐스틱, 거래량 SMA, ATR)
+
+    로컬 일봉 저장소를 증분 갱신한 뒤, 저장소에 함께 보관한 지표 상태를 새 봉만큼만 갱신해 계산합니다
+    (전체 이력을 다시 계산하지 않음, lib.indicator_state).
+
+    Args:
+        stock_code (str): 종목코드 (6자리)
+
+    Returns:
+        Dict: 최신 지표 (아직 계산할 수 없는 값은 null)
+        {
+            'stock_code': '005930',
+            'date': '2025-09-08',
+            'indicators': {'rsi': 58.2, 'macd': 412.5, ..., 'atr': 1520.3, 'current_price': 70900}
+        }
+    """
+    key = chart_cache_key('indicators', 'kiwoom', stock_code)
+    return await get_chart_cache().get_or_load(key, lambda: _load_indicators(stock_code))
+
+
+async def _load_indicators(stock_code: str) -> Dict[str, Any]:
+    """최신 지표 응답 생성 (차트 캐시 실패 시)"""
+    try:
+        from dotenv import load_dotenv
+        analyze_env_path = os.path.join(os.path.dirname(__file__), '../../../analyze/.env')
+        load_dotenv(analyze_env_path)
+
+        app_key = os.getenv('KIWOOM_APP_KEY')
+        secret_key = os.getenv('KIWOOM_SECRET_KEY')
+        account_no = os.getenv('KIWOOM_ACCOUNT_NO')
+        if not all([app_key, secret_key, account_no]):
+            raise HTTPException(
+                status_code=500,
+                detail="키움증권 API 설정이 완료되지 않았습니다 (.env 파일에서 KIWOOM_APP_KEY, KIWOOM_SECRET_KEY, KIWOOM_ACCOUNT_NO 확인)"
+            )
+
+        from lib.bar_store import get_bar_store
+        from lib.indicator_state import refresh_indicators
+        from lib.kiwoom_async import AsyncKiwoomAPI
+        api = AsyncKiwoomAPI(
+            app_key=app_key,
+            secret_key=secret_key,
+            account_no=account_no,
+            use_mock=os.getenv('KIWOOM_USE_MOCK', 'False').lower() == 'true'
+        )
+
+        await _refresh_kiwoom_bars(api, stock_code)
+        store = get_bar_store('kiwoom')
+        # 상태 파일 읽기/쓰기와 재계산이 이벤트 루프를 막지 않도록 스레드에서 실행
+        indicators = await asyncio.to_thread(refresh_indicators, store, stock_code)
+        if not indicators:
+            raise HTTPException(status_code=500, detail=f"종목 {stock_code}의 일봉 데이터를 조회할 수 없습니다")
+
+        names = list(indicators)
+        print(f"✅ 지표 조회 성공: {stock_code}")
+        return {
+            'stock_code': stock_code,
+            'date': str(store.last_date(stock_code).astype('datetime64[D]')),
+            'indicators': dict(zip(names, _nan_to_none([float(indicators[name]) for name in names]))),
+        }
+
+    except HTTPException:
+        raise  # HTTPException은 그대로 전달
+    except Exception as e:
+        print(f"❌ 지표 조회 중 오류: {e}")
+        raise HTTPException(status_code=500, detail=f"지표 조회 중 오류가 발생했습니다: {str(e)}")
+
+
 @router.get("/{stock_code}/trades")
 async def get_stock_trades(
     stock_code: str
@@ -535,8 +736,8 @@ async def get_stock_trades(
         analyze_env_path = os.path.join(os.path.dirname(__file__), '../../../analyze/.env')
         load_dotenv(analyze_env_path)
 
-        # KiwoomAPI를 통해 최근 거래 기록 조회
-        from lib.kiwoom import KiwoomAPI
+        # AsyncKiwoomAPI를 통해 최근 거래 기록 조회
+        from lib.kiwoom_async import AsyncKiwoomAPI
 
         app_key = os.getenv('KIWOOM_APP_KEY')
         secret_key = os.getenv('KIWOOM_SECRET_KEY')
@@ -548,7 +749,7 @@ async def get_stock_trades(
                 detail="키움증권 API 설정이 완료되지 않았습니다"
             )
 
-        api = KiwoomAPI(
+        api = AsyncKiwoomAPI(
             app_key=app_key,
             secret_key=secret_key,
             account_no=account_no,
@@ -556,7 +757,7 @@ async def get_stock_trades(
         )
 
         # 최근 거래 기록 조회 (최대 90일)
-        all_trades = api.get_recent_trades(days=90)
+        all_trades = await api.get_recent_trades(days=90)
 
         # 해당 종목의 거래만 필터링
         filtered_trades = [
@@ -681,13 +882,21 @@ async def get_atr(stock_code: str):
                 'statistics': {...}
             }
         }
+
+    같은 날의 결과는 차트 캐시에서 반환합니다 (장중에는 짧게, 장 마감 후에는 다음 장 시작까지 유지).
     """
+    key = chart_cache_key('atr', 'kiwoom', stock_code)
+    return await get_chart_cache().get_or_load(key, lambda: _load_atr(stock_code))
+
+
+async def _load_atr(stock_code: str) -> Dict[str, Any]:
+    """ATR 계산 결과 생성 (차트 캐시 실패 시)"""
     try:
         # 키움증권 API를 사용하여 OHLC 데이터 조회
         print(f"📊 ATR 계산 시작: {stock_code}")
 
         try:
-            from lib.kiwoom import KiwoomAPI
+            from lib.kiwoom_async import AsyncKiwoomAPI
             import os
             from dotenv import load_dotenv
             from datetime import datetime
@@ -696,7 +905,7 @@ async def get_atr(stock_code: str):
             analyze_env_path = os.path.join(os.path.dirname(__file__), '../../../analyze/.env')
             load_dotenv(analyze_env_path)
 
-            api = KiwoomAPI(
+            api = AsyncKiwoomAPI(
                 app_key=os.getenv('KIWOOM_APP_KEY'),
                 secret_key=os.getenv('KIWOOM_SECRET_KEY'),
                 account_no=os.getenv('KIWOOM_ACCOUNT_NO'),
@@ -705,44 +914,17 @@ async def get_atr(stock_code: str):
 
             print(f"🔑 키움 API 초기화 완료")
 
-            # 키움 API에서 일봉 차트 데이터 조회 (오늘 날짜 기준)
-            today_dt = datetime.now().strftime('%Y%m%d')
-            chart_result = api.get_daily_chart(stock_code, base_dt=today_dt)
-
-            # 응답 검증
-            if not chart_result:
-                raise Exception("키움 API에서 응답을 받을 수 없습니다")
+            # 로컬 일봉 저장소에서 읽고 새 봉만 증분 조회 (과거 → 최신 순, 마지막 행이 현재가)
+            bars = (await _refresh_kiwoom_bars(api, stock_code)).tail(DAILY_CHART_BARS)
+            if bars.empty:
+                raise Exception("키움 API에서 차트 데이터를 받을 수 없습니다")
 
-            # stk_dt_pole_chart_qry에서 데이터 추출
-            chart_data = chart_result.get('stk_dt_pole_chart_qry', [])
+            print(f"📈 키움 일봉 조회 완료: {len(bars)}개 데이터")
 
-            if not isinstance(chart_data, list) or len(chart_data) == 0:
-                raise Exception(f"키움 API에서 차트 데이터를 받을 수 없습니다: {chart_result.get('return_msg', 'Unknown error')}")
-
-            print(f"📈 키움 API 차트 데이터 조회 완료: {len(chart_data)}개 데이터")
-
-            # chart_data를 DataFrame으로 변환
-            ohlc_data = pd.DataFrame(chart_data)
+            from lib.ohlcv import to_analysis_frame
+            ohlc_data = to_analysis_frame(bars)
             print(f"✅ DataFrame으로 변환: {len(ohlc_data)}개 행")
 
-            # 키움 API의 컬럼명을 표준 형식으로 정규화
-            column_mapping = {
-                'open_pric': 'Open',
-                'high_pric': 'High',
-                'low_pric': 'Low',
-                'cur_prc': 'Close',
-                'trde_qty': 'Volume'
-            }
-            ohlc_data = ohlc_data.rename(columns=column_mapping)
-            print(f"✅ 컬럼명 정규화 완료: {list(ohlc_data.columns)}")
-
-            # 숫자로 변환 (문자열일 수 있으므로)
-            numeric_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-            for col in numeric_columns:
-                if col in ohlc_data.columns:
-                    ohlc_data[col] = pd.to_numeric(ohlc_data[col], errors='coerce')
-            print(f"✅ 숫자형 변환 완료")
-
         except Exception as kiwoom_error:
             print(f"❌ 키움 API 조회 실패: {kiwoom_error}")
             raise HTTPException(status_code=500, detail=f"키움 API에서 데이터를 조회할 수 없습니다: {str(kiwoom_error)}")
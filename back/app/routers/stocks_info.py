@@ -6,6 +6,7 @@ stocks_info 테이블에 저장/조회합니다.
 """
 
 import logging
+import os
 import sys
 from pathlib import Path
 from typing import Optional, List
@@ -18,10 +19,11 @@ from app.models import StocksInfo, User
 from app.schemas import StocksInfo as StocksInfoSchema, StocksInfoCreate
 from app.routers.auth import get_current_user
 
-# 부모 디렉토리를 path에 추가 (analyze 모듈 임포트를 위해)
-sys.path.insert(0, '/home/ubuntu/goni')
+# analyze 모듈 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../..', 'analyze'))
 
-from analyze.lib.kiwoom import KiwoomAPI
+from lib.kiwoom import KiwoomAPI
+from lib.rate_limiter import PRIORITY_BACKGROUND
 
 logger = logging.getLogger(__name__)
 
@@ -139,95 +141,104 @@ def sync_stocks_info(
             app_key=current_user.app_key,
             secret_key=current_user.app_secret,
             account_no="",  # 종목정보 조회에는 계좌번호 불필요
-            use_mock=False
+            use_mock=False,
+            priority=PRIORITY_BACKGROUND  # 대량 동기화는 화면 조회보다 뒤로
         )
 
-        # ka10099 API 호출
+        # ka10099 API 연속조회: 페이지 단위로 받아서 바로 저장 (전체 목록을 메모리에 모으지 않음)
         logger.info(f"키움 API ka10099 호출: market_code={market_code}")
-        result = kiwoom_api.get_stocks_info(mrkt_tp=market_code)
 
-        if not result:
+        page_count = 0
+        total_count = 0
+        added_count = 0
+        updated_count = 0
+        duplicated_count = 0
+
+        for stocks_list in kiwoom_api.iter_stocks_info(mrkt_tp=market_code):
+            page_count += 1
+            total_count += len(stocks_list)
+
+            # 페이지 내 기존 종목을 한 번에 조회
+            page_codes = [stock_data.get('code', '').strip() for stock_data in stocks_list]
+            existing_stocks = {
+                stock.code: stock
+                for stock in db.query(StocksInfo).filter(StocksInfo.code.in_([c for c in page_codes if c])).all()
+            }
+
+            # DB에 저장/업데이트
+            for stock_data in stocks_list:
+                try:
+                    code = stock_data.get('code', '').strip()
+
+                    if not code:
+                        logger.warning(f"종목코드가 없는 데이터 스킵: {stock_data}")
+                        continue
+
+                    existing_stock = existing_stocks.get(code)
+
+                    if existing_stock:
+                        # 기존 데이터 업데이트
+                        existing_stock.name = stock_data.get('name', '')
+                        existing_stock.list_count = stock_data.get('listCount', '')
+                        existing_stock.audit_info = stock_data.get('auditInfo', '')
+                        existing_stock.reg_day = stock_data.get('regDay', '')
+                        existing_stock.last_price = stock_data.get('lastPrice', '')
+                        existing_stock.state = stock_data.get('state', '')
+                        existing_stock.market_code = stock_data.get('marketCode', '')
+                        existing_stock.market_name = stock_data.get('marketName', '')
+                        existing_stock.up_name = stock_data.get('upName', '')
+                        existing_stock.up_size_name = stock_data.get('upSizeName', '')
+                        existing_stock.company_class_name = stock_data.get('companyClassName', '')
+                        existing_stock.order_warning = stock_data.get('orderWarning', '')
+                        existing_stock.nxt_enable = stock_data.get('nxtEnable', '')
+                        existing_stock.updated_at = datetime.utcnow()
+
+                        updated_count += 1
+                        logger.debug(f"종목정보 업데이트: {code} ({existing_stock.name})")
+                    else:
+                        # 새 데이터 추가
+                        new_stock = StocksInfo(
+                            code=code,
+                            name=stock_data.get('name', ''),
+                            list_count=stock_data.get('listCount', ''),
+                            audit_info=stock_data.get('auditInfo', ''),
+                            reg_day=stock_data.get('regDay', ''),
+                            last_price=stock_data.get('lastPrice', ''),
+                            state=stock_data.get('state', ''),
+                            market_code=stock_data.get('marketCode', ''),
+                            market_name=stock_data.get('marketName', ''),
+                            up_name=stock_data.get('upName', ''),
+                            up_size_name=stock_data.get('upSizeName', ''),
+                            company_class_name=stock_data.get('companyClassName', ''),
+                            order_warning=stock_data.get('orderWarning', ''),
+                            nxt_enable=stock_data.get('nxtEnable', ''),
+                        )
+                        db.add(new_stock)
+                        # 같은 응답 안에 중복 코드가 오면 업데이트로 처리
+                        existing_stocks[code] = new_stock
+                        added_count += 1
+                        logger.debug(f"종목정보 추가: {code} ({stock_data.get('name', '')})")
+
+                except Exception as e:
+                    logger.error(f"종목정보 저장 실패: {stock_data}, Error: {e}")
+                    duplicated_count += 1
+
+            # 페이지 단위 커밋 (다음 페이지 조회 전에 세션을 비움)
+            db.commit()
+            db.expunge_all()
+
+        if page_count == 0:
             raise HTTPException(
                 status_code=400,
                 detail=f"키움 API 호출 실패: market_code={market_code}"
             )
 
-        # 응답 데이터 파싱
-        stocks_list = result.get('list', [])
-
-        added_count = 0
-        updated_count = 0
-        duplicated_count = 0
-
-        # DB에 저장/업데이트
-        for stock_data in stocks_list:
-            try:
-                code = stock_data.get('code', '').strip()
-
-                if not code:
-                    logger.warning(f"종목코드가 없는 데이터 스킵: {stock_data}")
-                    continue
-
-                # 기존 데이터 확인
-                existing_stock = db.query(StocksInfo).filter(
-                    StocksInfo.code == code
-                ).first()
-
-                if existing_stock:
-                    # 기존 데이터 업데이트
-                    existing_stock.name = stock_data.get('name', '')
-                    existing_stock.list_count = stock_data.get('listCount', '')
-                    existing_stock.audit_info = stock_data.get('auditInfo', '')
-                    existing_stock.reg_day = stock_data.get('regDay', '')
-                    existing_stock.last_price = stock_data.get('lastPrice', '')
-                    existing_stock.state = stock_data.get('state', '')
-                    existing_stock.market_code = stock_data.get('marketCode', '')
-                    existing_stock.market_name = stock_data.get('marketName', '')
-                    existing_stock.up_name = stock_data.get('upName', '')
-                    existing_stock.up_size_name = stock_data.get('upSizeName', '')
-                    existing_stock.company_class_name = stock_data.get('companyClassName', '')
-                    existing_stock.order_warning = stock_data.get('orderWarning', '')
-                    existing_stock.nxt_enable = stock_data.get('nxtEnable', '')
-                    existing_stock.updated_at = datetime.utcnow()
-
-                    updated_count += 1
-                    logger.debug(f"종목정보 업데이트: {code} ({existing_stock.name})")
-                else:
-                    # 새 데이터 추가
-                    new_stock = StocksInfo(
-                        code=code,
-                        name=stock_data.get('name', ''),
-                        list_count=stock_data.get('listCount', ''),
-                        audit_info=stock_data.get('auditInfo', ''),
-                        reg_day=stock_data.get('regDay', ''),
-                        last_price=stock_data.get('lastPrice', ''),
-                        state=stock_data.get('state', ''),
-                        market_code=stock_data.get('marketCode', ''),
-                        market_name=stock_data.get('marketName', ''),
-                        up_name=stock_data.get('upName', ''),
-                        up_size_name=stock_data.get('upSizeName', ''),
-                        company_class_name=stock_data.get('companyClassName', ''),
-                        order_warning=stock_data.get('orderWarning', ''),
-                        nxt_enable=stock_data.get('nxtEnable', ''),
-                    )
-                    db.add(new_stock)
-                    added_count += 1
-                    logger.debug(f"종목정보 추가: {code} ({stock_data.get('name', '')})")
-
-            except Exception as e:
-                logger.error(f"종목정보 저장 실패: {stock_data}, Error: {e}")
-                duplicated_count += 1
-
-        # DB 커밋
-        db.commit()
-
-        total_count = len(stocks_list)
         logger.info(
             f"키움 API 동기화 완료: "
             f"시장={market_code}, "
             f"추가={added_count}, "
             f"업데이트={updated_count}, "
-            f"총 조회={total_count}"
+            f"총 조회={total_count} ({page_count}페이지)"
         )
 
         return {
@@ -239,6 +250,9 @@ def sync_stocks_info(
             "total": total_count
         }
 
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         logger.error(f"종목정보 동기화 실패: {e}")
         db.rollback()
@@ -11,6 +11,7 @@ import os
 # analyze 모듈 경로 추가
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../analyze'))
 from lib.kiwoom import KiwoomAPI
+from lib.price_feed import get_price_feed, get_realtime_price
 
 router = APIRouter(prefix="/api/trading-stocks", tags=["trading-stocks"])
 
@@ -389,17 +390,24 @@ def get_owned_stocks(
         # 페이징 적용
         paginated_stocks = owned_stocks[skip:skip + limit]
 
-        result = [
-            {
+        # 보유 종목은 실시간 체결을 구독해 다음 조회부터 메모리 저장소의 현재가 사용
+        price_feed = get_price_feed()
+        if price_feed is not None:
+            price_feed.subscribe(stock.get('stk_cd', '').lstrip('A') for stock in owned_stocks)
+
+        result = []
+        for stock in paginated_stocks:
+            if not stock.get('stk_cd', ''):
+                continue
+            realtime_price = get_realtime_price(stock.get('stk_cd', '').lstrip('A'))
+            result.append({
                 "id": 0,  # 임시 ID
                 "stock_code": stock.get('stk_cd', ''),
                 "stock_name": stock.get('stk_nm', ''),
                 "quantity": int(stock.get('rmnd_qty', 0)),
                 "avg_price": float(stock.get('avg_prc', 0)),
-            }
-            for stock in paginated_stocks
-            if stock.get('stk_cd', '')
-        ]
+                "current_price": realtime_price['current_price'] if realtime_price else abs(float(stock.get('cur_prc', 0) or 0)),
+            })
 
         print(f"✅ 보유 종목 조회 완료: {len(result)}건 (사용자 {current_user.id}, 전체: {len(owned_stocks)}건)")
 
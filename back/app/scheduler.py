@@ -1,7 +1,8 @@
 """
 추천 종목 정기 업데이트 스케줄러
 
-매일 토일 제외하고 18:10에 신고가 돌파 조건으로 추천 종목을 업데이트합니다.
+평일마다 조건식이 지정된 모든 알고리즘의 추천 종목을 한 번에 업데이트하고,
+장 마감 후 전 종목 일봉을 로컬 일봉 저장소에 채웁니다.
 """
 
 import logging
@@ -11,10 +12,11 @@ from apscheduler.triggers.cron import CronTrigger
 import os
 import sys
 
-# 프로젝트 경로 추가
-sys.path.insert(0, '/home/ubuntu/goni')
+# analyze 모듈 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..', 'analyze'))
 
 from app.database import SessionLocal
+from app.models import StocksInfo
 from app.services.recommendation_service import RecommendationService
 
 logger = logging.getLogger(__name__)
@@ -22,12 +24,20 @@ logger = logging.getLogger(__name__)
 # 스케줄러 인스턴스
 scheduler = BackgroundScheduler()
 
+# algorithm.condition_id가 비어 있을 때 사용할 기본 조건식 (알고리즘 ID: 조건식 ID)
+DEFAULT_ALGORITHM_CONDITIONS = {
+    1: '7',  # 신고가 따라잡기 (신고가 돌파)
+    2: '5',  # 대왕개미 단타론
+}
+
 
 def update_rec_stocks_job():
     """
-    신고가 돌파 조건으로 추천 종목을 검색하고 업데이트합니다.
+    조건식이 지정된 모든 알고리즘의 추천 종목을 한 번에 검색하고 업데이트합니다.
 
-    매일 18:10에 실행되며, 토요일과 일요일은 제외됩니다.
+    매일 평일에 실행되며, 토요일과 일요일은 제외됩니다.
+    알고리즘별 조건식(algorithm.condition_id, 예: 신고가 돌파 '7', 대왕개미 단타론 '5')을
+    WebSocket 세션 하나에서 일괄 검색하므로 알고리즘을 추가해도 요청 한 건만 늘어납니다.
     기존 데이터는 삭제하지 않고 누적되며, recommendation_date로 구분됩니다.
     """
     try:
@@ -46,22 +56,19 @@ def update_rec_stocks_job():
         db = SessionLocal()
 
         try:
-            # RecommendationService 생성
             service = RecommendationService(app_key, secret_key, account_no)
-
-            # 신고가 돌파 조건으로 알고리즘 1 업데이트 (조건 ID: 7)
-            success = service.search_and_update_rec_stocks(
-                condition_id='7',  # 신고가 돌파의 실제 ID
-                algorithm_id=1,
-                db=db,
-                stock_exchange_type='K'  # 전체
-            )
-
-            if success:
-                logger.info("[스케줄러] ✅ 추천 종목 업데이트 완료")
+            results = service.search_and_update_algorithms(db, stock_exchange_type='K')
+            if not results:
+                results = service.search_and_update_algorithms(
+                    db, DEFAULT_ALGORITHM_CONDITIONS, stock_exchange_type='K'
+                )
+
+            if results and all(results.values()):
+                logger.info(f"[스케줄러] ✅ 추천 종목 업데이트 완료: 알고리즘 {sorted(results)}")
                 return True
             else:
-                logger.error("[스케줄러] ❌ 추천 종목 업데이트 실패")
+                failed = sorted(algorithm_id for algorithm_id, success in results.items() if not success)
+                logger.error(f"[스케줄러] ❌ 추천 종목 업데이트 실패: 알고리즘 {failed or '없음'}")
                 return False
 
         finally:
@@ -72,17 +79,17 @@ def update_rec_stocks_job():
         return False
 
 
-def update_dae_wangkaemi_stocks_job():
+def backfill_bars_job():
     """
-    대왕개미 단타론 조건으로 추천 종목을 검색하고 업데이트합니다.
+    stocks_info의 코스피/코스닥 전 종목 일봉을 로컬 일봉 저장소(키움 수정주가)에 채웁니다.
 
-    매일 18:15에 실행되며, 토요일과 일요일은 제외됩니다.
-    기존 데이터는 삭제하지 않고 누적되며, recommendation_date로 구분됩니다.
+    평일 장 마감 후 실행되며, 이미 최신인 종목은 API를 호출하지 않습니다.
+    종목별 진행 상황을 체크포인트에 기록하므로 중단되면 다음 실행에서 남은 종목부터 이어갑니다.
+    키움 요청은 PRIORITY_BACKGROUND로 보내 화면 조회 요청을 먼저 처리합니다.
     """
     try:
-        logger.info(f"[스케줄러] 대왕개미 단타론 추천 종목 업데이트 작업 시작: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info(f"[스케줄러] 일봉 백필 작업 시작: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-        # 키움 API 자격증명 확인
         app_key = os.getenv('KIWOOM_APP_KEY')
         secret_key = os.getenv('KIWOOM_SECRET_KEY')
         account_no = os.getenv('KIWOOM_ACCOUNT_NO')
@@ -91,33 +98,40 @@ def update_dae_wangkaemi_stocks_job():
             logger.error("[스케줄러] 키움 API 자격증명이 설정되지 않았습니다")
             return False
 
-        # 데이터베이스 세션 생성
         db = SessionLocal()
-
         try:
-            # RecommendationService 생성
-            service = RecommendationService(app_key, secret_key, account_no)
+            codes = [
+                code for (code,) in db.query(StocksInfo.code)
+                .filter(StocksInfo.market_code.in_(['0', '10']))
+                .order_by(StocksInfo.code)
+                .all()
+            ]
+        finally:
+            db.close()
+
+        if not codes:
+            logger.warning("[스케줄러] stocks_info에 종목이 없어 일봉 백필을 건너뜁니다")
+            return False
 
-            # 대왕개미 단타론 조건으로 알고리즘 2 업데이트 (조건 ID: 5)
-            success = service.search_and_update_rec_stocks(
-                condition_id='5',  # 대왕개미단타의 실제 ID
-                algorithm_id=2,
-                db=db,
-                stock_exchange_type='K'  # 전체
-            )
+        from lib.bar_backfill import backfill_bars
+        from lib.bar_store import HISTORY_BARS, get_bar_store
+        from lib.kiwoom import KiwoomAPI
+        from lib.rate_limiter import PRIORITY_BACKGROUND
 
-            if success:
-                logger.info("[스케줄러] ✅ 대왕개미 단타론 추천 종목 업데이트 완료")
-                return True
-            else:
-                logger.error("[스케줄러] ❌ 대왕개미 단타론 추천 종목 업데이트 실패")
-                return False
+        api = KiwoomAPI(app_key, secret_key, account_no, priority=PRIORITY_BACKGROUND)
 
-        finally:
-            db.close()
+        def fetch(code, since, adjusted=True):
+            return api.fetch_daily_bars(code, since=since, max_bars=None if since else HISTORY_BARS, adjusted=adjusted)
+
+        report = backfill_bars(get_bar_store('kiwoom'), codes, fetch)
+        logger.info(
+            f"[스케줄러] ✅ 일봉 백필 완료: {report['total']}개 종목, 실패 {len(report['failed'])}개, "
+            f"{report['symbols_per_min']}종목/분"
+        )
+        return not report['failed']
 
     except Exception as e:
-        logger.error(f"[스케줄러] 대왕개미 단타론 추천 종목 업데이트 중 오류: {e}", exc_info=True)
+        logger.error(f"[스케줄러] 일봉 백필 중 오류: {e}", exc_info=True)
         return False
 
 
@@ -129,8 +143,9 @@ def start_scheduler():
             logger.warning("[스케줄러] 스케줄러가 이미 실행 중입니다")
             return
 
-        # 매일 월-금요일 18:10에 실행 (0=월, 1=화, 2=수, 3=목, 4=금)
+        # 매일 월-금요일 실행 (0=월, 1=화, 2=수, 3=목, 4=금)
         # day_of_week='0-4'는 월-금요일을 의미 (토일 제외)
+        # 모든 알고리즘(신고가 따라잡기, 대왕개미 단타론 등)을 한 작업에서 일괄 처리
         scheduler.add_job(
             update_rec_stocks_job,
             trigger=CronTrigger(
@@ -140,26 +155,27 @@ def start_scheduler():
                 timezone='Asia/Seoul'
             ),
             id='update_rec_stocks_job',
-            name='신고가 따라잡기 추천 종목 업데이트',
+            name='알고리즘별 추천 종목 일괄 업데이트',
             replace_existing=True
         )
 
-        # 매일 월-금요일 18:15에 실행 (대왕개미 단타론)
+        # 평일 장 마감 후 전 종목 일봉 백필 (당일 봉 확정 이후)
         scheduler.add_job(
-            update_dae_wangkaemi_stocks_job,
+            backfill_bars_job,
             trigger=CronTrigger(
-                hour=11,
-                minute=22,
-                day_of_week='0-4',  # 월-금요일만 (토일 제외)
+                hour=18,
+                minute=30,
+                day_of_week='0-4',
                 timezone='Asia/Seoul'
             ),
-            id='update_dae_wangkaemi_stocks_job',
-            name='대왕개미 단타론 추천 종목 업데이트',
-            replace_existing=True
+            id='backfill_bars_job',
+            name='전 종목 일봉 백필',
+            replace_existing=True,
+            max_instances=1
         )
 
         scheduler.start()
-        logger.info("[스케줄러] ✅ 스케줄러 시작 (매일 18:10, 18:15, 토일 제외)")
+        logger.info("[스케줄러] ✅ 스케줄러 시작 (평일 추천 종목 일괄 업데이트, 장 마감 후 일봉 백필, 토일 제외)")
         logger.info("[스케줄러] 등록된 작업:")
         for job in scheduler.get_jobs():
             logger.info(f"  - ID: {job.id}, 이름: {job.name}, 트리거: {job.trigger}")
@@ -274,6 +274,7 @@ class AlgorithmBase(BaseModel):
     """알고리즘 기본 정보"""
     name: str  # 알고리즘 이름
     description: Optional[str] = None  # 알고리즘 설명
+    condition_id: Optional[str] = None  # 키움 조건식 ID
 
 
 class AlgorithmCreate(AlgorithmBase):
@@ -0,0 +1,220 @@
+"""
+차트/지표 응답 캐시 (장 운영 시간 인식, 읽기 관통)
+
+종목 차트와 지표(ATR 등)는 사용자와 무관하게 같으므로 (종류, 공급자, 종목코드, 수정주가구분, 기준일) 단위로
+응답을 캐시합니다. 여러 사용자가 대시보드를 새로 고쳐도 조회는 한 번만 일어나고 나머지는 캐시 적중이 됩니다.
+
+만료 규칙 (KRX 영업일 달력 기준):
+- 기준일이 오늘 이전: 끝난 거래일의 봉이므로 만료 없음 (LRU로만 제거)
+- 오늘 기준, 장중(09:00 ~ 일봉 확정 시각): CHART_CACHE_LIVE_TTL_SEC초 후 만료 (당일 봉이 계속 바뀜)
+- 오늘 기준, 장 시작 전/장 마감 후/휴장일: 다음 장 시작(09:00)까지 유효
+
+- 메모리 상한(CHART_CACHE_MAX_BYTES)을 넘으면 가장 오래 사용하지 않은 항목부터 제거 (크기는 JSON 직렬화 길이로 추정)
+- 같은 키를 동시에 조회하면 첫 요청의 조회 결과를 함께 기다림 (중복 API 호출 없음)
+- 조회는 별도 태스크에서 진행하므로 어떤 요청이 취소돼도 다른 요청과 캐시 저장에는 영향 없음
+- 조회 실패는 캐시하지 않음
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from datetime import time as dt_time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 장중 당일 봉 캐시 유지 시간 (초)
+CHART_CACHE_LIVE_TTL_SEC = float(os.getenv('CHART_CACHE_LIVE_TTL_SEC', '5'))
+# 캐시 메모리 상한 (바이트, 응답 JSON 크기 기준)
+CHART_CACHE_MAX_BYTES = int(os.getenv('CHART_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+# 장 시작 시각
+MARKET_OPEN_TIME = dt_time(9, 0)
+
+CacheKey = Tuple[str, str, str, str, str]
+
+
+def chart_cache_key(kind: str, source: str, stock_code: str, adjustment: str = '1', base_dt: str = '') -> CacheKey:
+    """
+    캐시 키를 만듭니다. 기준일이 비어 있으면 오늘 날짜로 바꿔 같은 요청이 같은 키가 되게 합니다.
+
+    Args:
+        kind: 응답 종류 ('daily-chart', 'atr' 등)
+        source: 데이터 공급자 ('kiwoom', 'kis')
+        stock_code: 종목코드
+        adjustment: 수정주가구분 ('0': 미수정, '1': 수정)
+        base_dt: 기준일자 YYYYMMDD (공백이면 오늘)
+    """
+    return (kind, source, stock_code, adjustment, base_dt.strip() or datetime.now().strftime('%Y%m%d'))
+
+
+def expires_at(base_dt: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    기준일 차트 응답의 만료 시각을 계산합니다.
+
+    Args:
+        base_dt: 기준일자 YYYYMMDD
+        now: 현재 시각 (테스트용)
+
+    Returns:
+        datetime: 만료 시각 (None이면 만료 없음)
+    """
+    # lib 경로는 app.routers.stocks 임포트 시 sys.path에 추가됨
+    from lib.bar_store import BAR_FINAL_TIME
+    from lib.krx_calendar import is_trading_day, next_trading_day
+
+    now = now or datetime.now()
+    today = now.strftime('%Y%m%d')
+    if base_dt < today:
+        return None
+
+    if is_trading_day(now):
+        if now.time() < MARKET_OPEN_TIME:
+            return datetime.combine(now.date(), MARKET_OPEN_TIME)
+        if now.time() < BAR_FINAL_TIME:
+            return now + timedelta(seconds=CHART_CACHE_LIVE_TTL_SEC)
+    next_open = datetime.strptime(next_trading_day(now), '%Y%m%d')
+    return datetime.combine(next_open.date(), MARKET_OPEN_TIME)
+
+
+class ChartCache:
+    """
+    LRU + 메모리 상한 캐시 (이벤트 루프 안에서만 사용, 잠금 없음)
+    """
+
+    def __init__(self, max_bytes: int = CHART_CACHE_MAX_BYTES, clock: Callable[[], datetime] = datetime.now):
+        """
+        Args:
+            max_bytes: 캐시 메모리 상한 (바이트)
+            clock: 현재 시각 함수 (만료 판단과 expires_at 기준, 테스트용)
+        """
+        self.max_bytes = max_bytes
+        self.clock = clock
+        # key → (값, 크기, 만료 시각 또는 None)
+        self._entries: 'OrderedDict[CacheKey, Tuple[Any, int, Optional[datetime]]]' = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Task] = {}
+        self._bytes = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        """적중/실패 통계를 초기화합니다."""
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.since = self.clock()
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """유효한 캐시 값 (없거나 만료되었으면 None, 통계에 반영하지 않음)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, size, expires = entry
+        if expires is not None and self.clock() >= expires:
+            self._remove(key)
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: CacheKey, value: Any, expires: Optional[datetime] = None):
+        """
+        값을 저장하고 메모리 상한을 넘으면 오래 사용하지 않은 항목부터 제거합니다.
+
+        Args:
+            expires: 만료 시각 (None이면 만료 없음)
+        """
+        size = len(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'))
+        if size > self.max_bytes:
+            logger.warning(f"차트 캐시 항목이 메모리 상한보다 커서 저장하지 않음: {key}, {size}바이트")
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, size, expires)
+        self._bytes += size
+
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: CacheKey):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    async def get_or_load(self, key: CacheKey, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        캐시 값을 반환하고, 없으면 loader()로 조회해 저장합니다 (읽기 관통).
+        같은 키를 조회 중인 요청이 있으면 새로 조회하지 않고 그 결과를 기다립니다.
+
+        Args:
+            key: chart_cache_key()로 만든 키 (마지막 항목이 기준일)
+            loader: 캐시 실패 시 응답을 만드는 코루틴 함수
+
+        Returns:
+            loader()가 반환한 값 (캐시 값은 공유되므로 변경하지 말 것)
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # 조회는 요청과 분리된 태스크에서 진행: 먼저 온 요청이 취소돼도(클라이언트 연결 끊김 등)
+            # 함께 기다리던 요청은 결과를 그대로 받고, 결과는 캐시에 저장됨
+            inflight = asyncio.get_running_loop().create_task(self._load(key, loader))
+            inflight.add_done_callback(_consume_exception)
+            self._inflight[key] = inflight
+        # 기다리던 요청이 취소되면 기다리기만 그만둠 (조회 태스크는 계속 진행)
+        return await asyncio.shield(inflight)
+
+    async def _load(self, key: CacheKey, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """loader()로 조회해 저장 (조회 태스크 본체, 끝나면 진행 중 목록에서 뺌)"""
+        try:
+            value = await loader()
+            self.put(key, value, expires_at(key[-1], self.clock()))
+            return value
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/실패 통계와 현재 사용량"""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            'since': self.since.isoformat(timespec='seconds'),
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'hit_rate': round((self.hits + self.coalesced) / lookups, 4) if lookups else None,
+            'expirations': self.expirations,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+        }
+
+
+def _consume_exception(task: asyncio.Task):
+    """기다리는 요청이 모두 취소된 뒤 조회가 실패해도 "처리되지 않은 예외" 경고가 나지 않게 함"""
+    if not task.cancelled():
+        task.exception()
+
+
+_chart_cache: Optional[ChartCache] = None
+
+
+def get_chart_cache() -> ChartCache:
+    """프로세스 공유 차트 캐시"""
+    global _chart_cache
+    if _chart_cache is None:
+        _chart_cache = ChartCache()
+    return _chart_cache
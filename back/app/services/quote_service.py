@@ -0,0 +1,133 @@
+"""
+현재가 동시 조회 서비스
+
+여러 종목의 현재가를 동시에 조회합니다 (GET /api/stocks 시세 개요, 관심종목 등).
+- 실시간 체결 저장소(price_feed)에 값이 있는 종목은 API 호출 없이 바로 사용
+- 나머지는 동시 조회 수 상한(semaphore) 안에서 스레드로 KIS 현재가 조회 (이벤트 루프를 막지 않음)
+- 종목별 타임아웃: 늦은 종목은 실패로 처리하고 나머지 결과는 그대로 반환
+  (타임아웃 뒤에도 스레드의 KIS 요청은 끝까지 진행되므로, 실제 진행 중인 요청 수는 스레드 쪽 세마포어로 제한)
+전체 지연은 종목 수의 합이 아니라 가장 느린 한 종목(과 KIS 요청 한도)에 따라 결정됩니다.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models import StocksInfo
+
+logger = logging.getLogger(__name__)
+
+# 동시 조회 수 (실제 전송 속도는 KIS 요청 한도 버킷이 제한)
+QUOTE_CONCURRENCY = int(os.getenv('QUOTE_CONCURRENCY', '8'))
+# 종목별 현재가 조회 타임아웃 (초, 동시 조회 자리를 얻은 뒤부터)
+QUOTE_TIMEOUT_SEC = float(os.getenv('QUOTE_TIMEOUT_SEC', '3.0'))
+
+# 동시 조회 수 상한 (엔드포인트 concurrency 파라미터 최댓값)
+MAX_QUOTE_CONCURRENCY = 64
+
+# 현재가 조회 전용 스레드 풀 (기본 실행기를 다른 작업과 나눠 쓰면 동시 조회 수가 CPU 수에 묶이고,
+# 풀 대기 시간까지 타임아웃에 포함되므로 분리)
+_executor = ThreadPoolExecutor(max_workers=MAX_QUOTE_CONCURRENCY, thread_name_prefix='quote')
+
+# stocks_info.market_code → 시장명
+MARKET_NAMES = {'0': 'KOSPI', '10': 'KOSDAQ'}
+
+
+def lookup_stock_names(db: Session, symbols: Sequence[str]) -> Dict[str, Dict[str, str]]:
+    """
+    stocks_info에서 종목명/시장을 한 번에 조회합니다.
+
+    Returns:
+        dict: {종목코드: {'name': 종목명, 'market': 'KOSPI' 등}} (없는 종목은 제외)
+    """
+    if not symbols:
+        return {}
+    rows = db.query(StocksInfo.code, StocksInfo.name, StocksInfo.market_code, StocksInfo.market_name) \
+        .filter(StocksInfo.code.in_(list(symbols))).all()
+    return {
+        code: {'name': name, 'market': MARKET_NAMES.get(market_code) or market_name or ''}
+        for code, name, market_code, market_name in rows
+    }
+
+
+async def fetch_quotes(
+    symbols: Sequence[str],
+    concurrency: int = QUOTE_CONCURRENCY,
+    timeout: float = QUOTE_TIMEOUT_SEC
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    여러 종목의 현재가를 동시에 조회합니다.
+
+    Args:
+        symbols: 종목코드 목록 (중복은 한 번만 조회)
+        concurrency: 동시에 진행할 KIS 조회 수 상한
+        timeout: 종목별 조회 타임아웃 (초)
+
+    Returns:
+        tuple: ({종목코드: 현재가 데이터(get_current_price_data 형식)}, 실패/타임아웃 종목코드 목록)
+    """
+    # lib 경로는 app.routers.stocks 임포트 시 sys.path에 추가됨
+    from lib.hantu import get_current_price_data
+    from lib.price_feed import get_realtime_price
+
+    quotes: Dict[str, Dict[str, Any]] = {}
+    pending: List[str] = []
+    for symbol in dict.fromkeys(symbols):
+        price_data = get_realtime_price(symbol)
+        if price_data:
+            quotes[symbol] = price_data
+        else:
+            pending.append(symbol)
+
+    cached = len(quotes)
+    if not pending:
+        return quotes, []
+
+    limit = min(max(1, concurrency), MAX_QUOTE_CONCURRENCY)
+    semaphore = asyncio.Semaphore(limit)
+    # 타임아웃으로 응답을 버린 요청도 끝날 때까지 자리를 차지하도록 스레드 쪽에서도 같은 상한 적용
+    in_flight = threading.BoundedSemaphore(limit)
+    loop = asyncio.get_running_loop()
+
+    def fetch_in_thread(symbol: str, abandoned: threading.Event) -> Optional[Dict[str, Any]]:
+        with in_flight:
+            if abandoned.is_set():  # 자리를 기다리는 동안 타임아웃됨 → 요청하지 않음
+                return None
+            return get_current_price_data(symbol)
+
+    async def fetch(symbol: str) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            abandoned = threading.Event()
+            try:
+                # 타임아웃이 나도 스레드의 요청은 끝까지 진행되지만 응답은 기다리지 않음
+                return await asyncio.wait_for(
+                    loop.run_in_executor(_executor, fetch_in_thread, symbol, abandoned), timeout
+                )
+            except asyncio.TimeoutError:
+                abandoned.set()
+                logger.warning(f"현재가 조회 타임아웃 ({timeout}초): {symbol}")
+            except Exception as e:
+                logger.warning(f"현재가 조회 실패: {symbol}, {e}")
+            return None
+
+    started = time.monotonic()
+    results = await asyncio.gather(*(fetch(symbol) for symbol in pending))
+
+    failed = []
+    for symbol, price_data in zip(pending, results):
+        if price_data:
+            quotes[symbol] = price_data
+        else:
+            failed.append(symbol)
+
+    logger.info(
+        f"현재가 동시 조회: {len(pending) - len(failed)}/{len(pending)}개 성공 "
+        f"(실시간 저장소 {cached}개), {time.monotonic() - started:.2f}초"
+    )
+    return quotes, failed
@@ -0,0 +1,424 @@
+"""
+실시간 조건검색 구독 서비스
+
+알고리즘(Algorithm.condition_id)에 연결된 키움 조건식을 실시간 모드(search_type='1')로 등록하고,
+편입(I)/이탈(D) 이벤트가 도착하는 즉시 rec_stocks(오늘 날짜)와 메모리의 실시간 편입 종목 집합에 반영합니다.
+연결이 끊기면 다시 연결해 조건식을 재등록하고, 등록 응답(현재 편입 종목)으로 상태를 맞춥니다.
+거래일이 바뀌거나 알고리즘의 조건식이 바뀌면 연결은 유지한 채 조건식을 다시 등록해 그날의 편입 종목 전체를 새로 받습니다.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+# analyze 모듈 경로 추가 (라우터와 같은 'lib.*' 경로로 임포트해야 모듈 전역 세션/토큰이 하나로 유지됨)
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../..', 'analyze'))
+
+from lib.hantu import get_current_price_data
+from lib.kiwoom import KiwoomAPI
+from lib.kiwoom_ws import KiwoomWebSocketSession, parse_condition_events
+from lib.krx_calendar import is_trading_day
+from lib.price_feed import get_realtime_price
+from lib.rate_limiter import PRIORITY_BACKGROUND
+from app.models import RecStock, Algorithm, StocksInfo
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY_SEC = 5.0       # 재연결 첫 대기 시간
+MAX_RECONNECT_DELAY_SEC = 60.0  # 재연결 최대 대기 시간 (실패할 때마다 두 배씩 증가)
+RESYNC_CHECK_SEC = 60.0         # 거래일 변경/조건식 변경 확인 주기
+RESNAPSHOT_TIME = time(9, 0)    # 거래일마다 이 시각 이후 조건식을 다시 등록해 그날의 편입 종목 전체를 받음
+
+
+def resnapshot_due(snapshot_date: date, now: datetime) -> bool:
+    """snapshot_date에 받은 편입 종목을 now 기준 새 거래일 장 시작 후 다시 받아야 하는지 확인합니다."""
+    return now.date() > snapshot_date and is_trading_day(now.date()) and now.time() >= RESNAPSHOT_TIME
+
+
+def lookup_current_price(stock_code: str) -> Optional[Dict[str, Any]]:
+    """
+    편입 시점의 현재가 정보를 찾습니다 (실시간 체결 저장소 → KIS 현재가 조회 순).
+
+    Returns:
+        dict: get_current_price_data 형식 (current_price, change_rate 등), 조회 실패시 None
+    """
+    price_data = get_realtime_price(stock_code)
+    if price_data:
+        return price_data
+    try:
+        return get_current_price_data(stock_code)
+    except Exception as e:
+        logger.warning(f"[실시간 조건검색] {stock_code} 현재가 조회 실패: {e}")
+        return None
+
+
+def apply_condition_snapshot(
+    db: Session,
+    algorithm_id: int,
+    stocks: List[Dict[str, Any]],
+    recommendation_date: Optional[date] = None
+) -> Dict[str, int]:
+    """
+    조건식의 현재 편입 종목 전체로 해당 날짜의 rec_stocks를 맞춥니다.
+
+    Args:
+        db: SQLAlchemy 세션
+        algorithm_id: 알고리즘 ID
+        stocks: 편입 종목 리스트 (KiwoomAPI.search_condition 반환 형식)
+        recommendation_date: 추천날짜 (기본: 오늘)
+
+    Returns:
+        dict: {'added': 추가 수, 'removed': 삭제 수}
+    """
+    recommendation_date = recommendation_date or date.today()
+    existing = {
+        rec_stock.stock_code: rec_stock
+        for rec_stock in db.query(RecStock).filter(
+            RecStock.algorithm_id == algorithm_id,
+            RecStock.recommendation_date == recommendation_date
+        ).all()
+    }
+    codes = {stock['stock_code'] for stock in stocks if stock.get('stock_code')}
+
+    removed = 0
+    for stock_code, rec_stock in existing.items():
+        if stock_code not in codes:
+            db.delete(rec_stock)
+            removed += 1
+
+    added = 0
+    for stock in stocks:
+        stock_code = stock.get('stock_code')
+        if not stock_code or stock_code in existing:
+            continue
+        db.add(RecStock(
+            stock_name=stock.get('stock_name') or _lookup_stock_name(db, stock_code),
+            stock_code=stock_code,
+            recommendation_date=recommendation_date,
+            algorithm_id=algorithm_id,
+            closing_price=stock.get('current_price') or 0.0,
+            change_rate=None
+        ))
+        existing[stock_code] = None
+        added += 1
+
+    db.commit()
+    return {'added': added, 'removed': removed}
+
+
+def apply_condition_event(
+    db: Session,
+    algorithm_id: int,
+    stock_code: str,
+    action: str,
+    recommendation_date: Optional[date] = None,
+    price_data: Optional[Dict[str, Any]] = None
+) -> bool:
+    """
+    편입(I)/이탈(D) 이벤트 하나를 해당 날짜의 rec_stocks에 반영합니다.
+
+    Args:
+        db: SQLAlchemy 세션
+        algorithm_id: 알고리즘 ID
+        stock_code: 종목코드
+        action: 'I' (편입) 또는 'D' (이탈)
+        recommendation_date: 추천날짜 (기본: 오늘)
+        price_data: 편입 시점 현재가 정보 (lookup_current_price 반환 형식, 없으면 가격 0으로 두고 일괄 조회 때 채움)
+
+    Returns:
+        bool: rec_stocks가 변경되었는지 여부
+    """
+    recommendation_date = recommendation_date or date.today()
+    rec_stock = db.query(RecStock).filter(
+        RecStock.algorithm_id == algorithm_id,
+        RecStock.recommendation_date == recommendation_date,
+        RecStock.stock_code == stock_code
+    ).first()
+
+    if action == 'I':
+        if rec_stock:
+            return False
+        # 실시간 이벤트에는 종목명/가격이 없으므로 종목정보에서 이름을 찾고, 가격은 호출한 쪽에서 조회한 값을 씀
+        price_data = price_data or {}
+        db.add(RecStock(
+            stock_name=_lookup_stock_name(db, stock_code),
+            stock_code=stock_code,
+            recommendation_date=recommendation_date,
+            algorithm_id=algorithm_id,
+            closing_price=price_data.get('current_price') or 0.0,
+            change_rate=price_data.get('change_rate')
+        ))
+    else:
+        if not rec_stock:
+            return False
+        db.delete(rec_stock)
+
+    db.commit()
+    return True
+
+
+def _lookup_stock_name(db: Session, stock_code: str) -> str:
+    """stocks_info에서 종목명을 찾습니다 (없으면 종목코드)."""
+    stock_info = db.query(StocksInfo).filter(StocksInfo.code == stock_code).first()
+    return stock_info.name if stock_info else stock_code
+
+
+class RealtimeConditionSubscriber:
+    """알고리즘별 조건식을 실시간으로 구독해 rec_stocks에 반영하는 장기 실행 구독자"""
+
+    def __init__(
+        self,
+        app_key: str,
+        secret_key: str,
+        account_no: str,
+        use_mock: bool = False,
+        session_factory=SessionLocal,
+        price_lookup=lookup_current_price
+    ):
+        """
+        Args:
+            app_key: 키움증권 앱 키
+            secret_key: 키움증권 시크릿 키
+            account_no: 계좌번호
+            use_mock: 모의투자 여부
+            session_factory: DB 세션 생성 함수
+            price_lookup: 편입 종목 현재가 조회 함수 (종목코드 → 현재가 정보 또는 None)
+        """
+        self.kiwoom_api = KiwoomAPI(
+            app_key=app_key,
+            secret_key=secret_key,
+            account_no=account_no,
+            use_mock=use_mock,
+            priority=PRIORITY_BACKGROUND
+        )
+        self.ws_session = KiwoomWebSocketSession.get(self.kiwoom_api.token_broker, use_mock=use_mock)
+        self.session_factory = session_factory
+        self.price_lookup = price_lookup
+
+        self._condition_algorithms: Dict[str, List[int]] = {}  # 조건식 ID → 알고리즘 ID 목록
+        self._live: Dict[int, Dict[str, str]] = {}  # 알고리즘 ID → {종목코드: 편입시각}
+        self._live_lock = threading.Lock()
+        # DB 반영은 이벤트 도착 순서대로 별도 스레드에서 처리 (WebSocket 수신 루프를 막지 않음)
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._future = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def start(self):
+        """구독을 시작합니다 (이미 실행 중이면 무시)."""
+        if self.running:
+            return
+        self._stopping = False
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='rec-stocks-writer')
+        self.ws_session.add_listener(self._on_message)
+        self._future = self.ws_session.submit(self._run())
+        logger.info("[실시간 조건검색] 구독 시작")
+
+    def stop(self, timeout: float = 5.0):
+        """구독을 중지하고 등록한 실시간 조건검색을 해제합니다."""
+        self._stopping = True
+        self.ws_session.remove_listener(self._on_message)
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+        if self.ws_session.connected:
+            try:
+                self.ws_session.call(self._clear_conditions(), timeout=timeout)
+            except Exception as e:
+                logger.warning(f"[실시간 조건검색] 등록 해제 실패 (무시): {e}")
+
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        logger.info("[실시간 조건검색] 구독 중지")
+
+    def get_live_stocks(self, algorithm_id: int) -> Dict[str, str]:
+        """
+        알고리즘의 현재 실시간 편입 종목을 반환합니다.
+
+        Returns:
+            dict: {종목코드: 편입시각(HHMMSS, 등록 시점 편입 종목은 빈 문자열)}
+        """
+        with self._live_lock:
+            return dict(self._live.get(algorithm_id, {}))
+
+    def _load_condition_algorithms(self) -> Dict[str, List[int]]:
+        """condition_id가 지정된 알고리즘을 조건식 ID별로 묶어 반환합니다."""
+        db = self.session_factory()
+        try:
+            mapping: Dict[str, List[int]] = {}
+            algorithms = db.query(Algorithm).filter(Algorithm.condition_id.isnot(None)).order_by(Algorithm.id).all()
+            for algorithm in algorithms:
+                condition_id = algorithm.condition_id.strip()
+                if condition_id:
+                    mapping.setdefault(condition_id, []).append(algorithm.id)
+            return mapping
+        finally:
+            db.close()
+
+    async def _run(self):
+        """
+        연결 → 조건식 실시간 등록 → 연결이 끊기거나 다시 등록해야 할 때까지 대기를 반복합니다 (세션 루프에서 실행).
+        새 거래일 장 시작 후나 알고리즘의 조건식이 바뀌면 등록을 해제하고 바로 다시 등록합니다.
+        """
+        delay = RECONNECT_DELAY_SEC
+        while not self._stopping:
+            try:
+                mapping = await asyncio.to_thread(self._load_condition_algorithms)
+                self._condition_algorithms = mapping
+                if not mapping:
+                    logger.warning("[실시간 조건검색] condition_id가 지정된 알고리즘이 없습니다")
+                    await asyncio.sleep(MAX_RECONNECT_DELAY_SEC)
+                    continue
+
+                snapshot_date = date.today()
+                for condition_id, algorithm_ids in mapping.items():
+                    response = await self.ws_session.request_condition_search(condition_id, search_type='1')
+                    if response is None:
+                        raise ConnectionError(f"조건식 {condition_id} 실시간 등록 실패")
+                    stocks = KiwoomAPI._format_condition_results(condition_id, response) or []
+                    self._apply_snapshot(algorithm_ids, stocks)
+                    logger.info(f"[실시간 조건검색] 조건식 {condition_id} 등록: 현재 {len(stocks)}개 종목")
+
+                delay = RECONNECT_DELAY_SEC
+                reason = await self._wait_for_resync(mapping, snapshot_date)
+                if reason:
+                    logger.info(f"[실시간 조건검색] {reason}, 조건식 재등록")
+                    await self._clear_conditions()
+                    continue
+                if not self._stopping:
+                    logger.warning("[실시간 조건검색] WebSocket 연결 끊김, 재등록 예정")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[실시간 조건검색] 구독 오류: {e}")
+
+            if not self._stopping:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY_SEC)
+
+    async def _wait_for_resync(self, mapping: Dict[str, List[int]], snapshot_date: date) -> Optional[str]:
+        """
+        연결이 끊기거나 다시 등록해야 할 때까지 기다립니다.
+
+        Returns:
+            str: 다시 등록해야 하는 이유 (연결이 끊겼으면 None)
+        """
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self.ws_session.wait_disconnected(), RESYNC_CHECK_SEC)
+                return None
+            except asyncio.TimeoutError:
+                pass
+            if resnapshot_due(snapshot_date, datetime.now()):
+                return "새 거래일 시작"
+            if await asyncio.to_thread(self._load_condition_algorithms) != mapping:
+                return "알고리즘 조건식 변경"
+        return None
+
+    async def _clear_conditions(self):
+        for condition_id in list(self._condition_algorithms):
+            await self.ws_session.request_condition_clear(condition_id)
+
+    def _apply_snapshot(self, algorithm_ids: List[int], stocks: List[Dict[str, Any]]):
+        """등록 응답(현재 편입 종목 전체)으로 실시간 집합을 바꾸고 rec_stocks 반영을 예약합니다."""
+        with self._live_lock:
+            for algorithm_id in algorithm_ids:
+                self._live[algorithm_id] = {stock['stock_code']: '' for stock in stocks if stock.get('stock_code')}
+        for algorithm_id in algorithm_ids:
+            self._submit_write(self._write_snapshot, algorithm_id, stocks)
+
+    def _on_message(self, message: Dict[str, Any]):
+        """WebSocket 리스너: 편입/이탈 이벤트를 실시간 집합에 바로 반영하고 DB 반영을 예약합니다."""
+        for event in parse_condition_events(message):
+            algorithm_ids = self._condition_algorithms.get(event['condition_id'], [])
+            for algorithm_id in algorithm_ids:
+                with self._live_lock:
+                    live = self._live.setdefault(algorithm_id, {})
+                    if event['action'] == 'I':
+                        live[event['stock_code']] = event['time']
+                    else:
+                        live.pop(event['stock_code'], None)
+                self._submit_write(self._write_event, algorithm_id, event)
+
+    def _submit_write(self, fn, *args):
+        if self._writer is not None:
+            self._writer.submit(fn, *args)
+
+    def _write_snapshot(self, algorithm_id: int, stocks: List[Dict[str, Any]]):
+        db = self.session_factory()
+        try:
+            counts = apply_condition_snapshot(db, algorithm_id, stocks)
+            logger.info(f"[실시간 조건검색] 알고리즘 {algorithm_id} 동기화: 추가 {counts['added']}, 삭제 {counts['removed']}")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[실시간 조건검색] 알고리즘 {algorithm_id} 동기화 실패: {e}")
+        finally:
+            db.close()
+
+    def _write_event(self, algorithm_id: int, event: Dict[str, str]):
+        price_data = self.price_lookup(event['stock_code']) if event['action'] == 'I' else None
+        db = self.session_factory()
+        try:
+            if apply_condition_event(db, algorithm_id, event['stock_code'], event['action'], price_data=price_data):
+                action = '편입' if event['action'] == 'I' else '이탈'
+                logger.info(f"[실시간 조건검색] 알고리즘 {algorithm_id} {action}: {event['stock_code']}")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[실시간 조건검색] 이벤트 반영 실패: {event}, {e}")
+        finally:
+            db.close()
+
+
+# 애플리케이션 공유 구독자
+_subscriber: Optional[RealtimeConditionSubscriber] = None
+
+
+def get_realtime_subscriber() -> Optional[RealtimeConditionSubscriber]:
+    """실행 중인 실시간 조건검색 구독자를 반환합니다 (시작하지 않았으면 None)."""
+    return _subscriber
+
+
+def start_realtime_subscriber() -> Optional[RealtimeConditionSubscriber]:
+    """
+    환경변수의 키움 자격증명으로 실시간 조건검색 구독을 시작합니다.
+    REALTIME_CONDITION_ENABLED=false 이거나 자격증명이 없으면 시작하지 않습니다.
+    """
+    global _subscriber
+
+    if os.getenv('REALTIME_CONDITION_ENABLED', 'true').lower() != 'true':
+        logger.info("[실시간 조건검색] 비활성화됨 (REALTIME_CONDITION_ENABLED)")
+        return None
+
+    app_key = os.getenv('KIWOOM_APP_KEY')
+    secret_key = os.getenv('KIWOOM_SECRET_KEY')
+    account_no = os.getenv('KIWOOM_ACCOUNT_NO')
+    if not app_key or not secret_key or not account_no:
+        logger.warning("[실시간 조건검색] 키움 API 자격증명이 설정되지 않아 시작하지 않습니다")
+        return None
+
+    if _subscriber is None:
+        _subscriber = RealtimeConditionSubscriber(app_key, secret_key, account_no)
+    _subscriber.start()
+    return _subscriber
+
+
+def stop_realtime_subscriber():
+    """실시간 조건검색 구독을 중지합니다."""
+    global _subscriber
+    if _subscriber is not None:
+        _subscriber.stop()
+        _subscriber = None
@@ -5,15 +5,17 @@
 """
 
 import logging
+import os
 import sys
 from datetime import date
-from typing import Optional, List
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 
-# 프로젝트 경로 추가 (analyze 패키지 임포트용)
-sys.path.insert(0, '/home/ubuntu/goni')
+# analyze 모듈 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../..', 'analyze'))
 
-from analyze.lib.kiwoom import KiwoomAPI
+from lib.kiwoom import KiwoomAPI
+from lib.rate_limiter import PRIORITY_BACKGROUND
 from app.models import RecStock, Algorithm
 from app.database import SessionLocal
 
@@ -34,7 +36,8 @@ class RecommendationService:
             app_key=app_key,
             secret_key=secret_key,
             account_no=account_no,
-            use_mock=False  # 실전투자
+            use_mock=False,  # 실전투자
+            priority=PRIORITY_BACKGROUND  # 스케줄러 작업은 화면 조회보다 뒤로
         )
 
     def get_condition_by_name(self, condition_name: str) -> Optional[str]:
@@ -48,16 +51,17 @@ class RecommendationService:
             str: 조건 ID, 찾지 못하면 None
         """
         try:
+            # 앱 키별 캐시된 조건식 목록에서 찾음 (없으면 목록을 한 번 새로 조회)
+            condition_id = self.kiwoom_api.find_condition_id(condition_name)
+            if condition_id:
+                logger.info(f"조건 '{condition_name}' 찾음: ID={condition_id}")
+                return condition_id
+
             conditions = self.kiwoom_api.get_condition_list()
             if not conditions:
                 logger.error("조건 검색 목록을 가져올 수 없습니다")
                 return None
 
-            for condition in conditions:
-                if condition.get('name') == condition_name:
-                    logger.info(f"조건 '{condition_name}' 찾음: ID={condition.get('id')}")
-                    return condition.get('id')
-
             logger.warning(f"조건 '{condition_name}'을(를) 찾을 수 없습니다")
             logger.info(f"사용 가능한 조건: {[c.get('name') for c in conditions]}")
             return None
@@ -78,6 +82,7 @@ class RecommendationService:
         조건식으로 종목을 검색하고 rec_stocks 테이블에 저장합니다.
 
         기존 데이터는 삭제하지 않고 누적되며, recommendation_date로 구분됩니다.
+        같은 날 이미 저장된 종목은 새로 추가하지 않고 종목명/가격만 갱신합니다.
 
         Args:
             condition_name: 조건명 (예: '신고가 돌파') - condition_id가 없을 경우 사용
@@ -130,34 +135,7 @@ class RecommendationService:
             logger.info(f"검색 결과: {len(search_results)}개 종목")
 
             # 4. 오늘 날짜의 추천 종목 저장
-            today = date.today()
-            saved_count = 0
-            for stock in search_results:
-                try:
-                    stock_code = stock.get('stock_code', '')
-                    stock_name = stock.get('stock_name', '')
-                    current_price = stock.get('current_price', 0)
-
-                    if not stock_code or not stock_name:
-                        logger.warning(f"필수 정보 누락: {stock}")
-                        continue
-
-                    # rec_stock 생성
-                    rec_stock = RecStock(
-                        stock_name=stock_name,
-                        stock_code=stock_code,
-                        recommendation_date=today,
-                        algorithm_id=algorithm_id,
-                        closing_price=current_price,
-                        change_rate=None  # 키움 API에서 제공되지 않으므로 None
-                    )
-
-                    db.add(rec_stock)
-                    saved_count += 1
-
-                except Exception as e:
-                    logger.warning(f"종목 저장 실패: {stock.get('stock_name')} ({stock.get('stock_code')}), {e}")
-                    continue
+            saved_count = self._save_search_results(algorithm_id, search_results, db)
 
             # 6. 변경사항 저장
             db.commit()
@@ -170,6 +148,118 @@ class RecommendationService:
             logger.error(f"추천 종목 업데이트 실패: {e}")
             return False
 
+    def search_and_update_algorithms(
+        self,
+        db: Session,
+        algorithm_conditions: Optional[Dict[int, str]] = None,
+        stock_exchange_type: str = 'K'
+    ) -> Dict[int, bool]:
+        """
+        여러 알고리즘의 조건식을 한 번에 검색하고 rec_stocks 테이블에 저장합니다.
+
+        조건식 검색은 KiwoomAPI.search_conditions로 WebSocket 세션 하나에서 일괄 요청하므로,
+        알고리즘이 늘어나도 세션/토큰은 그대로이고 CNSRREQ 요청만 하나씩 늘어납니다.
+        같은 조건식을 쓰는 알고리즘은 검색 결과를 함께 사용합니다.
+
+        Args:
+            db: SQLAlchemy 세션
+            algorithm_conditions: {알고리즘 ID: 조건식 ID} (None이면 algorithm.condition_id가 있는 알고리즘 전체)
+            stock_exchange_type: 거래소 구분 (기본: 'K')
+
+        Returns:
+            dict: {알고리즘 ID: 성공 여부}
+        """
+        if algorithm_conditions is None:
+            algorithm_conditions = {
+                algorithm.id: algorithm.condition_id.strip()
+                for algorithm in db.query(Algorithm).filter(Algorithm.condition_id.isnot(None)).all()
+                if algorithm.condition_id.strip()
+            }
+        if not algorithm_conditions:
+            logger.warning("조건식이 지정된 알고리즘이 없습니다")
+            return {}
+
+        logger.info(f"조건식 일괄 검색 시작: {algorithm_conditions}")
+        search_results = self.kiwoom_api.search_conditions(
+            list(algorithm_conditions.values()),
+            search_type='0',  # 일반 조회
+            stock_exchange_type=stock_exchange_type
+        )
+
+        results: Dict[int, bool] = {}
+        for algorithm_id, condition_id in algorithm_conditions.items():
+            stocks = search_results.get(str(condition_id).strip())
+            if stocks is None:
+                logger.error(f"종목 검색 실패: 알고리즘 {algorithm_id}, 조건식 {condition_id}")
+                results[algorithm_id] = False
+                continue
+
+            try:
+                saved_count = self._save_search_results(algorithm_id, stocks, db)
+                db.commit()
+                logger.info(f"✅ 알고리즘 {algorithm_id} (조건식 {condition_id}) 추천 종목 저장 완료: {saved_count}개")
+                results[algorithm_id] = True
+            except Exception as e:
+                db.rollback()
+                logger.error(f"추천 종목 업데이트 실패: 알고리즘 {algorithm_id}, {e}")
+                results[algorithm_id] = False
+
+        return results
+
+    def _save_search_results(self, algorithm_id: int, search_results: List[dict], db: Session) -> int:
+        """
+        검색 결과를 오늘 날짜의 추천 종목으로 저장합니다 (commit은 호출하는 쪽에서).
+
+        Returns:
+            int: 저장/갱신한 종목 수
+        """
+        # 실시간 조건검색 구독자가 이미 넣은 종목은 중복 저장하지 않고 가격만 갱신
+        today = date.today()
+        existing_stocks = {
+            rec_stock.stock_code: rec_stock
+            for rec_stock in db.query(RecStock).filter(
+                RecStock.algorithm_id == algorithm_id,
+                RecStock.recommendation_date == today
+            ).all()
+        }
+        saved_count = 0
+        for stock in search_results:
+            try:
+                stock_code = stock.get('stock_code', '')
+                stock_name = stock.get('stock_name', '')
+                current_price = stock.get('current_price', 0)
+
+                if not stock_code or not stock_name:
+                    logger.warning(f"필수 정보 누락: {stock}")
+                    continue
+
+                existing_stock = existing_stocks.get(stock_code)
+                if existing_stock:
+                    existing_stock.stock_name = stock_name
+                    existing_stock.closing_price = current_price
+                    saved_count += 1
+                    continue
+
+                # rec_stock 생성
+                rec_stock = RecStock(
+                    stock_name=stock_name,
+                    stock_code=stock_code,
+                    recommendation_date=today,
+                    algorithm_id=algorithm_id,
+                    closing_price=current_price,
+                    change_rate=None  # 키움 API에서 제공되지 않으므로 None
+                )
+
+                db.add(rec_stock)
+                existing_stocks[stock_code] = rec_stock
+                saved_count += 1
+
+            except Exception as e:
+                logger.warning(f"종목 저장 실패: {stock.get('stock_name')} ({stock.get('stock_code')}), {e}")
+                continue
+
+        return saved_count
+
 
 def update_recommendation_stocks(
     condition_name: str,
@@ -223,7 +313,12 @@ def update_recommendation_stocks(
 
     try:
         service = RecommendationService(app_key, secret_key, account_no)
-        return service.search_and_update_rec_stocks(condition_name, algorithm_id, db, stock_exchange_type='K')
+        return service.search_and_update_rec_stocks(
+            condition_name=condition_name,
+            algorithm_id=algorithm_id,
+            db=db,
+            stock_exchange_type='K'
+        )
 
     finally:
         db.close()
@@ -0,0 +1,13 @@
+-- Migration: Add condition_id field to algorithm table
+-- Created: 2026-10-16
+-- Purpose: Link each algorithm to the Kiwoom condition used for real-time condition search
+
+ALTER TABLE algorithm
+ADD COLUMN condition_id VARCHAR DEFAULT NULL;
+
+-- Add comment to column
+COMMENT ON COLUMN algorithm.condition_id IS '키움 조건식 ID (실시간 조건검색 등록용)';
+
+-- 기존 알고리즘의 조건식 ID (스케줄러에서 사용하던 값)
+UPDATE algorithm SET condition_id = '7' WHERE id = 1;  -- 신고가 돌파
+UPDATE algorithm SET condition_id = '5' WHERE id = 2;  -- 대왕개미 단타론
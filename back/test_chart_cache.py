@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+차트/지표 응답 캐시 테스트
+
+현재 시각을 주입한 캐시로 장 운영 시간별 만료, 같은 키 동시 조회 합치기(먼저 온 요청 취소 포함), 조회 실패 미캐시,
+메모리 상한(바이트) LRU 제거, 통계 조회(GET)/초기화(POST) 엔드포인트를 확인합니다.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+# app.database는 임포트 시 엔진을 만들므로 PostgreSQL 설정이 없으면 메모리 SQLite 사용
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import app.routers.stocks  # noqa: F401  lib 경로를 sys.path에 추가
+from app.services.chart_cache import CHART_CACHE_LIVE_TTL_SEC, ChartCache, chart_cache_key, expires_at
+
+# 2026-10-16 (금) 영업일, 10-17/18 주말, 10-19 (월) 영업일
+FRIDAY = '20261016'
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class CountingLoader:
+    """호출 횟수를 세는 loader (fail이면 예외, delay만큼 걸림)"""
+
+    def __init__(self, value=None, fail=False, delay=0.0):
+        self.value = value if value is not None else {'bars': [1, 2, 3]}
+        self.fail = fail
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("조회 실패")
+        return self.value
+
+
+def test_expires_at():
+    """지난 기준일은 만료 없음, 장 시작 전/장 마감 후/휴장일은 다음 장 시작, 장중은 짧은 TTL"""
+    assert expires_at('20261015', datetime(2026, 10, 16, 10, 0)) is None
+    assert expires_at(FRIDAY, datetime(2026, 10, 16, 8, 0)) == datetime(2026, 10, 16, 9, 0)
+    intraday = datetime(2026, 10, 16, 10, 0)
+    assert expires_at(FRIDAY, intraday) == intraday + timedelta(seconds=CHART_CACHE_LIVE_TTL_SEC)
+    assert expires_at(FRIDAY, datetime(2026, 10, 16, 16, 0)) == datetime(2026, 10, 19, 9, 0)
+    assert expires_at('20261017', datetime(2026, 10, 17, 12, 0)) == datetime(2026, 10, 19, 9, 0)  # 토요일
+    assert expires_at('20261009', datetime(2026, 10, 9, 11, 0)) == datetime(2026, 10, 12, 9, 0)  # 한글날 휴장
+    print("✅ 장 운영 시간별 만료 시각 확인")
+
+
+def test_market_hours_expiry():
+    """장중 당일 응답은 TTL 후 다시 조회, 지난 기준일 응답은 시간이 지나도 유지"""
+    clock = FakeClock(datetime(2026, 10, 16, 10, 0))
+    cache = ChartCache(clock=clock)
+    today_key = chart_cache_key('daily-chart', 'kiwoom', '005930', '1', FRIDAY)
+    past_key = chart_cache_key('daily-chart', 'kiwoom', '005930', '1', '20261015')
+    today_loader, past_loader = CountingLoader(), CountingLoader()
+
+    async def scenario():
+        await cache.get_or_load(today_key, today_loader)
+        await cache.get_or_load(past_key, past_loader)
+        clock.now += timedelta(seconds=CHART_CACHE_LIVE_TTL_SEC - 1)
+        await cache.get_or_load(today_key, today_loader)
+        assert today_loader.calls == 1
+        clock.now += timedelta(seconds=2)
+        await cache.get_or_load(today_key, today_loader)
+        clock.now += timedelta(days=30)
+        await cache.get_or_load(past_key, past_loader)
+
+    asyncio.run(scenario())
+    assert today_loader.calls == 2 and past_loader.calls == 1
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['expirations']) == (2, 3, 1)
+    print("✅ 장중 TTL 만료/지난 기준일 유지 확인")
+
+
+def test_coalescing_and_failures():
+    """같은 키 동시 조회는 한 번만 조회, 실패는 기다리던 요청에도 전달되고 캐시하지 않음"""
+    cache = ChartCache(clock=FakeClock(datetime(2026, 10, 16, 16, 0)))
+    key = chart_cache_key('atr', 'kiwoom', '000660', '1', FRIDAY)
+
+    async def scenario():
+        loader = CountingLoader(delay=0.05)
+        results = await asyncio.gather(*(cache.get_or_load(key, loader) for _ in range(5)))
+        assert loader.calls == 1 and all(result is results[0] for result in results)
+        assert cache.stats()['coalesced'] == 4
+
+        failing_key = chart_cache_key('atr', 'kiwoom', '035420', '1', FRIDAY)
+        failing = CountingLoader(fail=True, delay=0.05)
+        results = await asyncio.gather(*(cache.get_or_load(failing_key, failing) for _ in range(3)),
+                                       return_exceptions=True)
+        assert failing.calls == 1 and all(isinstance(result, RuntimeError) for result in results)
+        assert cache.get(failing_key) is None
+
+        recovered = CountingLoader()
+        assert await cache.get_or_load(failing_key, recovered) == recovered.value and recovered.calls == 1
+
+    asyncio.run(scenario())
+    print("✅ 동시 조회 합치기/실패 미캐시 확인")
+
+
+def test_cancelled_first_request():
+    """먼저 온 요청이 취소돼도 함께 기다리던 요청은 결과를 받고, 조회 결과는 캐시됨"""
+    cache = ChartCache(clock=FakeClock(datetime(2026, 10, 16, 16, 0)))
+    key = chart_cache_key('indicators', 'kiwoom', '005930', '1', FRIDAY)
+
+    async def scenario():
+        loader = CountingLoader(delay=0.1)
+        first = asyncio.create_task(cache.get_or_load(key, loader))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(cache.get_or_load(key, loader)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        results = await asyncio.gather(*waiters)
+        assert first.cancelled()
+        assert loader.calls == 1 and all(result == loader.value for result in results)
+        assert cache.get(key) == loader.value and not cache._inflight
+
+        # 기다리는 요청이 모두 취소돼도 조회는 끝까지 진행되어 캐시됨
+        other_key = chart_cache_key('indicators', 'kiwoom', '000660', '1', FRIDAY)
+        other = CountingLoader(delay=0.05)
+        request = asyncio.create_task(cache.get_or_load(other_key, other))
+        await asyncio.sleep(0.01)
+        request.cancel()
+        await asyncio.sleep(0.1)
+        assert cache.get(other_key) == other.value and other.calls == 1
+
+    asyncio.run(scenario())
+    print("✅ 먼저 온 요청 취소 시 나머지 요청 유지 확인")
+
+
+def test_lru_byte_eviction():
+    """메모리 상한을 넘으면 가장 오래 사용하지 않은 항목부터 제거, 상한보다 큰 항목은 저장하지 않음"""
+    value = {'bars': 'x' * 80}  # JSON 약 95바이트
+    cache = ChartCache(max_bytes=300, clock=FakeClock(datetime(2026, 10, 16, 16, 0)))
+    keys = [chart_cache_key('daily-chart', 'kis', code, '1', '20261015') for code in ('A', 'B', 'C', 'D')]
+
+    for key in keys[:3]:
+        cache.put(key, value)
+    assert cache.get(keys[0]) is value  # A를 최근 사용으로
+    cache.put(keys[3], value)
+    assert cache.get(keys[1]) is None and cache.get(keys[0]) is value and cache.get(keys[3]) is value
+    assert cache.stats()['evictions'] == 1 and cache.stats()['bytes'] <= 300
+
+    cache.put(('daily-chart', 'kis', 'E', '1', '20261015'), {'bars': 'x' * 400})
+    assert cache.stats()['entries'] == 3
+    print("✅ 메모리 상한 LRU 제거 확인")
+
+
+def test_stats_endpoints():
+    """GET은 통계만 조회하고 초기화는 POST /api/chart-cache/reset로만 (초기화 직전 통계 반환, 캐시 내용 유지)"""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.services.chart_cache import get_chart_cache
+
+    cache = get_chart_cache()
+    cache.put(chart_cache_key('daily-chart', 'kis', '005930', '1', '20261015'), {'bars': [1]})
+    cache.hits = 3
+    client = TestClient(app)  # with 블록 없이 사용해 lifespan(스케줄러/피드 시작)은 실행하지 않음
+
+    assert client.get('/api/chart-cache', params={'reset': 'true'}).json()['hits'] == 3
+    assert cache.hits == 3
+    response = client.post('/api/chart-cache/reset')
+    assert response.status_code == 200 and response.json()['hits'] == 3
+    assert cache.hits == 0 and cache.stats()['entries'] >= 1
+    assert client.post('/api/metrics/reset').status_code == 200
+    print("✅ 통계 조회/초기화 엔드포인트 확인")
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("차트/지표 응답 캐시 테스트")
+    print("="*70)
+
+    try:
+        test_expires_at()
+        test_market_hours_expiry()
+        test_coalescing_and_failures()
+        test_cancelled_first_request()
+        test_lru_byte_eviction()
+        test_stats_endpoints()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+현재가 동시 조회 테스트
+
+가짜 get_current_price_data로 종목별 타임아웃과 일부 실패 시 나머지 결과 반환,
+타임아웃 뒤에도 진행 중인 요청 수가 동시 조회 상한을 넘지 않는지, 시세 개요의 X-Failed-Symbols 헤더를 확인합니다.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime
+
+# app.database는 임포트 시 엔진을 만들므로 PostgreSQL 설정이 없으면 메모리 SQLite 사용
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from fastapi import Response
+
+from app.routers.stocks import MAJOR_STOCKS, get_stocks  # lib 경로도 여기서 sys.path에 추가됨
+from app.services.quote_service import fetch_quotes
+import lib.hantu as hantu
+
+
+class FakePriceSource:
+    """slow 종목은 delay초 걸리고 broken 종목은 예외, 진행 중인 요청 수 최댓값을 기록"""
+
+    def __init__(self, slow=(), broken=(), delay=0.3):
+        self.slow = set(slow)
+        self.broken = set(broken)
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, stock_code):
+        with self._lock:
+            self.calls.append(stock_code)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay if stock_code in self.slow else 0.01)
+            if stock_code in self.broken:
+                raise Exception("API 호출 실패: 조회할 자료가 없습니다")
+            return {
+                'current_price': 70000, 'change_rate': 1.2, 'change_price': 800,
+                'volume': 1000, 'updated_at': datetime.now(),
+            }
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def run_with(source, coroutine_factory):
+    """lib.hantu.get_current_price_data를 source로 바꿔 실행 (타임아웃된 스레드가 끝날 때까지 기다림)"""
+    original = hantu.get_current_price_data
+    hantu.get_current_price_data = source
+    try:
+        result = asyncio.run(coroutine_factory())
+        time.sleep(source.delay + 0.1)
+        return result
+    finally:
+        hantu.get_current_price_data = original
+
+
+def test_timeout_and_partial_failure():
+    """늦은 종목/오류 종목만 실패로 돌려주고 나머지는 반환, 중복 종목은 한 번만 조회"""
+    source = FakePriceSource(slow={'000002'}, broken={'000003'})
+    symbols = ['000001', '000002', '000003', '000004', '000001']
+    started = time.monotonic()
+    quotes, failed = run_with(source, lambda: fetch_quotes(symbols, concurrency=4, timeout=0.1))
+    assert set(quotes) == {'000001', '000004'} and quotes['000001']['current_price'] == 70000
+    assert failed == ['000002', '000003']
+    assert sorted(source.calls) == ['000001', '000002', '000003', '000004']
+    assert time.monotonic() - started < 1.0
+    print("✅ 종목별 타임아웃/일부 실패 확인")
+
+
+def test_in_flight_cap_after_timeout():
+    """타임아웃으로 응답을 버린 요청도 끝날 때까지 자리를 차지 (자리를 기다리다 타임아웃된 종목은 요청하지 않음)"""
+    symbols = [f'{i:06d}' for i in range(8)]
+    source = FakePriceSource(slow=set(symbols[:4]))
+    quotes, failed = run_with(source, lambda: fetch_quotes(symbols, concurrency=2, timeout=0.05))
+    assert source.max_active <= 2
+    assert set(failed) >= set(symbols[:2]) and len(source.calls) < len(symbols)
+    assert set(quotes) | set(failed) == set(symbols)
+    print(f"✅ 동시 요청 상한 유지: 최대 {source.max_active}건, 요청 {len(source.calls)}/{len(symbols)}건")
+
+
+def test_failed_symbols_header():
+    """일부 종목 실패 시 성공한 종목만 반환하고 실패 종목코드는 X-Failed-Symbols 헤더로"""
+    broken = MAJOR_STOCKS[1]['symbol']
+    source = FakePriceSource(broken={broken})
+    response = Response()
+    result = run_with(source, lambda: get_stocks(
+        response, skip=0, limit=100, symbols=None, concurrency=8, timeout=1.0, db=None
+    ))
+    assert [stock['symbol'] for stock in result] == [s['symbol'] for s in MAJOR_STOCKS if s['symbol'] != broken]
+    assert response.headers['X-Failed-Symbols'] == broken
+    print("✅ X-Failed-Symbols 헤더 확인")
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("현재가 동시 조회 테스트")
+    print("="*70)
+
+    try:
+        test_timeout_and_partial_failure()
+        test_in_flight_cap_after_timeout()
+        test_failed_symbols_header()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
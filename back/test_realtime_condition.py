@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+실시간 조건검색 rec_stocks 반영 테스트
+
+메모리 SQLite 세션으로 등록 응답(현재 편입 종목 전체) 동기화, 편입/이탈 이벤트 반영과 편입 시점 가격,
+거래일마다 다시 등록하는 시점 판단을 확인합니다.
+"""
+
+import os
+from datetime import date, datetime
+
+# app.database는 임포트 시 엔진을 만들므로 PostgreSQL 설정이 없으면 메모리 SQLite 사용
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import sqlalchemy
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Algorithm, RecStock, StocksInfo
+from app.services.realtime_condition_service import (
+    apply_condition_event, apply_condition_snapshot, resnapshot_due
+)
+
+TODAY = date(2026, 10, 16)
+
+
+def make_session():
+    """테이블을 만든 메모리 SQLite 세션 (알고리즘 1개, 종목정보 2개)"""
+    engine = sqlalchemy.create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add(Algorithm(id=1, name='신고가 따라잡기', condition_id='7'))
+    db.add_all([StocksInfo(code='005930', name='삼성전자'), StocksInfo(code='000660', name='SK하이닉스')])
+    db.commit()
+    return db
+
+
+def rec_stocks(db, recommendation_date=TODAY):
+    rows = db.query(RecStock).filter(RecStock.algorithm_id == 1, RecStock.recommendation_date == recommendation_date)
+    return {row.stock_code: row for row in rows.all()}
+
+
+def test_snapshot():
+    """등록 응답 전체로 해당 날짜만 맞춤 (빠진 종목 삭제, 새 종목 추가, 이름이 없으면 종목정보에서 찾음)"""
+    db = make_session()
+    counts = apply_condition_snapshot(db, 1, [
+        {'stock_code': '005930', 'stock_name': '삼성전자', 'current_price': 70000.0},
+        {'stock_code': '000660', 'stock_name': '', 'current_price': 180000.0},
+    ], TODAY)
+    assert counts == {'added': 2, 'removed': 0}
+    assert rec_stocks(db)['000660'].stock_name == 'SK하이닉스'
+    assert rec_stocks(db)['005930'].closing_price == 70000.0
+
+    counts = apply_condition_snapshot(db, 1, [
+        {'stock_code': '000660', 'stock_name': 'SK하이닉스', 'current_price': 181000.0},
+        {'stock_code': '035720', 'stock_name': '카카오', 'current_price': 40000.0},
+        {'stock_code': '035720', 'stock_name': '카카오', 'current_price': 40000.0},
+    ], TODAY)
+    assert counts == {'added': 1, 'removed': 1}
+    assert set(rec_stocks(db)) == {'000660', '035720'}
+
+    # 다음 거래일 등록 응답은 전날 추천을 건드리지 않음
+    apply_condition_snapshot(db, 1, [{'stock_code': '005930', 'stock_name': '삼성전자'}], date(2026, 10, 19))
+    assert set(rec_stocks(db)) == {'000660', '035720'}
+    assert set(rec_stocks(db, date(2026, 10, 19))) == {'005930'}
+    print("✅ 등록 응답 동기화 확인")
+
+
+def test_event():
+    """편입은 조회한 현재가로 추가, 중복 편입/없는 종목 이탈은 변경 없음"""
+    db = make_session()
+    price_data = {'current_price': 70100, 'change_rate': 1.3}
+    assert apply_condition_event(db, 1, '005930', 'I', TODAY, price_data=price_data)
+    assert not apply_condition_event(db, 1, '005930', 'I', TODAY, price_data={'current_price': 1})
+    rec_stock = rec_stocks(db)['005930']
+    assert (rec_stock.stock_name, rec_stock.closing_price, rec_stock.change_rate) == ('삼성전자', 70100, 1.3)
+
+    # 가격 조회에 실패한 편입은 0으로 두고 일괄 조회 때 채움, 종목정보에 없으면 이름은 종목코드
+    assert apply_condition_event(db, 1, '123456', 'I', TODAY)
+    assert (rec_stocks(db)['123456'].stock_name, rec_stocks(db)['123456'].closing_price) == ('123456', 0.0)
+
+    assert apply_condition_event(db, 1, '005930', 'D', TODAY)
+    assert not apply_condition_event(db, 1, '005930', 'D', TODAY)
+    assert set(rec_stocks(db)) == {'123456'}
+    print("✅ 편입/이탈 이벤트 반영 확인")
+
+
+def test_resnapshot_due():
+    """다음 거래일 장 시작 이후에만 다시 등록 (같은 날, 주말, 장 시작 전은 제외)"""
+    assert not resnapshot_due(TODAY, datetime(2026, 10, 16, 15, 0))
+    assert not resnapshot_due(TODAY, datetime(2026, 10, 17, 10, 0))  # 토요일
+    assert not resnapshot_due(TODAY, datetime(2026, 10, 19, 8, 30))
+    assert resnapshot_due(TODAY, datetime(2026, 10, 19, 9, 1))
+    assert not resnapshot_due(date(2026, 10, 8), datetime(2026, 10, 9, 9, 30))  # 한글날 휴장
+    print("✅ 거래일 재등록 시점 확인")
+
+
+def main():
+    """모든 테스트 실행"""
+    print("\n" + "="*70)
+    print("실시간 조건검색 rec_stocks 반영 테스트")
+    print("="*70)
+
+    try:
+        test_snapshot()
+        test_event()
+        test_resnapshot_due()
+
+        print("\n" + "="*70)
+        print("✅ 모든 테스트 완료")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\n❌ 테스트 실패: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()